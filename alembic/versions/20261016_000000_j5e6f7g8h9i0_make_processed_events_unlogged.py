@@ -0,0 +1,26 @@
+"""Make processed_events an UNLOGGED table.
+
+Revision ID: j5e6f7g8h9i0
+Revises: i4d5e6f7g8h9
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "j5e6f7g8h9i0"
+down_revision: str | None = "i4d5e6f7g8h9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # claim は短命なので WAL を書かない (クラッシュ時に空になっても問題ない)
+    op.execute("ALTER TABLE processed_events SET UNLOGGED")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE processed_events SET LOGGED")
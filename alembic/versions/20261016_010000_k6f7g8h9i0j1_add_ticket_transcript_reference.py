@@ -0,0 +1,42 @@
+"""Add transcript reference columns to tickets.
+
+Revision ID: k6f7g8h9i0j1
+Revises: j5e6f7g8h9i0
+Create Date: 2026-10-16 01:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "k6f7g8h9i0j1"
+down_revision: str | None = "j5e6f7g8h9i0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # トランスクリプト本文はクローズログの添付ファイルに置き、
+    # DB にはメッセージへの参照と件数だけを保存する
+    op.add_column(
+        "tickets",
+        sa.Column("transcript_message_count", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "tickets",
+        sa.Column("transcript_channel_id", sa.String(), nullable=True),
+    )
+    op.add_column(
+        "tickets",
+        sa.Column("transcript_message_id", sa.String(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tickets", "transcript_message_id")
+    op.drop_column("tickets", "transcript_channel_id")
+    op.drop_column("tickets", "transcript_message_count")
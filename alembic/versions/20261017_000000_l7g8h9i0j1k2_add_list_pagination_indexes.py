@@ -0,0 +1,67 @@
+"""Add keyset pagination indexes to log and ticket tables.
+
+Revision ID: l7g8h9i0j1k2
+Revises: k6f7g8h9i0j1
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "l7g8h9i0j1k2"
+down_revision: str | None = "k6f7g8h9i0j1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (インデックス名, テーブル名, 列)
+# 管理画面の一覧は (created_at, id) の降順でページングするため、
+# 絞り込み条件の列の後ろに (created_at, id) を付ける
+_INDEXES: list[tuple[str, str, list[str]]] = [
+    ("ix_automod_logs_created_at_id", "automod_logs", ["created_at", "id"]),
+    (
+        "ix_automod_logs_guild_id_created_at_id",
+        "automod_logs",
+        ["guild_id", "created_at", "id"],
+    ),
+    (
+        "ix_automod_logs_user_id_created_at_id",
+        "automod_logs",
+        ["user_id", "created_at", "id"],
+    ),
+    ("ix_ban_logs_created_at_id", "ban_logs", ["created_at", "id"]),
+    (
+        "ix_ban_logs_guild_id_created_at_id",
+        "ban_logs",
+        ["guild_id", "created_at", "id"],
+    ),
+    (
+        "ix_ban_logs_user_id_created_at_id",
+        "ban_logs",
+        ["user_id", "created_at", "id"],
+    ),
+    ("ix_tickets_created_at_id", "tickets", ["created_at", "id"]),
+    (
+        "ix_tickets_guild_id_created_at_id",
+        "tickets",
+        ["guild_id", "created_at", "id"],
+    ),
+    ("ix_tickets_status_created_at_id", "tickets", ["status", "created_at", "id"]),
+    (
+        "ix_tickets_user_id_created_at_id",
+        "tickets",
+        ["user_id", "created_at", "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,77 @@
+"""Index audit: add indexes for hot service queries, drop redundant ones.
+
+Revision ID: m8h9i0j1k2l3
+Revises: l7g8h9i0j1k2
+Create Date: 2026-10-17 01:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "m8h9i0j1k2l3"
+down_revision: str | None = "l7g8h9i0j1k2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # get_due_bump_reminders / get_next_bump_reminder_at:
+    # 送信待ちの行だけの部分インデックス
+    op.create_index(
+        "ix_bump_reminders_due",
+        "bump_reminders",
+        ["remind_at"],
+        postgresql_where=sa.text("is_enabled IS true AND remind_at IS NOT NULL"),
+    )
+
+    # get_expired_chat_role_progress / get_next_chat_role_expiry は
+    # 付与済みの行だけを見る。
+    # expires_at 単体のインデックスは部分インデックスに置き換える
+    op.create_index(
+        "ix_chat_role_progress_granted_expires_at",
+        "chat_role_progress",
+        ["expires_at"],
+        postgresql_where=sa.text("granted IS true"),
+    )
+    op.drop_index("ix_chat_role_progress_expires_at", table_name="chat_role_progress")
+
+    # cleanup_expired_events: created_at < 期限 の範囲削除
+    op.create_index(
+        "ix_processed_events_created_at", "processed_events", ["created_at"]
+    )
+
+    # get_tickets_by_guild (guild_id + status、新しい順)
+    op.create_index(
+        "ix_tickets_guild_id_status_created_at_id",
+        "tickets",
+        ["guild_id", "status", "created_at", "id"],
+    )
+
+    # guild_id 単体のインデックスは、guild_id から始まる複合インデックス
+    # (ログは (guild_id, created_at, id)、チケットは uq_guild_ticket_number) で足りる。
+    # automod_logs は autoban_logs からのリネーム前の名前のまま残っている
+    op.drop_index("ix_autoban_logs_guild_id", table_name="automod_logs", if_exists=True)
+    op.drop_index("ix_automod_logs_guild_id", table_name="automod_logs", if_exists=True)
+    op.drop_index("ix_ban_logs_guild_id", table_name="ban_logs")
+    op.drop_index("ix_tickets_guild_id", table_name="tickets")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tickets_guild_id", "tickets", ["guild_id"])
+    op.create_index("ix_ban_logs_guild_id", "ban_logs", ["guild_id"])
+    op.create_index("ix_autoban_logs_guild_id", "automod_logs", ["guild_id"])
+
+    op.drop_index("ix_tickets_guild_id_status_created_at_id", table_name="tickets")
+    op.drop_index("ix_processed_events_created_at", table_name="processed_events")
+    op.create_index(
+        "ix_chat_role_progress_expires_at", "chat_role_progress", ["expires_at"]
+    )
+    op.drop_index(
+        "ix_chat_role_progress_granted_expires_at", table_name="chat_role_progress"
+    )
+    op.drop_index("ix_bump_reminders_due", table_name="bump_reminders")
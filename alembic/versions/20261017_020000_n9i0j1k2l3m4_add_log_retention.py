@@ -0,0 +1,133 @@
+"""Add log retention settings, archive tables and cleanup indexes.
+
+Revision ID: n9i0j1k2l3m4
+Revises: m8h9i0j1k2l3
+Create Date: 2026-10-17 02:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "n9i0j1k2l3m4"
+down_revision: str | None = "m8h9i0j1k2l3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# SiteSettings の保持日数 (NULL = 無期限)
+_RETENTION_DAYS_COLUMNS = (
+    "retention_automod_logs_days",
+    "retention_ban_logs_days",
+    "retention_intro_posts_days",
+    "retention_ticket_transcripts_days",
+    "retention_chat_role_progress_days",
+)
+
+
+def upgrade() -> None:
+    for name in _RETENTION_DAYS_COLUMNS:
+        op.add_column("site_settings", sa.Column(name, sa.Integer(), nullable=True))
+    op.add_column(
+        "site_settings",
+        sa.Column(
+            "retention_archive_logs",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text("false"),
+        ),
+    )
+
+    # 未付与の投稿カウントを最後の投稿から数えて消すための列。
+    # 既存の行は適用時刻から数え始める
+    op.add_column(
+        "chat_role_progress",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+    # retention ジョブが期限切れの行を探すためのインデックス
+    op.create_index(
+        "ix_chat_role_progress_pending_updated_at",
+        "chat_role_progress",
+        ["updated_at"],
+        postgresql_where=sa.text("granted IS false"),
+    )
+    op.create_index(
+        "ix_automod_intro_posts_posted_at", "automod_intro_posts", ["posted_at"]
+    )
+    op.create_index(
+        "ix_tickets_closed_at_with_transcript",
+        "tickets",
+        ["closed_at"],
+        postgresql_where=sa.text("transcript IS NOT NULL"),
+    )
+
+    # 保持期間を過ぎたログの退避先 (retention_archive_logs が有効なとき)。
+    # 元のルールが消えても残すため、rule_id に外部キーは張らない
+    op.create_table(
+        "automod_logs_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("guild_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("rule_id", sa.Integer(), nullable=False),
+        sa.Column("action_taken", sa.String(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_automod_logs_archive_guild_id_created_at",
+        "automod_logs_archive",
+        ["guild_id", "created_at"],
+    )
+    op.create_table(
+        "ban_logs_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("guild_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=True),
+        sa.Column("is_automod", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_ban_logs_archive_guild_id_created_at",
+        "ban_logs_archive",
+        ["guild_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ban_logs_archive")
+    op.drop_table("automod_logs_archive")
+
+    op.drop_index("ix_tickets_closed_at_with_transcript", table_name="tickets")
+    op.drop_index("ix_automod_intro_posts_posted_at", table_name="automod_intro_posts")
+    op.drop_index(
+        "ix_chat_role_progress_pending_updated_at", table_name="chat_role_progress"
+    )
+    op.drop_column("chat_role_progress", "updated_at")
+
+    op.drop_column("site_settings", "retention_archive_logs")
+    for name in reversed(_RETENTION_DAYS_COLUMNS):
+        op.drop_column("site_settings", name)
@@ -1,11 +1,13 @@
 import Link from 'next/link'
 import { apiFetch } from '@/lib/api'
 import { API_BASE } from '@/lib/constants'
-import type { AutoModLog, GuildsMap } from '@/lib/types'
+import type { AutoModLog, GuildsMap, Paginated } from '@/lib/types'
+import { listQuery } from '@/lib/utils'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Button } from '@/components/ui/button'
 import { DataTable, type Column } from '@/components/data-table'
+import { LogFilters, PageNav } from '@/components/log-filters'
 
 function resolveGuildName(guilds: GuildsMap, guildId: string) {
   return guilds[guildId] ?? guildId
@@ -20,11 +22,22 @@ function actionBadge(action: string) {
   return <Badge className={colors[action] ?? ''}>{action}</Badge>
 }
 
-export default async function AutoModLogsPage() {
-  const res = await apiFetch<{ logs: AutoModLog[]; guilds: GuildsMap }>(`${API_BASE}/automod/logs`)
+type SearchParams = { guild_id?: string; user_id?: string; cursor?: string }
+
+export default async function AutoModLogsPage({
+  searchParams,
+}: {
+  searchParams: Promise<SearchParams>
+}) {
+  const { guild_id, user_id, cursor } = await searchParams
+  const filters = { guild_id, user_id }
+  const res = await apiFetch<{ logs: AutoModLog[]; guilds: GuildsMap } & Paginated>(
+    `${API_BASE}/automod/logs${listQuery({ ...filters, cursor })}`
+  )
 
   const logs = res.data?.logs ?? []
   const guilds = res.data?.guilds ?? {}
+  const nextCursor = res.data?.next_cursor ?? null
 
   const columns: Column<AutoModLog>[] = [
     {
@@ -78,8 +91,15 @@ export default async function AutoModLogsPage() {
         <CardHeader>
           <CardTitle>Action Logs</CardTitle>
         </CardHeader>
-        <CardContent>
+        <CardContent className="space-y-4">
+          <LogFilters basePath="/dashboard/automod/logs" guilds={guilds} values={filters} />
           <DataTable columns={columns} data={logs} emptyMessage="No AutoMod logs found" />
+          <PageNav
+            basePath="/dashboard/automod/logs"
+            filters={filters}
+            cursor={cursor}
+            nextCursor={nextCursor}
+          />
         </CardContent>
       </Card>
     </div>
@@ -1,19 +1,32 @@
 import { apiFetch } from '@/lib/api'
 import { API_BASE } from '@/lib/constants'
-import type { BanLog, GuildsMap } from '@/lib/types'
+import type { BanLog, GuildsMap, Paginated } from '@/lib/types'
+import { listQuery } from '@/lib/utils'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { DataTable, type Column } from '@/components/data-table'
+import { LogFilters, PageNav } from '@/components/log-filters'
 
 function resolveGuildName(guilds: GuildsMap, guildId: string) {
   return guilds[guildId] ?? guildId
 }
 
-export default async function BanLogsPage() {
-  const res = await apiFetch<{ logs: BanLog[]; guilds: GuildsMap }>(`${API_BASE}/banlogs`)
+type SearchParams = { guild_id?: string; user_id?: string; cursor?: string }
+
+export default async function BanLogsPage({
+  searchParams,
+}: {
+  searchParams: Promise<SearchParams>
+}) {
+  const { guild_id, user_id, cursor } = await searchParams
+  const filters = { guild_id, user_id }
+  const res = await apiFetch<{ logs: BanLog[]; guilds: GuildsMap } & Paginated>(
+    `${API_BASE}/banlogs${listQuery({ ...filters, cursor })}`
+  )
 
   const logs = res.data?.logs ?? []
   const guilds = res.data?.guilds ?? {}
+  const nextCursor = res.data?.next_cursor ?? null
 
   const columns: Column<BanLog>[] = [
     {
@@ -64,8 +77,15 @@ export default async function BanLogsPage() {
         <CardHeader>
           <CardTitle>All Bans</CardTitle>
         </CardHeader>
-        <CardContent>
+        <CardContent className="space-y-4">
+          <LogFilters basePath="/dashboard/banlogs" guilds={guilds} values={filters} />
           <DataTable columns={columns} data={logs} emptyMessage="No ban logs found" />
+          <PageNav
+            basePath="/dashboard/banlogs"
+            filters={filters}
+            cursor={cursor}
+            nextCursor={nextCursor}
+          />
         </CardContent>
       </Card>
     </div>
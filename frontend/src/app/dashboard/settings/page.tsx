@@ -2,16 +2,50 @@
 
 import { useEffect, useState } from 'react'
 import { API_BASE } from '@/lib/constants'
+import type { RetentionSettings } from '@/lib/types'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Label } from '@/components/ui/label'
+import { Checkbox } from '@/components/ui/checkbox'
 import { toast } from 'sonner'
 
 interface SettingsData {
   timezone_offset: number
   email: string
   pending_email: string | null
+  retention: RetentionSettings
+}
+
+type RetentionDaysKey = Exclude<keyof RetentionSettings, 'archive_logs'>
+
+const RETENTION_FIELDS: { key: RetentionDaysKey; label: string; hint?: string }[] = [
+  { key: 'automod_logs_days', label: 'AutoMod logs' },
+  { key: 'ban_logs_days', label: 'Ban logs' },
+  {
+    key: 'ticket_transcripts_days',
+    label: 'Ticket transcripts',
+    hint: 'Counted from when the ticket was closed. The ticket itself is kept.',
+  },
+  {
+    key: 'chat_role_progress_days',
+    label: 'Chat role progress',
+    hint: 'Message counts of members without the role reset after this much inactivity.',
+  },
+  {
+    key: 'intro_posts_days',
+    label: 'Intro posts',
+    hint: 'Members whose post record is removed are treated as never having posted by intro rules.',
+  },
+]
+
+const DEFAULT_RETENTION: RetentionSettings = {
+  automod_logs_days: null,
+  ban_logs_days: null,
+  intro_posts_days: null,
+  ticket_transcripts_days: null,
+  chat_role_progress_days: null,
+  archive_logs: false,
 }
 
 export default function SettingsPage() {
@@ -21,6 +55,10 @@ export default function SettingsPage() {
   const [timezoneOffset, setTimezoneOffset] = useState(9)
   const [savingTimezone, setSavingTimezone] = useState(false)
 
+  // Retention
+  const [retention, setRetention] = useState<RetentionSettings>(DEFAULT_RETENTION)
+  const [savingRetention, setSavingRetention] = useState(false)
+
   // Email
   const [currentEmail, setCurrentEmail] = useState('')
   const [pendingEmail, setPendingEmail] = useState<string | null>(null)
@@ -41,6 +79,7 @@ export default function SettingsPage() {
           setTimezoneOffset(data.timezone_offset)
           setCurrentEmail(data.email)
           setPendingEmail(data.pending_email ?? null)
+          setRetention(data.retention ?? DEFAULT_RETENTION)
         }
       } finally {
         setLoading(false)
@@ -77,6 +116,35 @@ export default function SettingsPage() {
     }
   }
 
+  async function handleSaveRetention(e: React.SyntheticEvent<HTMLFormElement>) {
+    e.preventDefault()
+    setSavingRetention(true)
+    try {
+      const res = await fetch(`${API_BASE}/settings/retention`, {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(retention),
+      })
+      if (res.ok) {
+        toast.success('Retention updated successfully')
+      } else {
+        const body = await res.text()
+        let msg: string
+        try {
+          const data = JSON.parse(body)
+          msg = data.error || data.detail || body
+        } catch {
+          msg = body
+        }
+        toast.error(`Failed to update retention: ${msg}`)
+      }
+    } catch {
+      toast.error('Failed to update retention')
+    } finally {
+      setSavingRetention(false)
+    }
+  }
+
   async function handleSaveEmail(e: React.SyntheticEvent<HTMLFormElement>) {
     e.preventDefault()
     if (!newEmail.trim()) return
@@ -190,6 +258,55 @@ export default function SettingsPage() {
         </CardContent>
       </Card>
 
+      {/* Retention */}
+      <Card>
+        <CardHeader>
+          <CardTitle>Retention</CardTitle>
+        </CardHeader>
+        <CardContent>
+          <form onSubmit={handleSaveRetention} className="space-y-4 max-w-md">
+            <p className="text-sm text-muted-foreground">
+              Rows older than this many days are removed by an hourly background job. Leave a field
+              empty to keep everything.
+            </p>
+            {RETENTION_FIELDS.map(({ key, label, hint }) => (
+              <div key={key}>
+                <Label htmlFor={`retention-${key}`}>{label} (days)</Label>
+                <Input
+                  id={`retention-${key}`}
+                  type="number"
+                  min={1}
+                  max={3650}
+                  value={retention[key] ?? ''}
+                  onChange={(e) => {
+                    const days = parseInt(e.target.value, 10)
+                    setRetention({ ...retention, [key]: Number.isNaN(days) ? null : days })
+                  }}
+                  placeholder="Keep forever"
+                  className="w-40 mt-1.5"
+                />
+                {hint && <p className="text-xs text-muted-foreground mt-1">{hint}</p>}
+              </div>
+            ))}
+            <div className="flex items-center gap-2">
+              <Checkbox
+                id="retention-archive-logs"
+                checked={retention.archive_logs}
+                onCheckedChange={(checked) =>
+                  setRetention({ ...retention, archive_logs: checked === true })
+                }
+              />
+              <label htmlFor="retention-archive-logs" className="text-sm">
+                Move expired AutoMod and ban logs to archive tables instead of deleting them
+              </label>
+            </div>
+            <Button type="submit" disabled={savingRetention}>
+              {savingRetention ? 'Saving...' : 'Save Retention'}
+            </Button>
+          </form>
+        </CardContent>
+      </Card>
+
       {/* Email */}
       <Card>
         <CardHeader>
@@ -114,6 +114,25 @@ export default async function TicketDetailPage({ params }: { params: Promise<{ i
         </Card>
       )}
 
+      {!ticket.transcript && ticket.transcript_url && (
+        <Card>
+          <CardHeader>
+            <CardTitle>Transcript</CardTitle>
+          </CardHeader>
+          <CardContent className="text-sm">
+            {ticket.transcript_message_count ?? 0} messages, attached to the close log.{' '}
+            <a
+              href={ticket.transcript_url}
+              target="_blank"
+              rel="noopener noreferrer"
+              className="text-primary underline-offset-4 hover:underline"
+            >
+              Open in Discord
+            </a>
+          </CardContent>
+        </Card>
+      )}
+
       <div>
         <DeleteButton
           endpoint={`${API_BASE}/tickets/${id}/delete`}
@@ -1,9 +1,10 @@
 'use client'
 
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useState } from 'react'
 import Link from 'next/link'
 import { API_BASE } from '@/lib/constants'
-import type { Ticket, GuildsMap } from '@/lib/types'
+import type { Ticket, GuildsMap, Paginated } from '@/lib/types'
+import { listQuery } from '@/lib/utils'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Button } from '@/components/ui/button'
@@ -11,6 +12,7 @@ import { DataTable, type Column } from '@/components/data-table'
 import { DeleteButton } from '@/components/delete-button'
 
 type StatusFilter = 'all' | 'open' | 'closed'
+type TicketsResponse = { tickets: Ticket[]; guilds: GuildsMap } & Paginated
 
 function resolveGuildName(guilds: GuildsMap, guildId: string) {
   return guilds[guildId] ?? guildId
@@ -20,20 +22,41 @@ export default function TicketsPage() {
   const [tickets, setTickets] = useState<Ticket[]>([])
   const [guilds, setGuilds] = useState<GuildsMap>({})
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [statusFilter, setStatusFilter] = useState<StatusFilter>('all')
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+
+  // The status filter is applied by the API so that every page is filtered,
+  // not only the tickets loaded so far.
+  const fetchPage = useCallback(
+    async (cursor?: string) => {
+      const status = statusFilter === 'all' ? '' : statusFilter
+      const res: TicketsResponse | null = await fetch(
+        `${API_BASE}/tickets${listQuery({ status, cursor })}`
+      ).then((r) => r.json())
+      setGuilds(res?.guilds ?? {})
+      setNextCursor(res?.next_cursor ?? null)
+      return res?.tickets ?? []
+    },
+    [statusFilter]
+  )
 
   useEffect(() => {
     async function fetchData() {
-      const res = await fetch(`${API_BASE}/tickets`).then((r) => r.json())
-      setTickets(res?.tickets ?? [])
-      setGuilds(res?.guilds ?? {})
+      setLoading(true)
+      setTickets(await fetchPage())
       setLoading(false)
     }
     fetchData()
-  }, [])
+  }, [fetchPage])
 
-  const filteredTickets =
-    statusFilter === 'all' ? tickets : tickets.filter((t) => t.status === statusFilter)
+  async function loadMore() {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    const older = await fetchPage(nextCursor)
+    setTickets((current) => [...current, ...older])
+    setLoadingMore(false)
+  }
 
   const columns: Column<Ticket>[] = [
     {
@@ -123,7 +146,14 @@ export default function TicketsPage() {
           <CardTitle>Tickets</CardTitle>
         </CardHeader>
         <CardContent>
-          <DataTable columns={columns} data={filteredTickets} emptyMessage="No tickets found" />
+          <DataTable columns={columns} data={tickets} emptyMessage="No tickets found" />
+          {nextCursor && (
+            <div className="mt-4 flex justify-center">
+              <Button variant="outline" size="sm" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>
@@ -0,0 +1,83 @@
+import Link from 'next/link'
+import type { GuildsMap } from '@/lib/types'
+import { listQuery } from '@/lib/utils'
+import { Button } from '@/components/ui/button'
+import { Input } from '@/components/ui/input'
+
+export interface LogFilterValues {
+  guild_id?: string
+  user_id?: string
+}
+
+// Server / user filters for log lists. Submitting the form (GET) drops the
+// cursor, so a new filter always starts from the newest entry.
+export function LogFilters({
+  basePath,
+  guilds,
+  values,
+}: {
+  basePath: string
+  guilds: GuildsMap
+  values: LogFilterValues
+}) {
+  return (
+    <form action={basePath} method="get" className="flex flex-wrap items-center gap-2">
+      <select
+        name="guild_id"
+        defaultValue={values.guild_id ?? ''}
+        aria-label="Server"
+        className="h-9 rounded-md border border-input bg-transparent px-3 text-sm"
+      >
+        <option value="">All servers</option>
+        {Object.entries(guilds).map(([id, name]) => (
+          <option key={id} value={id}>
+            {name}
+          </option>
+        ))}
+      </select>
+      <Input
+        name="user_id"
+        defaultValue={values.user_id ?? ''}
+        placeholder="User ID"
+        aria-label="User ID"
+        className="w-48"
+      />
+      <Button type="submit" variant="outline" size="sm">
+        Filter
+      </Button>
+    </form>
+  )
+}
+
+// "Newest" / "Older" links for a keyset-paginated list.
+export function PageNav({
+  basePath,
+  filters,
+  cursor,
+  nextCursor,
+}: {
+  basePath: string
+  filters: LogFilterValues
+  cursor?: string
+  nextCursor: string | null
+}) {
+  if (!cursor && !nextCursor) return null
+  return (
+    <div className="flex justify-end gap-2">
+      {cursor && (
+        <Link href={`${basePath}${listQuery({ ...filters })}`}>
+          <Button variant="outline" size="sm">
+            Newest
+          </Button>
+        </Link>
+      )}
+      {nextCursor && (
+        <Link href={`${basePath}${listQuery({ ...filters, cursor: nextCursor })}`}>
+          <Button variant="outline" size="sm">
+            Older
+          </Button>
+        </Link>
+      )}
+    </div>
+  )
+}
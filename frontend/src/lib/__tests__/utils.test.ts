@@ -1,5 +1,5 @@
 import { describe, it, expect } from 'vitest'
-import { cn } from '../utils'
+import { cn, listQuery } from '../utils'
 
 describe('cn', () => {
   it('merges class names', () => {
@@ -33,3 +33,20 @@ describe('cn', () => {
     expect(cn({ hidden: false, visible: true })).toBe('visible')
   })
 })
+
+describe('listQuery', () => {
+  it('returns empty string when every value is empty', () => {
+    expect(listQuery({})).toBe('')
+    expect(listQuery({ guild_id: '', cursor: undefined })).toBe('')
+  })
+
+  it('skips empty values', () => {
+    expect(listQuery({ guild_id: '123', user_id: '', cursor: 'abc' })).toBe(
+      '?guild_id=123&cursor=abc'
+    )
+  })
+
+  it('encodes values', () => {
+    expect(listQuery({ cursor: 'a=b&c' })).toBe('?cursor=a%3Db%26c')
+  })
+})
@@ -8,6 +8,11 @@ export interface ChannelsMap {
 export interface RolesMap {
   [guildId: string]: { id: string; name: string; color: number }[]
 }
+// Keyset-paginated lists: pass `next_cursor` back as `cursor` for the next
+// (older) page. null means this is the last page.
+export interface Paginated {
+  next_cursor: string | null
+}
 
 // Lobbies
 export interface Lobby {
@@ -88,6 +93,16 @@ export interface ActivitySettings {
   activity_text: string
 }
 
+// Retention (null days = keep forever)
+export interface RetentionSettings {
+  automod_logs_days: number | null
+  ban_logs_days: number | null
+  intro_posts_days: number | null
+  ticket_transcripts_days: number | null
+  chat_role_progress_days: number | null
+  archive_logs: boolean
+}
+
 // Health
 export interface HealthConfig {
   id: number
@@ -185,6 +200,8 @@ export interface Ticket {
 }
 export interface TicketDetail extends Ticket {
   transcript: string | null
+  transcript_message_count: number | null
+  transcript_url: string | null
 }
 export interface TicketCategory {
   id: number
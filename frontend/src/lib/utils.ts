@@ -4,3 +4,14 @@ import { twMerge } from 'tailwind-merge'
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+// Build a `?key=value` query string, skipping empty values.
+// Used for list filters and the `cursor` of keyset-paginated endpoints.
+export function listQuery(params: Record<string, string | undefined>) {
+  const search = new URLSearchParams()
+  for (const [key, value] of Object.entries(params)) {
+    if (value) search.set(key, value)
+  }
+  const query = search.toString()
+  return query ? `?${query}` : ''
+}
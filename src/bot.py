@@ -1,6 +1,6 @@
 """Discord bot class definition.
 
-Bot 本体のクラス定義。起動時の初期化処理（DB・Cog・View の復元）を担う。
+Bot 本体のクラス定義。起動時の初期化処理（DB・Cog・ボタンの登録）を担う。
 
 Examples:
     基本的な使い方::
@@ -22,18 +22,31 @@ Notes:
     - Discord Developer Portal で必要な Intents を有効化すること
 """
 
+import asyncio
 import logging
+from typing import Any
 
 import discord
 from discord.ext import commands
 
-from src.database.engine import async_session
+from src.config import settings
+from src.constants import CHANGE_FEED_CONNECT_TIMEOUT_SECONDS
+from src.core.instrumentation import ListenerMetrics
+from src.core.loop_monitor import LoopLagProbe
+from src.core.message_router import MessageRouter
+from src.core.metrics import (
+    GATEWAY_LATENCY,
+    REGISTRY,
+    MetricsServer,
+    install_db_metrics,
+)
+from src.database.change_feed import ChangeBatch, ChangeFeedListener
+from src.database.engine import async_session, engine
 from src.services.db_service import (
-    get_all_voice_sessions,
     get_bot_activity,
     get_site_settings,
 )
-from src.ui.control_panel import ControlPanelView
+from src.ui.control_panel import ControlPanelButton
 
 logger = logging.getLogger(__name__)
 
@@ -146,11 +159,49 @@ class EphemeralVCBot(commands.Bot):
             activity=activity,
         )
 
+        # --- Web 管理画面からの変更通知 (LISTEN/NOTIFY) ---
+        # 受け取った変更は on_db_change イベントとして各 Cog に配る
+        self.change_feed = ChangeFeedListener(self._dispatch_db_change)
+
+        # --- リスナー・スラッシュコマンドの計測 ---
+        # add_cog 時に各 Cog のリスナーとコマンドを包み、(Cog, イベント) ごとの
+        # 処理時間・DB トランザクション数・例外数を集計する
+        self.listener_metrics = ListenerMetrics(
+            slow_seconds=settings.listener_slow_seconds
+        )
+
+        # --- on_message ルーター ---
+        # 各 Cog は on_message リスナーを持たず、関心のあるチャンネル/ギルドを
+        # ルーターに登録する。共通の判定は 1 回だけ行い、関心のある Cog だけに配る
+        self.message_router = MessageRouter(self, metrics=self.listener_metrics)
+        self.add_listener(self.message_router.dispatch, "on_message")
+
+        # --- メトリクス (/metrics) ---
+        # イベントループの遅れを測り、METRICS_PORT が設定されていれば
+        # Prometheus 形式で配信する HTTP リスナーを起動する
+        self.loop_probe = LoopLagProbe()
+        self.metrics_server: MetricsServer | None = None
+        if settings.metrics_port:
+            self.metrics_server = MetricsServer(
+                settings.metrics_host,
+                settings.metrics_port,
+                token=settings.metrics_token,
+            )
+
+    async def add_cog(self, cog: commands.Cog, /, **kwargs: Any) -> None:
+        """Cog のリスナーとスラッシュコマンドを計測付きにしてから登録する。"""
+        self.listener_metrics.instrument_cog(cog)
+        await super().add_cog(cog, **kwargs)
+
+    def _dispatch_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面での変更を on_db_change イベントとして配る。"""
+        self.dispatch("db_change", batch)
+
     async def setup_hook(self) -> None:
         """Bot 起動前に呼ばれるフック。Cog・View の初期化を行う。
 
         discord.py が内部的に呼び出す。Cog の読み込み、
-        永続 View の復元、スラッシュコマンドの同期を行う。
+        永続ボタンの登録、スラッシュコマンドの同期を行う。
 
         Returns:
             None
@@ -163,6 +214,9 @@ class EphemeralVCBot(commands.Bot):
         Notes:
             実行される処理:
 
+            0. Web 管理画面からの変更通知 (LISTEN) の受信開始と
+               メトリクスの収集・配信 (METRICS_PORT 設定時) の開始
+
             1. Cog (機能モジュール) の読み込み
                - voice: ボイスチャンネル管理
                - admin: /lobby コマンド
@@ -170,8 +224,9 @@ class EphemeralVCBot(commands.Bot):
                - bump: bump リマインダー
                - sticky: sticky メッセージ
 
-            2. 永続 View の復元
-               - DB から VoiceSession を取得し、ControlPanelView を再登録
+            2. サイト設定の読み込みと永続ボタンの登録
+               - タイムゾーン設定を読み込む
+               - コントロールパネルのボタン (ControlPanelButton) を登録
 
             3. スラッシュコマンドの同期
                - tree.sync() で Discord にコマンドを登録
@@ -186,8 +241,33 @@ class EphemeralVCBot(commands.Bot):
 
         See Also:
             - :meth:`on_ready`: 起動完了時の処理
-            - :class:`src.ui.control_panel.ControlPanelView`: コントロールパネル
+            - :class:`src.ui.control_panel.ControlPanelButton`: コントロールパネル
         """
+        # 0. Web 管理画面からの変更通知の受信を開始
+        #    start() はタスクを作るだけなので、LISTEN の開始は Cog の読み込み前に
+        #    wait_connected() で待つ (読み込み中の Web の変更を取りこぼさない)
+        self.change_feed.start()
+
+        #    メトリクスの収集と配信を開始する
+        install_db_metrics(engine)
+        GATEWAY_LATENCY.set_function(lambda: self.latency)
+        REGISTRY.add_collector(self.listener_metrics.collect)
+        self.loop_probe.start()
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+
+        #    DB に繋がらなくても起動は止めない (取りこぼしは定期 resync で拾う)
+        try:
+            await asyncio.wait_for(
+                self.change_feed.wait_connected(),
+                CHANGE_FEED_CONNECT_TIMEOUT_SECONDS,
+            )
+        except TimeoutError:
+            logger.warning(
+                "Change feed did not start listening within %ss; loading cogs anyway",
+                CHANGE_FEED_CONNECT_TIMEOUT_SECONDS,
+            )
+
         # 1. Cog の読み込み — 各機能を独立したファイル (Cog) に分けている
         #    voice: ボイスチャンネルの作成・削除・オーナー引き継ぎ
         #    admin: /lobby コマンドでロビーVC を作成
@@ -207,6 +287,7 @@ class EphemeralVCBot(commands.Bot):
             "src.cogs.chatrole",
             "src.cogs.auto_reaction",
             "src.cogs.eventlog",
+            "src.cogs.retention",
         ]
         for ext in extensions:
             try:
@@ -216,10 +297,7 @@ class EphemeralVCBot(commands.Bot):
                 logger.exception("Failed to load extension %s: %s", ext, e)
                 raise  # 起動時に Cog 読み込みに失敗したら例外を上げて停止
 
-        # 2. 永続 View の復元
-        #    discord.py の View (ボタン等) は Bot が再起動すると動かなくなる。
-        #    DB に保存されているセッション情報から View を再登録することで、
-        #    再起動後もボタンが押せるようにする。
+        # 2. サイト設定の読み込みと永続ボタンの登録
         async with async_session() as session:
             # タイムゾーン設定を読み込み
             site = await get_site_settings(session)
@@ -229,38 +307,10 @@ class EphemeralVCBot(commands.Bot):
                 set_timezone_offset(site.timezone_offset)
                 logger.info("Timezone offset loaded: UTC%+d", site.timezone_offset)
 
-            sessions = await get_all_voice_sessions(session)
-            logger.info("Restoring %d persistent views from database", len(sessions))
-            for voice_session in sessions:
-                # NSFW 状態は DB に保存していないため、チャンネルから取得する
-                # setup_hook 時点ではキャッシュが空の場合があるため、
-                # 取得できなければデフォルト値 False を使う
-                is_nsfw = False
-                channel = self.get_channel(int(voice_session.channel_id))
-                if channel is None:
-                    logger.debug(
-                        "Channel %s not in cache for session %d, using NSFW=False",
-                        voice_session.channel_id,
-                        voice_session.id,
-                    )
-                elif isinstance(channel, discord.VoiceChannel):
-                    is_nsfw = channel.nsfw
-                else:
-                    logger.warning(
-                        "Channel %s is not a VoiceChannel (type=%s) for session %d",
-                        voice_session.channel_id,
-                        type(channel).__name__,
-                        voice_session.id,
-                    )
-                view = ControlPanelView(
-                    voice_session.id,
-                    voice_session.is_locked,
-                    voice_session.is_hidden,
-                    is_nsfw,
-                )
-                # add_view() で Bot にビューを登録する。
-                # custom_id が一致するボタンのクリックイベントが届くようになる。
-                self.add_view(view)
+        # コントロールパネルのボタンは DynamicItem で、custom_id に一致すれば
+        # どのチャンネルのパネルでも動作する。状態はクリック時に DB から読むので、
+        # セッションの数に関係なく登録は 1 回で済む。
+        self.add_dynamic_items(ControlPanelButton)
 
         # 3. スラッシュコマンドの同期
         #    tree.sync() で Bot のスラッシュコマンドを Discord に登録する。
@@ -272,6 +322,14 @@ class EphemeralVCBot(commands.Bot):
             logger.exception("Failed to sync slash commands: %s", e)
             raise
 
+    async def close(self) -> None:
+        """変更通知の受信とメトリクスの配信を止めてから Bot を終了する。"""
+        await self.change_feed.stop()
+        await self.loop_probe.stop()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+        await super().close()
+
     async def on_ready(self) -> None:
         """Bot が Discord に接続完了したときに呼ばれる。
 
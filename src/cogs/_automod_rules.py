@@ -0,0 +1,234 @@
+"""AutoMod cog helper: compiled rule evaluators and guild rule cache.
+
+DB の AutoModRule をイベント処理前に一度だけ前処理 (コンパイル) し、
+ギルド単位・イベント種別ごとに振り分けて保持する。
+
+- ロール ID のカンマ区切り文字列は frozenset に分割済み
+- ユーザー名パターンは小文字化済み
+- 自己紹介チャンネル (vc_without_intro / msg_without_intro) は集合に集約済み
+
+キャッシュはギルドごとのバージョン番号を持ち、スラッシュコマンドによる
+即時無効化と定期的な全件再読み込みが競合しても古いデータで上書きしない。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.database.models import AutoModRule
+
+# イベント種別ごとに評価するルールタイプ
+JOIN_RULE_TYPES = frozenset({"username_match", "account_age", "no_avatar"})
+MEMBER_UPDATE_RULE_TYPES = frozenset({"role_acquired", "role_count"})
+VOICE_RULE_TYPES = frozenset({"vc_join", "vc_without_intro"})
+MESSAGE_RULE_TYPES = frozenset({"message_post", "msg_without_intro"})
+INTRO_RULE_TYPES = frozenset({"vc_without_intro", "msg_without_intro"})
+
+
+def _lower_username_pattern(pattern: str | None) -> str | None:
+    """ユーザー名パターンを小文字化したユーザー名との比較用に小文字化する。
+
+    wildcard は部分一致 (in)、それ以外は完全一致 (==) で評価する。
+    """
+    if not pattern:
+        return None
+    return pattern.lower()
+
+
+def _split_role_ids(raw: str | None) -> frozenset[str]:
+    """カンマ区切りのロール ID 文字列を集合に分割する。"""
+    if not raw:
+        return frozenset()
+    return frozenset(rid.strip() for rid in raw.split(",") if rid.strip())
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """前処理済みの AutoMod ルール (不変)。
+
+    ORM インスタンスをセッション外で保持しないよう、評価とアクション実行に
+    必要な値だけをコピーして保持する。
+    """
+
+    id: int
+    guild_id: str
+    rule_type: str
+    action: str
+    pattern: str | None
+    use_wildcard: bool
+    threshold_seconds: int | None
+    required_channel_id: str | None
+    target_role_ids: frozenset[str]
+    timeout_duration_seconds: int | None
+    created_at: datetime
+    username_pattern: str | None
+
+    @classmethod
+    def from_model(cls, rule: AutoModRule) -> CompiledRule:
+        """AutoModRule からコンパイル済みルールを作成する。"""
+        return cls(
+            id=rule.id,
+            guild_id=rule.guild_id,
+            rule_type=rule.rule_type,
+            action=rule.action,
+            pattern=rule.pattern,
+            use_wildcard=rule.use_wildcard,
+            threshold_seconds=rule.threshold_seconds,
+            required_channel_id=rule.required_channel_id,
+            target_role_ids=_split_role_ids(rule.target_role_ids),
+            timeout_duration_seconds=rule.timeout_duration_seconds,
+            created_at=rule.created_at,
+            username_pattern=_lower_username_pattern(rule.pattern),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GuildRuleSet:
+    """1ギルド分の有効ルールをイベント種別ごとに振り分けたもの (不変)。"""
+
+    join_rules: tuple[CompiledRule, ...] = ()
+    member_update_rules: tuple[CompiledRule, ...] = ()
+    voice_rules: tuple[CompiledRule, ...] = ()
+    message_rules: tuple[CompiledRule, ...] = ()
+    intro_channel_ids: frozenset[str] = frozenset()
+    rule_ids: frozenset[int] = frozenset()
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[AutoModRule]) -> GuildRuleSet:
+        """ルール一覧をコンパイルしてルールセットを作成する (順序は維持)。"""
+        compiled = [CompiledRule.from_model(r) for r in rules]
+        return cls(
+            join_rules=tuple(r for r in compiled if r.rule_type in JOIN_RULE_TYPES),
+            member_update_rules=tuple(
+                r for r in compiled if r.rule_type in MEMBER_UPDATE_RULE_TYPES
+            ),
+            voice_rules=tuple(r for r in compiled if r.rule_type in VOICE_RULE_TYPES),
+            message_rules=tuple(
+                r for r in compiled if r.rule_type in MESSAGE_RULE_TYPES
+            ),
+            intro_channel_ids=frozenset(
+                r.required_channel_id
+                for r in compiled
+                if r.rule_type in INTRO_RULE_TYPES and r.required_channel_id
+            ),
+            rule_ids=frozenset(r.id for r in compiled),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.join_rules
+            or self.member_update_rules
+            or self.voice_rules
+            or self.message_rules
+        )
+
+
+EMPTY_RULE_SET = GuildRuleSet()
+
+
+class AutoModRuleCache:
+    """guild_id → GuildRuleSet のキャッシュ (バージョン付き無効化)。
+
+    未ロード (``loaded`` が False) の間、``get`` は None を返し、呼び出し側は
+    DB にフォールバックする。ロード済みでエントリがないギルドは
+    「有効ルールなし」として EMPTY_RULE_SET を返す。
+    """
+
+    def __init__(self) -> None:
+        self._rule_sets: dict[str, GuildRuleSet] | None = None
+        self._versions: dict[str, int] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._rule_sets is not None
+
+    def __len__(self) -> int:
+        return len(self._rule_sets) if self._rule_sets is not None else 0
+
+    def get(self, guild_id: str) -> GuildRuleSet | None:
+        """ギルドのルールセットを返す (未ロード時は None)。"""
+        if self._rule_sets is None:
+            return None
+        return self._rule_sets.get(guild_id, EMPTY_RULE_SET)
+
+    def invalidate(self, guild_id: str) -> int:
+        """ギルドのバージョンを進め、新しいバージョン番号を返す。
+
+        進行中の再読み込みは完了時にバージョン不一致となり破棄される。
+        """
+        version = self._versions.get(guild_id, 0) + 1
+        self._versions[guild_id] = version
+        return version
+
+    def guilds_containing(self, rule_id: int) -> list[str]:
+        """指定ルールを含むギルド ID 一覧を返す。"""
+        if self._rule_sets is None:
+            return []
+        return [
+            guild_id
+            for guild_id, rule_set in self._rule_sets.items()
+            if rule_id in rule_set.rule_ids
+        ]
+
+    def store(self, guild_id: str, rules: Iterable[AutoModRule], version: int) -> bool:
+        """1ギルド分のルールを格納する。
+
+        ``version`` が現在のバージョンと一致しない (より新しい無効化があった)
+        場合は格納せず False を返す。未ロード時も格納しない。
+        """
+        if self._rule_sets is None or self._versions.get(guild_id, 0) != version:
+            return False
+        rule_set = GuildRuleSet.from_rules(rules)
+        if rule_set:
+            self._rule_sets[guild_id] = rule_set
+        else:
+            self._rule_sets.pop(guild_id, None)
+        return True
+
+    def message_guild_ids(self) -> set[str] | None:
+        """メッセージ投稿を処理する必要があるギルド ID 一覧 (未ロード時は None)。
+
+        message_post / msg_without_intro ルールか、自己紹介チャンネルの
+        記録が必要なルールを持つギルド。
+        """
+        if self._rule_sets is None:
+            return None
+        return {
+            guild_id
+            for guild_id, rule_set in self._rule_sets.items()
+            if rule_set.message_rules or rule_set.intro_channel_ids
+        }
+
+    def snapshot_versions(self) -> dict[str, int]:
+        """全件再読み込みの開始前に現在のバージョンを記録する。"""
+        return dict(self._versions)
+
+    def replace_all(
+        self, rules: Iterable[AutoModRule], versions: dict[str, int]
+    ) -> None:
+        """全ギルドのルールを置き換える。
+
+        ``versions`` (読み込み開始時点のスナップショット) 以降に無効化された
+        ギルドは、読み込んだデータが古い可能性があるため既存エントリを維持する。
+        """
+        grouped: dict[str, list[AutoModRule]] = {}
+        for rule in rules:
+            grouped.setdefault(rule.guild_id, []).append(rule)
+
+        new_sets: dict[str, GuildRuleSet] = {}
+        for guild_id, guild_rules in grouped.items():
+            rule_set = GuildRuleSet.from_rules(guild_rules)
+            if rule_set:
+                new_sets[guild_id] = rule_set
+
+        old_sets = self._rule_sets or {}
+        for guild_id, version in self._versions.items():
+            if versions.get(guild_id, 0) == version:
+                continue
+            if guild_id in old_sets:
+                new_sets[guild_id] = old_sets[guild_id]
+            else:
+                new_sets.pop(guild_id, None)
+        self._rule_sets = new_sets
@@ -0,0 +1,198 @@
+"""EventLog cog helper: per-channel batched send queue.
+
+イベントごとに ``channel.send`` するとレイドや大量のロール変更で
+レート制限に当たり、Gateway のイベント処理も詰まる。そこで送信先
+チャンネルごとにキューとワーカータスクを持ち、Embed をまとめて送る。
+
+- ``put`` はキューに積むだけで待たない (イベントハンドラはすぐ戻る)
+- ワーカーは最初の Embed を受け取ってから ``flush_delay`` 秒だけ待ち、
+  その間に届いた Embed を 1 メッセージ (最大 10 個・合計 6000 文字) にまとめる
+- キューは ``max_size`` で上限を持ち、溢れた Embed は捨てて件数を数える
+- チャンネルごとに独立したワーカーなので、送信はチャンネル間で並行に進む
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Iterator
+
+import discord
+
+from src.constants import (
+    EVENTLOG_FLUSH_DELAY_SECONDS,
+    EVENTLOG_QUEUE_CLOSE_TIMEOUT_SECONDS,
+    EVENTLOG_QUEUE_MAX_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Discord の 1 メッセージあたりの Embed 数の上限
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# Discord の 1 メッセージあたりの Embed 合計文字数の上限
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def chunk_embeds(embeds: list[discord.Embed]) -> Iterator[list[discord.Embed]]:
+    """Embed を 1 メッセージに収まる単位に分割する。
+
+    各チャンクは最大 MAX_EMBEDS_PER_MESSAGE 個、合計文字数
+    (``len(embed)``) が MAX_EMBED_CHARS_PER_MESSAGE 以下になる。
+    順序は保つ。
+    """
+    chunk: list[discord.Embed] = []
+    chars = 0
+    for embed in embeds:
+        size = len(embed)
+        if chunk and (
+            len(chunk) >= MAX_EMBEDS_PER_MESSAGE
+            or chars + size > MAX_EMBED_CHARS_PER_MESSAGE
+        ):
+            yield chunk
+            chunk, chars = [], 0
+        chunk.append(embed)
+        chars += size
+    if chunk:
+        yield chunk
+
+
+class EventLogSendQueue:
+    """送信先チャンネルごとに Embed をまとめて送るキュー。"""
+
+    def __init__(
+        self,
+        *,
+        max_size: int = EVENTLOG_QUEUE_MAX_SIZE,
+        flush_delay: float = EVENTLOG_FLUSH_DELAY_SECONDS,
+    ) -> None:
+        self._max_size = max_size
+        self._flush_delay = flush_delay
+        # channel_id -> キュー / 最新のチャンネルオブジェクト / ワーカー
+        self._queues: dict[int, asyncio.Queue[discord.Embed]] = {}
+        self._channels: dict[int, discord.TextChannel] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
+        # channel_id -> 前回の送信以降に捨てた件数 (ログ用)
+        self._dropped_since_log: dict[int, int] = {}
+        # 累計カウンター
+        self.dropped = 0
+        self.sent_messages = 0
+        self.sent_embeds = 0
+
+    async def put(self, channel: discord.TextChannel, embed: discord.Embed) -> bool:
+        """Embed を送信キューに積む。
+
+        キューが満杯でも待たずに捨てる (イベントハンドラを止めない)。
+
+        Returns:
+            True: キューに積んだ。False: キューが満杯で捨てた。
+        """
+        channel_id = channel.id
+        self._channels[channel_id] = channel
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = asyncio.Queue(self._max_size)
+
+        try:
+            queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._dropped_since_log[channel_id] = (
+                self._dropped_since_log.get(channel_id, 0) + 1
+            )
+            return False
+
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(
+                self._worker(channel_id), name=f"eventlog-send:{channel_id}"
+            )
+        return True
+
+    async def close(self) -> None:
+        """キューに残った Embed を送り切ってからワーカーを停止する。
+
+        EVENTLOG_QUEUE_CLOSE_TIMEOUT_SECONDS 以内に送り切れなかった分は捨てる。
+        """
+        queues = list(self._queues.values())
+        if queues:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    asyncio.gather(*(q.join() for q in queues)),
+                    EVENTLOG_QUEUE_CLOSE_TIMEOUT_SECONDS,
+                )
+        workers = list(self._workers.values())
+        self._workers.clear()
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+
+    async def _collect(
+        self, queue: asyncio.Queue[discord.Embed]
+    ) -> list[discord.Embed]:
+        """最初の Embed から flush_delay 秒の間に届いた Embed をまとめる。"""
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._flush_delay
+        while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _worker(self, channel_id: int) -> None:
+        """1 チャンネル分の送信ループ。"""
+        queue = self._queues[channel_id]
+        while True:
+            batch = await self._collect(queue)
+            try:
+                await self._send(channel_id, batch)
+            except Exception:
+                logger.exception(
+                    "Unexpected error sending event log to channel %s", channel_id
+                )
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+            dropped = self._dropped_since_log.pop(channel_id, 0)
+            if dropped:
+                logger.warning(
+                    "Event log queue for channel %s was full, dropped %d embed(s)",
+                    channel_id,
+                    dropped,
+                )
+
+    async def _send(self, channel_id: int, embeds: list[discord.Embed]) -> None:
+        channel = self._channels[channel_id]
+        for chunk in chunk_embeds(embeds):
+            try:
+                if len(chunk) == 1:
+                    await channel.send(embed=chunk[0])
+                else:
+                    await channel.send(embeds=chunk)
+            except discord.Forbidden:
+                logger.warning(
+                    "Missing permissions for event log channel %s",
+                    channel_id,
+                )
+                return
+            except discord.HTTPException as e:
+                logger.warning(
+                    "Failed to send event log to channel %s: %s",
+                    channel_id,
+                    e,
+                )
+                continue
+            self.sent_messages += 1
+            self.sent_embeds += len(chunk)
@@ -4,13 +4,14 @@
 自動でリアクションとして付与する。
 
 仕組み:
-    - on_message イベントで投稿を検知
-    - 設定済みチャンネルなら、事前パース済みの絵文字リストでリアクション
-    - 1分ごとのバックグラウンドタスクでキャッシュを再構築する
-      (Web 管理画面での変更は最大 60 秒で反映される)
+    - 設定済みチャンネルを MessageRouter に登録し、その投稿だけを受け取る
+    - 事前パース済みの絵文字リストでリアクション
+    - Web 管理画面での変更は on_db_change で即座にキャッシュを再構築する
+      (取りこぼし対策に 10 分ごとのバックグラウンドタスクでも再構築する)
 
-ホットパス最適化: on_message は per-message に呼ばれるため DB アクセス・
+ホットパス最適化: メッセージハンドラーは per-message に呼ばれるため DB アクセス・
 JSON デコード・絵文字パースを全て事前計算してキャッシュする。
+設定のないチャンネルの投稿はルーターの索引で弾かれ、この Cog には届かない。
 """
 
 from __future__ import annotations
@@ -20,7 +21,10 @@ import logging
 import discord
 from discord.ext import commands, tasks
 
-from src.database.engine import async_session
+from src.constants import CACHE_RESYNC_INTERVAL_SECONDS
+from src.core.message_router import MessageRoute, get_message_router
+from src.database.change_feed import ChangeBatch
+from src.database.engine import async_session, read_session
 from src.services.db_service import get_enabled_auto_reaction_emoji_map
 
 logger = logging.getLogger(__name__)
@@ -37,24 +41,24 @@ class AutoReactionCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         # channel_id → 事前パース済み PartialEmoji リスト。
-        # None は「未初期化」を意味し on_message は何もしない (DB フォールバックなし:
+        # None は「未初期化」を意味し何もしない (DB フォールバックなし:
         # 起動直後の超短時間だけ。次の cog_load/refresh で必ず初期化される)。
         self._configs: dict[str, list[discord.PartialEmoji]] | None = None
+        # 設定済みチャンネルのメッセージだけを受け取るルート (未初期化の間は空)
+        self._message_route = MessageRoute("auto_reaction", self.handle_message)
 
     async def cog_load(self) -> None:
+        get_message_router(self.bot).add_route(self._message_route)
         self._refresh_cache.start()
         logger.info("AutoReaction cog loaded, cache refresh loop started")
 
     async def cog_unload(self) -> None:
+        get_message_router(self.bot).remove_route(self._message_route)
         if self._refresh_cache.is_running():
             self._refresh_cache.cancel()
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        if not message.guild or not message.author:
-            return
-        if message.author.bot:
-            return
+    async def handle_message(self, message: discord.Message) -> None:
+        """設定済みチャンネルへの投稿にリアクションを付ける (MessageRouter から)。"""
         if self._configs is None:
             return
 
@@ -73,11 +77,34 @@ class AutoReactionCog(commands.Cog):
                     message.channel.id,
                 )
 
-    @tasks.loop(minutes=1)
+    @commands.Cog.listener()
+    async def on_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面で設定が変更されたらキャッシュを再構築する。"""
+        if not batch.touches("auto_reaction_configs"):
+            return
+        try:
+            await self._reload_configs()
+        except Exception:
+            logger.exception("Failed to reload auto_reaction cache")
+
+    @tasks.loop(seconds=CACHE_RESYNC_INTERVAL_SECONDS)
     async def _refresh_cache(self) -> None:
-        async with async_session() as session:
+        await self._reload_configs(from_replica=True)
+
+    async def _reload_configs(self, *, from_replica: bool = False) -> None:
+        """有効な設定を DB から読み込み、絵文字キャッシュとルートを再構築する。
+
+        Args:
+            from_replica: リードレプリカから読む (定期同期のときだけ)
+        """
+        async with (
+            read_session(async_session) if from_replica else async_session()
+        ) as session:
             raw_map = await get_enabled_auto_reaction_emoji_map(session)
         self._configs = {cid: _parse_emojis(raws) for cid, raws in raw_map.items()}
+        self._message_route.set_channels(
+            cid for cid, emojis in self._configs.items() if emojis
+        )
 
     @_refresh_cache.before_loop
     async def _before_refresh_cache(self) -> None:
@@ -90,8 +117,6 @@ async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(cog)
 
     try:
-        async with async_session() as session:
-            raw_map = await get_enabled_auto_reaction_emoji_map(session)
-        cog._configs = {cid: _parse_emojis(raws) for cid, raws in raw_map.items()}
+        await cog._reload_configs()
     except Exception:
         logger.exception("Failed to load auto_reaction cache")
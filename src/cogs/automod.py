@@ -17,9 +17,17 @@
   - on_member_join イベントで新規メンバーを検知
   - on_member_update イベントでロール変更を検知
   - on_voice_state_update イベントでVC参加を検知
-  - on_message イベントでメッセージ投稿を検知
-  - DB から有効ルールを取得し、順にチェック
+  - MessageRouter 経由でメッセージ投稿を検知 (対象ルールのあるギルドのみ)
+  - キャッシュ済みのコンパイル済みルールを取得し、順にチェック
   - マッチしたら ban/kick/timeout + DB にログ記録
+
+ホットパス最適化:
+  - 有効ルールは guild_id → GuildRuleSet としてキャッシュし、イベント種別ごとに
+    振り分け済み。対象ルールのないイベントは DB に触れずに終了する
+  - /automod add・remove と Web 管理画面での変更 (on_db_change) で該当ギルドを
+    即時再読み込みする。取りこぼし対策に 10 分ごとに全件を再構築する
+  - メッセージ系ルールのあるギルドだけを MessageRouter に登録するため、
+    それ以外のギルドのメッセージはこの Cog に届かない
 """
 
 from __future__ import annotations
@@ -29,16 +37,20 @@ from datetime import UTC, datetime, timedelta
 
 import discord
 from discord import app_commands
-from discord.ext import commands
-
-from src.constants import DEFAULT_EMBED_COLOR
-from src.database.engine import async_session
-from src.database.models import AutoModRule
+from discord.ext import commands, tasks
+
+from src.cogs._automod_rules import AutoModRuleCache, CompiledRule, GuildRuleSet
+from src.constants import CACHE_RESYNC_INTERVAL_SECONDS, DEFAULT_EMBED_COLOR
+from src.core.message_router import MessageRoute, get_message_router
+from src.core.metrics import CACHE_ENTRIES, CACHE_LOOKUPS
+from src.database.change_feed import ChangeBatch
+from src.database.engine import async_session, read_session, unit_of_work
 from src.services.db_service import (
     claim_automod_log,
     claim_ban_log,
     create_automod_rule,
     delete_automod_rule,
+    get_all_enabled_automod_rules,
     get_automod_config,
     get_automod_logs_by_guild,
     get_automod_rules_by_guild,
@@ -61,6 +73,110 @@ class AutoModCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        # guild_id → コンパイル済みルールセットのキャッシュ。
+        # 未ロードの間は各イベントで DB にフォールバックする。
+        self._rule_cache = AutoModRuleCache()
+        # メッセージ系ルールのあるギルドのメッセージだけを受け取るルート
+        # (キャッシュ未ロードの間は全メッセージを受け取る)
+        self._message_route = MessageRoute("automod", self.handle_message)
+        self._message_route.watch_all()
+
+    async def cog_load(self) -> None:
+        """Cog 読み込み時にルートを登録し、ルールキャッシュ更新タスクを開始する。"""
+        get_message_router(self.bot).add_route(self._message_route)
+        CACHE_ENTRIES.set_function(lambda: len(self._rule_cache), cache="automod")
+        self._refresh_rules.start()
+
+    async def cog_unload(self) -> None:
+        """Cog アンロード時にルートを登録解除し、タスクを停止する。"""
+        get_message_router(self.bot).remove_route(self._message_route)
+        CACHE_ENTRIES.remove(cache="automod")
+        if self._refresh_rules.is_running():
+            self._refresh_rules.cancel()
+
+    # ==========================================================================
+    # ルールキャッシュ
+    # ==========================================================================
+
+    async def _get_rule_set(self, guild_id: str) -> GuildRuleSet:
+        """ギルドのルールセットを返す (キャッシュ未ロード時は DB から構築)。"""
+        cached = self._rule_cache.get(guild_id)
+        if cached is not None:
+            CACHE_LOOKUPS.inc(cache="automod", result="hit")
+            return cached
+        CACHE_LOOKUPS.inc(cache="automod", result="miss")
+        async with async_session() as session:
+            rules = await get_enabled_automod_rules_by_guild(session, guild_id)
+        return GuildRuleSet.from_rules(rules)
+
+    async def _load_rules(self, *, from_replica: bool = False) -> None:
+        """全ギルドの有効ルールを DB から読み込み、キャッシュを置き換える。
+
+        Args:
+            from_replica: リードレプリカから読む (定期的な再構築用。
+                変更通知による再読み込みは直前の書き込みが見えるようプライマリ)
+        """
+        versions = self._rule_cache.snapshot_versions()
+        async with (
+            read_session(async_session) if from_replica else async_session()
+        ) as session:
+            rules = await get_all_enabled_automod_rules(session)
+        self._rule_cache.replace_all(rules, versions)
+        self._sync_message_route()
+
+    async def _invalidate_rules(self, guild_id: str) -> None:
+        """ギルドのキャッシュを無効化し、DB から即時再読み込みする。"""
+        version = self._rule_cache.invalidate(guild_id)
+        if not self._rule_cache.loaded:
+            return
+        try:
+            async with async_session() as session:
+                rules = await get_enabled_automod_rules_by_guild(session, guild_id)
+        except Exception:
+            logger.exception("Failed to reload automod rules for guild %s", guild_id)
+            return
+        if self._rule_cache.store(guild_id, rules, version):
+            self._sync_message_route()
+
+    def _sync_message_route(self) -> None:
+        """メッセージを受け取るギルドをルールキャッシュに合わせる。"""
+        guild_ids = self._rule_cache.message_guild_ids()
+        if guild_ids is None:
+            self._message_route.watch_all()
+        else:
+            self._message_route.set_guilds(guild_ids)
+
+    @tasks.loop(seconds=CACHE_RESYNC_INTERVAL_SECONDS)
+    async def _refresh_rules(self) -> None:
+        """ルールキャッシュを定期的に再構築する。
+
+        Web 管理画面での設定変更は on_db_change で即座に反映されるため、
+        これは通知を取りこぼした場合の保険。
+        """
+        try:
+            await self._load_rules(from_replica=True)
+        except Exception:
+            logger.exception("Failed to refresh automod rule cache")
+
+    @commands.Cog.listener()
+    async def on_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面でルールが変更されたらキャッシュを読み直す。"""
+        if not batch.touches("automod_rules"):
+            return
+        guild_ids = batch.guild_ids("automod_rules")
+        if guild_ids is None:
+            try:
+                await self._load_rules()
+            except Exception:
+                logger.exception("Failed to refresh automod rule cache")
+            return
+        for guild_id in guild_ids:
+            await self._invalidate_rules(guild_id)
+
+    @_refresh_rules.before_loop
+    async def _before_refresh_rules(self) -> None:
+        """Bot の接続完了を待つ。"""
+        await self.bot.wait_until_ready()
 
     # ==========================================================================
     # イベントリスナー
@@ -81,9 +197,7 @@ class AutoModCog(commands.Cog):
             await self._execute_ban_list_action(member, ban_reason)
             return
 
-        async with async_session() as session:
-            rules = await get_enabled_automod_rules_by_guild(session, guild_id)
-
+        rules = (await self._get_rule_set(guild_id)).join_rules
         if not rules:
             return
 
@@ -112,9 +226,7 @@ class AutoModCog(commands.Cog):
 
         guild_id = str(after.guild.id)
 
-        async with async_session() as session:
-            rules = await get_enabled_automod_rules_by_guild(session, guild_id)
-
+        rules = (await self._get_rule_set(guild_id)).member_update_rules
         if not rules:
             return
 
@@ -147,9 +259,7 @@ class AutoModCog(commands.Cog):
 
         guild_id = str(member.guild.id)
 
-        async with async_session() as session:
-            rules = await get_enabled_automod_rules_by_guild(session, guild_id)
-
+        rules = (await self._get_rule_set(guild_id)).voice_rules
         if not rules:
             return
 
@@ -165,14 +275,12 @@ class AutoModCog(commands.Cog):
                     await self._execute_action(member, rule, reason)
                     return
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        """メッセージ投稿時の automod ルールをチェックする。"""
-        if not message.guild or not message.author:
-            return
+    async def handle_message(self, message: discord.Message) -> None:
+        """メッセージ投稿時の automod ルールをチェックする (MessageRouter から)。
 
-        # Bot は無視
-        if message.author.bot:
+        DM と Bot のメッセージはルーターで除外済み。
+        """
+        if message.guild is None:
             return
 
         # システムメッセージ (参加通知など) は無視
@@ -186,23 +294,15 @@ class AutoModCog(commands.Cog):
             return
 
         guild_id = str(message.guild.id)
+        channel_id_str = str(message.channel.id)
 
-        async with async_session() as session:
-            rules = await get_enabled_automod_rules_by_guild(session, guild_id)
-
-        if not rules:
+        rule_set = await self._get_rule_set(guild_id)
+        rules = rule_set.message_rules
+        if not rules and channel_id_str not in rule_set.intro_channel_ids:
             return
 
-        channel_id_str = str(message.channel.id)
-
         # 指定チャンネルへの投稿を記録 (vc_without_intro / msg_without_intro 用)
-        intro_rule_types = ("vc_without_intro", "msg_without_intro")
-        required_channels = {
-            r.required_channel_id
-            for r in rules
-            if r.rule_type in intro_rule_types and r.required_channel_id
-        }
-        if channel_id_str in required_channels:
+        if channel_id_str in rule_set.intro_channel_ids:
             async with async_session() as session:
                 await record_intro_post(
                     session, guild_id, str(member.id), channel_id_str
@@ -264,7 +364,7 @@ class AutoModCog(commands.Cog):
     # ==========================================================================
 
     def _check_rule(
-        self, rule: AutoModRule, member: discord.Member
+        self, rule: CompiledRule, member: discord.Member
     ) -> tuple[bool, str]:
         """JOIN 時にチェックするルール (username_match / account_age / no_avatar のみ)。
 
@@ -281,25 +381,24 @@ class AutoModCog(commands.Cog):
         return False, ""
 
     def _check_username_match(
-        self, rule: AutoModRule, member: discord.Member
+        self, rule: CompiledRule, member: discord.Member
     ) -> tuple[bool, str]:
         """ユーザー名マッチングをチェック。"""
-        if not rule.pattern:
+        if rule.username_pattern is None:
             return False, ""
 
         username_lower = member.name.lower()
-        pattern_lower = rule.pattern.lower()
 
         if rule.use_wildcard:
-            if pattern_lower in username_lower:
+            if rule.username_pattern in username_lower:
                 return True, f"Username contains '{rule.pattern}' (wildcard match)"
-        elif username_lower == pattern_lower:
+        elif username_lower == rule.username_pattern:
             return True, f"Username matches '{rule.pattern}' (exact match)"
 
         return False, ""
 
     def _check_account_age(
-        self, rule: AutoModRule, member: discord.Member
+        self, rule: CompiledRule, member: discord.Member
     ) -> tuple[bool, str]:
         """アカウント年齢をチェック。"""
         if not rule.threshold_seconds:
@@ -324,7 +423,7 @@ class AutoModCog(commands.Cog):
         return False, ""
 
     def _check_join_timing(
-        self, rule: AutoModRule, member: discord.Member
+        self, rule: CompiledRule, member: discord.Member
     ) -> tuple[bool, str]:
         """サーバーJOIN後の経過時間をチェック (role_acquired / vc_join 共通)。"""
         if not rule.threshold_seconds or not member.joined_at:
@@ -339,16 +438,11 @@ class AutoModCog(commands.Cog):
         return False, ""
 
     def _check_role_count(
-        self, rule: AutoModRule, member: discord.Member
+        self, rule: CompiledRule, member: discord.Member
     ) -> tuple[bool, str]:
         """指定ロールのうち閾値以上を保持しているかチェック。"""
-        if not rule.threshold_seconds or not rule.target_role_ids:
-            return False, ""
-
-        target_ids = {
-            rid.strip() for rid in rule.target_role_ids.split(",") if rid.strip()
-        }
-        if not target_ids:
+        target_ids = rule.target_role_ids
+        if not rule.threshold_seconds or not target_ids:
             return False, ""
 
         matched_roles = [r for r in member.roles if str(r.id) in target_ids]
@@ -363,7 +457,7 @@ class AutoModCog(commands.Cog):
         return False, ""
 
     async def _check_intro_missing(
-        self, rule: AutoModRule, member: discord.Member
+        self, rule: CompiledRule, member: discord.Member
     ) -> tuple[bool, str]:
         """指定チャンネルに投稿していないかチェック。"""
         if not rule.required_channel_id or not member.joined_at:
@@ -373,20 +467,19 @@ class AutoModCog(commands.Cog):
         if member.joined_at < rule.created_at:
             return False, ""
 
-        async with async_session() as session:
+        # 投稿記録と設定の確認は 1 つのセッション (接続) で行う
+        async with unit_of_work(async_session) as session:
             posted = await has_intro_post(
                 session,
                 str(member.guild.id),
                 str(member.id),
                 rule.required_channel_id,
             )
+            if posted:
+                return False, ""
 
-        if posted:
-            return False, ""
-
-        # DB に記録がない場合、チャンネル履歴をフォールバックチェック
-        # (デプロイ中にメッセージを取りこぼした場合の救済)
-        async with async_session() as session:
+            # DB に記録がない場合、チャンネル履歴をフォールバックチェック
+            # (デプロイ中にメッセージを取りこぼした場合の救済)
             config = await get_automod_config(session, str(member.guild.id))
         check_limit = config.intro_check_messages if config else 50
 
@@ -422,7 +515,7 @@ class AutoModCog(commands.Cog):
     async def _execute_action(
         self,
         member: discord.Member,
-        rule: AutoModRule,
+        rule: CompiledRule,
         reason: str,
     ) -> None:
         """マッチしたルールに基づきアクションを実行する。"""
@@ -523,7 +616,7 @@ class AutoModCog(commands.Cog):
         guild: discord.Guild,
         channel_id: str,
         action_taken: str,
-        rule: AutoModRule,
+        rule: CompiledRule,
         reason: str,
         member_name: str,
         member_id: int,
@@ -883,6 +976,7 @@ class AutoModCog(commands.Cog):
                 target_role_ids=target_role_ids_str,
                 timeout_duration_seconds=timeout_duration_seconds,
             )
+        await self._invalidate_rules(guild_id)
 
         desc_parts = [f"Type: {rule_type}", f"Action: {action}"]
         if pattern:
@@ -921,6 +1015,12 @@ class AutoModCog(commands.Cog):
             deleted = await delete_automod_rule(session, rule_id)
 
         if deleted:
+            guild_ids = {
+                str(interaction.guild.id),
+                *self._rule_cache.guilds_containing(rule_id),
+            }
+            for guild_id in guild_ids:
+                await self._invalidate_rules(guild_id)
             await interaction.response.send_message(
                 f"AutoMod rule #{rule_id} deleted.", ephemeral=True
             )
@@ -1009,6 +1109,13 @@ class AutoModCog(commands.Cog):
 
 
 async def setup(bot: commands.Bot) -> None:
-    """Cog を Bot に登録する。"""
-    await bot.add_cog(AutoModCog(bot))
+    """Cog を Bot に登録し、ルールキャッシュを初期化する。"""
+    cog = AutoModCog(bot)
+    await bot.add_cog(cog)
     logger.info("AutoMod cog loaded")
+
+    try:
+        await cog._load_rules()
+        logger.info("Loaded automod rules for %d guild(s)", len(cog._rule_cache))
+    except Exception:
+        logger.exception("Failed to load automod rule cache")
@@ -3,9 +3,11 @@
 DISBOARD/ディス速報の bump 成功を検知し、2時間後にリマインドを送信する。
 
 仕組み:
-  - on_message で DISBOARD/ディス速報 Bot のメッセージを監視
+  - bump 設定済みギルドを MessageRouter に登録し、DISBOARD/ディス速報 Bot の
+    メッセージを監視 (設定のないギルドのメッセージはこの Cog に届かない)
   - bump 成功 Embed を検知したら DB にリマインダーを保存
-  - 30秒ごとのループタスクで送信予定時刻を過ぎたリマインダーをチェック
+  - DeadlineScheduler が次の送信予定時刻ちょうどにリマインダーをチェック
+    (保存時にスケジューラへ知らせるため、ポーリングはしない)
   - Server Bumper ロールにメンションして通知
   - 通知の有効/無効をボタンで切り替え可能
 
@@ -22,9 +24,11 @@ from datetime import UTC, datetime, timedelta
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from src.constants import DEFAULT_EMBED_COLOR
+from src.core.message_router import MessageRoute, get_message_router
+from src.core.scheduler import DeadlineScheduler
 from src.database.engine import async_session
 from src.services.db_service import (
     claim_bump_detection,
@@ -34,6 +38,7 @@ from src.services.db_service import (
     get_bump_config,
     get_bump_reminder,
     get_due_bump_reminders,
+    get_next_bump_reminder_at,
     toggle_bump_reminder,
     update_bump_reminder_role,
     upsert_bump_config,
@@ -59,9 +64,6 @@ DISSOKU_SUCCESS_KEYWORD = "アップ"
 # リマインダーの送信間隔 (bump から何時間後か)
 REMINDER_HOURS = 2
 
-# リマインダーチェック間隔 (秒)
-REMINDER_CHECK_INTERVAL_SECONDS = 30
-
 # リマインド対象のロール名
 TARGET_ROLE_NAME = "Server Bumper"
 
@@ -297,10 +299,24 @@ class BumpNotificationView(discord.ui.View):
         async with get_resource_lock(
             f"bump_notification:{self.guild_id}:{self.service_name}"
         ):
+            remind_at: datetime | None = None
             async with async_session() as session:
                 new_state = await toggle_bump_reminder(
                     session, self.guild_id, self.service_name
                 )
+                if new_state:
+                    reminder = await get_bump_reminder(
+                        session, self.guild_id, self.service_name
+                    )
+                    remind_at = reminder.remind_at if reminder else None
+
+            # 再度有効にしたリマインダーの期限をこのプロセスのスケジューラに知らせる
+            # (知らせないと定期的な再読み込みまで通知が遅れる)
+            client = interaction.client
+            if remind_at is not None and isinstance(client, commands.Bot):
+                cog = client.get_cog("BumpCog")
+                if isinstance(cog, BumpCog):
+                    cog.schedule_reminder(remind_at)
 
             self._update_toggle_button(new_state)
 
@@ -364,16 +380,57 @@ class BumpCog(commands.Cog):
         # bump 設定済みギルド ID のインメモリキャッシュ
         # None = 未ロード (フォールスルー), set = ロード済み (キャッシュ使用)
         self._bump_guild_ids: set[str] | None = None
+        # bump 設定済みギルドのメッセージだけを受け取るルート。
+        # bump の検知対象は Bot のメッセージなので include_bots=True。
+        # キャッシュ未ロードの間は全メッセージを受け取る
+        self._message_route = MessageRoute(
+            "bump", self.handle_message, include_bots=True
+        )
+        self._message_route.watch_all()
+        # 次の remind_at ちょうどに _reminder_check を呼ぶスケジューラ
+        self._reminder_scheduler = DeadlineScheduler(
+            "bump_reminder",
+            next_deadline=self._next_reminder_at,
+            run_due=self._reminder_check,
+            before_start=self._before_reminder_check,
+        )
 
     async def cog_load(self) -> None:
-        """Cog が読み込まれたときに呼ばれる。リマインダーチェックループを開始する。"""
-        self._reminder_check.start()
-        logger.info("Bump reminder cog loaded, reminder check loop started")
+        """Cog が読み込まれたときに呼ばれる。リマインダースケジューラを開始する。"""
+        get_message_router(self.bot).add_route(self._message_route)
+        self._reminder_scheduler.start()
+        logger.info("Bump reminder cog loaded, reminder scheduler started")
 
     async def cog_unload(self) -> None:
-        """Cog がアンロードされたときに呼ばれる。ループを停止する。"""
-        if self._reminder_check.is_running():
-            self._reminder_check.cancel()
+        """Cog がアンロードされたときに呼ばれる。スケジューラを停止する。"""
+        get_message_router(self.bot).remove_route(self._message_route)
+        if self._reminder_scheduler.is_running():
+            await self._reminder_scheduler.stop()
+
+    def schedule_reminder(self, remind_at: datetime) -> None:
+        """リマインダーの期限をスケジューラに知らせる (DB に書き込んだ後に呼ぶ)。"""
+        self._reminder_scheduler.schedule(remind_at)
+
+    # ==========================================================================
+    # ギルドキャッシュ
+    # ==========================================================================
+
+    def _set_bump_guild_cache(self, guild_ids: set[str]) -> None:
+        """bump 設定済みギルドのキャッシュとルートを置き換える。"""
+        self._bump_guild_ids = guild_ids
+        self._message_route.set_guilds(guild_ids)
+
+    def _cache_add_guild(self, guild_id: str) -> None:
+        """ギルドをキャッシュに追加する (未ロード時は何もしない)。"""
+        if self._bump_guild_ids is not None:
+            self._bump_guild_ids.add(guild_id)
+            self._message_route.add(guild_id)
+
+    def _cache_discard_guild(self, guild_id: str) -> None:
+        """ギルドをキャッシュから削除する (未ロード時は何もしない)。"""
+        if self._bump_guild_ids is not None:
+            self._bump_guild_ids.discard(guild_id)
+            self._message_route.discard(guild_id)
 
     # ==========================================================================
     # クリーンアップリスナー
@@ -391,8 +448,7 @@ class BumpCog(commands.Cog):
             # 削除されたチャンネルが監視チャンネルと一致する場合のみ削除
             if config and config.channel_id == channel_id:
                 await delete_bump_config(session, guild_id)
-                if self._bump_guild_ids is not None:
-                    self._bump_guild_ids.discard(guild_id)
+                self._cache_discard_guild(guild_id)
                 # リマインダーも削除 (チャンネルが存在しないため送信不可)
                 count = await delete_bump_reminders_by_guild(session, guild_id)
                 logger.info(
@@ -411,8 +467,7 @@ class BumpCog(commands.Cog):
         async with async_session() as session:
             # 設定を削除
             await delete_bump_config(session, guild_id)
-            if self._bump_guild_ids is not None:
-                self._bump_guild_ids.discard(guild_id)
+            self._cache_discard_guild(guild_id)
             # リマインダーを削除
             count = await delete_bump_reminders_by_guild(session, guild_id)
 
@@ -427,9 +482,8 @@ class BumpCog(commands.Cog):
     # メッセージ監視
     # ==========================================================================
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        """メッセージを監視し、bump 成功を検知する。"""
+    async def handle_message(self, message: discord.Message) -> None:
+        """メッセージを監視し、bump 成功を検知する (MessageRouter から)。"""
         await self._process_bump_message(message)
 
     @commands.Cog.listener()
@@ -554,6 +608,9 @@ class BumpCog(commands.Cog):
             is_enabled = reminder.is_enabled
             custom_role_id = reminder.role_id
 
+        if is_enabled:
+            self._reminder_scheduler.schedule(remind_at)
+
         # 通知先ロール名を取得
         role_name: str | None = None
         if custom_role_id:
@@ -762,13 +819,18 @@ class BumpCog(commands.Cog):
         return embed
 
     # ==========================================================================
-    # リマインダーチェックループ
+    # リマインダーチェック (DeadlineScheduler から呼ばれる)
     # ==========================================================================
 
-    @tasks.loop(seconds=REMINDER_CHECK_INTERVAL_SECONDS)
+    async def _next_reminder_at(self) -> datetime | None:
+        """DB から次に送信予定のリマインダー時刻を取得する。"""
+        async with async_session() as session:
+            return await get_next_bump_reminder_at(session)
+
     async def _reminder_check(self) -> None:
-        """30秒ごとに実行されるリマインダーチェック処理。
+        """送信予定時刻を過ぎたリマインダーを送信する。
 
+        スケジューラが次の remind_at ちょうどに呼び出す。
         DB から送信予定時刻を過ぎたリマインダーを取得し、
         対象チャンネルに Server Bumper ロールをメンションして通知する。
         """
@@ -783,9 +845,8 @@ class BumpCog(commands.Cog):
                 if cleared:
                     await self._send_reminder(reminder)
 
-    @_reminder_check.before_loop
     async def _before_reminder_check(self) -> None:
-        """リマインダーチェックループ開始前に Bot の接続完了を待つ。"""
+        """スケジューラ開始前に Bot の接続完了を待つ。"""
         await self.bot.wait_until_ready()
 
     async def _send_reminder(self, reminder: BumpReminder) -> None:
@@ -891,8 +952,7 @@ class BumpCog(commands.Cog):
                 await upsert_bump_config(session, guild_id, channel_id)
 
             # キャッシュに追加
-            if self._bump_guild_ids is not None:
-                self._bump_guild_ids.add(guild_id)
+            self._cache_add_guild(guild_id)
 
             # チャンネルの履歴から最近の bump を探す
             channel = interaction.channel
@@ -926,6 +986,8 @@ class BumpCog(commands.Cog):
                                 role = interaction.guild.get_role(int(reminder.role_id))
                                 if role:
                                     custom_role_name = role.name
+                        if is_enabled:
+                            self._reminder_scheduler.schedule(remind_at)
                         ts = int(remind_at.timestamp())
                         reminder_time_text = f"<t:{ts}:t>"
                         recent_bump_info = (
@@ -1066,8 +1128,7 @@ class BumpCog(commands.Cog):
             deleted = await delete_bump_config(session, guild_id)
 
         # キャッシュから削除
-        if self._bump_guild_ids is not None:
-            self._bump_guild_ids.discard(guild_id)
+        self._cache_discard_guild(guild_id)
 
         if deleted:
             embed = discord.Embed(
@@ -1110,7 +1171,8 @@ async def setup(bot: commands.Bot) -> None:
             from src.services.db_service import get_all_bump_configs
 
             configs = await get_all_bump_configs(session)
-            cog._bump_guild_ids = {c.guild_id for c in configs}
-        logger.info("Bump guild cache loaded (%d guild(s))", len(cog._bump_guild_ids))
+            guild_ids = {c.guild_id for c in configs}
+        cog._set_bump_guild_cache(guild_ids)
+        logger.info("Bump guild cache loaded (%d guild(s))", len(guild_ids))
     except Exception:
         logger.critical("Failed to load bump guild cache", exc_info=True)
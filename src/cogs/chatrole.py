@@ -5,33 +5,207 @@ duration_hours が指定されていれば付与から N 時間後にロール
 (再度 threshold まで投稿すれば再付与)。
 
 仕組み:
-  - on_message イベントで投稿を検知
+  - 対象チャンネルを MessageRouter に登録し、その投稿だけを受け取る
   - 設定された (guild_id, channel_id) に該当する有効な ChatRoleConfig を取得
-  - ChatRoleProgress を increment、threshold 到達でロール付与 + granted=True
-  - 毎分バックグラウンドタスクで期限切れチェック → ロール削除 + granted=False
+  - ChatRoleProgress のカウントを ChatRoleProgressBuffer に溜め、数秒ごとに
+    まとめて DB に反映 (threshold 到達時は即時反映してロール付与 + granted=True)
+  - DeadlineScheduler が最も早い expires_at まで眠り、期限が来たら
+    期限切れチェック → ロール削除 + granted=False (付与時に次の期限を知らせる)
+  - 毎分バックグラウンドタスクで対象チャンネルのキャッシュを更新
   - config.created_at より前の投稿はカウント対象外
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 
 import discord
 from discord.ext import commands, tasks
 
-from src.database.engine import async_session
+from src.constants import (
+    CACHE_RESYNC_INTERVAL_SECONDS,
+    CHATROLE_PROGRESS_FLUSH_INTERVAL_SECONDS,
+    CHATROLE_PROGRESS_FLUSH_MAX_ENTRIES,
+    CHATROLE_PROGRESS_KNOWN_MAX_ENTRIES,
+    CHATROLE_PROGRESS_KNOWN_TTL_SECONDS,
+)
+from src.core.message_router import MessageRoute, get_message_router
+from src.core.scheduler import DeadlineScheduler
+from src.database.change_feed import ChangeBatch
+from src.database.engine import async_session, read_session, unit_of_work
+from src.database.models import ChatRoleProgress
 from src.services.db_service import (
+    add_chat_role_progress_counts,
+    get_chat_role_progress,
     get_enabled_chat_role_channel_ids,
     get_enabled_chat_role_configs_for_channel,
     get_expired_chat_role_progress,
-    increment_chat_role_progress,
+    get_next_chat_role_expiry,
     mark_chat_role_progress_expired,
     mark_chat_role_progress_granted,
 )
 
 logger = logging.getLogger(__name__)
 
+# (config_id, user_id)
+_ProgressKey = tuple[int, str]
+
+
+class ChatRoleProgressBuffer:
+    """ChatRoleProgress の投稿カウントを溜めてまとめて書き込むバッファ。
+
+    (config_id, user_id) ごとに「ローカルで把握しているカウント」と
+    「DB 未反映の加算数」を持つ。
+
+    - 投稿はメモリ上で加算するだけで、flush() でまとめて
+      add_chat_role_progress_counts の 1 文で反映する
+    - 初めて見るキー (または把握してから CHATROLE_PROGRESS_KNOWN_TTL_SECONDS
+      経ったキー) は threshold 判定のために DB のカウントを読むだけで、
+      書き込みは他の投稿と同じく flush を待つ
+    - ローカルのカウントが threshold に達したらそのキーだけ即時に反映し、
+      最新の Progress を返す (ロール付与は flush を待たない)
+
+    把握しているカウントは flush をまたいで保持し、flush の戻り値
+    (他インスタンスの加算を含む DB の値) で更新する。保持数は
+    CHATROLE_PROGRESS_KNOWN_MAX_ENTRIES で LRU 的に制限する。
+    付与済み (granted=True) の記録も TTL まで保持するので、期限切れで
+    リセットしたキーは forget() で忘れさせる。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CHATROLE_PROGRESS_FLUSH_MAX_ENTRIES,
+        *,
+        known_ttl: float = CHATROLE_PROGRESS_KNOWN_TTL_SECONDS,
+        known_max_entries: int = CHATROLE_PROGRESS_KNOWN_MAX_ENTRIES,
+    ) -> None:
+        self._max_entries = max_entries
+        self._known_ttl = known_ttl
+        self._known_max_entries = known_max_entries
+        # ローカルで把握しているカウント (None は付与済み、または設定削除済み)
+        # と DB から取得した時刻 (time.monotonic)。古い順に並ぶ
+        self._counts: OrderedDict[_ProgressKey, tuple[int | None, float]] = (
+            OrderedDict()
+        )
+        # DB 未反映の加算数
+        self._pending: dict[_ProgressKey, int] = {}
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """DB 未反映のキー数。"""
+        return len(self._pending)
+
+    def forget(self, config_id: int, user_id: str) -> None:
+        """把握しているカウントを捨て、次の投稿で DB から取り直す。"""
+        self._counts.pop((config_id, user_id), None)
+
+    def _known(self, key: _ProgressKey) -> tuple[int | None, float] | None:
+        """有効期限内の (把握済みカウント, 取得時刻) を返す (未把握なら None)。"""
+        entry = self._counts.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] >= self._known_ttl:
+            del self._counts[key]
+            return None
+        self._counts.move_to_end(key)
+        return entry
+
+    def _remember(self, key: _ProgressKey, count: int | None) -> None:
+        """DB で確認したカウントを記録する (既存の記録に上書きでマージ)。"""
+        self._counts[key] = (count, time.monotonic())
+        self._counts.move_to_end(key)
+        while len(self._counts) > self._known_max_entries:
+            self._counts.popitem(last=False)
+
+    async def add(
+        self, config_id: int, user_id: str, threshold: int
+    ) -> ChatRoleProgress | None:
+        """投稿 1 件分を加算する。
+
+        Returns:
+            threshold に達した場合のみ、DB に反映した最新の Progress。
+            未達、または既に付与済みなら None。
+        """
+        key = (config_id, user_id)
+        entry = self._known(key)
+        if entry is None:
+            async with async_session() as session:
+                progress = await get_chat_role_progress(session, config_id, user_id)
+            if progress is not None and progress.granted:
+                self._remember(key, None)
+                return None
+            # 未反映の加算 (捨てられた記録の分を含む) を足して把握し直す
+            base = progress.count if progress is not None else 0
+            self._pending[key] = self._pending.get(key, 0) + 1
+            count = base + self._pending[key]
+            self._remember(key, count)
+        else:
+            known_count, loaded_at = entry
+            if known_count is None:
+                return None
+            self._pending[key] = self._pending.get(key, 0) + 1
+            count = known_count + 1
+            self._counts[key] = (count, loaded_at)
+
+        if count >= threshold:
+            return await self._flush_key(key)
+        if len(self._pending) >= self._max_entries and not self._flush_lock.locked():
+            await self.flush()
+        return None
+
+    async def _flush_key(self, key: _ProgressKey) -> ChatRoleProgress | None:
+        """1 キー分の加算を即時に反映し、最新の Progress を返す。"""
+        delta = self._pending.pop(key, 0)
+        try:
+            async with async_session() as session:
+                progresses = await add_chat_role_progress_counts(session, {key: delta})
+        except Exception:
+            self._pending[key] = self._pending.get(key, 0) + delta
+            raise
+
+        if not progresses:
+            self._remember(key, None)
+            return None
+        progress = progresses[0]
+        self._remember(key, progress.count + self._pending.get(key, 0))
+        return progress
+
+    async def flush(self) -> int:
+        """溜めた加算をまとめて DB に反映する。
+
+        失敗した場合は加算を戻して例外を送出する (次回の flush で再試行)。
+
+        Returns:
+            反映したキー数。
+        """
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                async with async_session() as session:
+                    progresses = await add_chat_role_progress_counts(session, batch)
+            except Exception:
+                for key, delta in batch.items():
+                    self._pending[key] = self._pending.get(key, 0) + delta
+                raise
+
+            # 戻り値に含まれないキーは付与済み、または設定削除済み。
+            # await 中に add / _flush_key が更新したキーもあるため、
+            # 辞書は置き換えずに反映したキーだけを上書きする
+            refreshed: dict[_ProgressKey, int | None] = dict.fromkeys(batch)
+            for progress in progresses:
+                refreshed[(progress.config_id, progress.user_id)] = progress.count
+            for key, count in refreshed.items():
+                if count is not None:
+                    count += self._pending.get(key, 0)
+                self._remember(key, count)
+            return len(batch)
+
 
 class ChatRoleCog(commands.Cog):
     """Chat Role 機能を提供する Cog。"""
@@ -39,32 +213,56 @@ class ChatRoleCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         # 有効な ChatRoleConfig を持つチャンネル ID のキャッシュ。
-        # on_message ホットパスで DB 問い合わせを回避する用途。None は
+        # メッセージのホットパスで DB 問い合わせを回避する用途。None は
         # 「未初期化なので DB にフォールバック」を意味する。
-        # 1分ごとのバックグラウンドタスクで再構築するため、Web 管理画面での
-        # 変更は最大 60 秒で反映される。
+        # Web 管理画面での変更は on_db_change で即座に再構築する
+        # (取りこぼし対策に 10 分ごとのバックグラウンドタスクでも再構築する)。
         self._chatrole_channels: set[str] | None = None
+        # 対象チャンネルのメッセージだけを受け取るルート
+        # (キャッシュ未初期化の間は全メッセージを受け取る)
+        self._message_route = MessageRoute("chat_role", self.handle_message)
+        self._message_route.watch_all()
+        # 投稿カウントの write-behind バッファ
+        self._progress_buffer = ChatRoleProgressBuffer()
+        self._expiry_scheduler = DeadlineScheduler(
+            "chat_role_expiry",
+            next_deadline=self._next_expiry,
+            run_due=self._check_expired_roles,
+            before_start=self._before_check_expired_roles,
+        )
 
     async def cog_load(self) -> None:
-        """Cog 読み込み時にバックグラウンドタスクを開始する。"""
-        self._check_expired_roles.start()
-        logger.info("ChatRole cog loaded, expiry check loop started")
+        """Cog 読み込み時にバックグラウンドタスクとスケジューラを開始する。"""
+        get_message_router(self.bot).add_route(self._message_route)
+        self._refresh_channel_cache.start()
+        self._flush_progress.start()
+        self._expiry_scheduler.start()
+        logger.info("ChatRole cog loaded, expiry scheduler started")
 
     async def cog_unload(self) -> None:
-        """Cog アンロード時にバックグラウンドタスクを停止する。"""
-        if self._check_expired_roles.is_running():
-            self._check_expired_roles.cancel()
+        """Cog アンロード時にバックグラウンドタスクを停止し、カウントを反映する。"""
+        get_message_router(self.bot).remove_route(self._message_route)
+        if self._refresh_channel_cache.is_running():
+            self._refresh_channel_cache.cancel()
+        if self._expiry_scheduler.is_running():
+            await self._expiry_scheduler.stop()
+        if self._flush_progress.is_running():
+            self._flush_progress.cancel()
+        try:
+            await self._progress_buffer.flush()
+        except Exception:
+            logger.exception("ChatRole: Failed to flush progress on unload")
 
     # ==========================================================================
     # イベントリスナー
     # ==========================================================================
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        """メッセージ投稿時に ChatRole の進捗を更新する。"""
-        if not message.guild or not message.author:
-            return
-        if message.author.bot:
+    async def handle_message(self, message: discord.Message) -> None:
+        """メッセージ投稿時に ChatRole の進捗を更新する (MessageRouter から)。
+
+        DM と Bot のメッセージはルーターで除外済み。
+        """
+        if message.guild is None:
             return
         if message.type != discord.MessageType.default:
             return
@@ -75,7 +273,7 @@ class ChatRoleCog(commands.Cog):
 
         channel_id = str(message.channel.id)
 
-        # ホットパス短絡: ChatRole 対象チャンネルでない場合は DB 問い合わせなし。
+        # 未初期化時のフォールバック中にキャッシュがロードされた場合の短絡
         if (
             self._chatrole_channels is not None
             and channel_id not in self._chatrole_channels
@@ -84,80 +282,117 @@ class ChatRoleCog(commands.Cog):
 
         guild_id = str(message.guild.id)
 
-        async with async_session() as session:
+        # 設定の取得・カウント加算 (ChatRoleProgressBuffer 内の async_session も
+        # 含む)・付与の記録で 1 つのセッションを共有する。書き込みはサービス関数内で
+        # コミットし、接続はそこでプールに返るため、add_roles の待ち時間に
+        # 接続を握ったままにはならない
+        async with unit_of_work(async_session) as session:
             configs = await get_enabled_chat_role_configs_for_channel(
                 session, guild_id, channel_id
             )
-        if not configs:
-            return
+            if not configs:
+                return
 
-        for config in configs:
-            if message.created_at < config.created_at:
-                continue
+            for config in configs:
+                if message.created_at < config.created_at:
+                    continue
 
-            async with async_session() as session:
-                progress = await increment_chat_role_progress(
-                    session, config.id, str(member.id)
+                progress = await self._progress_buffer.add(
+                    config.id, str(member.id), config.threshold
                 )
 
-            if progress is None:
-                continue  # 既に granted=True (DB 上で更新スキップ)
-            if progress.count < config.threshold:
-                continue
-
-            role = message.guild.get_role(int(config.role_id))
-            if role is None:
-                logger.warning(
-                    "ChatRole: Role %s not found in guild %s",
-                    config.role_id,
-                    guild_id,
+                if progress is None:
+                    continue  # threshold 未達、または既に granted=True
+                if progress.count < config.threshold:
+                    continue
+
+                role = message.guild.get_role(int(config.role_id))
+                if role is None:
+                    logger.warning(
+                        "ChatRole: Role %s not found in guild %s",
+                        config.role_id,
+                        guild_id,
+                    )
+                    continue
+
+                now = datetime.now(UTC)
+                expires_at: datetime | None = (
+                    now + timedelta(hours=config.duration_hours)
+                    if config.duration_hours is not None
+                    else None
                 )
-                continue
 
-            now = datetime.now(UTC)
-            expires_at: datetime | None = (
-                now + timedelta(hours=config.duration_hours)
-                if config.duration_hours is not None
-                else None
-            )
-
-            async with async_session() as session:
                 claimed = await mark_chat_role_progress_granted(
                     session,
                     progress.id,
                     granted_at=now,
                     expires_at=expires_at,
                 )
-            if not claimed:
-                continue
-
-            try:
-                await member.add_roles(role, reason="ChatRole: 投稿ロール付与")
-            except discord.HTTPException:
-                logger.exception(
-                    "ChatRole: Failed to add role %s to member %s in guild %s",
-                    config.role_id,
-                    member.id,
-                    guild_id,
-                )
+                if not claimed:
+                    continue
+                if expires_at is not None:
+                    self._expiry_scheduler.schedule(expires_at)
+
+                try:
+                    await member.add_roles(role, reason="ChatRole: 投稿ロール付与")
+                except discord.HTTPException:
+                    logger.exception(
+                        "ChatRole: Failed to add role %s to member %s in guild %s",
+                        config.role_id,
+                        member.id,
+                        guild_id,
+                    )
 
     # ==========================================================================
     # バックグラウンドタスク
     # ==========================================================================
 
-    @tasks.loop(minutes=1)
-    async def _check_expired_roles(self) -> None:
-        """毎分実行: 期限切れロールの削除 + チャンネルキャッシュの更新。
+    @tasks.loop(seconds=CACHE_RESYNC_INTERVAL_SECONDS)
+    async def _refresh_channel_cache(self) -> None:
+        """定期実行: チャンネルキャッシュの更新。
 
-        Web 管理画面での設定変更はこのタスクの周期 (最大 60 秒) で反映される。
+        Web 管理画面での設定変更は on_db_change で即座に反映されるため、
+        これは通知を取りこぼした場合の保険。
         """
+        await self._load_channel_cache(from_replica=True)
+
+    async def _load_channel_cache(self, *, from_replica: bool = False) -> None:
+        """対象チャンネルのキャッシュとルートを DB から再構築する。
+
+        Args:
+            from_replica: リードレプリカから読む (定期実行のとき)
+        """
+        async with (
+            read_session(async_session) if from_replica else async_session()
+        ) as session:
+            self._chatrole_channels = await get_enabled_chat_role_channel_ids(session)
+        self._message_route.set_channels(self._chatrole_channels)
+
+    @commands.Cog.listener()
+    async def on_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面で ChatRole 設定が変更されたらキャッシュを更新する。"""
+        if not batch.touches("chat_role_configs"):
+            return
+        try:
+            await self._load_channel_cache()
+        except Exception:
+            logger.exception("Failed to refresh chat role channel cache")
+
+    async def _next_expiry(self) -> datetime | None:
+        """DB から最も早い付与の有効期限を取得する。"""
+        async with async_session() as session:
+            return await get_next_chat_role_expiry(session)
+
+    async def _check_expired_roles(self) -> None:
+        """期限切れロールを削除する (DeadlineScheduler から呼ばれる)。"""
         now = datetime.now(UTC)
 
         async with async_session() as session:
-            self._chatrole_channels = await get_enabled_chat_role_channel_ids(session)
             expired = await get_expired_chat_role_progress(session, now)
 
         for progress, config in expired:
+            # 付与済みとして把握している記録を捨て、リセット後の投稿を数え直す
+            self._progress_buffer.forget(progress.config_id, progress.user_id)
             guild = self.bot.get_guild(int(config.guild_id))
             if guild is None:
                 async with async_session() as session:
@@ -191,7 +426,15 @@ class ChatRoleCog(commands.Cog):
                     config.guild_id,
                 )
 
-    @_check_expired_roles.before_loop
+    @tasks.loop(seconds=CHATROLE_PROGRESS_FLUSH_INTERVAL_SECONDS)
+    async def _flush_progress(self) -> None:
+        """溜めた投稿カウントを定期的に DB に反映する。"""
+        try:
+            await self._progress_buffer.flush()
+        except Exception:
+            logger.exception("ChatRole: Failed to flush progress")
+
+    @_refresh_channel_cache.before_loop
     async def _before_check_expired_roles(self) -> None:
         """Bot の接続完了を待つ。"""
         await self.bot.wait_until_ready()
@@ -203,7 +446,6 @@ async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(cog)
 
     try:
-        async with async_session() as session:
-            cog._chatrole_channels = await get_enabled_chat_role_channel_ids(session)
+        await cog._load_channel_cache()
     except Exception:
         logger.exception("Failed to load chatrole channel cache")
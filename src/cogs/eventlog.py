@@ -30,8 +30,10 @@
   - emoji_update: 絵文字追加/削除/変更
 
 仕組み:
-  - 60 秒ごとに DB から有効な設定をキャッシュ
-  - 各イベントリスナーでキャッシュを参照し、対応チャンネルに Embed 送信
+  - DB から有効な設定をキャッシュし、Web 管理画面での変更は on_db_change で
+    該当ギルドだけ読み直す (取りこぼし対策に 10 分ごとに全件を再構築)
+  - 各イベントリスナーでキャッシュを参照し、対応チャンネルの送信キューに Embed を積む
+  - 送信キューはチャンネルごとに Embed をまとめて (最大 10 個) 送信する
 """
 
 from __future__ import annotations
@@ -49,7 +51,10 @@ from src.cogs._eventlog_helpers import (
     set_user_thumbnail,
     truncate_content,
 )
-from src.database.engine import async_session
+from src.cogs._eventlog_queue import EventLogSendQueue
+from src.constants import CACHE_RESYNC_INTERVAL_SECONDS
+from src.database.change_feed import ChangeBatch
+from src.database.engine import async_session, read_session
 from src.services.db_service import get_enabled_event_log_configs
 from src.utils import format_datetime
 
@@ -83,14 +88,17 @@ class EventLogCog(commands.Cog):
         self._cache: dict[tuple[str, str], list[str]] = {}
         # 招待キャッシュ: guild_id -> {invite_code: uses}
         self._invite_cache: dict[int, dict[str, _InviteData]] = {}
+        # 送信先チャンネルごとの Embed 送信キュー
+        self._send_queue = EventLogSendQueue()
 
     async def cog_load(self) -> None:
         """Cog 読み込み時にキャッシュ同期タスクを開始する。"""
         self._sync_cache_task.start()
 
     async def cog_unload(self) -> None:
-        """Cog アンロード時にタスクを停止する。"""
+        """Cog アンロード時にタスクを停止し、送信キューを送り切る。"""
         self._sync_cache_task.cancel()
+        await self._send_queue.close()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -121,24 +129,65 @@ class EventLogCog(commands.Cog):
                 guild.id,
             )
 
-    @tasks.loop(seconds=60)
+    @tasks.loop(seconds=CACHE_RESYNC_INTERVAL_SECONDS)
     async def _sync_cache_task(self) -> None:
-        """DB から有効な EventLog 設定を定期的にキャッシュする。"""
+        """DB から有効な EventLog 設定を定期的にキャッシュする。
+
+        Web 管理画面での変更は on_db_change で即座に反映されるため、
+        これは通知を取りこぼした場合の保険。
+        """
+        try:
+            await self._refresh_cache(from_replica=True)
+        except Exception:
+            logger.exception("Failed to refresh event log cache")
+
+    @commands.Cog.listener()
+    async def on_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面で EventLog 設定が変更されたらキャッシュを読み直す。"""
+        if not batch.touches("event_log_configs"):
+            return
+        guild_ids = batch.guild_ids("event_log_configs")
         try:
-            await self._refresh_cache()
+            if guild_ids is None:
+                await self._refresh_cache()
+            else:
+                for guild_id in guild_ids:
+                    await self._refresh_guild_cache(guild_id)
         except Exception:
             logger.exception("Failed to refresh event log cache")
 
-    async def _refresh_cache(self) -> None:
-        """キャッシュを DB から再構築する。"""
+    async def _load_guild_cache(
+        self, guild_id: str, *, from_replica: bool = False
+    ) -> dict[tuple[str, str], list[str]]:
+        """1 ギルド分のキャッシュエントリを DB から読み込む。"""
+        entries: dict[tuple[str, str], list[str]] = {}
+        async with (
+            read_session(async_session) if from_replica else async_session()
+        ) as session:
+            configs = await get_enabled_event_log_configs(session, guild_id)
+        for config in configs:
+            key = (guild_id, config.event_type)
+            entries.setdefault(key, []).append(config.channel_id)
+        return entries
+
+    async def _refresh_cache(self, *, from_replica: bool = False) -> None:
+        """キャッシュを DB から再構築する。
+
+        Args:
+            from_replica: リードレプリカから読む (定期同期用)
+        """
         new_cache: dict[tuple[str, str], list[str]] = {}
         for guild in self.bot.guilds:
-            guild_id = str(guild.id)
-            async with async_session() as session:
-                configs = await get_enabled_event_log_configs(session, guild_id)
-            for config in configs:
-                key = (guild_id, config.event_type)
-                new_cache.setdefault(key, []).append(config.channel_id)
+            new_cache.update(
+                await self._load_guild_cache(str(guild.id), from_replica=from_replica)
+            )
+        self._cache = new_cache
+
+    async def _refresh_guild_cache(self, guild_id: str) -> None:
+        """指定ギルドのキャッシュだけを DB から読み直す。"""
+        entries = await self._load_guild_cache(guild_id)
+        new_cache = {k: v for k, v in self._cache.items() if k[0] != guild_id}
+        new_cache.update(entries)
         self._cache = new_cache
 
     def _get_channels(self, guild: discord.Guild, event_type: str) -> list[str]:
@@ -148,24 +197,15 @@ class EventLogCog(commands.Cog):
     async def _send_log(
         self, guild: discord.Guild, event_type: str, embed: discord.Embed
     ) -> None:
-        """指定イベントタイプの全チャンネルに Embed を送信する。"""
+        """指定イベントタイプの全チャンネルの送信キューに Embed を積む。
+
+        送信は EventLogSendQueue のワーカーが行うため、送信完了は待たない。
+        """
         channel_ids = self._get_channels(guild, event_type)
         for channel_id in channel_ids:
             channel = guild.get_channel(int(channel_id))
             if channel and isinstance(channel, discord.TextChannel):
-                try:
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    logger.warning(
-                        "Missing permissions for event log channel %s",
-                        channel_id,
-                    )
-                except discord.HTTPException as e:
-                    logger.warning(
-                        "Failed to send event log to channel %s: %s",
-                        channel_id,
-                        e,
-                    )
+                await self._send_queue.put(channel, embed)
 
     # =====================================================================
     # Message Events
@@ -7,6 +7,11 @@ Bot の死活監視を行う Cog。discord.py の tasks.loop を使い、
   - 10分ごとにハートビートを送信
   - Uptime (稼働時間)、Latency (遅延)、Guilds (サーバー数) を表示
   - レイテンシに応じて Embed の色が変わる (緑/黄/赤)
+  - Bot に ``listener_metrics`` があれば、p95 の遅いハンドラーと
+    直近の遅い呼び出しも Embed に載せる
+  - Bot に ``loop_probe`` があれば、イベントループの遅れ (直近の p50/p95/max) と
+    ループを塞いだ回数・最後に塞いだ場所も載せる。Discord 側の遅延
+    (Latency) とは別に、プロセス自身が詰まっているかを切り分けられる
   - ログにも出力されるので Heroku logs 等でも確認可能
 
 注意:
@@ -27,6 +32,8 @@ from discord.ext import commands, tasks
 
 from src.bot import make_activity
 from src.constants import DEFAULT_EMBED_COLOR
+from src.core.instrumentation import ListenerMetrics
+from src.core.loop_monitor import LoopLagProbe
 from src.database.engine import async_session
 from src.database.models import HealthConfig
 from src.services.db_service import (
@@ -48,6 +55,13 @@ _HEARTBEAT_MINUTES = 10
 # 日本標準時 (JST = UTC+9)。Boot 時刻の表示に使う
 _JST = timezone(timedelta(hours=9))
 
+# ハートビートに載せるハンドラー (p95 の遅い順) と遅い呼び出しの件数
+_HANDLER_LINES = 5
+_SLOW_CALL_LINES = 3
+
+# Embed フィールドの値の上限 (文字数)
+_FIELD_VALUE_LIMIT = 1024
+
 
 class HealthCog(commands.Cog):
     """定期的にハートビート Embed を送信する死活監視 Cog。"""
@@ -188,8 +202,7 @@ class HealthCog(commands.Cog):
             try:
                 bucket = int(time.time()) // 600
                 event_key = f"heartbeat:{bucket}"
-                async with async_session() as session:
-                    claimed = await claim_event(session, event_key)
+                claimed = await claim_event(event_key)
             except Exception:
                 logger.debug("Failed to claim heartbeat event, proceeding anyway")
 
@@ -204,12 +217,11 @@ class HealthCog(commands.Cog):
                 )
                 await self._send_to_channels(health_configs, embed, "heartbeat")
 
-        # --- 重複排除テーブルのクリーンアップ ---
+        # --- 期限切れ claim のクリーンアップ ---
         try:
-            async with async_session() as session:
-                deleted = await cleanup_expired_events(session)
-                if deleted > 0:
-                    logger.info("Cleaned up %d expired event records", deleted)
+            deleted = await cleanup_expired_events()
+            if deleted > 0:
+                logger.info("Cleaned up %d expired event claims", deleted)
         except Exception:
             logger.exception("Failed to cleanup expired events")
 
@@ -271,8 +283,7 @@ class HealthCog(commands.Cog):
             try:
                 boot_key = self._boot_jst.strftime("%Y%m%d%H%M")
                 event_key = f"deploy:{boot_key}"
-                async with async_session() as session:
-                    claimed = await claim_event(session, event_key)
+                claimed = await claim_event(event_key)
             except Exception:
                 logger.debug("Failed to claim deploy event, proceeding anyway")
 
@@ -359,9 +370,65 @@ class HealthCog(commands.Cog):
         embed.add_field(name="Uptime", value=uptime_str, inline=True)
         embed.add_field(name="Latency", value=f"{latency_ms}ms", inline=True)
         embed.add_field(name="Guilds", value=str(guild_count), inline=True)
+
+        loop_probe = getattr(self.bot, "loop_probe", None)
+        if isinstance(loop_probe, LoopLagProbe):
+            self._add_loop_field(embed, loop_probe)
+
+        metrics = getattr(self.bot, "listener_metrics", None)
+        if isinstance(metrics, ListenerMetrics):
+            self._add_handler_fields(embed, metrics)
+
         embed.set_footer(text=f"Boot: {self._boot_jst:%Y-%m-%d %H:%M JST}")
         return embed
 
+    @staticmethod
+    def _add_loop_field(embed: discord.Embed, loop_probe: LoopLagProbe) -> None:
+        """イベントループの遅れと、ループを塞いだ記録を Embed に追加する。"""
+        summary = loop_probe.summary()
+        value = (
+            f"lag {summary.p50 * 1000:.0f}/{summary.p95 * 1000:.0f}/"
+            f"{summary.max * 1000:.0f}ms (p50/p95/max) blocks={summary.blocks}"
+        )
+        blocks = loop_probe.blocks
+        if blocks:
+            last = blocks[-1]
+            value += (
+                f"\nlast: {last.seconds:.2f}s <t:{int(last.at.timestamp())}:R> "
+                f"`{last.where}`"
+            )
+        embed.add_field(
+            name="Event loop", value=value[:_FIELD_VALUE_LIMIT], inline=False
+        )
+
+    @staticmethod
+    def _add_handler_fields(embed: discord.Embed, metrics: ListenerMetrics) -> None:
+        """ハンドラーの処理時間 (p50/p95/p99) と遅い呼び出しを Embed に追加する。"""
+        lines = [
+            f"`{s.cog}.{s.event}` "
+            f"{s.p50 * 1000:.0f}/{s.p95 * 1000:.0f}/{s.p99 * 1000:.0f}ms "
+            f"n={s.calls} err={s.errors} db={s.sessions_per_call:.1f}"
+            for s in metrics.snapshot()[:_HANDLER_LINES]
+        ]
+        if lines:
+            embed.add_field(
+                name="Handlers (p50/p95/p99)",
+                value="\n".join(lines)[:_FIELD_VALUE_LIMIT],
+                inline=False,
+            )
+
+        slow_calls = metrics.slow_calls[-_SLOW_CALL_LINES:]
+        if slow_calls:
+            value = "\n".join(
+                f"`{c.cog}.{c.event}` {c.seconds:.2f}s <t:{int(c.at.timestamp())}:R>"
+                for c in reversed(slow_calls)
+            )
+            embed.add_field(
+                name=f"Slow calls (>= {metrics.slow_seconds:g}s)",
+                value=value[:_FIELD_VALUE_LIMIT],
+                inline=False,
+            )
+
 
 async def setup(bot: commands.Bot) -> None:
     """Cog を Bot に登録する関数。bot.load_extension() から呼ばれる。"""
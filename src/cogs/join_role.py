@@ -7,7 +7,8 @@
   - on_member_join イベントで新規メンバーを検知
   - DB から有効な JoinRoleConfig を取得し、各ロールを付与
   - JoinRoleAssignment レコードを作成して追跡
-  - 毎分バックグラウンドタスクで期限切れチェック → ロール削除
+  - DeadlineScheduler が最も早い expires_at まで眠り、期限が来たら
+    期限切れチェック → ロール削除 (付与時に次の期限を知らせる)
 """
 
 from __future__ import annotations
@@ -16,14 +17,16 @@ import logging
 from datetime import UTC, datetime, timedelta
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
+from src.core.scheduler import DeadlineScheduler
 from src.database.engine import async_session
 from src.services.db_service import (
     claim_join_role_assignment,
     delete_join_role_assignment,
     get_enabled_join_role_configs,
     get_expired_join_role_assignments,
+    get_next_join_role_expiry,
 )
 
 logger = logging.getLogger(__name__)
@@ -34,16 +37,22 @@ class JoinRoleCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self._expiry_scheduler = DeadlineScheduler(
+            "join_role_expiry",
+            next_deadline=self._next_expiry,
+            run_due=self._check_expired_roles,
+            before_start=self._before_check_expired_roles,
+        )
 
     async def cog_load(self) -> None:
-        """Cog 読み込み時にバックグラウンドタスクを開始する。"""
-        self._check_expired_roles.start()
-        logger.info("JoinRole cog loaded, expiry check loop started")
+        """Cog 読み込み時に期限切れスケジューラを開始する。"""
+        self._expiry_scheduler.start()
+        logger.info("JoinRole cog loaded, expiry scheduler started")
 
     async def cog_unload(self) -> None:
-        """Cog アンロード時にバックグラウンドタスクを停止する。"""
-        if self._check_expired_roles.is_running():
-            self._check_expired_roles.cancel()
+        """Cog アンロード時に期限切れスケジューラを停止する。"""
+        if self._expiry_scheduler.is_running():
+            await self._expiry_scheduler.stop()
 
     # ==========================================================================
     # イベントリスナー
@@ -107,6 +116,8 @@ class JoinRoleCog(commands.Cog):
                 )
                 continue
 
+            self._expiry_scheduler.schedule(expires_at)
+
             try:
                 await member.add_roles(role, reason="JoinRole: 自動ロール付与")
             except discord.HTTPException:
@@ -118,12 +129,16 @@ class JoinRoleCog(commands.Cog):
                 )
 
     # ==========================================================================
-    # バックグラウンドタスク
+    # 期限切れ処理 (DeadlineScheduler から呼ばれる)
     # ==========================================================================
 
-    @tasks.loop(minutes=1)
+    async def _next_expiry(self) -> datetime | None:
+        """DB から最も早い付与の有効期限を取得する。"""
+        async with async_session() as session:
+            return await get_next_join_role_expiry(session)
+
     async def _check_expired_roles(self) -> None:
-        """毎分実行: 期限切れロールを削除する。"""
+        """期限切れロールを削除する。"""
         now = datetime.now(UTC)
 
         async with async_session() as session:
@@ -164,7 +179,6 @@ class JoinRoleCog(commands.Cog):
                     assignment.guild_id,
                 )
 
-    @_check_expired_roles.before_loop
     async def _before_check_expired_roles(self) -> None:
         """Bot の接続完了を待つ。"""
         await self.bot.wait_until_ready()
@@ -0,0 +1,71 @@
+"""Retention cog for pruning old rows from log tables.
+
+Web 管理画面で設定した保持期間 (SiteSettings) を過ぎたログを、
+定期ジョブで削除・アーカイブする。処理の中身は
+:func:`src.services.retention_service.run_retention` にある。
+
+仕組み:
+  - RETENTION_INTERVAL_SECONDS ごとに実行 (Bot 起動直後に 1 回目)
+  - 周期ごとのバケットで claim し、複数インスタンスのうち 1 つだけが実行する
+  - 各テーブルは小さいバッチで処理されるので、実行中も Bot の書き込みは止まらない
+  - 保持期間が 1 つも設定されていなければ何もしない
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from discord.ext import commands, tasks
+
+from src.constants import RETENTION_INTERVAL_SECONDS
+from src.database.engine import async_session
+from src.services.db_service import claim_event, run_retention
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionCog(commands.Cog):
+    """保持期間を過ぎたログを定期的に削除する Cog。"""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+
+    async def cog_load(self) -> None:
+        """Cog 読み込み時に定期ジョブを開始する。"""
+        self._prune.start()
+
+    async def cog_unload(self) -> None:
+        """Cog アンロード時に定期ジョブを停止する。"""
+        self._prune.cancel()
+
+    @tasks.loop(seconds=RETENTION_INTERVAL_SECONDS)
+    async def _prune(self) -> None:
+        # 削除は冪等だが、全インスタンスで同時に走らせても無駄な負荷になるだけ
+        bucket = int(time.time()) // RETENTION_INTERVAL_SECONDS
+        try:
+            claimed = await claim_event(f"retention:{bucket}")
+        except Exception:
+            logger.exception("Failed to claim retention run, skipping")
+            return
+        if not claimed:
+            logger.debug("Retention run already claimed by another instance")
+            return
+
+        try:
+            results = await run_retention(async_session)
+        except Exception:
+            logger.exception("Retention run failed")
+            return
+        for table, count in results.items():
+            if count:
+                logger.info("Retention pruned %d row(s) from %s", count, table)
+
+    @_prune.before_loop
+    async def _before_prune(self) -> None:
+        await self.bot.wait_until_ready()
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Cog を Bot に登録する。"""
+    await bot.add_cog(RetentionCog(bot))
@@ -14,8 +14,10 @@
   - reaction: リアクション式
 """
 
+import asyncio
 import json
 import logging
+import time
 from typing import Literal
 
 import discord
@@ -23,10 +25,19 @@ from discord import app_commands
 from discord.ext import commands, tasks
 from sqlalchemy.exc import IntegrityError
 
-from src.constants import DEFAULT_EMBED_COLOR
-from src.database.engine import async_session
+from src.constants import (
+    CACHE_RESYNC_INTERVAL_SECONDS,
+    DEFAULT_EMBED_COLOR,
+    GUILD_SYNC_CONCURRENCY,
+)
+from src.database.change_feed import ChangeBatch
+from src.database.engine import async_session, read_session
 from src.services.db_service import (
+    DiscordChannelRow,
+    DiscordRoleRow,
     add_role_panel_item,
+    bulk_sync_discord_channels,
+    bulk_sync_discord_roles,
     delete_discord_channel,
     delete_discord_channels_by_guild,
     delete_discord_guild,
@@ -46,8 +57,8 @@ from src.services.db_service import (
     upsert_discord_role,
 )
 from src.ui.role_panel_view import (
+    RoleButton,
     RolePanelCreateModal,
-    RolePanelView,
     refresh_role_panel,
 )
 from src.utils import is_valid_emoji, normalize_emoji
@@ -65,53 +76,61 @@ class RolePanelCog(commands.Cog):
         self._panel_message_ids: set[str] | None = None
 
     async def cog_load(self) -> None:
-        """Cog 読み込み時に永続 View を登録し、定期同期タスクを開始する。"""
+        """Cog 読み込み時にロールボタンを登録し、定期同期タスクを開始する。
+
+        ロールボタンは DynamicItem なので、パネルの数に関係なく
+        テンプレートを 1 つ登録するだけで全パネルのボタンが動作する。
+        """
+        self.bot.add_dynamic_items(RoleButton)
         try:
-            await self._register_all_views()
+            await self._load_panel_message_ids()
         except Exception:
-            logger.critical(
-                "Failed to register role panel views on startup. "
-                "Role panel buttons will NOT work until the sync task succeeds.",
-                exc_info=True,
-            )
-        self._sync_views_task.start()
+            logger.exception("Failed to load role panel message IDs on startup")
+        self._sync_cache_task.start()
 
     async def cog_unload(self) -> None:
-        """Cog アンロード時に定期同期タスクを停止する。"""
-        self._sync_views_task.cancel()
+        """Cog アンロード時にロールボタンの登録を外し、定期同期タスクを停止する。"""
+        self._sync_cache_task.cancel()
+        self.bot.remove_dynamic_items(RoleButton)
 
-    async def _register_all_views(self) -> None:
-        """DB から全てのボタン式パネルを読み込み、永続 View を登録する。"""
-        new_ids: set[str] = set()
-        button_count = 0
-        async with async_session() as db_session:
+    async def _load_panel_message_ids(self, *, from_replica: bool = False) -> None:
+        """DB の全パネルの message_id をキャッシュに読み込む。
+
+        Args:
+            from_replica: リードレプリカから読む (定期同期のとき。
+                on_db_change ではパネル作成直後の message_id が必要なのでプライマリ)
+        """
+        async with (
+            read_session(async_session) if from_replica else async_session()
+        ) as db_session:
             panels = await get_all_role_panels(db_session)
-            for panel in panels:
-                # message_id をキャッシュに追加 (reaction パネル用)
-                if panel.message_id:
-                    new_ids.add(panel.message_id)
-                if panel.panel_type == "button" and panel.message_id:
-                    items = await get_role_panel_items(db_session, panel.id)
-                    view = RolePanelView(panel.id, items)
-                    self.bot.add_view(view, message_id=int(panel.message_id))
-                    logger.debug("Registered role panel view for panel %d", panel.id)
-                    button_count += 1
-
-        self._panel_message_ids = new_ids
-        logger.info("Loaded %d role panel views", button_count)
-
-    @tasks.loop(seconds=60)
-    async def _sync_views_task(self) -> None:
-        """Web 管理画面で追加されたパネルの永続 View を定期的に同期する。
-
-        Bot と Web は別プロセスで動作するため、Web 側でパネルが作成/変更
-        されても Bot の永続 View は自動更新されない。このタスクで定期的に
-        DB を確認し、最新のパネル構成を反映する。
+        self._panel_message_ids = {p.message_id for p in panels if p.message_id}
+
+    @tasks.loop(seconds=CACHE_RESYNC_INTERVAL_SECONDS)
+    async def _sync_cache_task(self) -> None:
+        """パネルの message_id キャッシュを定期的に同期する。
+
+        Web 管理画面での変更は on_db_change で即座に反映されるため、
+        これは通知を取りこぼした場合の保険。
         """
         try:
-            await self._register_all_views()
+            await self._load_panel_message_ids(from_replica=True)
         except Exception:
-            logger.exception("Failed to sync role panel views")
+            logger.exception("Failed to sync role panel message IDs")
+
+    @commands.Cog.listener()
+    async def on_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面でパネルが作成/削除されたら message_id キャッシュを同期する。
+
+        Bot と Web は別プロセスで動作するため、Web 側で作成したパネルの
+        リアクションはキャッシュを読み直すまで無視されてしまう。
+        """
+        if not batch.touches("role_panels"):
+            return
+        try:
+            await self._load_panel_message_ids()
+        except Exception:
+            logger.exception("Failed to sync role panel message IDs")
 
     # -------------------------------------------------------------------------
     # コマンドグループ
@@ -241,7 +260,7 @@ class RolePanelCog(commands.Cog):
                 else None
             )
             if isinstance(channel, discord.TextChannel):
-                await refresh_role_panel(channel, panel, items, self.bot)
+                await refresh_role_panel(channel, panel, items)
 
         await interaction.followup.send(
             f"ロール {role.mention} ({emoji}) を追加しました。",
@@ -296,7 +315,7 @@ class RolePanelCog(commands.Cog):
                 else None
             )
             if isinstance(channel, discord.TextChannel):
-                await refresh_role_panel(channel, panel, items, self.bot)
+                await refresh_role_panel(channel, panel, items)
 
         await interaction.followup.send(
             f"ロール ({emoji}) を削除しました。", ephemeral=True
@@ -563,7 +582,10 @@ class RolePanelCog(commands.Cog):
             )
 
     async def _sync_guild_channels(self, guild: discord.Guild) -> int:
-        """ギルドのチャンネル情報を DB に同期する。
+        """ギルドのチャンネル情報を DB に一括同期する。
+
+        対象チャンネルを 1 回の upsert で書き込み、対象外になったチャンネル
+        (削除済み・閲覧不可) はキャッシュから削除する。
 
         Args:
             guild: Discord ギルド
@@ -571,32 +593,34 @@ class RolePanelCog(commands.Cog):
         Returns:
             同期したチャンネル数
         """
-        count = 0
-        async with async_session() as db_session:
-            for channel in guild.channels:
-                # テキスト系チャンネルのみ同期
-                if channel.type not in self.SYNC_CHANNEL_TYPES:
-                    continue
-                # Bot が見えるチャンネルのみ
-                if not channel.permissions_for(guild.me).view_channel:
-                    continue
-
-                await upsert_discord_channel(
-                    db_session,
-                    guild_id=str(guild.id),
-                    channel_id=str(channel.id),
-                    channel_name=channel.name,
-                    channel_type=channel.type.value,
-                    position=channel.position,
-                    category_id=(
+        rows: list[DiscordChannelRow] = []
+        for channel in guild.channels:
+            # テキスト系チャンネルのみ同期
+            if channel.type not in self.SYNC_CHANNEL_TYPES:
+                continue
+            # Bot が見えるチャンネルのみ
+            if not channel.permissions_for(guild.me).view_channel:
+                continue
+            rows.append(
+                {
+                    "channel_id": str(channel.id),
+                    "channel_name": channel.name,
+                    "channel_type": channel.type.value,
+                    "position": channel.position,
+                    "category_id": (
                         str(channel.category_id) if channel.category_id else None
                     ),
-                )
-                count += 1
-        return count
+                }
+            )
+
+        async with async_session() as db_session:
+            return await bulk_sync_discord_channels(db_session, str(guild.id), rows)
 
     async def _sync_guild_roles(self, guild: discord.Guild) -> int:
-        """ギルドのロール情報を DB に同期する。
+        """ギルドのロール情報を DB に一括同期する。
+
+        対象ロールを 1 回の upsert で書き込み、Discord 側で削除された
+        ロールはキャッシュから削除する。
 
         Args:
             guild: Discord ギルド
@@ -604,48 +628,66 @@ class RolePanelCog(commands.Cog):
         Returns:
             同期したロール数
         """
-        count = 0
+        rows: list[DiscordRoleRow] = [
+            {
+                "role_id": str(role.id),
+                "role_name": role.name,
+                "color": role.color.value,
+                "position": role.position,
+            }
+            for role in guild.roles
+            # @everyone ロールとマネージドロール (Bot ロール等) は除外
+            if not (role.is_default() or role.managed)
+        ]
+
         async with async_session() as db_session:
-            for role in guild.roles:
-                # @everyone ロールとマネージドロール (Bot ロール等) は除外
-                if role.is_default() or role.managed:
-                    continue
-                await upsert_discord_role(
-                    db_session,
-                    guild_id=str(guild.id),
-                    role_id=str(role.id),
-                    role_name=role.name,
-                    color=role.color.value,
-                    position=role.position,
-                )
-                count += 1
-        return count
+            return await bulk_sync_discord_roles(db_session, str(guild.id), rows)
+
+    async def _sync_guild(self, guild: discord.Guild) -> tuple[int, int]:
+        """1 ギルド分の情報・ロール・チャンネルを同期する。
+
+        Args:
+            guild: Discord ギルド
+
+        Returns:
+            (同期したロール数, 同期したチャンネル数)
+        """
+        await self._sync_guild_info(guild)
+        role_count = await self._sync_guild_roles(guild)
+        channel_count = await self._sync_guild_channels(guild)
+        logger.debug(
+            "Synced %d roles, %d channels for guild %s",
+            role_count,
+            channel_count,
+            guild.name,
+        )
+        return role_count, channel_count
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        """Bot 起動時に全ギルドの情報を同期する。"""
-        total_roles = 0
-        total_channels = 0
-        for guild in self.bot.guilds:
-            # ギルド情報を同期
-            await self._sync_guild_info(guild)
-            # ロールを同期
-            role_count = await self._sync_guild_roles(guild)
-            total_roles += role_count
-            # チャンネルを同期
-            channel_count = await self._sync_guild_channels(guild)
-            total_channels += channel_count
-            logger.debug(
-                "Synced %d roles, %d channels for guild %s",
-                role_count,
-                channel_count,
-                guild.name,
-            )
+        """Bot 起動時に全ギルドの情報を同期する。
+
+        ギルドごとの同期は GUILD_SYNC_CONCURRENCY 件まで並行に実行する。
+        1 ギルドの失敗は他のギルドの同期を止めない。
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(GUILD_SYNC_CONCURRENCY)
+
+        async def sync_one(guild: discord.Guild) -> tuple[int, int]:
+            async with semaphore:
+                try:
+                    return await self._sync_guild(guild)
+                except Exception:
+                    logger.exception("Failed to sync guild %s", guild.id)
+                    return 0, 0
+
+        results = await asyncio.gather(*(sync_one(g) for g in self.bot.guilds))
         logger.info(
-            "Synced %d guilds, %d roles, %d channels",
+            "Synced %d guilds, %d roles, %d channels in %.2fs",
             len(self.bot.guilds),
-            total_roles,
-            total_channels,
+            sum(r for r, _ in results),
+            sum(c for _, c in results),
+            time.perf_counter() - started,
         )
 
     @commands.Cog.listener()
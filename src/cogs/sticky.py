@@ -5,9 +5,17 @@
 
 仕組み:
   - /sticky set で sticky メッセージを設定 (embed または text を選択)
-  - on_message で新規メッセージを監視
+  - MessageRouter 経由で sticky のあるチャンネルの新規メッセージだけを受け取る
   - delay 秒後に古い sticky を削除して新しい sticky を投稿（デバウンス方式）
   - Bot 再起動後も DB から設定を復元して動作継続
+
+ホットパス最適化:
+  - 設定済みチャンネルは channel_id → スナップショットのインメモリキャッシュで
+    判定し、同じチャンネル集合をルーターに登録する。sticky のないチャンネルの
+    メッセージはルーターの索引で弾かれ、この Cog には届かない
+  - キャッシュは /sticky set・/sticky remove・チャンネル削除と Web 管理画面での
+    変更 (on_db_change) で即時更新する。取りこぼし対策に 10 分ごとに全件を再構築する
+  - DB を参照するのは遅延再投稿 (_delayed_repost) の実行時のみ
 """
 
 from __future__ import annotations
@@ -20,10 +28,14 @@ from typing import Any
 
 import discord
 from discord import app_commands
-from discord.ext import commands
-
-from src.constants import DEFAULT_EMBED_COLOR
-from src.database.engine import async_session
+from discord.ext import commands, tasks
+
+from src.constants import CACHE_RESYNC_INTERVAL_SECONDS, DEFAULT_EMBED_COLOR
+from src.core.message_router import MessageRoute, get_message_router
+from src.core.metrics import CACHE_ENTRIES, CACHE_LOOKUPS
+from src.database.change_feed import ChangeBatch
+from src.database.engine import async_session, read_session
+from src.database.models import StickyMessage
 from src.services.db_service import (
     claim_sticky_repost,
     create_sticky_message,
@@ -38,6 +50,30 @@ from src.utils import get_resource_lock
 logger = logging.getLogger(__name__)
 
 
+class _StickySnapshot:
+    """on_message ホットパス用の sticky 設定スナップショット。
+
+    ORM インスタンスをセッション外で保持しないよう、判定に必要な値だけを
+    コピーして保持する。
+    """
+
+    __slots__ = ("channel_id", "guild_id", "cooldown_seconds")
+
+    def __init__(self, channel_id: str, guild_id: str, cooldown_seconds: int) -> None:
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.cooldown_seconds = cooldown_seconds
+
+    @classmethod
+    def from_model(cls, sticky: StickyMessage) -> _StickySnapshot:
+        """StickyMessage からスナップショットを作成する。"""
+        return cls(
+            channel_id=sticky.channel_id,
+            guild_id=sticky.guild_id,
+            cooldown_seconds=sticky.cooldown_seconds,
+        )
+
+
 class StickyEmbedModal(discord.ui.Modal, title="Sticky メッセージ設定 (Embed)"):
     """Embed 形式の Sticky メッセージを設定するモーダル。"""
 
@@ -142,9 +178,8 @@ class StickyEmbedModal(discord.ui.Modal, title="Sticky メッセージ設定 (Em
                     message_type="embed",
                 )
 
-            # キャッシュに追加
-            if self.cog._sticky_channels is not None:
-                self.cog._sticky_channels.add(channel_id)
+            # キャッシュに追加 (以降の on_message は DB を参照しない)
+            self.cog._cache_put(_StickySnapshot(channel_id, guild_id, delay_seconds))
 
             # embed を投稿
             embed = self.cog._build_embed(title, description, color_int)
@@ -249,9 +284,8 @@ class StickyTextModal(discord.ui.Modal, title="Sticky メッセージ設定 (テ
                     message_type="text",
                 )
 
-            # キャッシュに追加
-            if self.cog._sticky_channels is not None:
-                self.cog._sticky_channels.add(channel_id)
+            # キャッシュに追加 (以降の on_message は DB を参照しない)
+            self.cog._cache_put(_StickySnapshot(channel_id, guild_id, delay_seconds))
 
             await interaction.followup.send(
                 "✅ Sticky メッセージ (テキスト) を設定しました。", ephemeral=True
@@ -330,16 +364,111 @@ class StickyCog(commands.Cog):
         self.bot = bot
         # チャンネルごとの遅延再投稿タスクを管理
         self._pending_tasks: dict[str, asyncio.Task[None]] = {}
-        # sticky 設定済みチャンネル ID のインメモリキャッシュ
-        # None = 未ロード (フォールスルー), set = ロード済み (キャッシュ使用)
-        self._sticky_channels: set[str] | None = None
+        # channel_id → sticky 設定スナップショットのインメモリキャッシュ
+        # None = 未ロード (DB にフォールバック), dict = ロード済み (キャッシュ使用)
+        self._sticky_cache: dict[str, _StickySnapshot] | None = None
+        # sticky のあるチャンネルのメッセージだけを受け取るルート。
+        # 自分以外の Bot の投稿も再投稿のトリガーになるため include_bots=True。
+        # キャッシュ未ロードの間は全メッセージを受け取り DB にフォールバックする
+        self._message_route = MessageRoute(
+            "sticky", self.handle_message, include_bots=True
+        )
+        self._message_route.watch_all()
+
+    async def cog_load(self) -> None:
+        """Cog 読み込み時にルートを登録し、キャッシュ更新タスクを開始する。"""
+        get_message_router(self.bot).add_route(self._message_route)
+        CACHE_ENTRIES.set_function(
+            lambda: len(self._sticky_cache or ()), cache="sticky"
+        )
+        self._refresh_cache.start()
 
     async def cog_unload(self) -> None:
         """Cog がアンロードされる際に、保留中のタスクをキャンセルする。"""
+        get_message_router(self.bot).remove_route(self._message_route)
+        CACHE_ENTRIES.remove(cache="sticky")
+        if self._refresh_cache.is_running():
+            self._refresh_cache.cancel()
         for task in self._pending_tasks.values():
             task.cancel()
         self._pending_tasks.clear()
 
+    # ==========================================================================
+    # キャッシュ
+    # ==========================================================================
+
+    def _cache_put(self, snapshot: _StickySnapshot) -> None:
+        """sticky 設定をキャッシュに反映する (未ロード時は何もしない)。"""
+        if self._sticky_cache is not None:
+            self._sticky_cache[snapshot.channel_id] = snapshot
+            self._message_route.add(snapshot.channel_id)
+
+    def _cache_discard(self, channel_id: str) -> None:
+        """チャンネルの sticky 設定をキャッシュから削除する。"""
+        if self._sticky_cache is not None:
+            self._sticky_cache.pop(channel_id, None)
+            self._message_route.discard(channel_id)
+
+    async def _load_cache(self, *, from_replica: bool = False) -> None:
+        """全ての sticky 設定を DB から読み込み、キャッシュを再構築する。
+
+        Args:
+            from_replica: リードレプリカから読む (定期的な再構築のとき)
+        """
+        async with (
+            read_session(async_session) if from_replica else async_session()
+        ) as session:
+            stickies = await get_all_sticky_messages(session)
+        self._sticky_cache = {
+            s.channel_id: _StickySnapshot.from_model(s) for s in stickies
+        }
+        self._message_route.set_channels(self._sticky_cache)
+
+    async def _reload_cached_channels(self, channel_ids: set[str]) -> None:
+        """指定チャンネルの sticky 設定だけを DB から読み直す。"""
+        for channel_id in channel_ids:
+            async with async_session() as session:
+                sticky = await get_sticky_message(session, channel_id)
+            if sticky is None:
+                self._cache_discard(channel_id)
+            else:
+                self._cache_put(_StickySnapshot.from_model(sticky))
+
+    @tasks.loop(seconds=CACHE_RESYNC_INTERVAL_SECONDS)
+    async def _refresh_cache(self) -> None:
+        """キャッシュを定期的に再構築する。
+
+        Web 管理画面での設定変更は on_db_change で即座に反映されるため、
+        これは通知を取りこぼした場合の保険。
+        """
+        try:
+            await self._load_cache(from_replica=True)
+        except Exception:
+            logger.exception("Failed to refresh sticky cache")
+
+    @_refresh_cache.before_loop
+    async def _before_refresh_cache(self) -> None:
+        """Bot の接続完了を待つ。"""
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_db_change(self, batch: ChangeBatch) -> None:
+        """Web 管理画面で sticky 設定が変更されたらキャッシュを更新する。
+
+        行 (チャンネル) を特定できる変更はそのチャンネルだけ、
+        特定できない変更 (一括更新・resync) は全件を読み直す。
+        """
+        if not batch.touches("sticky_messages"):
+            return
+        events = batch.events_for("sticky_messages")
+        try:
+            if batch.resync or any(e.id is None for e in events):
+                await self._load_cache()
+            else:
+                await self._reload_cached_channels({e.id for e in events if e.id})
+        except Exception:
+            logger.exception("Failed to refresh sticky cache")
+
     # ==========================================================================
     # クリーンアップリスナー
     # ==========================================================================
@@ -355,8 +484,7 @@ class StickyCog(commands.Cog):
             self._pending_tasks.pop(channel_id, None)
 
         # キャッシュから削除
-        if self._sticky_channels is not None:
-            self._sticky_channels.discard(channel_id)
+        self._cache_discard(channel_id)
 
         # DB から削除
         async with async_session() as session:
@@ -374,9 +502,20 @@ class StickyCog(commands.Cog):
         """ギルドからボットが削除された時に関連する sticky メッセージを全て削除する。"""
         guild_id = str(guild.id)
 
-        # 保留中のタスクをキャンセル (このギルドに属するもの)
-        # 注: channel_id からギルドを特定できないため、DB から削除後にクリア
-        # 実際のタスクは DB 参照時に sticky が見つからず終了する
+        # このギルドに属するキャッシュエントリと保留中のタスクを破棄
+        # キャッシュ未ロード時のタスクは DB 参照時に sticky が見つからず終了する
+        if self._sticky_cache is not None:
+            channel_ids = [
+                cid
+                for cid, snapshot in self._sticky_cache.items()
+                if snapshot.guild_id == guild_id
+            ]
+            for cid in channel_ids:
+                del self._sticky_cache[cid]
+                self._message_route.discard(cid)
+                task = self._pending_tasks.pop(cid, None)
+                if task is not None:
+                    task.cancel()
 
         async with async_session() as session:
             count = await delete_sticky_messages_by_guild(session, guild_id)
@@ -392,30 +531,24 @@ class StickyCog(commands.Cog):
     # メッセージ監視
     # ==========================================================================
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        """新規メッセージを監視し、sticky メッセージの再投稿をスケジュールする。"""
-        # 自分自身のメッセージは無視（無限ループ防止）
-        # 他のボットや他のユーザーのメッセージは sticky を再投稿するトリガーとなる
-        if self.bot.user and message.author.id == self.bot.user.id:
-            return
-
-        # ギルドがなければ無視 (DM など)
-        if not message.guild:
-            return
+    async def handle_message(self, message: discord.Message) -> None:
+        """新規メッセージを監視し、sticky メッセージの再投稿をスケジュールする。
 
+        MessageRouter から呼ばれる。DM と自分自身のメッセージ (無限ループ防止) は
+        ルーターで除外済み。他のボットや他のユーザーのメッセージは sticky を
+        再投稿するトリガーとなる。
+        """
         channel_id = str(message.channel.id)
 
-        # インメモリキャッシュで高速フィルタリング (DB アクセスゼロ)
-        if (
-            self._sticky_channels is not None
-            and channel_id not in self._sticky_channels
-        ):
-            return
-
-        # sticky 設定を取得
-        async with async_session() as session:
-            sticky = await get_sticky_message(session, channel_id)
+        # インメモリキャッシュで判定 (DB アクセスゼロ)
+        # 未ロード時のみ DB にフォールバックする
+        sticky: _StickySnapshot | StickyMessage | None
+        if self._sticky_cache is not None:
+            sticky = self._sticky_cache.get(channel_id)
+            CACHE_LOOKUPS.inc(cache="sticky", result="hit" if sticky else "miss")
+        else:
+            async with async_session() as session:
+                sticky = await get_sticky_message(session, channel_id)
 
         if not sticky:
             return
@@ -459,8 +592,13 @@ class StickyCog(commands.Cog):
             sticky = await get_sticky_message(session, channel_id)
 
         if not sticky:
+            # Web 管理画面などで削除済み: キャッシュの古いエントリを破棄
+            self._cache_discard(channel_id)
             return
 
+        # Web 管理画面での cooldown 変更などを即時反映
+        self._cache_put(_StickySnapshot.from_model(sticky))
+
         # 再投稿の権利をアトミックに取得 (複数インスタンス実行時の重複防止)
         now = datetime.now(UTC)
         async with async_session() as session:
@@ -481,8 +619,7 @@ class StickyCog(commands.Cog):
                 "No message_id for sticky, removing config: channel=%s",
                 channel_id,
             )
-            if self._sticky_channels is not None:
-                self._sticky_channels.discard(channel_id)
+            self._cache_discard(channel_id)
             async with async_session() as session:
                 await delete_sticky_message(session, channel_id)
             return
@@ -502,8 +639,7 @@ class StickyCog(commands.Cog):
                     "Sticky message already deleted, removing config: channel=%s",
                     channel_id,
                 )
-                if self._sticky_channels is not None:
-                    self._sticky_channels.discard(channel_id)
+                self._cache_discard(channel_id)
                 async with async_session() as session:
                     await delete_sticky_message(session, channel_id)
                 return
@@ -514,8 +650,7 @@ class StickyCog(commands.Cog):
                     e,
                 )
                 # 取得・削除に失敗した場合も再投稿せず、DB からも削除
-                if self._sticky_channels is not None:
-                    self._sticky_channels.discard(channel_id)
+                self._cache_discard(channel_id)
                 async with async_session() as session:
                     await delete_sticky_message(session, channel_id)
                 return
@@ -640,8 +775,7 @@ class StickyCog(commands.Cog):
                     )
 
         # キャッシュから削除
-        if self._sticky_channels is not None:
-            self._sticky_channels.discard(channel_id)
+        self._cache_discard(channel_id)
 
         # DB から削除
         async with async_session() as session:
@@ -704,15 +838,13 @@ async def setup(bot: commands.Bot) -> None:
     cog = StickyCog(bot)
     await bot.add_cog(cog)
 
-    # Bot 起動時に全ての sticky 設定をログ出力 + キャッシュ構築
+    # Bot 起動時に全ての sticky 設定をキャッシュに読み込む
     try:
-        async with async_session() as session:
-            stickies = await get_all_sticky_messages(session)
-            cog._sticky_channels = {s.channel_id for s in stickies}
-            if stickies:
-                logger.info(
-                    "Loaded %d sticky message configurations",
-                    len(stickies),
-                )
+        await cog._load_cache()
+        if cog._sticky_cache:
+            logger.info(
+                "Loaded %d sticky message configurations",
+                len(cog._sticky_cache),
+            )
     except Exception:
         logger.critical("Failed to load sticky channel cache", exc_info=True)
@@ -16,23 +16,20 @@ from datetime import UTC, datetime
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from src.config import settings
 from src.database.engine import async_session
 from src.services.db_service import (
     delete_ticket_panel_by_message_id,
-    get_all_ticket_panels,
-    get_all_tickets,
     get_ticket_by_channel_id,
     get_ticket_category,
-    get_ticket_panel_categories,
     update_ticket_status,
 )
 from src.ui.ticket_view import (
-    TicketControlView,
-    TicketPanelView,
+    TICKET_DYNAMIC_ITEMS,
     generate_transcript,
+    save_transcript,
     send_close_log,
 )
 
@@ -46,74 +43,16 @@ class TicketCog(commands.Cog):
         self.bot = bot
 
     async def cog_load(self) -> None:
-        """Cog 読み込み時に永続 View を登録し、定期同期タスクを開始する。"""
-        try:
-            await self._register_all_views()
-        except Exception:
-            logger.critical(
-                "Failed to register ticket views on startup. "
-                "Ticket buttons will NOT work until the sync task succeeds.",
-                exc_info=True,
-            )
-        self._sync_views_task.start()
+        """Cog 読み込み時にチケットのボタンを登録する。
 
-    async def cog_unload(self) -> None:
-        """Cog アンロード時に定期同期タスクを停止する。"""
-        self._sync_views_task.cancel()
+        ボタンは DynamicItem なので、パネルやチケットの数に関係なく
+        テンプレートを登録するだけで全てのボタンが動作する。
+        """
+        self.bot.add_dynamic_items(*TICKET_DYNAMIC_ITEMS)
 
-    async def _register_all_views(self) -> None:
-        """DB から全パネルと open/claimed チケットの永続 View を登録する。"""
-        async with async_session() as db_session:
-            # パネルの View を登録
-            panels = await get_all_ticket_panels(db_session)
-            panel_count = 0
-            for panel in panels:
-                try:
-                    associations = await get_ticket_panel_categories(
-                        db_session, panel.id
-                    )
-                    if associations:
-                        # カテゴリ名を取得
-                        category_names: dict[int, str] = {}
-                        for assoc in associations:
-                            cat = await get_ticket_category(
-                                db_session, assoc.category_id
-                            )
-                            if cat:
-                                category_names[cat.id] = cat.name
-                        view = TicketPanelView(panel.id, associations, category_names)
-                        self.bot.add_view(view)
-                        panel_count += 1
-                except Exception:
-                    logger.exception("Failed to register view for panel %d", panel.id)
-
-            # open/claimed チケットの ControlView を登録
-            tickets = await get_all_tickets(db_session, limit=500)
-            ticket_count = 0
-            for ticket in tickets:
-                if ticket.status in ("open", "claimed") and ticket.channel_id:
-                    try:
-                        ctrl_view = TicketControlView(ticket.id)
-                        self.bot.add_view(ctrl_view)
-                        ticket_count += 1
-                    except Exception:
-                        logger.exception(
-                            "Failed to register control view for ticket %d", ticket.id
-                        )
-
-        logger.info(
-            "Registered %d ticket panel views and %d ticket control views",
-            panel_count,
-            ticket_count,
-        )
-
-    @tasks.loop(seconds=60)
-    async def _sync_views_task(self) -> None:
-        """Web 管理画面で追加されたパネルの永続 View を定期的に同期する。"""
-        try:
-            await self._register_all_views()
-        except Exception:
-            logger.exception("Failed to sync ticket views")
+    async def cog_unload(self) -> None:
+        """Cog アンロード時にチケットのボタンの登録を外す。"""
+        self.bot.remove_dynamic_items(*TICKET_DYNAMIC_ITEMS)
 
     # -------------------------------------------------------------------------
     # スラッシュコマンド
@@ -139,58 +78,82 @@ class TicketCog(commands.Cog):
             )
             return
 
+        # 読み取りだけで閉じ、履歴の取得やアップロード中は接続を保持しない
         async with async_session() as db_session:
             ticket = await get_ticket_by_channel_id(
                 db_session, str(interaction.channel_id)
             )
-            if ticket is None:
-                await interaction.response.send_message(
-                    "このチャンネルはチケットチャンネルではありません。",
-                    ephemeral=True,
-                )
-                return
+            category = (
+                await get_ticket_category(db_session, ticket.category_id)
+                if ticket is not None and ticket.status != "closed"
+                else None
+            )
 
-            if ticket.status == "closed":
-                await interaction.response.send_message(
-                    "このチケットは既にクローズされています。", ephemeral=True
-                )
-                return
+        if ticket is None:
+            await interaction.response.send_message(
+                "このチャンネルはチケットチャンネルではありません。",
+                ephemeral=True,
+            )
+            return
 
-            await interaction.response.defer()
+        if ticket.status == "closed":
+            await interaction.response.send_message(
+                "このチケットは既にクローズされています。", ephemeral=True
+            )
+            return
 
-            category = await get_ticket_category(db_session, ticket.category_id)
-            category_name = category.name if category else "Unknown"
+        await interaction.response.defer()
 
-            # トランスクリプト生成
-            transcript_text = ""
-            if isinstance(interaction.channel, discord.TextChannel):
-                transcript_text = await generate_transcript(
-                    interaction.channel,
-                    ticket,
-                    category_name,
-                    interaction.user.name,
-                )
+        category_name = category.name if category else "Unknown"
 
-            # DB 更新
-            await update_ticket_status(
-                db_session,
+        # トランスクリプト生成
+        transcript = None
+        if isinstance(interaction.channel, discord.TextChannel):
+            transcript = await generate_transcript(
+                interaction.channel,
+                ticket,
+                category_name,
+                interaction.user.name,
+            )
+
+        try:
+            # ログチャンネルに通知 (トランスクリプトを添付)
+            log_message = await send_close_log(
+                interaction.guild,
                 ticket,
-                status="closed",
-                closed_by=interaction.user.name,
+                category,
+                interaction.user.name,
+                settings.ticket_web_base_url,
+                transcript=transcript,
                 close_reason=reason,
-                transcript=transcript_text,
-                closed_at=datetime.now(UTC),
-                channel_id=None,
             )
 
-        # ログチャンネルに通知
-        await send_close_log(
-            interaction.guild,
-            ticket,
-            category,
-            interaction.user.name,
-            settings.ticket_web_base_url,
-        )
+            # 新しいセッションで読み直してから書き込む
+            async with async_session() as db_session:
+                current = await get_ticket_by_channel_id(
+                    db_session, str(interaction.channel_id)
+                )
+                if current is None or current.status == "closed":
+                    await interaction.followup.send(
+                        "このチケットは既にクローズされています。", ephemeral=True
+                    )
+                    return
+
+                # DB 更新
+                await update_ticket_status(
+                    db_session,
+                    current,
+                    status="closed",
+                    closed_by=interaction.user.name,
+                    close_reason=reason,
+                    closed_at=datetime.now(UTC),
+                    channel_id=None,
+                )
+                if transcript is not None:
+                    await save_transcript(db_session, current, transcript, log_message)
+        finally:
+            if transcript is not None:
+                transcript.close()
 
         # チャンネル削除
         try:
@@ -410,10 +410,10 @@ class VoiceCog(commands.Cog):
                         reason = "人数制限を超えているため"
 
             if should_kick:
-                # 重複排除テーブルで重複防止 (マルチインスタンス)
+                # claim で重複防止 (マルチインスタンス)
                 bucket = int(time.time()) // 5
                 event_key = f"vc_kick:{channel.id}:{member.id}:{bucket}"
-                if not await claim_event(session, event_key):
+                if not await claim_event(event_key):
                     logger.info(
                         "VC kick already claimed by another instance: %s",
                         event_key,
@@ -527,10 +527,10 @@ class VoiceCog(commands.Cog):
                 )
                 return
 
-            # 重複排除テーブルで重複防止 (マルチインスタンス)
+            # claim で重複防止 (マルチインスタンス)
             bucket = int(time.time()) // 5
             event_key = f"vc_lobby:{member.id}:{channel.id}:{bucket}"
-            if not await claim_event(session, event_key):
+            if not await claim_event(event_key):
                 logger.info(
                     "VC lobby join already claimed by another instance: %s",
                     event_key,
@@ -649,7 +649,6 @@ class VoiceCog(commands.Cog):
                     voice_session.is_locked,
                     voice_session.is_hidden,
                 )
-                self.bot.add_view(view)
                 panel_msg = await new_channel.send(embed=embed, view=view)
 
                 # コントロールパネルをピン留めする。
@@ -711,9 +710,9 @@ class VoiceCog(commands.Cog):
 
             # --- 全員退出 → チャンネル削除 ---
             if len(channel.members) == 0:
-                # 重複排除テーブルで重複防止 (マルチインスタンス)
+                # claim で重複防止 (マルチインスタンス)
                 event_key = f"vc_delete:{channel.id}"
-                if not await claim_event(session, event_key):
+                if not await claim_event(event_key):
                     logger.info(
                         "VC delete already claimed by another instance: %s",
                         event_key,
@@ -811,10 +810,10 @@ class VoiceCog(commands.Cog):
             )
             return  # 人間のメンバーが誰もいない
 
-        # 重複排除テーブルで重複防止 (マルチインスタンス)
+        # claim で重複防止 (マルチインスタンス)
         bucket = int(time.time()) // 5
         event_key = f"vc_transfer:{channel.id}:{old_owner.id}:{bucket}"
-        if not await claim_event(session, event_key):
+        if not await claim_event(event_key):
             logger.info(
                 "VC transfer already claimed by another instance: %s",
                 event_key,
@@ -845,7 +844,7 @@ class VoiceCog(commands.Cog):
             )
 
         # コントロールパネルを再投稿 (旧パネル削除 → 新パネル送信 → ピン留め)
-        await repost_panel(channel, self.bot)
+        await repost_panel(channel)
 
         # チャンネルに引き継ぎ通知を送信
         try:
@@ -974,7 +973,7 @@ class VoiceCog(commands.Cog):
                 )
                 return
 
-        await repost_panel(channel, self.bot)
+        await repost_panel(channel)
         await interaction.response.send_message(
             "コントロールパネルを再投稿しました。", ephemeral=True
         )
@@ -24,10 +24,18 @@ See Also:
     - src.constants: デフォルト値の定義
 """
 
+from typing import Literal
+
 from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from src.constants import DEFAULT_DATABASE_URL
+from src.constants import (
+    DEFAULT_DATABASE_URL,
+    DEFAULT_DISCORD_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    DEFAULT_DISCORD_HTTP_MAX_CONNECTIONS,
+    DEFAULT_DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LISTENER_SLOW_SECONDS,
+)
 
 
 class Settings(BaseSettings):
@@ -42,6 +50,8 @@ class Settings(BaseSettings):
             Discord Developer Portal で取得する。
         database_url (str): データベース接続 URL。
             デフォルトはローカル PostgreSQL。
+        database_read_replica_url (str): リードレプリカの接続 URL。
+            空の場合は読み取りもプライマリを使う。
         admin_email (str): Web 管理画面の初期管理者メールアドレス。
         admin_password (str): Web 管理画面の初期管理者パスワード。
         bump_channel_id (int): bump リマインダー用チャンネル ID。
@@ -53,6 +63,19 @@ class Settings(BaseSettings):
         smtp_from_email (str): メール送信元アドレス。
         smtp_use_tls (bool): TLS を使用するかどうか。
         app_url (str): アプリの URL (パスワードリセットリンク用)。
+        claim_backend (str): イベント claim のバックエンド
+            ("memory" または "postgres")。
+        discord_http_max_connections (int): Web 管理画面の Discord REST
+            クライアントの最大同時接続数。
+        discord_http_max_keepalive_connections (int): keep-alive で保持する
+            アイドル接続の最大数。
+        discord_http_keepalive_expiry (float): アイドル接続を保持する秒数。
+        listener_slow_seconds (float): リスナー/スラッシュコマンドを
+            遅いとみなして警告ログに出す秒数。
+        metrics_host (str): Bot の /metrics リスナーの待ち受けアドレス。
+        metrics_port (int): Bot の /metrics リスナーのポート。0 なら無効。
+        metrics_token (str): /metrics に要求する Bearer トークン。
+            空なら Bot のリスナーは認証なし、Web の /metrics は無効 (404)。
 
     Examples:
         設定値へのアクセス::
@@ -123,6 +146,10 @@ class Settings(BaseSettings):
     # データベース接続URL。デフォルトはローカルの PostgreSQL
     database_url: str = DEFAULT_DATABASE_URL
 
+    # リードレプリカの接続URL。管理画面の一覧や Bot のキャッシュ再構築など、
+    # 読み取り専用の処理をこちらに振り分ける。空ならプライマリを使う
+    database_read_replica_url: str = ""
+
     # Web 管理画面の初期管理者メールアドレス
     admin_email: str = "admin@example.com"
 
@@ -162,6 +189,37 @@ class Settings(BaseSettings):
     # タイムゾーンオフセット (UTC からの時差。例: 9 = JST, -5 = EST)
     timezone_offset: int = 9
 
+    # --- イベント claim (マルチインスタンス重複防止) のバックエンド ---
+    # memory: プロセス内 (シングルインスタンス構成向け、DB に書き込まない)
+    # postgres: UNLOGGED テーブル (マルチインスタンス構成向け)
+    claim_backend: Literal["memory", "postgres"] = "postgres"
+
+    # --- Discord REST API クライアント設定 (Web 管理画面) ---
+    # 共有 HTTP クライアントの最大同時接続数
+    discord_http_max_connections: int = DEFAULT_DISCORD_HTTP_MAX_CONNECTIONS
+
+    # keep-alive で保持するアイドル接続の最大数
+    discord_http_max_keepalive_connections: int = (
+        DEFAULT_DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS
+    )
+
+    # アイドル接続を保持する秒数
+    discord_http_keepalive_expiry: float = DEFAULT_DISCORD_HTTP_KEEPALIVE_EXPIRY_SECONDS
+
+    # --- リスナー・スラッシュコマンドの計測 ---
+    # これ以上 (秒) かかった呼び出しを警告ログとハートビートに出す
+    listener_slow_seconds: float = LISTENER_SLOW_SECONDS
+
+    # --- メトリクス (/metrics) ---
+    # Bot プロセス内の /metrics リスナー。0 なら起動しない。
+    # 既定ではローカルからのスクレイプだけを受ける
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+
+    # 空でなければ Authorization: Bearer <token> を要求する。
+    # Web 管理画面の /metrics は公開されているため、空なら 404 を返す
+    metrics_token: str = ""
+
     @property
     def smtp_enabled(self) -> bool:
         """SMTP が設定されているかどうかを判定する。
@@ -244,16 +302,32 @@ class Settings(BaseSettings):
             - :mod:`src.database.engine`: この URL を使用してエンジンを作成
             - asyncpg: https://github.com/MagicStack/asyncpg
         """
-        url = self.database_url
-        # 既に asyncpg ドライバが指定されている場合はそのまま返す
-        if url.startswith("postgresql+asyncpg://"):
-            return url
-        # Heroku は postgres:// を使うが、SQLAlchemy は postgresql+asyncpg:// が必要
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+asyncpg://", 1)
-        elif url.startswith("postgresql://"):
-            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        return _to_async_url(self.database_url)
+
+    @property
+    def async_read_replica_url(self) -> str:
+        """DATABASE_READ_REPLICA_URL を非同期ドライバ対応の形式に変換する。
+
+        変換は :attr:`async_database_url` と同じ。未設定の場合は空文字列を返す。
+
+        Returns:
+            str: asyncpg ドライバを使用する形式の接続 URL、または空文字列。
+        """
+        url = self.database_read_replica_url.strip()
+        return _to_async_url(url) if url else ""
+
+
+def _to_async_url(url: str) -> str:
+    """PostgreSQL の接続 URL を asyncpg ドライバ形式に変換する。"""
+    # 既に asyncpg ドライバが指定されている場合はそのまま返す
+    if url.startswith("postgresql+asyncpg://"):
         return url
+    # Heroku は postgres:// を使うが、SQLAlchemy は postgresql+asyncpg:// が必要
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
 
 
 #: アプリケーション全体で共有する設定インスタンス。
@@ -132,6 +132,225 @@ DEFAULT_DB_POOL_SIZE = 5
 # プールが満杯の場合に追加で作成できる接続数
 DEFAULT_DB_MAX_OVERFLOW = 10
 
+# 適応モード (DB_POOL_ADAPTIVE=true) で接続の空きを待つ最大秒数
+# プール自体のタイムアウト (30 秒) より長くし、バーストは順番待ちで吸収する
+DEFAULT_DB_POOL_QUEUE_TIMEOUT = 60
+
+# 適応モードで接続の作成に失敗して同時接続数を減らした後、
+# 再び増やし始めるまでの秒数
+DB_POOL_LIMIT_BACKOFF_SECONDS = 30.0
+
+# 接続の取得待ち時間ヒストグラムのバケット上限 (秒)
+DB_POOL_WAIT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    30.0,
+)
+
+# リードレプリカ (DATABASE_READ_REPLICA_URL) に読み取りを振り分ける遅延の上限 (秒)
+# これより遅れているときはプライマリを使う
+DEFAULT_DB_READ_REPLICA_MAX_LAG = 5
+
+# リードレプリカの接続確認・遅延の測定結果を使い回す秒数
+DB_READ_REPLICA_CHECK_INTERVAL_SECONDS = 10.0
+
+# リードレプリカの接続確認・遅延の測定の最大秒数
+# 応答しないレプリカで読み取りが止まらないよう短くする
+DB_READ_REPLICA_CHECK_TIMEOUT_SECONDS = 3.0
+
+# 起動時のギルド同期 (ロール・チャンネル) で同時に処理するギルド数
+# 各ギルドが 1 接続を使うため、プールサイズより小さくして他の処理用に空きを残す
+GUILD_SYNC_CONCURRENCY = 4
+
+# =============================================================================
+# イベント claim (マルチインスタンス重複防止) 設定
+# =============================================================================
+
+# claim の保持期間 (秒)
+# この期間内は同じ event_key を再 claim できない。期限切れの claim は
+# health cog の heartbeat で定期削除される
+CLAIM_TTL_SECONDS = 3600
+
+# =============================================================================
+# ログ系テーブルの保持期間 (retention) 設定
+# =============================================================================
+
+# 保持期間を過ぎた行を削除・アーカイブする定期ジョブの間隔 (秒)
+RETENTION_INTERVAL_SECONDS = 3600
+
+# 1 トランザクションで削除・アーカイブする行数
+# 行ロックと WAL を小さく保ち、Bot の書き込みを長く待たせない
+RETENTION_BATCH_SIZE = 1000
+
+# バッチの間に空ける時間 (秒)。他のクエリに接続と I/O を譲る
+RETENTION_BATCH_PAUSE_SECONDS = 0.1
+
+# 管理画面で設定できる保持日数の上限 (約 10 年)
+RETENTION_DAYS_MAX = 3650
+
+# パーティション化したログテーブルで、先に作っておく月パーティションの数
+# (今月 + この数だけ先の月)
+RETENTION_PARTITION_MONTHS_AHEAD = 2
+
+# =============================================================================
+# EventLog: 送信キュー設定
+# =============================================================================
+
+# 最初の Embed を受け取ってから、まとめて送信するまでの待ち時間 (秒)
+EVENTLOG_FLUSH_DELAY_SECONDS = 0.5
+
+# 送信先チャンネルごとのキューの上限 (溢れた Embed は捨てる)
+EVENTLOG_QUEUE_MAX_SIZE = 500
+
+# Cog アンロード時にキューを送り切るまで待つ最大秒数
+EVENTLOG_QUEUE_CLOSE_TIMEOUT_SECONDS = 10
+
+# =============================================================================
+# Web → Bot 変更通知 (LISTEN/NOTIFY) 設定
+# =============================================================================
+
+# Web 管理画面の書き込みを通知する PostgreSQL の NOTIFY チャンネル名
+CHANGE_FEED_CHANNEL = "discord_util_bot_changes"
+
+# 通知を受け取ってから、まとめて Cog に配るまでの待ち時間 (秒)
+# 1 回の保存で複数行が変わっても、キャッシュの読み直しを 1 回にまとめる
+CHANGE_FEED_BATCH_DELAY_SECONDS = 0.2
+
+# LISTEN 接続の死活確認の間隔 (秒)
+CHANGE_FEED_PING_INTERVAL_SECONDS = 30
+
+# LISTEN 接続が切れたときの再接続待ちの上限 (秒, 指数バックオフ)
+CHANGE_FEED_RECONNECT_MAX_DELAY_SECONDS = 60
+
+# 起動時に LISTEN の開始を待つ上限 (秒)
+# これを過ぎたら LISTEN を待たずに Cog を読み込む
+CHANGE_FEED_CONNECT_TIMEOUT_SECONDS = 10
+
+# 変更通知を取りこぼした場合に備えた、キャッシュ・永続 View の全件読み直し間隔 (秒)
+CACHE_RESYNC_INTERVAL_SECONDS = 600
+
+# =============================================================================
+# Ticket: トランスクリプト設定
+# =============================================================================
+
+# gzip 圧縮したトランスクリプトをメモリに置く上限 (バイト)
+# これを超えると一時ファイルに書き出す (長いチケットでメモリを食わない)
+TICKET_TRANSCRIPT_SPOOL_MAX_BYTES = 1024 * 1024
+
+# クローズログに添付できなかったトランスクリプトを DB に保存する上限 (バイト)
+# これを超える分は先頭から切り捨て、末尾 (クローズ直前のやりとり) を残す
+TICKET_TRANSCRIPT_DB_MAX_BYTES = 256 * 1024
+
+# =============================================================================
+# 期限付きジョブのスケジューラ設定
+# =============================================================================
+
+# 期限 (bump リマインダー・ロールの有効期限) を DB から読み直す間隔 (秒)
+# 同じプロセス内で書き込んだ期限は即時に反映されるため、これは
+# 他インスタンスや Web 管理画面が書き込んだ期限を拾うための上限
+SCHEDULER_RESYNC_SECONDS = 300
+
+# =============================================================================
+# on_message ルーター設定
+# =============================================================================
+
+# 1 メッセージの処理にこれ以上 (秒) かかったハンドラーを警告ログに出す
+MESSAGE_HANDLER_SLOW_SECONDS = 1.0
+
+# =============================================================================
+# リスナー・スラッシュコマンドの計測設定
+# =============================================================================
+
+# これ以上 (秒) かかったリスナー/コマンドを警告ログと遅延記録に残す
+# LISTENER_SLOW_SECONDS 環境変数で上書き可能
+LISTENER_SLOW_SECONDS = 0.5
+
+# 処理時間ヒストグラムのバケット上限 (秒)。p50/p95/p99 はこの値で近似する
+LISTENER_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# 遅かった呼び出しを直近何件まで保持するか
+SLOW_CALL_LOG_SIZE = 50
+
+# =============================================================================
+# メトリクス (/metrics) 設定
+# =============================================================================
+
+# Prometheus テキスト形式の Content-Type
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bot の /metrics リスナーがリクエスト行とヘッダーを読み切るまでの上限 (秒)。
+# 行ごとではなく全体にかけるので、少しずつ送り続けても接続を保持できない
+METRICS_REQUEST_TIMEOUT_SECONDS = 5.0
+
+# リクエストのヘッダー行数と 1 行の長さ (バイト) の上限
+METRICS_MAX_HEADER_LINES = 64
+METRICS_MAX_LINE_BYTES = 8192
+
+# イベントループの遅延を測る間隔 (秒)
+EVENT_LOOP_PROBE_INTERVAL_SECONDS = 0.5
+
+# イベントループがこれ以上 (秒) 塞がれたら、塞いでいるコールバックの
+# スタックを取得して警告ログに出す
+EVENT_LOOP_BLOCK_THRESHOLD_SECONDS = 0.25
+
+# ループ遅延のローリング統計に使う直近のサンプル数
+# 0.5 秒間隔 × 600 = 直近 5 分
+EVENT_LOOP_LAG_WINDOW_SIZE = 600
+
+# 塞がれた記録 (スタック付き) を直近何件まで保持するか
+EVENT_LOOP_BLOCK_LOG_SIZE = 10
+
+# =============================================================================
+# ChatRole: 投稿カウントのバッファ設定
+# =============================================================================
+
+# 溜めた投稿カウントを DB に反映する間隔 (秒)
+# 反映前にプロセスが落ちた場合、最大でこの期間分のカウントが失われる
+CHATROLE_PROGRESS_FLUSH_INTERVAL_SECONDS = 5
+
+# 未反映の (config_id, user_id) がこの件数に達したら間隔を待たずに反映する
+CHATROLE_PROGRESS_FLUSH_MAX_ENTRIES = 500
+
+# 把握しているカウントを DB から取り直すまでの秒数。
+# 反映間隔よりずっと長くし、数秒おきに投稿しないユーザーでも
+# 投稿ごとに DB を読まないようにする。他インスタンスでの付与・期限切れは
+# 最大でこの期間遅れて反映される
+CHATROLE_PROGRESS_KNOWN_TTL_SECONDS = 600
+
+# 把握しているカウントを保持する (config_id, user_id) の上限 (LRU で捨てる)
+CHATROLE_PROGRESS_KNOWN_MAX_ENTRIES = 10_000
+
+# =============================================================================
+# Web 管理画面: Discord REST API クライアント設定
+# =============================================================================
+
+# 共有 HTTP クライアントの最大同時接続数
+DEFAULT_DISCORD_HTTP_MAX_CONNECTIONS = 20
+
+# keep-alive で保持するアイドル接続の最大数
+DEFAULT_DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# アイドル接続を保持する秒数
+DEFAULT_DISCORD_HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
 # =============================================================================
 # Web 管理画面: フォーム送信クールタイム設定
 # =============================================================================
@@ -145,3 +364,13 @@ FORM_SUBMIT_COOLDOWN_SECONDS = 1
 # メモリリーク防止のため、古いエントリを定期的に削除する
 # 1時間 = 3600秒
 FORM_COOLDOWN_CLEANUP_INTERVAL_SECONDS = 3600
+
+# =============================================================================
+# Web 管理画面: 一覧のページング設定
+# =============================================================================
+
+# ログ・チケット一覧の 1 ページの件数 (limit 未指定時)
+LIST_PAGE_SIZE = 100
+
+# limit で指定できる 1 ページの最大件数
+LIST_PAGE_SIZE_MAX = 500
@@ -1 +1 @@
-"""Core module - Pure functions for business logic."""
+"""Core module - Pure functions for business logic and shared schedulers."""
@@ -0,0 +1,320 @@
+"""Latency instrumentation for gateway listeners and app commands.
+
+Cog のリスナー (on_voice_state_update など) とスラッシュコマンドの処理時間を
+(Cog, イベント) ごとに集計する。どのハンドラーが遅いのかを、ログを
+追わずにヘルスチェックの Embed から確認できるようにする。
+
+仕組み:
+  - Bot の ``add_cog`` で ``ListenerMetrics.instrument_cog`` を呼び、
+    Cog のリスナーとスラッシュコマンドのコールバックを計測用の関数で包む
+  - 処理時間は固定バケットのヒストグラムに積み、p50/p95/p99 はバケットの
+    上限値で近似する (サンプルを保持しないのでメモリは一定)
+  - ハンドラー内で開始された DB トランザクションの数を contextvar で数える。
+    SQLAlchemy の ``after_begin`` イベントで、実行中のハンドラーに加算する
+  - ``slow_seconds`` 以上かかった呼び出しは警告ログに出し、直近の
+    ``SLOW_CALL_LOG_SIZE`` 件を ``slow_calls`` に残す
+  - 例外は数えたうえでそのまま送出する (握りつぶすのは呼び出し側の責務)
+
+on_message は Cog ごとのリスナーではなく ``MessageRouter`` が配るため、
+ルーターが各ルートの処理時間を ``record`` で直接記録する。
+``collect`` は集計値を Prometheus のテキスト形式で返す (``/metrics`` 用)。
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from discord import app_commands
+from discord.ext import commands
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.constants import (
+    LISTENER_LATENCY_BUCKETS,
+    LISTENER_SLOW_SECONDS,
+    SLOW_CALL_LOG_SIZE,
+)
+from src.core.metrics import format_histogram, format_sample
+
+logger = logging.getLogger(__name__)
+
+# 実行中のハンドラーの DB トランザクション数 (ハンドラーごとに 1 つ)
+_session_counter: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "listener_session_counter", default=None
+)
+
+
+def _count_session(*_args: Any) -> None:
+    counter = _session_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_session_counter() -> None:
+    """DB トランザクションの開始を計測中のハンドラーに数える (冪等)。"""
+    if not event.contains(Session, "after_begin", _count_session):
+        event.listen(Session, "after_begin", _count_session)
+
+
+class HandlerStats:
+    """1 つの (Cog, イベント) の集計値。
+
+    Args:
+        cog: Cog 名 (ルーター経由の場合はルート名)
+        event: イベント名 (``on_message`` や ``/health setup`` など)
+        buckets: ヒストグラムのバケット上限 (秒, 昇順)
+    """
+
+    def __init__(
+        self,
+        cog: str,
+        event: str,
+        buckets: tuple[float, ...] = LISTENER_LATENCY_BUCKETS,
+    ) -> None:
+        self.cog = cog
+        self.event = event
+        self.buckets = buckets
+        # counts[i] は buckets[i] 以下、最後の要素は最大バケットを超えた件数
+        self.counts = [0] * (len(buckets) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.db_sessions = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, elapsed: float, *, failed: bool, db_sessions: int) -> None:
+        """1 回の呼び出しを記録する。"""
+        self.counts[bisect.bisect_left(self.buckets, elapsed)] += 1
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        self.db_sessions += db_sessions
+        if failed:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """q 分位 (0〜1) の処理時間をバケット上限で近似して返す (秒)。"""
+        if self.calls == 0:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if i < len(self.buckets):
+                    return min(self.buckets[i], self.max_seconds)
+                break
+        return self.max_seconds
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(0.95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    @property
+    def sessions_per_call(self) -> float:
+        return self.db_sessions / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class SlowCall:
+    """``slow_seconds`` を超えた 1 回の呼び出し。"""
+
+    cog: str
+    event: str
+    seconds: float
+    at: datetime
+    detail: str = ""
+
+
+class ListenerMetrics:
+    """(Cog, イベント) ごとの処理時間・DB トランザクション数・例外数の登録簿。
+
+    Args:
+        slow_seconds: これ以上かかった呼び出しを警告ログと slow_calls に残す秒数
+        slow_log_size: slow_calls に残す件数
+    """
+
+    def __init__(
+        self,
+        *,
+        slow_seconds: float = LISTENER_SLOW_SECONDS,
+        slow_log_size: int = SLOW_CALL_LOG_SIZE,
+    ) -> None:
+        self.slow_seconds = slow_seconds
+        self._stats: dict[tuple[str, str], HandlerStats] = {}
+        self._slow_calls: deque[SlowCall] = deque(maxlen=slow_log_size)
+        install_session_counter()
+
+    # ==========================================================================
+    # 参照
+    # ==========================================================================
+
+    def stats(self, cog: str, event: str) -> HandlerStats:
+        """(Cog, イベント) の集計値を返す (なければ作る)。"""
+        key = (cog, event)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = HandlerStats(cog, event)
+        return stats
+
+    def snapshot(self) -> list[HandlerStats]:
+        """呼び出し実績のある集計値を p95 の降順で返す。"""
+        return sorted(
+            (s for s in self._stats.values() if s.calls),
+            key=lambda s: (s.p95, s.calls),
+            reverse=True,
+        )
+
+    @property
+    def slow_calls(self) -> tuple[SlowCall, ...]:
+        """直近の遅い呼び出し (古い順)。"""
+        return tuple(self._slow_calls)
+
+    def collect(self) -> list[str]:
+        """集計値を Prometheus のテキスト形式の行で返す。"""
+        labels = ("cog", "event")
+        durations = [
+            "# HELP listener_duration_seconds Listener and app command duration",
+            "# TYPE listener_duration_seconds histogram",
+        ]
+        errors = [
+            "# HELP listener_errors_total Listener and app command exceptions",
+            "# TYPE listener_errors_total counter",
+        ]
+        sessions = [
+            "# HELP listener_db_sessions_total DB transactions begun in handlers",
+            "# TYPE listener_db_sessions_total counter",
+        ]
+        for (cog, event_name), stats in sorted(self._stats.items()):
+            if not stats.calls:
+                continue
+            values = (cog, event_name)
+            durations.extend(
+                format_histogram(
+                    "listener_duration_seconds",
+                    labels,
+                    values,
+                    stats.buckets,
+                    stats.counts,
+                    stats.total_seconds,
+                )
+            )
+            errors.append(
+                format_sample("listener_errors_total", stats.errors, labels, values)
+            )
+            sessions.append(
+                format_sample(
+                    "listener_db_sessions_total", stats.db_sessions, labels, values
+                )
+            )
+        return durations + errors + sessions
+
+    # ==========================================================================
+    # 記録
+    # ==========================================================================
+
+    def record(
+        self,
+        cog: str,
+        event: str,
+        elapsed: float,
+        *,
+        failed: bool = False,
+        db_sessions: int = 0,
+        detail: str = "",
+    ) -> None:
+        """1 回の呼び出しを記録し、遅ければ警告ログに出す。"""
+        self.stats(cog, event).observe(elapsed, failed=failed, db_sessions=db_sessions)
+        if elapsed >= self.slow_seconds:
+            self._slow_calls.append(
+                SlowCall(cog, event, elapsed, datetime.now(UTC), detail)
+            )
+            logger.warning(
+                "Slow handler %s.%s: %.3fs db_sessions=%d %s",
+                cog,
+                event,
+                elapsed,
+                db_sessions,
+                detail,
+            )
+
+    @contextlib.contextmanager
+    def track(self, cog: str, event: str, *, detail: str = "") -> Iterator[None]:
+        """with ブロックの処理時間と DB トランザクション数を記録する。"""
+        counter = [0]
+        token = _session_counter.set(counter)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _session_counter.reset(token)
+            self.record(
+                cog,
+                event,
+                elapsed,
+                failed=failed,
+                db_sessions=counter[0],
+                detail=detail,
+            )
+
+    def wrap(
+        self,
+        cog: str,
+        event: str,
+        func: Callable[..., Awaitable[Any]],
+    ) -> Callable[..., Awaitable[Any]]:
+        """コルーチン関数を計測付きの関数で包む (包み済みならそのまま返す)。"""
+        if getattr(func, "__instrumented__", False):
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.track(cog, event):
+                return await func(*args, **kwargs)
+
+        wrapper.__instrumented__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    def instrument_cog(self, cog: commands.Cog) -> None:
+        """Cog のリスナーとスラッシュコマンドを計測付きに置き換える。
+
+        ``Bot.add_cog`` より前に呼ぶこと。リスナーは Cog インスタンスの
+        属性として上書きするため、add_cog 時に包んだ関数が登録される。
+        """
+        cog_name = cog.qualified_name
+        for event_name, method_name in cog.__cog_listeners__:
+            method = getattr(cog, method_name)
+            setattr(cog, method_name, self.wrap(cog_name, event_name, method))
+
+        for command in cog.walk_app_commands():
+            if isinstance(command, app_commands.Command):
+                command._callback = self.wrap(  # type: ignore[assignment]
+                    cog_name, f"/{command.qualified_name}", command._callback
+                )
@@ -0,0 +1,205 @@
+"""Event loop lag probe and blocking-callback monitor.
+
+一定間隔で眠り、予定より何秒遅れて起きたかを測る。遅れはイベントループが
+他のコールバック (同期 I/O や重い計算) で塞がれていた時間で、Discord 側の
+遅延 (``bot.latency``) とは別に「プロセス自身が詰まっているか」を示す。
+
+仕組み:
+  - 測った遅れは ``EVENT_LOOP_LAG`` ヒストグラムと、直近 ``window`` 件の
+    ローリング統計 (``summary()`` の p50/p95/p99/max) に記録する
+  - 別スレッドのウォッチドッグが、ループが ``block_threshold`` 秒以上
+    起きてこないことを検知したら、その時点のループスレッドのスタックを
+    取得する (塞いでいるコールバックの中で取るので、原因の関数が分かる)
+  - ループが起きたときに遅れが閾値以上なら、取得したスタックと遅れを
+    ``blocks`` に残し、警告ログに出す
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+
+from src.constants import (
+    EVENT_LOOP_BLOCK_LOG_SIZE,
+    EVENT_LOOP_BLOCK_THRESHOLD_SECONDS,
+    EVENT_LOOP_LAG_WINDOW_SIZE,
+    EVENT_LOOP_PROBE_INTERVAL_SECONDS,
+)
+from src.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class LoopBlock:
+    """ループが閾値以上塞がれた 1 回分の記録。"""
+
+    seconds: float
+    at: datetime
+    # 塞いでいたコールバックの最も内側のフレーム ("file:line in func")
+    where: str
+    stack: str
+
+
+@dataclass(frozen=True, slots=True)
+class LoopLagSummary:
+    """直近の遅れのローリング統計 (秒)。"""
+
+    samples: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    blocks: int
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class LoopLagProbe:
+    """イベントループの遅れを測り、塞いだコールバックのスタックを取る。
+
+    Args:
+        interval: 眠る間隔 (秒)
+        block_threshold: これ以上塞がれたらスタックを取る秒数 (0 で無効)
+        window: ローリング統計に使う直近のサンプル数
+        block_log_size: ``blocks`` に残す件数
+    """
+
+    def __init__(
+        self,
+        interval: float = EVENT_LOOP_PROBE_INTERVAL_SECONDS,
+        *,
+        block_threshold: float = EVENT_LOOP_BLOCK_THRESHOLD_SECONDS,
+        window: int = EVENT_LOOP_LAG_WINDOW_SIZE,
+        block_log_size: int = EVENT_LOOP_BLOCK_LOG_SIZE,
+    ) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.last_lag = 0.0
+        self.block_count = 0
+        self._lags: deque[float] = deque(maxlen=window)
+        self._blocks: deque[LoopBlock] = deque(maxlen=block_log_size)
+        self._task: asyncio.Task[None] | None = None
+        # ウォッチドッグとループの間で共有する状態 (_lock で保護)
+        self._lock = threading.Lock()
+        self._beat = 0.0
+        self._pending: tuple[str, str] | None = None
+        self._loop_thread_id = 0
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def blocks(self) -> tuple[LoopBlock, ...]:
+        """直近の塞がれた記録 (古い順)。"""
+        return tuple(self._blocks)
+
+    def summary(self) -> LoopLagSummary:
+        """直近 ``window`` 件の遅れの統計を返す。"""
+        lags = sorted(self._lags)
+        if not lags:
+            return LoopLagSummary(0, 0.0, 0.0, 0.0, 0.0, self.block_count)
+        if len(lags) == 1:
+            p50 = p95 = p99 = lags[0]
+        else:
+            cuts = statistics.quantiles(lags, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        return LoopLagSummary(len(lags), p50, p95, p99, lags[-1], self.block_count)
+
+    def start(self) -> None:
+        """計測を開始する (開始済みなら何もしない)。"""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._run(), name="loop-lag-probe")
+        if self.block_threshold > 0:
+            self._stopping.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-lag-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """計測を止める。"""
+        self._stopping.set()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        watchdog, self._watchdog = self._watchdog, None
+        if watchdog is not None:
+            watchdog.join(timeout=1)
+
+    def observe(self, lag: float) -> None:
+        """1 回分の遅れを記録する (閾値以上なら塞がれた記録も残す)。"""
+        self.last_lag = lag
+        self._lags.append(lag)
+        EVENT_LOOP_LAG.observe(lag)
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if self.block_threshold <= 0 or lag < self.block_threshold:
+            return
+
+        where, stack = pending or ("unknown", "")
+        self.block_count += 1
+        EVENT_LOOP_BLOCKS.inc()
+        self._blocks.append(LoopBlock(lag, datetime.now(UTC), where, stack))
+        logger.warning(
+            "Event loop blocked for %.3fs at %s\n%s", lag, where, stack.rstrip()
+        )
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            with self._lock:
+                self._beat = started
+            await asyncio.sleep(self.interval)
+            self.observe(max(0.0, time.monotonic() - started - self.interval))
+
+    # ==========================================================================
+    # ウォッチドッグ (別スレッド)
+    # ==========================================================================
+
+    def _watch(self) -> None:
+        check = min(self.block_threshold / 2, self.interval)
+        captured_beat = -1.0
+        while not self._stopping.wait(check):
+            with self._lock:
+                beat = self._beat
+            overdue = time.monotonic() - beat - self.interval
+            if overdue < self.block_threshold or beat == captured_beat:
+                continue
+            captured_beat = beat
+            captured = self._capture_loop_stack()
+            if captured is not None:
+                with self._lock:
+                    if self._beat == beat:
+                        self._pending = captured
+
+    def _capture_loop_stack(self) -> tuple[str, str] | None:
+        """ループスレッドの現在のスタックを (最も内側のフレーム, 全体) で返す。"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        frames = traceback.extract_stack(frame)
+        if not frames:
+            return None
+        inner = frames[-1]
+        where = f"{inner.filename}:{inner.lineno} in {inner.name}"
+        return where, "".join(traceback.format_list(frames))
@@ -0,0 +1,313 @@
+"""Central on_message router.
+
+複数の Cog がそれぞれ on_message リスナーを登録すると、discord.py は
+メッセージ 1 件ごとにリスナーの数だけタスクを作り、各 Cog が同じ
+ギルド/Bot 判定を繰り返す。ルーターは on_message を 1 つだけ受け取り、
+共通の判定を 1 回で済ませてから、そのチャンネル/ギルドに関心のある
+ハンドラーだけを呼び出す。
+
+仕組み:
+  - 各 Cog は ``MessageRoute`` (ハンドラー + 関心のあるチャンネル/ギルド) を
+    持ち、cog_load で ``add_route``、cog_unload で ``remove_route`` する
+  - ルーターは channel_id → ルート、guild_id → ルートの索引を持つ。
+    Cog のキャッシュが変わったら ``MessageRoute.set_channels`` などで
+    関心を更新し、索引はその場で差分更新される
+  - DM と Bot 自身のメッセージは全ルートに届く前に捨てる。
+    他の Bot のメッセージは ``include_bots=True`` のルートにだけ届く
+  - キャッシュ未ロードで DB にフォールバックしたい Cog は ``watch_all()``
+    で全メッセージを受け取る
+  - ハンドラーごとに処理時間を計測し、``MESSAGE_HANDLER_SLOW_SECONDS``
+    を超えたら警告ログを出す。例外はハンドラー単位で握りつぶして記録する
+  - ``metrics`` を渡すと、処理時間・DB トランザクション数・例外数を
+    (ルート名, "on_message") として ``ListenerMetrics`` にも記録する。
+    遅延の警告ログは ``ListenerMetrics`` 側の閾値で出す
+
+関心のないチャンネルのメッセージは索引の参照だけで終わる。索引の当たり/外れは
+``cache_lookups_total{cache="message_router"}`` に記録する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+
+import discord
+from discord.ext import commands
+
+from src.constants import MESSAGE_HANDLER_SLOW_SECONDS
+from src.core.instrumentation import ListenerMetrics
+from src.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[discord.Message], Awaitable[None]]
+
+# ルートの関心範囲
+_SCOPE_NONE = "none"
+_SCOPE_ALL = "all"
+_SCOPE_CHANNELS = "channels"
+_SCOPE_GUILDS = "guilds"
+
+
+class MessageRoute:
+    """ルーターに登録する 1 つのハンドラーと、その関心範囲。
+
+    関心範囲は「なし」「全メッセージ」「チャンネル集合」「ギルド集合」の
+    いずれか 1 つ。作成直後は「なし」。
+
+    Args:
+        name: ログ用の名前
+        handler: メッセージを受け取るコルーチン関数
+        include_bots: True なら他の Bot のメッセージも受け取る
+    """
+
+    def __init__(
+        self, name: str, handler: MessageHandler, *, include_bots: bool = False
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.include_bots = include_bots
+        self._scope = _SCOPE_NONE
+        self._ids: set[int] = set()
+        self._router: MessageRouter | None = None
+        # 計測値 (ルーター経由で呼ばれた回数・合計秒数・例外数)
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.errors = 0
+
+    @property
+    def scope(self) -> str:
+        """関心範囲の種類 ("none" / "all" / "channels" / "guilds")。"""
+        return self._scope
+
+    @property
+    def ids(self) -> frozenset[int]:
+        """関心のあるチャンネル/ギルド ID。"""
+        return frozenset(self._ids)
+
+    def _replace(self, scope: str, ids: Iterable[int | str] = ()) -> None:
+        router = self._router
+        if router is not None:
+            router._unindex(self)
+        self._scope = scope
+        self._ids = {int(i) for i in ids}
+        if router is not None:
+            router._index(self)
+
+    def watch_all(self) -> None:
+        """ギルド内の全メッセージを受け取る (キャッシュ未ロード時など)。"""
+        self._replace(_SCOPE_ALL)
+
+    def watch_none(self) -> None:
+        """メッセージを受け取らない。"""
+        self._replace(_SCOPE_NONE)
+
+    def set_channels(self, channel_ids: Iterable[int | str]) -> None:
+        """関心のあるチャンネルを置き換える。"""
+        self._replace(_SCOPE_CHANNELS, channel_ids)
+
+    def set_guilds(self, guild_ids: Iterable[int | str]) -> None:
+        """関心のあるギルドを置き換える。"""
+        self._replace(_SCOPE_GUILDS, guild_ids)
+
+    def add(self, target_id: int | str) -> None:
+        """チャンネル/ギルドを 1 つ追加する (set_channels/set_guilds 済みの場合)。"""
+        if self._scope not in (_SCOPE_CHANNELS, _SCOPE_GUILDS):
+            return
+        key = int(target_id)
+        if key in self._ids:
+            return
+        self._ids.add(key)
+        if self._router is not None:
+            self._router._index_key(self, key)
+
+    def discard(self, target_id: int | str) -> None:
+        """チャンネル/ギルドを 1 つ取り除く (set_channels/set_guilds 済みの場合)。"""
+        if self._scope not in (_SCOPE_CHANNELS, _SCOPE_GUILDS):
+            return
+        key = int(target_id)
+        if key not in self._ids:
+            return
+        self._ids.discard(key)
+        if self._router is not None:
+            self._router._unindex_key(self, key)
+
+
+class MessageRouter:
+    """on_message を 1 つだけ受け取り、関心のあるルートに配るルーター。
+
+    Args:
+        bot: 自身のメッセージを判定するための Bot
+        slow_seconds: これ以上かかったハンドラーを警告ログに出す秒数
+            (metrics を渡した場合は metrics 側の閾値を使う)
+        metrics: ハンドラーごとの計測値の記録先
+    """
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        *,
+        slow_seconds: float = MESSAGE_HANDLER_SLOW_SECONDS,
+        metrics: ListenerMetrics | None = None,
+    ) -> None:
+        self._bot = bot
+        self._slow_seconds = slow_seconds
+        self._metrics = metrics
+        self._routes: list[MessageRoute] = []
+        self._by_channel: dict[int, tuple[MessageRoute, ...]] = {}
+        self._by_guild: dict[int, tuple[MessageRoute, ...]] = {}
+        self._all: tuple[MessageRoute, ...] = ()
+
+    @property
+    def routes(self) -> tuple[MessageRoute, ...]:
+        """登録済みのルート。"""
+        return tuple(self._routes)
+
+    def add_route(self, route: MessageRoute) -> None:
+        """ルートを登録する (登録済みなら何もしない)。"""
+        if route._router is self:
+            return
+        if route._router is not None:
+            route._router.remove_route(route)
+        route._router = self
+        self._routes.append(route)
+        self._index(route)
+
+    def remove_route(self, route: MessageRoute) -> None:
+        """ルートを登録解除する (未登録なら何もしない)。"""
+        if route._router is not self:
+            return
+        self._unindex(route)
+        self._routes.remove(route)
+        route._router = None
+
+    # ==========================================================================
+    # 索引
+    # ==========================================================================
+
+    def _table(self, route: MessageRoute) -> dict[int, tuple[MessageRoute, ...]]:
+        return self._by_channel if route.scope == _SCOPE_CHANNELS else self._by_guild
+
+    def _index_key(self, route: MessageRoute, key: int) -> None:
+        table = self._table(route)
+        table[key] = (*table.get(key, ()), route)
+
+    def _unindex_key(self, route: MessageRoute, key: int) -> None:
+        table = self._table(route)
+        remaining = tuple(r for r in table.get(key, ()) if r is not route)
+        if remaining:
+            table[key] = remaining
+        else:
+            table.pop(key, None)
+
+    def _index(self, route: MessageRoute) -> None:
+        if route.scope == _SCOPE_ALL:
+            self._all = (*self._all, route)
+        elif route.scope in (_SCOPE_CHANNELS, _SCOPE_GUILDS):
+            for key in route._ids:
+                self._index_key(route, key)
+
+    def _unindex(self, route: MessageRoute) -> None:
+        if route.scope == _SCOPE_ALL:
+            self._all = tuple(r for r in self._all if r is not route)
+        elif route.scope in (_SCOPE_CHANNELS, _SCOPE_GUILDS):
+            for key in route._ids:
+                self._unindex_key(route, key)
+
+    def routes_for(self, message: discord.Message) -> list[MessageRoute]:
+        """メッセージを受け取るルートを返す (共通の判定を含む)。"""
+        guild = message.guild
+        if guild is None:
+            return []
+
+        routes = self._all
+        by_channel = self._by_channel.get(message.channel.id)
+        if by_channel:
+            routes = (*routes, *by_channel)
+        by_guild = self._by_guild.get(guild.id)
+        if by_guild:
+            routes = (*routes, *by_guild)
+        if not routes:
+            CACHE_LOOKUPS.inc(cache="message_router", result="miss")
+            return []
+        CACHE_LOOKUPS.inc(cache="message_router", result="hit")
+
+        author = message.author
+        user = self._bot.user
+        if user is not None and author.id == user.id:
+            return []
+        if author.bot:
+            return [r for r in routes if r.include_bots]
+        return list(routes)
+
+    # ==========================================================================
+    # 配信
+    # ==========================================================================
+
+    async def dispatch(self, message: discord.Message) -> None:
+        """メッセージを関心のあるルートに配る (on_message リスナー)。"""
+        routes = self.routes_for(message)
+        if not routes:
+            return
+        if len(routes) == 1:
+            await self._run(routes[0], message)
+            return
+        await asyncio.gather(*(self._run(route, message) for route in routes))
+
+    async def _run(self, route: MessageRoute, message: discord.Message) -> None:
+        if self._metrics is not None:
+            detail = f"channel={message.channel.id} message={message.id}"
+            with (
+                contextlib.suppress(Exception),
+                self._metrics.track(route.name, "on_message", detail=detail),
+            ):
+                await self._call(route, message)
+            return
+
+        started = time.perf_counter()
+        with contextlib.suppress(Exception):
+            await self._call(route, message)
+        elapsed = time.perf_counter() - started
+        if elapsed >= self._slow_seconds:
+            logger.warning(
+                "Slow message handler %s: %.3fs channel=%s message=%s",
+                route.name,
+                elapsed,
+                message.channel.id,
+                message.id,
+            )
+
+    async def _call(self, route: MessageRoute, message: discord.Message) -> None:
+        started = time.perf_counter()
+        try:
+            await route.handler(message)
+        except Exception:
+            route.errors += 1
+            logger.exception(
+                "Message handler %s failed: guild=%s channel=%s message=%s",
+                route.name,
+                message.guild.id if message.guild else None,
+                message.channel.id,
+                message.id,
+            )
+            raise
+        finally:
+            route.calls += 1
+            route.total_seconds += time.perf_counter() - started
+
+
+def get_message_router(bot: commands.Bot) -> MessageRouter:
+    """Bot のメッセージルーターを返す。
+
+    まだなければ作成し、Bot の on_message リスナーとして登録する。
+    """
+    router = getattr(bot, "message_router", None)
+    if isinstance(router, MessageRouter):
+        return router
+    router = MessageRouter(bot)
+    setattr(bot, "message_router", router)  # noqa: B010
+    bot.add_listener(router.dispatch, "on_message")
+    return router
@@ -0,0 +1,544 @@
+"""Prometheus-compatible metrics registry.
+
+Bot と Web 管理画面のプロセスごとにカウンター・ゲージ・ヒストグラムを持ち、
+Prometheus のテキスト形式 (exposition format 0.0.4) で出力する。
+Web は FastAPI の ``/metrics``、Bot は ``MetricsServer`` (小さな HTTP
+リスナー) から同じ形式で配信する。
+
+仕組み:
+  - メトリクスはモジュールレベルで定義し、プロセス内の ``REGISTRY`` に登録する
+  - ゲージは ``set_function`` で「出力時に値を読む関数」を登録できる
+    (プールの使用数やキャッシュの件数など、常に最新値を持っているもの)
+  - 外部の集計値 (``ListenerMetrics`` など) は ``REGISTRY.add_collector`` で
+    出力時にテキストを生成する関数として登録する
+  - ``install_db_metrics(engine)`` で SQLAlchemy のプール状態
+    (適応モードの limit と待ち数を含む)、接続の取得待ち時間・タイムアウトと、
+    テーブル・操作ごとのクエリ数を記録する
+
+ラベルの値は ID を入れない (種類が増え続けないもの) に限ること。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import functools
+import hmac
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.constants import (
+    LISTENER_LATENCY_BUCKETS,
+    METRICS_CONTENT_TYPE,
+    METRICS_MAX_HEADER_LINES,
+    METRICS_MAX_LINE_BYTES,
+    METRICS_REQUEST_TIMEOUT_SECONDS,
+)
+from src.database.pool import PoolStats, instrumented_pool
+
+logger = logging.getLogger(__name__)
+
+Collector = Callable[[], Iterable[str]]
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def format_sample(
+    name: str,
+    value: float,
+    label_names: Sequence[str] = (),
+    label_values: Sequence[str] = (),
+) -> str:
+    """1 サンプル分の行を返す。"""
+    return f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}"
+
+
+def format_histogram(
+    name: str,
+    label_names: Sequence[str],
+    label_values: Sequence[str],
+    buckets: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> list[str]:
+    """ヒストグラム 1 系列分の行 (_bucket / _sum / _count) を返す。
+
+    Args:
+        counts: バケットごとの件数 (累積ではない)。最後の要素は最大バケット超え
+    """
+    names = (*label_names, "le")
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*buckets, math.inf), counts, strict=True):
+        cumulative += count
+        lines.append(
+            format_sample(
+                f"{name}_bucket",
+                cumulative,
+                names,
+                (*label_values, _format_value(bound)),
+            )
+        )
+    lines.append(format_sample(f"{name}_sum", total, label_names, label_values))
+    lines.append(format_sample(f"{name}_count", cumulative, label_names, label_values))
+    return lines
+
+
+class _Metric(ABC):
+    """メトリクスの共通部分 (名前・説明・ラベル名)。"""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        *,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """サンプル行を返す (HELP/TYPE 行は header() が返す)。"""
+
+
+class Counter(_Metric):
+    """増えるだけの値。"""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        return [
+            format_sample(self.name, value, self.label_names, key)
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """増減する値。``set_function`` で出力時に読む関数も登録できる。"""
+
+    kind = "gauge"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """出力時に呼んで値を得る関数を登録する (同じラベルなら置き換える)。"""
+        self._functions[self._key(labels)] = function
+
+    def remove(self, **labels: str) -> None:
+        key = self._key(labels)
+        self._values.pop(key, None)
+        self._functions.pop(key, None)
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        return function() if function is not None else self._values.get(key, 0.0)
+
+    def render(self) -> list[str]:
+        values = dict(self._values)
+        for key, function in self._functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                logger.debug("Gauge function for %s%s failed", self.name, key)
+        return [
+            format_sample(self.name, value, self.label_names, key)
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """固定バケットの分布。"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        *args: Any,
+        buckets: Sequence[float] = LISTENER_LATENCY_BUCKETS,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def render(self) -> list[str]:
+        lines: list[str] = []
+        for key, counts in sorted(self._counts.items()):
+            lines.extend(
+                format_histogram(
+                    self.name,
+                    self.label_names,
+                    key,
+                    self.buckets,
+                    counts,
+                    self._sums[key],
+                )
+            )
+        return lines
+
+
+class MetricsRegistry:
+    """プロセス内のメトリクスとコレクターの登録簿。"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """出力時に行を生成する関数を登録する (登録済みなら何もしない)。"""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Collector) -> None:
+        with contextlib.suppress(ValueError):
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Prometheus のテキスト形式で全メトリクスを返す。"""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception:
+                logger.exception("Metrics collector %r failed", collector)
+        return "\n".join(lines) + "\n"
+
+
+#: プロセス全体で共有するレジストリ
+REGISTRY = MetricsRegistry()
+
+# =============================================================================
+# 共通メトリクス
+# =============================================================================
+
+GATEWAY_LATENCY = Gauge(
+    "discord_gateway_latency_seconds", "Discord gateway heartbeat latency"
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay between scheduled and actual loop wake-ups"
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total", "Times the event loop was blocked past the threshold"
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "SQLAlchemy connection pool state (size, checked_out, overflow, limit, waiting)",
+    ("state",),
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed", ("table", "operation")
+)
+DISCORD_REST_LATENCY = Histogram(
+    "discord_rest_request_duration_seconds",
+    "Discord REST request duration including rate limit waits",
+    ("method",),
+)
+DISCORD_REST_RATE_LIMITED = Counter(
+    "discord_rest_rate_limited_total", "Discord REST 429 responses", ("scope",)
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "In-memory cache lookups", ("cache", "result")
+)
+CACHE_ENTRIES = Gauge("cache_entries", "In-memory cache entries", ("cache",))
+
+
+# =============================================================================
+# SQLAlchemy
+# =============================================================================
+
+_STATEMENT_PATTERN = re.compile(
+    r"^\s*(?:(select)\b.*?\bfrom\s+|(insert)\s+into\s+|(update)\s+|(delete)\s+from\s+)"
+    r'"?(\w+)"?',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def classify_statement(statement: str) -> tuple[str, str]:
+    """SQL 文から (テーブル名, 操作) を求める。
+
+    SQLAlchemy は同じ文字列を繰り返し使うため、結果をキャッシュする。
+    判別できない文 (SELECT 1 や WITH 句など) は ("other", 操作) になる。
+    """
+    match = _STATEMENT_PATTERN.match(statement)
+    if match is None:
+        head = statement.lstrip().split(None, 1)
+        operation = head[0].lower() if head else "other"
+        return "other", operation
+    operation = next(g for g in match.groups()[:4] if g).lower()
+    return match.group(5).lower(), operation
+
+
+def _count_query(
+    _conn: Any, _cursor: Any, statement: str, *_args: Any, **_kwargs: Any
+) -> None:
+    table, operation = classify_statement(statement)
+    DB_QUERIES.inc(table=table, operation=operation)
+
+
+# install_db_metrics で登録したプールの累積値 (エンジンごと)
+_pool_stats: list[PoolStats] = []
+
+
+def _collect_pool_stats() -> list[str]:
+    """プールの取得待ち時間・タイムアウト・接続エラーを出力する。"""
+    waits = [
+        "# HELP db_pool_checkout_wait_seconds Time to obtain a pooled DB connection",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+    ]
+    timeouts = [
+        "# HELP db_pool_timeouts_total Connection checkouts that timed out",
+        "# TYPE db_pool_timeouts_total counter",
+    ]
+    errors = [
+        "# HELP db_pool_connect_errors_total Failures creating a new DB connection",
+        "# TYPE db_pool_connect_errors_total counter",
+    ]
+    for stats in _pool_stats:
+        waits.extend(
+            format_histogram(
+                "db_pool_checkout_wait_seconds",
+                (),
+                (),
+                stats.buckets,
+                stats.counts,
+                stats.wait_seconds,
+            )
+        )
+        timeouts.append(format_sample("db_pool_timeouts_total", stats.timeouts))
+        errors.append(
+            format_sample("db_pool_connect_errors_total", stats.connect_errors)
+        )
+    return waits + timeouts + errors
+
+
+def install_db_metrics(engine: AsyncEngine) -> None:
+    """エンジンのプール状態とクエリ数をメトリクスに記録する (冪等)。"""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _count_query):
+        event.listen(sync_engine, "before_cursor_execute", _count_query)
+
+    pool: Any = sync_engine.pool
+    for state, reader in (
+        ("size", "size"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ):
+        if hasattr(pool, reader):
+            DB_POOL_CONNECTIONS.set_function(getattr(pool, reader), state=state)
+
+    instrumented = instrumented_pool(engine)
+    if instrumented is None:
+        return
+    if instrumented.stats not in _pool_stats:
+        _pool_stats.append(instrumented.stats)
+    REGISTRY.add_collector(_collect_pool_stats)
+    limiter = instrumented.limiter
+    if limiter is not None:
+        DB_POOL_CONNECTIONS.set_function(lambda: limiter.limit, state="limit")
+        DB_POOL_CONNECTIONS.set_function(lambda: limiter.waiting, state="waiting")
+
+
+# =============================================================================
+# 配信
+# =============================================================================
+
+
+def is_authorized(authorization: str | None, token: str) -> bool:
+    """``Authorization: Bearer <token>`` を確認する (token が空なら常に許可)。"""
+    if not token:
+        return True
+    if not authorization or not authorization.startswith("Bearer "):
+        return False
+    return hmac.compare_digest(authorization.removeprefix("Bearer "), token)
+
+
+class MetricsServer:
+    """``GET /metrics`` だけに応答する小さな HTTP/1.0 サーバー。
+
+    Bot のプロセスは Web フレームワークを持たないため、asyncio のストリームで
+    最小限の応答だけを返す。
+
+    Args:
+        host: 待ち受けるアドレス
+        port: 待ち受けるポート
+        token: 空でなければ Bearer トークンを要求する
+        registry: 出力するレジストリ
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        token: str = "",
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self._token = token
+        self._registry = registry
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=METRICS_MAX_LINE_BYTES
+        )
+        sockets = self._server.sockets or ()
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        logger.info("Metrics server listening on %s:%d", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            async with asyncio.timeout(METRICS_REQUEST_TIMEOUT_SECONDS):
+                request_line, authorization, complete = await self._read_head(reader)
+
+            parts = request_line.decode("latin-1").split()
+            if not complete:
+                status, body, content_type = (
+                    "431 Request Header Fields Too Large",
+                    b"",
+                    "text/plain",
+                )
+            elif len(parts) < 2 or parts[0] != "GET" or parts[1] != "/metrics":
+                status, body, content_type = "404 Not Found", b"", "text/plain"
+            elif not is_authorized(authorization, self._token):
+                status, body, content_type = "401 Unauthorized", b"", "text/plain"
+            else:
+                status = "200 OK"
+                body = self._registry.render().encode()
+                content_type = METRICS_CONTENT_TYPE
+
+            writer.write(
+                f"HTTP/1.0 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (TimeoutError, ConnectionError, ValueError):
+            # ValueError: 1 行が METRICS_MAX_LINE_BYTES を超えた
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _read_head(
+        reader: asyncio.StreamReader,
+    ) -> tuple[bytes, str | None, bool]:
+        """リクエスト行と Authorization ヘッダーを読む。
+
+        Returns:
+            (リクエスト行, Authorization の値, ヘッダーを最後まで読めたか)。
+            ヘッダーが METRICS_MAX_HEADER_LINES 行を超えたら読むのをやめて
+            False を返す。
+        """
+        request_line = await reader.readline()
+        authorization = None
+        for _ in range(METRICS_MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return request_line, authorization, True
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "authorization":
+                authorization = value.strip()
+        return request_line, authorization, False
@@ -0,0 +1,158 @@
+"""Deadline scheduler for timed jobs.
+
+DB に保存された「次の期限」まで眠り、期限が来たら処理を実行する
+プロセス内スケジューラ。固定間隔のポーリングループの代わりに使う。
+
+仕組み:
+  - 起動時に ``next_deadline()`` で DB から最も近い期限を読み込む
+  - 既知の期限をヒープで持ち、先頭の期限ちょうどまで眠る
+  - 新しい期限を書き込んだ側は ``schedule(when)`` で起こす
+    (より早い期限ならその時刻に合わせて眠り直す。DB には問い合わせない)
+  - 期限が来たら ``run_due()`` を実行し、次の期限を DB から読み直す
+  - 他インスタンスや Web 管理画面が書き込んだ期限は ``schedule`` で
+    知らせられないため、``resync_seconds`` ごとに DB から読み直す
+
+期限の処理自体 (claim とロール削除など) は ``run_due`` 側の責務で、
+スケジューラは「いつ呼ぶか」だけを決める。処理が終わった期限は
+DB から消える前提なので、再起動しても取りこぼさない。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from src.constants import SCHEDULER_RESYNC_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 処理直後にまだ期限切れの行が残っていた場合 (処理の失敗など) に
+# 再実行するまでの秒数。同じ期限で処理を空回りさせないための下限
+RETRY_DELAY_SECONDS = 30.0
+
+
+class DeadlineScheduler:
+    """期限ちょうどに処理を呼び出すスケジューラ。
+
+    Args:
+        name: ログ用の名前
+        next_deadline: DB から最も近い未処理の期限を返す (なければ None)
+        run_due: 期限を過ぎたものをすべて処理する
+        before_start: ループ開始前に await する処理 (Bot の接続待ちなど)
+        resync_seconds: 期限がなくても DB から読み直す間隔 (秒)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        next_deadline: Callable[[], Awaitable[datetime | None]],
+        run_due: Callable[[], Awaitable[None]],
+        before_start: Callable[[], Awaitable[None]] | None = None,
+        resync_seconds: float = SCHEDULER_RESYNC_SECONDS,
+    ) -> None:
+        self.name = name
+        self._next_deadline = next_deadline
+        self._run_due = run_due
+        self._before_start = before_start
+        self._resync_seconds = resync_seconds
+        self._heap: list[datetime] = []
+        self._scheduled: set[datetime] = set()
+        self._wakeup = asyncio.Event()
+        self._last_sync = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    def is_running(self) -> bool:
+        """ループが動作中なら True。"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """ループを開始する (動作中なら何もしない)。"""
+        if self.is_running():
+            return
+        self._task = asyncio.create_task(self._loop(), name=f"scheduler:{self.name}")
+
+    async def stop(self) -> None:
+        """ループを停止する。"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    def schedule(self, when: datetime) -> None:
+        """期限を登録し、必要ならループを起こす。
+
+        DB に期限を書き込んだ直後に呼ぶ。既に登録済みの期限は無視する。
+        """
+        if when in self._scheduled:
+            return
+        self._scheduled.add(when)
+        heapq.heappush(self._heap, when)
+        if self._heap[0] == when:
+            self._wakeup.set()
+
+    def next_due(self) -> datetime | None:
+        """次に処理する予定の期限 (なければ None)。"""
+        return self._heap[0] if self._heap else None
+
+    def _pop_due(self, now: datetime) -> bool:
+        """期限を過ぎたものをヒープから取り除き、1 つでもあれば True。"""
+        popped = False
+        while self._heap and self._heap[0] <= now:
+            self._scheduled.discard(heapq.heappop(self._heap))
+            popped = True
+        return popped
+
+    async def _reload(self, *, after_run: bool = False) -> None:
+        """DB から最も近い期限を読み直す。
+
+        Args:
+            after_run: run_due の直後なら True。まだ期限切れの行が残っていれば
+                RETRY_DELAY_SECONDS 後に回す (処理できない行で空回りしない)
+        """
+        self._last_sync = time.monotonic()
+        try:
+            deadline = await self._next_deadline()
+        except Exception:
+            logger.exception("Scheduler %s: failed to load next deadline", self.name)
+            return
+        if deadline is None:
+            return
+        now = datetime.now(UTC)
+        if after_run and deadline <= now:
+            deadline = now + timedelta(seconds=RETRY_DELAY_SECONDS)
+        self.schedule(deadline)
+
+    def _timeout(self) -> float:
+        """次に起きるまでの秒数 (期限と再同期の早い方)。"""
+        resync = max(0.0, self._last_sync + self._resync_seconds - time.monotonic())
+        if not self._heap:
+            return resync
+        remaining = (self._heap[0] - datetime.now(UTC)).total_seconds()
+        return max(0.0, min(remaining, resync))
+
+    async def _loop(self) -> None:
+        if self._before_start is not None:
+            await self._before_start()
+        await self._reload()
+
+        while True:
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._timeout())
+
+            if self._pop_due(datetime.now(UTC)):
+                try:
+                    await self._run_due()
+                except Exception:
+                    logger.exception("Scheduler %s: job failed", self.name)
+                await self._reload(after_run=True)
+            elif time.monotonic() - self._last_sync >= self._resync_seconds:
+                await self._reload()
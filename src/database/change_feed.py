@@ -0,0 +1,352 @@
+"""Change feed from the web admin to the bot via PostgreSQL LISTEN/NOTIFY.
+
+Bot と Web 管理画面は別プロセスで動くため、Web で設定を変更しても Bot の
+インメモリキャッシュや永続 View にはそのままでは伝わらない。
+
+仕組み:
+  - Web 側: ``enable_change_notify(session)`` を付けたセッションは、flush した
+    行ごとに ``pg_notify`` を同じトランザクション内で発行する。
+    通知は commit されたときだけ配信され、rollback されれば破棄される
+  - Bot 側: ``ChangeFeedListener`` が専用の接続で LISTEN し、短い間隔で
+    まとめた ``ChangeBatch`` をコールバックに渡す
+    (Bot はこれを ``on_db_change`` イベントとして各 Cog に配る)
+  - LISTEN 接続が切れて再接続したときは、切断中の通知を取りこぼしている
+    可能性があるので ``resync=True`` のバッチを渡す (全件読み直しの合図)
+
+payload は ``{"table", "op", "id", "guild_id"}`` の JSON。
+``id`` は単一カラムの主キー、``guild_id`` は行に guild_id カラムがあればその値。
+一括 UPDATE/DELETE など行を特定できない変更では両方 None になる。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction, object_mapper
+from sqlalchemy.pool import NullPool
+
+from src.config import settings
+from src.constants import (
+    CHANGE_FEED_BATCH_DELAY_SECONDS,
+    CHANGE_FEED_CHANNEL,
+    CHANGE_FEED_PING_INTERVAL_SECONDS,
+    CHANGE_FEED_RECONNECT_MAX_DELAY_SECONDS,
+)
+from src.database.engine import _get_connect_args
+
+logger = logging.getLogger(__name__)
+
+# Session.info のキー。True のセッションだけが変更を通知する
+_NOTIFY_INFO_KEY = "change_notify"
+
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, :payload)")
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """1 行 (または 1 テーブル) の変更通知。"""
+
+    table: str
+    op: str  # "insert" | "update" | "delete"
+    id: str | None = None
+    guild_id: str | None = None
+
+    def to_payload(self) -> str:
+        return json.dumps(
+            {
+                "table": self.table,
+                "op": self.op,
+                "id": self.id,
+                "guild_id": self.guild_id,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_payload(cls, payload: str) -> ChangeEvent | None:
+        """payload を復元する。形式が不正なら None。"""
+        try:
+            data = json.loads(payload)
+            table = data["table"]
+            op = data["op"]
+        except (ValueError, TypeError, KeyError):
+            return None
+        if not isinstance(table, str) or not isinstance(op, str):
+            return None
+        row_id = data.get("id")
+        guild_id = data.get("guild_id")
+        return cls(
+            table=table,
+            op=op,
+            id=str(row_id) if row_id is not None else None,
+            guild_id=str(guild_id) if guild_id is not None else None,
+        )
+
+
+@dataclass(frozen=True)
+class ChangeBatch:
+    """短い間隔でまとめた変更通知。
+
+    Attributes:
+        events: 重複を除いた変更通知 (受信順)
+        resync: True なら通知を取りこぼした可能性があり、全件読み直しが必要
+    """
+
+    events: tuple[ChangeEvent, ...] = ()
+    resync: bool = False
+
+    def touches(self, *tables: str) -> bool:
+        """いずれかのテーブルに変更があれば True (resync 時も True)。"""
+        return self.resync or any(e.table in tables for e in self.events)
+
+    def events_for(self, *tables: str) -> list[ChangeEvent]:
+        """指定テーブルの変更通知を返す。"""
+        return [e for e in self.events if e.table in tables]
+
+    def guild_ids(self, *tables: str) -> set[str] | None:
+        """指定テーブルで変更のあったギルド ID を返す。
+
+        ギルドを特定できない変更を含む場合 (と resync 時) は None を返す。
+        呼び出し側は全件を読み直す。
+        """
+        if self.resync:
+            return None
+        guild_ids: set[str] = set()
+        for e in self.events_for(*tables):
+            if e.guild_id is None:
+                return None
+            guild_ids.add(e.guild_id)
+        return guild_ids
+
+
+# =============================================================================
+# 通知の発行 (Web 側)
+# =============================================================================
+
+
+def enable_change_notify(session: AsyncSession) -> None:
+    """このセッションで書き込んだ変更を Bot に通知するようにする。"""
+    session.info[_NOTIFY_INFO_KEY] = True
+
+
+def _should_notify(session: Session) -> bool:
+    if not session.info.get(_NOTIFY_INFO_KEY):
+        return False
+    return bool(session.get_bind().dialect.name == "postgresql")
+
+
+def _row_event(obj: object, op: str) -> ChangeEvent | None:
+    """ORM オブジェクトから変更通知を作る。"""
+    mapper = object_mapper(obj)
+    table = getattr(mapper.local_table, "name", None)
+    if table is None:
+        return None
+    pk = mapper.primary_key_from_instance(obj)
+    row_id = str(pk[0]) if len(pk) == 1 and pk[0] is not None else None
+    guild_id = getattr(obj, "guild_id", None)
+    return ChangeEvent(
+        table=table,
+        op=op,
+        id=row_id,
+        guild_id=str(guild_id) if guild_id is not None else None,
+    )
+
+
+def _emit(connection: Connection, events: Iterable[ChangeEvent]) -> None:
+    params = [
+        {"channel": CHANGE_FEED_CHANNEL, "payload": e.to_payload()} for e in events
+    ]
+    if params:
+        connection.execute(_NOTIFY_SQL, params)
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_flushed_rows(session: Session, _flush_context: UOWTransaction) -> None:
+    """flush した行ごとに NOTIFY を発行する (commit 時に配信される)。"""
+    if not _should_notify(session):
+        return
+    # after_flush の時点では new / dirty / deleted は flush 前の状態を保っている
+    events: dict[ChangeEvent, None] = {}
+    for op, objs in (
+        ("insert", session.new),
+        ("update", session.dirty),
+        ("delete", session.deleted),
+    ):
+        for obj in objs:
+            if op == "update" and not session.is_modified(obj):
+                continue
+            change = _row_event(obj, op)
+            if change is not None:
+                events[change] = None
+    _emit(session.connection(), events)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _notify_bulk_statement(orm_execute_state: ORMExecuteState) -> None:
+    """一括 INSERT/UPDATE/DELETE はテーブル単位で NOTIFY を発行する。"""
+    if orm_execute_state.is_select:
+        return
+    session = orm_execute_state.session
+    if not _should_notify(session):
+        return
+    if orm_execute_state.is_insert:
+        op = "insert"
+    elif orm_execute_state.is_update:
+        op = "update"
+    elif orm_execute_state.is_delete:
+        op = "delete"
+    else:
+        return
+    table = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if table is None:
+        return
+    _emit(session.connection(), [ChangeEvent(table=table, op=op)])
+
+
+# =============================================================================
+# 通知の受信 (Bot 側)
+# =============================================================================
+
+
+class ChangeFeedListener:
+    """専用の接続で LISTEN し、変更通知をまとめてコールバックに渡す。
+
+    Args:
+        on_change: まとめた変更通知を受け取る (例外はログに残して無視する)
+        url: 接続先 (省略時は settings.async_database_url)
+        batch_delay: 最初の通知からまとめて渡すまでの待ち時間 (秒)
+        ping_interval: 接続の死活確認の間隔 (秒)
+        reconnect_max_delay: 再接続待ちの上限 (秒)
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[ChangeBatch], None],
+        *,
+        url: str | None = None,
+        batch_delay: float = CHANGE_FEED_BATCH_DELAY_SECONDS,
+        ping_interval: float = CHANGE_FEED_PING_INTERVAL_SECONDS,
+        reconnect_max_delay: float = CHANGE_FEED_RECONNECT_MAX_DELAY_SECONDS,
+    ) -> None:
+        self._on_change = on_change
+        self._url = url or settings.async_database_url
+        self._batch_delay = batch_delay
+        self._ping_interval = ping_interval
+        self._reconnect_max_delay = reconnect_max_delay
+        self._initial_delay = min(1.0, reconnect_max_delay)
+        self._pending: dict[ChangeEvent, None] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._connected = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def is_running(self) -> bool:
+        """受信ループが動作中なら True。"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """受信ループを開始する (動作中なら何もしない)。"""
+        if self.is_running():
+            return
+        self._task = asyncio.create_task(self._run(), name="change-feed")
+
+    async def stop(self) -> None:
+        """受信ループを停止する。未配信の通知は捨てる。"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def wait_connected(self) -> None:
+        """LISTEN を開始するまで待つ (テスト・起動確認用)。"""
+        await self._connected.wait()
+
+    async def _run(self) -> None:
+        # LISTEN 専用なのでプールは使わない (アプリのプールを 1 本占有しない)
+        engine = create_async_engine(
+            self._url, poolclass=NullPool, connect_args=_get_connect_args()
+        )
+        delay = self._initial_delay
+        listened_before = False
+        try:
+            while True:
+                try:
+                    async with engine.connect() as conn:
+                        raw = await conn.get_raw_connection()
+                        await self._listen(raw.driver_connection, listened_before)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if self._connected.is_set():
+                        logger.warning("Change feed: LISTEN connection lost: %s", e)
+                    else:
+                        logger.warning(
+                            "Change feed: failed to connect (retry in %.0fs): %s",
+                            delay,
+                            e,
+                        )
+                if self._connected.is_set():
+                    # 一度は LISTEN できたので待ち時間を戻し、次の接続で resync する
+                    self._connected.clear()
+                    listened_before = True
+                    delay = self._initial_delay
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._reconnect_max_delay)
+        finally:
+            await engine.dispose()
+
+    async def _listen(self, driver: Any, listened_before: bool) -> None:
+        """LISTEN して、接続が切れるまで死活確認を続ける。"""
+        closed = asyncio.Event()
+        driver.add_termination_listener(lambda _conn: closed.set())
+        await driver.add_listener(CHANGE_FEED_CHANNEL, self._on_notify)
+        logger.info("Change feed: listening on %s", CHANGE_FEED_CHANNEL)
+        self._connected.set()
+        if listened_before:
+            # 切断中の通知は届いていないので全件読み直してもらう
+            self._deliver(ChangeBatch(resync=True))
+
+        while not closed.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(closed.wait(), self._ping_interval)
+            if not closed.is_set():
+                await asyncio.wait_for(driver.execute("SELECT 1"), self._ping_interval)
+        msg = "LISTEN connection closed"
+        raise ConnectionError(msg)
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        change = ChangeEvent.from_payload(payload)
+        if change is None:
+            logger.warning("Change feed: ignored malformed payload %r", payload)
+            return
+        self._pending[change] = None
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._batch_delay, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        events = tuple(self._pending)
+        self._pending.clear()
+        if events:
+            self._deliver(ChangeBatch(events=events))
+
+    def _deliver(self, batch: ChangeBatch) -> None:
+        try:
+            self._on_change(batch)
+        except Exception:
+            logger.exception("Change feed: change handler failed")
@@ -21,6 +21,14 @@ Examples:
             result = await session.execute(select(User))
             users = result.scalars().all()
 
+    読み取り専用の処理をリードレプリカに振り分ける::
+
+        from src.database.engine import async_session, read_session
+
+        # レプリカが未設定・停止中・遅延しているときは async_session() を使う
+        async with read_session(async_session) as session:
+            rules = await get_all_enabled_automod_rules(session)
+
     接続確認::
 
         from src.database.engine import check_database_connection_with_retry
@@ -30,6 +38,23 @@ Examples:
         else:
             print("Connection failed")
 
+    1 つのイベント処理でセッションを共有する::
+
+        from src.database.engine import async_session, unit_of_work
+
+        async with unit_of_work(async_session) as session:
+            posted = await has_intro_post(session, guild_id, user_id, channel_id)
+            # 入れ子の async_session() も同じセッション (接続) を使う
+            await record_intro_post(session, guild_id, user_id, channel_id)
+
+    クエリ数の確認 (テスト用)::
+
+        from src.database.engine import count_queries
+
+        with count_queries() as log:
+            await cog.handle_message(message)
+        print(len(log.statements), log.sessions, log.repeated())
+
 See Also:
     - :mod:`src.database.models`: テーブル定義
     - :mod:`src.services.db_service`: CRUD 操作関数
@@ -41,20 +66,49 @@ Notes:
     - DATABASE_REQUIRE_SSL=true: SSL 接続を有効化
     - DB_POOL_SIZE: コネクションプールサイズ (デフォルト: 5)
     - DB_MAX_OVERFLOW: オーバーフロー接続数 (デフォルト: 10)
+    - DB_POOL_ADAPTIVE=true: 同時接続数を上限内で増減させる (:mod:`src.database.pool`)
+    - DB_POOL_MAX_CONNECTIONS: 適応モードの同時接続数の上限
+      (デフォルト: DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    - DB_POOL_QUEUE_TIMEOUT: 適応モードで接続の空きを待つ秒数 (デフォルト: 60)
+    - DATABASE_READ_REPLICA_URL: リードレプリカの接続 URL (:func:`read_session`)
+    - DB_READ_REPLICA_MAX_LAG: レプリカを使う遅延の上限秒数 (デフォルト: 5)
 """
 
 import asyncio
+import contextlib
+import contextvars
 import logging
 import os
+import re
 import ssl
-from typing import Any
-
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
 from src.config import settings
-from src.constants import DEFAULT_DB_MAX_OVERFLOW, DEFAULT_DB_POOL_SIZE
+from src.constants import (
+    DEFAULT_DB_MAX_OVERFLOW,
+    DEFAULT_DB_POOL_QUEUE_TIMEOUT,
+    DEFAULT_DB_POOL_SIZE,
+    DEFAULT_DB_READ_REPLICA_MAX_LAG,
+)
 from src.database.models import Base
+from src.database.pool import (
+    ConnectionLimiter,
+    InstrumentedAsyncPool,
+    instrumented_pool,
+)
+from src.database.replica import ReplicaMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +160,26 @@ def _parse_int_env(name: str, default: int) -> int:
 POOL_SIZE = _parse_int_env("DB_POOL_SIZE", DEFAULT_DB_POOL_SIZE)
 MAX_OVERFLOW = _parse_int_env("DB_MAX_OVERFLOW", DEFAULT_DB_MAX_OVERFLOW)
 
+# --- 適応モード ---
+# DB_POOL_ADAPTIVE=true: 同時接続数を POOL_SIZE から DB_POOL_MAX_CONNECTIONS
+# までの間で増減させ、空きがなければ DB_POOL_QUEUE_TIMEOUT 秒まで順番に待つ
+# (詳細は src.database.pool)
+POOL_ADAPTIVE = os.environ.get("DB_POOL_ADAPTIVE", "").lower() == "true"
+POOL_MAX_CONNECTIONS = _parse_int_env(
+    "DB_POOL_MAX_CONNECTIONS", POOL_SIZE + max(MAX_OVERFLOW, 0)
+)
+POOL_QUEUE_TIMEOUT = _parse_int_env(
+    "DB_POOL_QUEUE_TIMEOUT", DEFAULT_DB_POOL_QUEUE_TIMEOUT
+)
+
+# --- リードレプリカ ---
+# DATABASE_READ_REPLICA_URL を設定すると read_session() の読み取りを
+# レプリカに振り分ける。遅延が DB_READ_REPLICA_MAX_LAG 秒を超えたら
+# プライマリに戻す (詳細は src.database.replica)
+READ_REPLICA_MAX_LAG = _parse_int_env(
+    "DB_READ_REPLICA_MAX_LAG", DEFAULT_DB_READ_REPLICA_MAX_LAG
+)
+
 # --- SSL 設定 ---
 # Heroku Postgres は SSL 接続を要求する
 # DATABASE_URL に sslmode が含まれているか、環境変数で明示的に指定する
@@ -166,20 +240,375 @@ def _get_connect_args() -> dict[str, Any]:
 # create_async_engine: 非同期で DB に接続するためのエンジンを作る
 # echo=False: SQL 文をログに出力しない (True にするとデバッグ時に便利)
 # pool_pre_ping=True: 接続プールの接続が有効かチェックする
+# poolclass=InstrumentedAsyncPool: 接続の取得待ち時間・タイムアウトを計測する
+#   (適応モードでは POOL_MAX_CONNECTIONS までオーバーフローを許し、
+#   実際の同時接続数は ConnectionLimiter で抑える)
 engine = create_async_engine(
     settings.async_database_url,
     echo=False,
     pool_pre_ping=True,  # 接続前にpingして無効な接続を検出
-    pool_size=POOL_SIZE,
-    max_overflow=MAX_OVERFLOW,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=min(POOL_SIZE, POOL_MAX_CONNECTIONS) if POOL_ADAPTIVE else POOL_SIZE,
+    max_overflow=(
+        max(POOL_MAX_CONNECTIONS - POOL_SIZE, 0) if POOL_ADAPTIVE else MAX_OVERFLOW
+    ),
     connect_args=_get_connect_args(),
 )
+if POOL_ADAPTIVE:
+    _pool = instrumented_pool(engine)
+    if _pool is not None:
+        _pool.limiter = ConnectionLimiter(
+            POOL_SIZE, POOL_MAX_CONNECTIONS, timeout=POOL_QUEUE_TIMEOUT
+        )
+        logger.info(
+            "Adaptive DB pool enabled: %d-%d connections, queue timeout %ds",
+            _pool.limiter.limit,
+            POOL_MAX_CONNECTIONS,
+            POOL_QUEUE_TIMEOUT,
+        )
+
+
+# --- リードレプリカのエンジン ---
+# プライマリとは別のサーバーなので、プールの大きさは同じ設定を使う
+read_engine: AsyncEngine | None = None
+replica_monitor: ReplicaMonitor | None = None
+if settings.async_read_replica_url:
+    read_engine = create_async_engine(
+        settings.async_read_replica_url,
+        echo=False,
+        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        connect_args=_get_connect_args(),
+    )
+    replica_monitor = ReplicaMonitor(read_engine, max_lag_seconds=READ_REPLICA_MAX_LAG)
+    logger.info("Read replica configured (max lag %ds)", READ_REPLICA_MAX_LAG)
+
+
+# =============================================================================
+# ユニットオブワーク
+# =============================================================================
+# 1 つのイベント処理の中で async_session() を何度も開くと、そのたびに
+# プールから接続を借りてトランザクションを始めることになる。
+# unit_of_work() の中では、同じタスクからの async_session() が
+# 外側のセッションをそのまま返すため、入れ子のサービス呼び出しが
+# 1 つのセッション (= 1 つの接続・トランザクション) を共有する。
+#
+# - コミットは明示的に行う (サービス関数の commit や呼び出し側の
+#   ``await session.commit()``)。ブロックを抜けるときは通常の
+#   ``async with async_session()`` と同じくセッションを閉じ、
+#   未コミットの変更は破棄する
+# - 共有するのは unit_of_work() を開いたタスクだけ。ブロック内で作成した
+#   タスク (contextvar を引き継ぐ) は並行に動くため、従来どおり自分の
+#   セッションを開く
+# - 借りた側のブロックで例外が出た場合はロールバックし、外側が続けて
+#   使えるようにする。ロールバックはセッション内のオブジェクトを期限切れに
+#   するため、その後は属性を読む前に取り直すこと
+
+# 実行中のユニットオブワーク (開いたタスクと共有するセッション)
+_current_unit_of_work: contextvars.ContextVar["_UnitOfWork | None"] = (
+    contextvars.ContextVar("unit_of_work", default=None)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _UnitOfWork:
+    session: AsyncSession
+    owner: "asyncio.Task[Any] | None"
+
+    def owned_by_current_task(self) -> bool:
+        try:
+            return self.owner is asyncio.current_task()
+        except RuntimeError:
+            # イベントループ外 (to_thread で contextvar を引き継いだ場合など)
+            return False
+
+
+class _BorrowedSession:
+    """ユニットオブワークのセッションを ``async with`` で貸し出す (閉じない)。"""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    async def __aenter__(self) -> AsyncSession:
+        return self._session
+
+    async def __aexit__(self, exc_type: object, *_exc: object) -> None:
+        if exc_type is not None:
+            await self._session.rollback()
+
+
+class UnitOfWorkSessionmaker(async_sessionmaker[AsyncSession]):
+    """実行中の unit_of_work() があればそのセッションを返すセッションファクトリ。
+
+    引数付きの呼び出し (``async_session(bind=...)`` など) は共有せず、
+    常に新しいセッションを作る。
+    """
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        current = _current_unit_of_work.get()
+        if current is not None and not local_kw and current.owned_by_current_task():
+            # async with でのみ使われる前提で、AsyncSession として返す
+            return cast(AsyncSession, _BorrowedSession(current.session))
+        return super().__call__(**local_kw)
+
 
 # --- セッションファクトリの作成 ---
 # async_sessionmaker: セッション (DB 操作の単位) を生成するファクトリ
 # expire_on_commit=False: commit 後もオブジェクトの属性にアクセスできるようにする
 #   (False にしないと、commit 後に session.name 等を読むとエラーになる)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# UnitOfWorkSessionmaker: unit_of_work() の中では外側のセッションを共有する
+async_session = UnitOfWorkSessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@contextlib.asynccontextmanager
+async def unit_of_work(
+    factory: Callable[[], AsyncSession] | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """ブロック内の async_session() に同じセッションを使わせる。
+
+    既に同じタスクでユニットオブワークが開かれていれば、そのセッションを
+    そのまま使う (入れ子にしても 1 つのセッションのまま)。
+
+    Args:
+        factory: セッションファクトリ。省略時は :data:`async_session`。
+            Cog からはモジュールで import した ``async_session`` を渡す
+            (テストで差し替えたファクトリがそのまま使われる)
+
+    Yields:
+        AsyncSession: 共有するセッション
+
+    Examples:
+        ::
+
+            async with unit_of_work(async_session) as session:
+                posted = await has_intro_post(session, ...)
+                # 入れ子の呼び出しも同じセッションを使う
+                async with async_session() as same_session:
+                    config = await get_automod_config(same_session, ...)
+                await session.commit()  # 明示的なコミットポイント
+    """
+    async with (factory or async_session)() as session:
+        current = _current_unit_of_work.get()
+        if (
+            current is not None
+            and current.session is session
+            and current.owned_by_current_task()
+        ):
+            yield session
+            return
+        token = _current_unit_of_work.set(_UnitOfWork(session, asyncio.current_task()))
+        try:
+            yield session
+        finally:
+            _current_unit_of_work.reset(token)
+
+
+# =============================================================================
+# リードレプリカへの振り分け
+# =============================================================================
+# read_session() はリードレプリカが使えればレプリカのセッションを、
+# 使えなければ呼び出し側が渡したプライマリのセッション (ファクトリ) を返す。
+#
+# - レプリカの内容は最大 READ_REPLICA_MAX_LAG 秒古い。直前の書き込みを
+#   読み直す処理 (変更通知によるキャッシュの再読み込みなど) には使わない
+# - unit_of_work() の中では、未コミットの変更も見えるよう共有セッションを使う
+# - レプリカに接続できなければ、次の確認までプライマリを使う
+#   (そのセッションもプライマリで開き直す)
+# - 読み取り中にレプリカの接続が切れたら、次の確認までプライマリを使う
+#   (エラー自体は呼び出し側に伝える)。ブロック内の他のエラーでは止めない
+
+# レプリカのセッションファクトリ (レプリカ未設定なら None)
+_replica_session: async_sessionmaker[AsyncSession] | None = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+
+async def _use_replica() -> bool:
+    if _replica_session is None or replica_monitor is None:
+        return False
+    current = _current_unit_of_work.get()
+    if current is not None and current.owned_by_current_task():
+        return False
+    return await replica_monitor.usable()
+
+
+@contextlib.asynccontextmanager
+async def read_session(
+    primary: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """読み取り専用のセッションを開く (リードレプリカが使えればレプリカ)。
+
+    Args:
+        primary: レプリカを使えないときのセッションファクトリ、または
+            既に開いているセッション (閉じずにそのまま使う)。
+            省略時は :data:`async_session`。Cog からはモジュールで import した
+            ``async_session`` を、Web のルートからはリクエストのセッションを渡す
+
+    Yields:
+        AsyncSession: 読み取りに使うセッション (書き込みには使わないこと)
+
+    Examples:
+        ::
+
+            async with read_session(async_session) as session:
+                rules = await get_all_enabled_automod_rules(session)
+    """
+    if await _use_replica():
+        assert _replica_session is not None and replica_monitor is not None
+        async with _replica_session() as session:
+            try:
+                # 接続を先に確保し、接続できなければプライマリで読む
+                connection = await session.connection()
+            except (exc.DBAPIError, OSError):
+                # asyncpg は接続時のエラーを OSError のまま送出する
+                replica_monitor.mark_down()
+            else:
+                try:
+                    yield session
+                except exc.DBAPIError as e:
+                    # ブロック内ではプライマリや Discord の処理も動くので、
+                    # レプリカの接続自体が無効化されたときだけ止める
+                    if e.connection_invalidated and connection.invalidated:
+                        replica_monitor.mark_down()
+                    raise
+                return
+
+    if isinstance(primary, AsyncSession):
+        yield primary
+    else:
+        async with (primary or async_session)() as session:
+            yield session
+
+
+# =============================================================================
+# クエリカウンター
+# =============================================================================
+# count_queries() の中で実行された SQL 文と開始されたトランザクションを数える。
+# テストで「このハンドラーは何回 DB を引いてよいか」を検証するためのもの。
+# count_queries() の外では contextvar を 1 回読むだけなので本番への影響はない。
+
+# 実行中の count_queries() の記録先 (入れ子になっている場合は外側から順に)
+_query_logs: contextvars.ContextVar[tuple["QueryLog", ...]] = contextvars.ContextVar(
+    "query_logs", default=()
+)
+
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL 文からパラメータを取り除いた「形」を返す。
+
+    プレースホルダ ($1, %(name)s, %s) を ``?`` に、``IN (?, ?, ?)`` のような
+    プレースホルダの並びを ``(?)`` にまとめる。値だけが違う同じクエリは
+    同じ形になるため、N+1 (ループ内で同じクエリを繰り返す) の検出に使う。
+
+    Args:
+        statement: 実行された SQL 文
+
+    Returns:
+        str: 正規化した SQL 文
+
+    Examples:
+        >>> statement_shape("SELECT * FROM t WHERE id IN ($1, $2)")
+        'SELECT * FROM t WHERE id IN (?)'
+    """
+    shape = _PLACEHOLDER_RE.sub("?", statement)
+    shape = _PLACEHOLDER_LIST_RE.sub("(?)", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryLog:
+    """count_queries() の間に実行された SQL 文とトランザクション数。
+
+    Attributes:
+        statements: 実行された SQL 文 (実行順)
+        sessions: 開始されたトランザクション (≒ DB を使ったセッション) の数
+    """
+
+    statements: list[str] = field(default_factory=list)
+    sessions: int = 0
+
+    def shapes(self) -> Counter[str]:
+        """SQL 文の形ごとの実行回数を返す。"""
+        return Counter(statement_shape(s) for s in self.statements)
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        """threshold 回以上実行された形を返す (N+1 の候補)。"""
+        return {
+            shape: count
+            for shape, count in self.shapes().most_common()
+            if count >= threshold
+        }
+
+
+def _record_statement(*args: Any) -> None:
+    # before_cursor_execute(conn, cursor, statement, parameters, context, many)
+    for log in _query_logs.get():
+        log.statements.append(args[2])
+
+
+def _record_session(*_args: Any) -> None:
+    for log in _query_logs.get():
+        log.sessions += 1
+
+
+def install_query_counter(target: AsyncEngine) -> None:
+    """エンジンの SQL 文を count_queries() で数えられるようにする (冪等)。
+
+    アプリのエンジンにはモジュール読み込み時に取り付け済み。
+    テスト用に別のエンジンを作った場合に呼ぶ。
+
+    Args:
+        target: 対象の非同期エンジン
+    """
+    sync_engine = target.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _record_statement):
+        event.listen(sync_engine, "before_cursor_execute", _record_statement)
+    if not event.contains(Session, "after_begin", _record_session):
+        event.listen(Session, "after_begin", _record_session)
+
+
+@contextlib.contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """with ブロック内で実行された SQL 文とトランザクションを記録する。
+
+    ブロック内で作成されたタスクの実行分も含む (contextvar を引き継ぐため)。
+    入れ子にした場合は外側のブロックにも記録される。
+
+    Yields:
+        QueryLog: 記録先 (ブロックを抜けた後も参照できる)
+
+    Examples:
+        ::
+
+            with count_queries() as log:
+                await cog.handle_message(message)
+            assert len(log.statements) <= 1
+            assert not log.repeated()
+    """
+    log = QueryLog()
+    token = _query_logs.set((*_query_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _query_logs.reset(token)
+
+
+install_query_counter(engine)
+if read_engine is not None:
+    install_query_counter(read_engine)
 
 
 async def init_db() -> None:
@@ -44,10 +44,13 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    func,
+    text,
 )
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -481,6 +484,13 @@ class BumpReminder(Base):
     __table_args__ = (
         # 同じ guild + service の組み合わせは 1 件のみ
         UniqueConstraint("guild_id", "service_name", name="uq_guild_service"),
+        # 送信待ちのリマインダー (get_due_bump_reminders と次の送信時刻の取得) 用。
+        # 送信済み (remind_at = None) と無効化されたものは含めない
+        Index(
+            "ix_bump_reminders_due",
+            "remind_at",
+            postgresql_where=text("is_enabled IS true AND remind_at IS NOT NULL"),
+        ),
     )
 
     # id: 自動採番の主キー
@@ -1249,7 +1259,7 @@ class AutoModLog(Base):
 
     Attributes:
         id (int): 自動採番の主キー。
-        guild_id (str): Discord サーバーの ID。インデックス付き。
+        guild_id (str): Discord サーバーの ID。
         user_id (str): BAN/KICK/Timeout されたユーザーの ID。
         username (str): アクション時のユーザー名。
         rule_id (int): 適用されたルールへの外部キー。
@@ -1261,12 +1271,23 @@ class AutoModLog(Base):
     Notes:
         - テーブル名: ``automod_logs``
         - ルール削除時にログもカスケード削除される
+        - 保持期間を過ぎた行は retention ジョブが削除する
+          (設定によっては ``automod_logs_archive`` に移す)
+        - ``src.database.partitioning`` で created_at の月単位パーティションに
+          変換できる
     """
 
     __tablename__ = "automod_logs"
+    __table_args__ = (
+        # 管理画面の一覧 (新しい順のキーセットページング) と、その絞り込み用
+        Index("ix_automod_logs_created_at_id", "created_at", "id"),
+        Index("ix_automod_logs_guild_id_created_at_id", "guild_id", "created_at", "id"),
+        Index("ix_automod_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    guild_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    # guild_id 単体の検索も (guild_id, created_at, id) のインデックスを使う
+    guild_id: Mapped[str] = mapped_column(String, nullable=False)
     user_id: Mapped[str] = mapped_column(String, nullable=False)
     username: Mapped[str] = mapped_column(String, nullable=False)
     rule_id: Mapped[int] = mapped_column(
@@ -1304,6 +1325,8 @@ class AutoModIntroPost(Base):
     Notes:
         - テーブル名: ``automod_intro_posts``
         - (guild_id, user_id, channel_id) でユニーク制約
+        - 保持期間 (SiteSettings.retention_intro_posts_days) を設定すると
+          retention ジョブが posted_at の古い行を削除する
     """
 
     __tablename__ = "automod_intro_posts"
@@ -1320,8 +1343,12 @@ class AutoModIntroPost(Base):
     guild_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
     user_id: Mapped[str] = mapped_column(String, nullable=False)
     channel_id: Mapped[str] = mapped_column(String, nullable=False)
+    # retention ジョブの範囲削除 (posted_at < 期限) 用
     posted_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+        index=True,
     )
 
     def __repr__(self) -> str:
@@ -1380,7 +1407,7 @@ class BanLog(Base):
 
     Attributes:
         id (int): 自動採番の主キー。
-        guild_id (str): Discord サーバーの ID。インデックス付き。
+        guild_id (str): Discord サーバーの ID。
         user_id (str): BAN されたユーザーの ID。
         username (str): BAN 時のユーザー名。
         reason (str | None): BAN 理由 (なしの場合 None)。
@@ -1390,12 +1417,21 @@ class BanLog(Base):
     Notes:
         - テーブル名: ``ban_logs``
         - AutoMod / 手動 BAN を問わず全ての BAN を記録
+        - 保持期間・アーカイブ・パーティションは AutoModLog と同じ
+          (アーカイブ先は ``ban_logs_archive``)
     """
 
     __tablename__ = "ban_logs"
+    __table_args__ = (
+        # 管理画面の一覧 (新しい順のキーセットページング) と、その絞り込み用
+        Index("ix_ban_logs_created_at_id", "created_at", "id"),
+        Index("ix_ban_logs_guild_id_created_at_id", "guild_id", "created_at", "id"),
+        Index("ix_ban_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    guild_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    # guild_id 単体の検索も (guild_id, created_at, id) のインデックスを使う
+    guild_id: Mapped[str] = mapped_column(String, nullable=False)
     user_id: Mapped[str] = mapped_column(String, nullable=False)
     username: Mapped[str] = mapped_column(String, nullable=False)
     reason: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -1412,6 +1448,92 @@ class BanLog(Base):
         )
 
 
+class AutoModLogArchive(Base):
+    """保持期間を過ぎた AutoMod ログの退避先テーブル。
+
+    SiteSettings.retention_archive_logs が有効なとき、retention ジョブが
+    ``automod_logs`` から削除した行をそのままの id で移す。
+
+    Attributes:
+        id (int): 元の ``automod_logs.id``。
+        guild_id (str): Discord サーバーの ID。
+        user_id (str): 対象ユーザーの ID。
+        username (str): アクション時のユーザー名。
+        rule_id (int): 適用されたルールの ID (ルール削除後も残すため外部キーなし)。
+        action_taken (str): 実行されたアクション。
+        reason (str): 人間可読な理由文字列。
+        created_at (datetime): 実行日時 (UTC)。
+        archived_at (datetime): アーカイブした日時 (UTC)。
+
+    Notes:
+        - テーブル名: ``automod_logs_archive``
+        - Bot・管理画面からは読まない (調査時に SQL で直接参照する)
+    """
+
+    __tablename__ = "automod_logs_archive"
+    __table_args__ = (
+        Index("ix_automod_logs_archive_guild_id_created_at", "guild_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    guild_id: Mapped[str] = mapped_column(String, nullable=False)
+    user_id: Mapped[str] = mapped_column(String, nullable=False)
+    username: Mapped[str] = mapped_column(String, nullable=False)
+    rule_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action_taken: Mapped[str] = mapped_column(String, nullable=False)
+    reason: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # INSERT ... SELECT で移すため DB 側のデフォルトを使う
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """デバッグ用の文字列表現。"""
+        return (
+            f"<AutoModLogArchive(id={self.id}, guild_id={self.guild_id}, "
+            f"user_id={self.user_id}, action={self.action_taken})>"
+        )
+
+
+class BanLogArchive(Base):
+    """保持期間を過ぎた BAN ログの退避先テーブル。
+
+    列は BanLog と同じで、アーカイブした日時 ``archived_at`` が加わる。
+
+    Notes:
+        - テーブル名: ``ban_logs_archive``
+        - id は元の ``ban_logs.id``
+    """
+
+    __tablename__ = "ban_logs_archive"
+    __table_args__ = (
+        Index("ix_ban_logs_archive_guild_id_created_at", "guild_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    guild_id: Mapped[str] = mapped_column(String, nullable=False)
+    user_id: Mapped[str] = mapped_column(String, nullable=False)
+    username: Mapped[str] = mapped_column(String, nullable=False)
+    reason: Mapped[str | None] = mapped_column(String, nullable=True)
+    is_automod: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """デバッグ用の文字列表現。"""
+        return (
+            f"<BanLogArchive(id={self.id}, guild_id={self.guild_id}, "
+            f"user_id={self.user_id}, is_automod={self.is_automod})>"
+        )
+
+
 class TicketCategory(Base):
     """チケットカテゴリ設定テーブル。
 
@@ -1571,7 +1693,7 @@ class Ticket(Base):
 
     Attributes:
         id (int): 自動採番の主キー。
-        guild_id (str): Discord サーバーの ID。インデックス付き。
+        guild_id (str): Discord サーバーの ID。
         channel_id (str | None): チケットチャンネルの ID (クローズ後 None)。
         user_id (str): チケット作成者の Discord ユーザー ID。
         username (str): 作成時のユーザー名。
@@ -1580,7 +1702,13 @@ class Ticket(Base):
         claimed_by (str | None): 担当スタッフの ID。
         closed_by (str | None): クローズしたユーザーの ID。
         close_reason (str | None): クローズ理由。
-        transcript (str | None): トランスクリプト全文。
+        transcript (str | None): トランスクリプト全文。クローズログに
+            添付できなかった場合のみ保存する。
+        transcript_message_count (int | None): トランスクリプトのメッセージ数。
+        transcript_channel_id (str | None): トランスクリプトを添付した
+            クローズログのチャンネル ID。
+        transcript_message_id (str | None): トランスクリプトを添付した
+            クローズログのメッセージ ID。
         ticket_number (int): ギルド内連番。
         form_answers (str | None): フォーム回答の JSON 文字列。
         created_at (datetime): 作成日時 (UTC)。
@@ -1590,15 +1718,37 @@ class Ticket(Base):
         - テーブル名: ``tickets``
         - (guild_id, ticket_number) でユニーク制約
         - channel_id はクローズ後に None に設定
+        - 保持期間 (SiteSettings.retention_ticket_transcripts_days) を設定すると
+          retention ジョブがクローズ済みチケットの transcript を None にする
     """
 
     __tablename__ = "tickets"
     __table_args__ = (
         UniqueConstraint("guild_id", "ticket_number", name="uq_guild_ticket_number"),
+        # 管理画面の一覧 (新しい順のキーセットページング) と、その絞り込み用
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_guild_id_created_at_id", "guild_id", "created_at", "id"),
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tickets_user_id_created_at_id", "user_id", "created_at", "id"),
+        # ギルド + 状態で絞り込む一覧 (get_tickets_by_guild) 用
+        Index(
+            "ix_tickets_guild_id_status_created_at_id",
+            "guild_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # retention ジョブが消す対象 (本文が残っているクローズ済みチケット) 用
+        Index(
+            "ix_tickets_closed_at_with_transcript",
+            "closed_at",
+            postgresql_where=text("transcript IS NOT NULL"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    guild_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    # guild_id 単体の検索は uq_guild_ticket_number と上の複合インデックスを使う
+    guild_id: Mapped[str] = mapped_column(String, nullable=False)
     channel_id: Mapped[str | None] = mapped_column(
         String, nullable=True, unique=True, index=True
     )
@@ -1612,6 +1762,9 @@ class Ticket(Base):
     closed_by: Mapped[str | None] = mapped_column(String, nullable=True)
     close_reason: Mapped[str | None] = mapped_column(String, nullable=True)
     transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
+    transcript_message_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    transcript_channel_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    transcript_message_id: Mapped[str | None] = mapped_column(String, nullable=True)
     ticket_number: Mapped[int] = mapped_column(Integer, nullable=False)
     form_answers: Mapped[str | None] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -1746,6 +1899,8 @@ class ChatRoleProgress(Base):
     投稿のたびに count++ し、threshold に達した瞬間にロール付与 + granted=True。
     duration_hours が指定されていれば expires_at に削除予定時刻を記録し、
     バックグラウンドタスクで期限切れロールを削除する。
+    未付与のまま updated_at が古くなった行は retention ジョブが削除する
+    (SiteSettings.retention_chat_role_progress_days)。
     """
 
     __tablename__ = "chat_role_progress"
@@ -1753,6 +1908,18 @@ class ChatRoleProgress(Base):
         UniqueConstraint(
             "config_id", "user_id", name="uq_chat_role_progress_config_user"
         ),
+        # 期限切れロールの検索と次の期限の取得は付与済みの行だけを見る
+        Index(
+            "ix_chat_role_progress_granted_expires_at",
+            "expires_at",
+            postgresql_where=text("granted IS true"),
+        ),
+        # retention ジョブが消す対象 (未付与の古い行) 用
+        Index(
+            "ix_chat_role_progress_pending_updated_at",
+            "updated_at",
+            postgresql_where=text("granted IS false"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -1769,7 +1936,12 @@ class ChatRoleProgress(Base):
         DateTime(timezone=True), nullable=True
     )
     expires_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), nullable=True, index=True
+        DateTime(timezone=True), nullable=True
+    )
+    # 最後にカウントが増えた日時。行は INSERT ... ON CONFLICT でしか
+    # 書かれないため、DB 側のデフォルトと ON CONFLICT の SET で更新する
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
     def __repr__(self) -> str:
@@ -1872,7 +2044,7 @@ class ProcessedEvent(Base):
 
     複数インスタンスが同じ Discord Gateway イベントを受信した際に、
     1 インスタンスだけが処理を実行するための重複排除レコード。
-    event_key の UNIQUE 制約により、INSERT の IntegrityError で
+    event_key の UNIQUE 制約と INSERT ... ON CONFLICT により、
     アトミックに重複を検出する。
 
     Attributes:
@@ -1883,14 +2055,21 @@ class ProcessedEvent(Base):
     Notes:
         - テーブル名: ``processed_events``
         - 古いレコードは health cog の heartbeat で定期削除される
+        - UNLOGGED テーブル (WAL を書かない。クラッシュ時は空になる)
+        - 操作は src.services.claim_service.PostgresClaimStore 経由
     """
 
     __tablename__ = "processed_events"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     event_key: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    # cleanup (created_at < 期限) の範囲削除用
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+        index=True,
     )
 
     def __repr__(self) -> str:
@@ -1945,13 +2124,44 @@ class SiteSettings(Base):
         id: 自動採番の主キー。
         timezone_offset: UTC からのタイムゾーンオフセット (時間単位)。
             例: 9 = JST, -5 = EST。デフォルト 9。
+        retention_automod_logs_days: AutoMod ログの保持日数。
+        retention_ban_logs_days: BAN ログの保持日数。
+        retention_intro_posts_days: 指定チャンネル投稿記録の保持日数。
+            削除されたメンバーは「未投稿」扱いになり、vc_without_intro /
+            msg_without_intro ルールの対象に戻る点に注意。
+        retention_ticket_transcripts_days: クローズ済みチケットの
+            トランスクリプト本文の保持日数 (closed_at 起点)。
+        retention_chat_role_progress_days: ロール未付与の投稿カウントの
+            保持日数 (最後の投稿起点)。期限を過ぎるとカウントが 0 に戻る。
+        retention_archive_logs: True なら AutoMod ログ・BAN ログを削除せず
+            ``*_archive`` テーブルに移す。
         updated_at: 最終更新日時 (UTC)。
+
+    Notes:
+        - retention_*_days は None で無期限 (削除しない)。デフォルトは全て None
+        - 削除は src.cogs.retention の定期ジョブが行う
     """
 
     __tablename__ = "site_settings"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     timezone_offset: Mapped[int] = mapped_column(Integer, nullable=False, default=9)
+    retention_automod_logs_days: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    retention_ban_logs_days: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    retention_intro_posts_days: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    retention_ticket_transcripts_days: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    retention_chat_role_progress_days: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    retention_archive_logs: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=text("false")
+    )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC),
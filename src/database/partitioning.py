@@ -0,0 +1,328 @@
+"""Optional monthly range partitioning for append-only log tables.
+
+``automod_logs`` と ``ban_logs`` を created_at の月ごとのパーティションに
+分割する。分割しておくと、retention ジョブが保持期間を過ぎた月を
+``DROP TABLE`` 1 回で消せる (行ごとの DELETE も、その後の VACUUM も要らない)。
+
+仕組み:
+  - パーティション名は ``<table>_pYYYYMM`` で、その月の 1 日 00:00 (UTC) から
+    翌月 1 日までの行を持つ。どの月にも入らない行は ``<table>_default`` に入る
+  - PostgreSQL の制約で主キーにパーティションキーを含める必要があるため、
+    変換後の主キーは (id, created_at) になる。id の採番 (シーケンス) は変わらない
+  - 変換 (:func:`convert_to_partitioned`) は 1 トランザクションで、既存テーブルを
+    リネーム → パーティション親を作成 → 行をコピー → 旧テーブルを削除 → インデックス
+    と外部キーを作り直す。その間は書き込みが止まるため、メンテナンス時に
+    ``python -m src.database.partitioning`` で実行する
+  - 先の月のパーティションは retention ジョブが毎回 :func:`ensure_partitions` で
+    補う。default に同じ月の行が入っていた場合は、新しいパーティションに移してから
+    親に ATTACH する
+
+パーティション化は任意の運用上の変更なので、Alembic のマイグレーションには
+含めない。分割していないテーブルでは retention はバッチ削除だけを行う。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import sys
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.constants import RETENTION_PARTITION_MONTHS_AHEAD
+
+logger = logging.getLogger(__name__)
+
+# パーティション化できるテーブル (created_at 列を持つ追記専用のログ)
+PARTITIONED_LOG_TABLES = ("automod_logs", "ban_logs")
+
+_MONTH_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def _check_table(table: str) -> None:
+    # テーブル名は SQL に直接埋め込むため、既知の名前だけを受け付ける
+    if table not in PARTITIONED_LOG_TABLES:
+        raise ValueError(f"Unsupported partitioned table: {table!r}")
+
+
+def month_start(moment: datetime) -> datetime:
+    """moment を含む月の 1 日 00:00 (UTC) を返す。"""
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """月初 month から months か月後 (負なら前) の月初を返す。"""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """table の month の月パーティション名を返す。"""
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bounds(month: datetime) -> str:
+    # DDL にはバインドパラメータを使えないため、自分で作った日時をリテラルにする
+    return f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+
+
+async def is_partitioned(conn: AsyncConnection, table: str) -> bool:
+    """table がパーティション親テーブルなら True を返す。"""
+    result = await conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    )
+    return result.scalar_one_or_none() == "p"
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> dict[datetime, str]:
+    """table の月パーティションを {月初: パーティション名} で返す。
+
+    default パーティションは含まない。
+    """
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:t)"
+        ),
+        {"t": table},
+    )
+    partitions: dict[datetime, str] = {}
+    for name in result.scalars():
+        match = _MONTH_SUFFIX.search(name)
+        if match is None or not name.startswith(f"{table}_p"):
+            continue
+        month = datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC)
+        partitions[month] = name
+    return partitions
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    table: str,
+    *,
+    now: datetime,
+    months_ahead: int = RETENTION_PARTITION_MONTHS_AHEAD,
+) -> list[str]:
+    """今月から months_ahead か月先までのパーティションを作成する。
+
+    default パーティションに入っていた同じ月の行は、新しいパーティションに移す。
+
+    Args:
+        conn: トランザクション中の接続。
+        table: パーティション親テーブル名。
+        now: 基準時刻。
+        months_ahead: 今月に加えて作成する月数。
+
+    Returns:
+        作成したパーティション名のリスト。
+
+    Raises:
+        ValueError: パーティション化できないテーブル名の場合。
+    """
+    _check_table(table)
+    existing = await list_partitions(conn, table)
+    default = f"{table}_default"
+    created: list[str] = []
+    current = month_start(now)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        name = partition_name(table, month)
+        # default に同じ月の行があると PARTITION OF で作れないため、
+        # 単独のテーブルとして作って行を移してから ATTACH する
+        await conn.execute(
+            text(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS)')
+        )
+        await conn.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" '
+                "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            ),
+            {"start": month, "end": add_months(month, 1)},
+        )
+        await conn.execute(
+            text(
+                f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+                f"FOR VALUES {_bounds(month)}"
+            )
+        )
+        created.append(name)
+    if created:
+        logger.info("Created partitions for %s: %s", table, ", ".join(created))
+    return created
+
+
+async def drop_partitions_before(
+    conn: AsyncConnection, table: str, cutoff: datetime
+) -> list[str]:
+    """全ての行が cutoff より古い月のパーティションを DROP する。
+
+    cutoff を含む月のパーティションは残す (端数は呼び出し側がバッチ削除する)。
+
+    Returns:
+        削除したパーティション名のリスト。
+
+    Raises:
+        ValueError: パーティション化できないテーブル名の場合。
+    """
+    _check_table(table)
+    dropped: list[str] = []
+    partitions = await list_partitions(conn, table)
+    for month, name in sorted(partitions.items()):
+        if add_months(month, 1) > cutoff:
+            break
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        dropped.append(name)
+    if dropped:
+        logger.info("Dropped partitions of %s: %s", table, ", ".join(dropped))
+    return dropped
+
+
+async def convert_to_partitioned(
+    conn: AsyncConnection,
+    table: str,
+    *,
+    now: datetime,
+    months_ahead: int = RETENTION_PARTITION_MONTHS_AHEAD,
+) -> bool:
+    """通常のテーブル table を created_at の月単位パーティションに変換する。
+
+    既存の行は全て移し、id のシーケンス・インデックス・外部キーを引き継ぐ。
+    呼び出し側のトランザクションの中で実行し、コミットまで table への
+    読み書きはブロックされる。
+
+    Args:
+        conn: トランザクション中の接続。
+        table: 変換するテーブル名。
+        now: 先の月のパーティションを作る基準時刻。
+        months_ahead: 今月に加えて作成する月数。
+
+    Returns:
+        変換した場合は True、既にパーティション化済みなら False。
+
+    Raises:
+        ValueError: パーティション化できないテーブル名の場合。
+    """
+    _check_table(table)
+    if await is_partitioned(conn, table):
+        return False
+
+    old = f"{table}_unpartitioned"
+    await conn.execute(text(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE'))
+
+    # 作り直すもの: 主キー以外のインデックス定義、外部キー、id のシーケンス
+    index_defs = (
+        (
+            await conn.execute(
+                text(
+                    "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+                    "WHERE indrelid = to_regclass(:t) AND NOT indisprimary"
+                ),
+                {"t": table},
+            )
+        )
+        .scalars()
+        .all()
+    )
+    foreign_keys = (
+        await conn.execute(
+            text(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = to_regclass(:t) AND contype = 'f'"
+            ),
+            {"t": table},
+        )
+    ).all()
+    pkey = (
+        await conn.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = to_regclass(:t) AND contype = 'p'"
+            ),
+            {"t": table},
+        )
+    ).scalar_one()
+    sequence = (
+        await conn.execute(
+            text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}
+        )
+    ).scalar_one()
+    oldest = (
+        await conn.execute(text(f'SELECT min(created_at) FROM "{table}"'))
+    ).scalar_one()
+
+    # 旧テーブルを退避 (主キーのインデックス名が新しい主キーとぶつからないよう改名)
+    await conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "{old}"'))
+    await conn.execute(
+        text(f'ALTER TABLE "{old}" RENAME CONSTRAINT "{pkey}" TO "{old}_pkey"')
+    )
+
+    await conn.execute(
+        text(
+            f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS) '
+            "PARTITION BY RANGE (created_at)"
+        )
+    )
+    await conn.execute(
+        text(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{pkey}" '
+            "PRIMARY KEY (id, created_at)"
+        )
+    )
+    if sequence is not None:
+        # 旧テーブルの DROP でシーケンスが消えないよう、所有者を新しい id 列に移す
+        await conn.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY "{table}".id'))
+
+    await conn.execute(
+        text(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+    )
+    current = month_start(now)
+    month = month_start(oldest) if oldest is not None else current
+    last = add_months(current, months_ahead)
+    while month <= last:
+        await conn.execute(
+            text(
+                f'CREATE TABLE "{partition_name(table, month)}" '
+                f'PARTITION OF "{table}" FOR VALUES {_bounds(month)}'
+            )
+        )
+        month = add_months(month, 1)
+
+    await conn.execute(text(f'INSERT INTO "{table}" SELECT * FROM "{old}"'))
+    await conn.execute(text(f'DROP TABLE "{old}"'))
+
+    # インデックスは行を入れた後に作る方が速い。親に作ると各パーティションにも作られる
+    for index_def in index_defs:
+        await conn.execute(text(index_def))
+    for name, definition in foreign_keys:
+        await conn.execute(
+            text(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        )
+    await conn.execute(text(f'ANALYZE "{table}"'))
+    logger.info("Converted %s to monthly range partitions", table)
+    return True
+
+
+async def _main(tables: list[str]) -> None:
+    from src.database.engine import engine
+
+    now = datetime.now(UTC)
+    for table in tables:
+        async with engine.begin() as conn:
+            converted = await convert_to_partitioned(conn, table, now=now)
+        print(f"{table}: {'converted' if converted else 'already partitioned'}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    # Usage: python -m src.database.partitioning [table ...]
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(sys.argv[1:] or list(PARTITIONED_LOG_TABLES)))
@@ -0,0 +1,269 @@
+"""Connection pool telemetry and adaptive checkout limiting.
+
+SQLAlchemy の接続プールに、接続の取得待ち時間などの計測と、
+同時接続数を上限内で増減させる適応モードを加える。
+
+仕組み:
+  - ``InstrumentedAsyncPool`` は ``AsyncAdaptedQueuePool`` の接続取得
+    (``_do_get``) にかかった時間を ``PoolStats`` のヒストグラムに積み、
+    タイムアウトと接続の作成失敗を数える
+  - 適応モードでは ``ConnectionLimiter`` をプールに取り付け、接続を取る前に
+    許可を取る (返却時に戻す)。許可の数 ``limit`` が実効的な同時接続数になる
+  - ``limit`` は ``DB_POOL_SIZE`` から始め、許可待ちが発生するたびに 1 ずつ
+    増やす (上限は ``DB_POOL_MAX_CONNECTIONS``)。接続の作成に失敗したら半分に
+    減らし、``DB_POOL_LIMIT_BACKOFF_SECONDS`` の間は増やさない。
+    待ちがなく使用数が半分を下回ったら、開始値まで 1 ずつ戻す
+  - 許可待ちは先着順で ``DB_POOL_QUEUE_TIMEOUT`` 秒まで待つ。
+    バーストはプールのタイムアウトで一斉にエラーになる代わりに順番に処理される
+
+Heroku の 20 接続制限を Bot と Web で分け合う構成では、片方が接続を
+使い切ったときにもう片方の接続作成が失敗する。適応モードはそれを
+``limit`` の縮小で吸収する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+from sqlalchemy.util import await_only
+
+from src.constants import DB_POOL_LIMIT_BACKOFF_SECONDS, DB_POOL_WAIT_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """接続プールの累積値 (取得待ち時間のヒストグラム・タイムアウト・接続エラー)。
+
+    Args:
+        buckets: 取得待ち時間のバケット上限 (秒, 昇順)
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DB_POOL_WAIT_BUCKETS) -> None:
+        self.buckets = buckets
+        # counts[i] は buckets[i] 以下、最後の要素は最大バケットを超えた件数
+        self.counts = [0] * (len(buckets) + 1)
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.connect_errors = 0
+
+    def observe_wait(self, elapsed: float) -> None:
+        """1 回の接続取得にかかった時間を記録する。"""
+        self.counts[bisect.bisect_left(self.buckets, elapsed)] += 1
+        self.checkouts += 1
+        self.wait_seconds += elapsed
+        self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.wait_seconds / self.checkouts if self.checkouts else 0.0
+
+
+class ConnectionLimiter:
+    """同時接続数を ``limit`` に抑える、上限付きで増減する許可の管理。
+
+    Args:
+        initial: 開始時 (および待ちがないときに戻す) の limit
+        maximum: limit の上限 (DB 側の接続数制限に合わせる)
+        timeout: 許可を待つ最大秒数
+        backoff_seconds: 縮小後、再び増やし始めるまでの秒数
+        clock: 現在時刻 (秒) を返す関数 (テスト用)
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        maximum: int,
+        *,
+        timeout: float,
+        backoff_seconds: float = DB_POOL_LIMIT_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base = max(1, min(initial, maximum))
+        self.maximum = max(1, maximum)
+        self.limit = self.base
+        self.timeout = timeout
+        self.in_use = 0
+        self._backoff_seconds = backoff_seconds
+        self._clock = clock
+        self._last_shrink: float | None = None
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """許可を待っている数。"""
+        return sum(1 for w in self._waiters if not w.done())
+
+    def try_acquire(self) -> bool:
+        """待たずに許可を取れれば取る。"""
+        if self.in_use < self.limit and not self.waiting:
+            self.in_use += 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """許可を取る。空きがなければ先着順で待つ。
+
+        Raises:
+            TimeoutError: timeout 秒以内に許可を取れなかった場合
+        """
+        if self.try_acquire():
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        # 待ちが発生した = 需要が limit を超えている
+        self._grow()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except BaseException:
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+            # 許可が渡された直後にキャンセル・タイムアウトした場合は返す
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """許可を返し、待っている次の取得者に渡す。"""
+        self.in_use = max(0, self.in_use - 1)
+        if (
+            not self.waiting
+            and self.limit > self.base
+            and self.in_use < self.limit // 2
+        ):
+            self.limit -= 1
+        self._wake()
+
+    def shrink(self) -> None:
+        """limit を半分にする (接続の作成に失敗したとき)。"""
+        self._last_shrink = self._clock()
+        new_limit = max(1, self.limit // 2)
+        if new_limit < self.limit:
+            logger.warning(
+                "DB pool limit lowered %d -> %d after a connection failure",
+                self.limit,
+                new_limit,
+            )
+            self.limit = new_limit
+
+    def _grow(self) -> None:
+        if self.limit >= self.maximum:
+            return
+        if (
+            self._last_shrink is not None
+            and self._clock() - self._last_shrink < self._backoff_seconds
+        ):
+            return
+        self.limit += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_use += 1
+            waiter.set_result(None)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """取得待ち時間を計測し、limiter があれば接続の取得を制限するプール。
+
+    ``create_async_engine(..., poolclass=InstrumentedAsyncPool)`` で使い、
+    適応モードでは作成後に ``limiter`` を設定する。
+    ``engine.dispose()`` で作り直されたプールにも stats と limiter を引き継ぐ。
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.limiter: ConnectionLimiter | None = None
+
+    def recreate(self) -> InstrumentedAsyncPool:
+        pool = super().recreate()
+        assert isinstance(pool, InstrumentedAsyncPool)
+        pool.stats = self.stats
+        pool.limiter = self.limiter
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        limiter = self.limiter
+        if limiter is not None and not limiter.try_acquire():
+            try:
+                # _do_get は greenlet 内で同期的に呼ばれるため await_only で待つ
+                await_only(limiter.acquire())
+            except TimeoutError:
+                self.stats.timeouts += 1
+                raise exc.TimeoutError(
+                    f"DB pool limit of {limiter.limit} reached, "
+                    f"connection timed out, timeout {limiter.timeout:.2f}"
+                ) from None
+
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            if limiter is not None:
+                limiter.release()
+            raise
+        except Exception:
+            self.stats.connect_errors += 1
+            if limiter is not None:
+                limiter.release()
+                limiter.shrink()
+            raise
+        except BaseException:
+            if limiter is not None:
+                limiter.release()
+            raise
+        self.stats.observe_wait(time.perf_counter() - started)
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        try:
+            super()._do_return_conn(record)
+        finally:
+            if self.limiter is not None:
+                self.limiter.release()
+
+
+def instrumented_pool(engine: AsyncEngine) -> InstrumentedAsyncPool | None:
+    """エンジンのプールが InstrumentedAsyncPool ならそれを返す。"""
+    pool = engine.sync_engine.pool
+    return pool if isinstance(pool, InstrumentedAsyncPool) else None
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any] | None:
+    """プールの現在の状態と累積値を返す (ヘルスチェック用)。"""
+    pool = instrumented_pool(engine)
+    if pool is None:
+        return None
+    stats = pool.stats
+    status: dict[str, Any] = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": stats.checkouts,
+        "mean_wait_ms": round(stats.mean_wait_seconds * 1000, 3),
+        "max_wait_ms": round(stats.max_wait_seconds * 1000, 3),
+        "timeouts": stats.timeouts,
+        "connect_errors": stats.connect_errors,
+    }
+    if pool.limiter is not None:
+        status["limit"] = pool.limiter.limit
+        status["max_connections"] = pool.limiter.maximum
+        status["waiting"] = pool.limiter.waiting
+    return status
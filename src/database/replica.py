@@ -0,0 +1,149 @@
+"""Read replica health and lag tracking.
+
+読み取り専用の処理をリードレプリカに振り分けるかどうかを判断する。
+レプリカのエンジンとセッションの振り分け自体は :func:`src.database.engine.read_session`
+が行い、このモジュールはレプリカが「使える状態か」だけを管理する。
+
+仕組み:
+  - ``ReplicaMonitor.usable()`` はレプリカに接続して遅延 (最後に適用した
+    トランザクションからの経過秒数) を測り、``max_lag_seconds`` 以下なら使える
+    と判断する。結果は ``DB_READ_REPLICA_CHECK_INTERVAL_SECONDS`` の間
+    使い回すため、確認のクエリは読み取りのたびには走らない
+  - 接続できない・確認が ``DB_READ_REPLICA_CHECK_TIMEOUT_SECONDS`` 以内に
+    終わらない・遅延が大きい場合は使えないと判断し、呼び出し側はプライマリを使う
+  - 読み取り中に接続エラーが起きたら ``mark_down()`` で使えない状態にし、
+    次の確認までプライマリに戻す
+  - WAL receiver がストリーミング中 (``pg_stat_wal_receiver.status =
+    'streaming'``) でなければ、プライマリとの差が測れないので使えないと判断する。
+    status は ``pg_read_all_stats`` (または ``pg_monitor``) を持つロールにしか
+    見えないため、レプリカの接続ユーザーにはこのロールを付けること
+  - ストリーミング中で WAL をすべて適用済み (受信位置 = 適用位置) のときは、
+    書き込みがなく最後のトランザクションが古いだけなので遅延 0 とみなす。
+    レプリカでないサーバー (開発環境でプライマリを指定した場合など) も 0 になる
+
+レプリカの内容は最大で ``max_lag_seconds`` 秒古い。直前の書き込みを
+読み直す必要がある処理 (変更通知によるキャッシュの再読み込みや、
+書き込みと同じリクエスト内の読み取り) はプライマリを使うこと。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.constants import (
+    DB_READ_REPLICA_CHECK_INTERVAL_SECONDS,
+    DB_READ_REPLICA_CHECK_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# レプリカの遅延 (秒)。レプリカでないサーバーと、ストリーミング中で WAL を
+# 適用し終えたレプリカは 0。WAL receiver がストリーミング中でなければ NULL
+# (受信が止まっていると受信位置 = 適用位置でも遅れていないとは言えない)
+_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN NOT EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaMonitor:
+    """リードレプリカが使えるか (接続でき、遅延が許容範囲か) を判断する。
+
+    Args:
+        engine: レプリカのエンジン
+        max_lag_seconds: 使える遅延の上限 (秒)
+        check_interval: 確認結果を使い回す秒数
+        check_timeout: 確認 (接続とクエリ) の最大秒数
+        clock: 現在時刻 (秒) を返す関数 (テスト用)
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        max_lag_seconds: float,
+        check_interval: float = DB_READ_REPLICA_CHECK_INTERVAL_SECONDS,
+        check_timeout: float = DB_READ_REPLICA_CHECK_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.lag_seconds: float | None = None
+        self._clock = clock
+        self._usable = False
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def usable(self) -> bool:
+        """レプリカを使ってよいかを返す (必要なら遅延を測り直す)。"""
+        if self._is_fresh():
+            return self._usable
+        async with self._lock:
+            # 待っている間に他のタスクが確認を終えていればその結果を使う
+            if not self._is_fresh():
+                await self._check()
+        return self._usable
+
+    def mark_down(self) -> None:
+        """レプリカを次の確認まで使えない状態にする (読み取り中の接続エラー時)。"""
+        self._set_usable(False, "connection error")
+        self._checked_at = self._clock()
+
+    def status(self) -> dict[str, Any]:
+        """最後の確認結果を返す (ヘルスチェック用)。"""
+        return {
+            "usable": self._usable,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and self._clock() - self._checked_at < self.check_interval
+        )
+
+    async def _check(self) -> None:
+        try:
+            lag = await asyncio.wait_for(self._measure_lag(), self.check_timeout)
+        except (OSError, TimeoutError, exc.SQLAlchemyError) as e:
+            self.lag_seconds = None
+            self._set_usable(False, f"{type(e).__name__}: {e}")
+        else:
+            self.lag_seconds = lag
+            if lag is None:
+                self._set_usable(False, "WAL receiver is not streaming")
+            elif lag > self.max_lag_seconds:
+                self._set_usable(False, f"lag {lag:.1f}s")
+            else:
+                self._set_usable(True, "")
+        self._checked_at = self._clock()
+
+    async def _measure_lag(self) -> float | None:
+        """遅延 (秒) を返す。ストリーミング中でないレプリカは None。"""
+        async with self.engine.connect() as conn:
+            lag = (await conn.execute(_LAG_SQL)).scalar_one()
+        return None if lag is None else float(lag)
+
+    def _set_usable(self, usable: bool, reason: str) -> None:
+        # 状態が変わったときだけログに出す
+        if usable and not self._usable and self._checked_at is not None:
+            logger.info("Read replica is back, routing reads to it")
+        elif not usable and (self._usable or self._checked_at is None):
+            logger.warning("Read replica unavailable (%s), using primary", reason)
+        self._usable = usable
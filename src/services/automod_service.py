@@ -27,6 +27,7 @@ __all__ = [
     "get_all_automod_configs",
     "get_all_automod_logs",
     "get_all_automod_rules",
+    "get_all_enabled_automod_rules",
     "get_automod_config",
     "get_automod_logs_by_guild",
     "get_automod_rule",
@@ -82,6 +83,18 @@ async def get_enabled_automod_rules_by_guild(
     return list(result.scalars().all())
 
 
+async def get_all_enabled_automod_rules(
+    session: AsyncSession,
+) -> list[AutoModRule]:
+    """全サーバーの有効な automod ルールを取得する (ルールキャッシュ構築用)。"""
+    result = await session.execute(
+        select(AutoModRule)
+        .where(AutoModRule.is_enabled.is_(True))
+        .order_by(AutoModRule.guild_id, AutoModRule.id)
+    )
+    return list(result.scalars().all())
+
+
 async def get_automod_rule(session: AsyncSession, rule_id: int) -> AutoModRule | None:
     """ルール ID から automod ルールを取得する。"""
     result = await session.execute(select(AutoModRule).where(AutoModRule.id == rule_id))
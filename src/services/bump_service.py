@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, func, select, update
 from sqlalchemy import or_ as db_or
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,6 +17,7 @@ __all__ = [
     "get_bump_config",
     "get_bump_reminder",
     "get_due_bump_reminders",
+    "get_next_bump_reminder_at",
     "toggle_bump_reminder",
     "update_bump_reminder_role",
     "upsert_bump_config",
@@ -128,6 +129,24 @@ async def get_due_bump_reminders(
     return list(result.scalars().all())
 
 
+async def get_next_bump_reminder_at(session: AsyncSession) -> datetime | None:
+    """次に送信予定の有効な bump リマインダーの時刻を取得する。
+
+    Args:
+        session: DB セッション
+
+    Returns:
+        is_enabled = True のリマインダーの最も早い remind_at (なければ None)
+    """
+    result = await session.execute(
+        select(func.min(BumpReminder.remind_at)).where(
+            BumpReminder.remind_at.isnot(None),
+            BumpReminder.is_enabled.is_(True),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
 async def clear_bump_reminder(session: AsyncSession, reminder_id: int) -> bool:
     """bump リマインダーの remind_at をアトミックにクリアする。
 
@@ -1,20 +1,34 @@
 """ChatRole の DB 操作。"""
 
+from collections.abc import Mapping
 from datetime import datetime
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import (
+    Integer,
+    String,
+    column,
+    delete,
+    false,
+    func,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import ChatRoleConfig, ChatRoleProgress
 
 __all__ = [
+    "add_chat_role_progress_counts",
     "create_chat_role_config",
     "delete_chat_role_config",
     "get_chat_role_configs",
+    "get_chat_role_progress",
     "get_enabled_chat_role_channel_ids",
     "get_enabled_chat_role_configs_for_channel",
     "get_expired_chat_role_progress",
+    "get_next_chat_role_expiry",
     "increment_chat_role_progress",
     "mark_chat_role_progress_expired",
     "mark_chat_role_progress_granted",
@@ -120,6 +134,18 @@ async def toggle_chat_role_config(
 # =============================================================================
 
 
+async def get_chat_role_progress(
+    session: AsyncSession, config_id: int, user_id: str
+) -> ChatRoleProgress | None:
+    """(config_id, user_id) の Progress を取得する (なければ None)。"""
+    stmt = select(ChatRoleProgress).where(
+        ChatRoleProgress.config_id == config_id,
+        ChatRoleProgress.user_id == user_id,
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
 async def increment_chat_role_progress(
     session: AsyncSession, config_id: int, user_id: str
 ) -> ChatRoleProgress | None:
@@ -138,7 +164,7 @@ async def increment_chat_role_progress(
         .values(config_id=config_id, user_id=user_id, count=1, granted=False)
         .on_conflict_do_update(
             index_elements=["config_id", "user_id"],
-            set_={"count": ChatRoleProgress.count + 1},
+            set_={"count": ChatRoleProgress.count + 1, "updated_at": func.now()},
             where=ChatRoleProgress.granted.is_(False),
         )
         .returning(ChatRoleProgress)
@@ -149,6 +175,49 @@ async def increment_chat_role_progress(
     return progress
 
 
+async def add_chat_role_progress_counts(
+    session: AsyncSession, deltas: Mapping[tuple[int, str], int]
+) -> list[ChatRoleProgress]:
+    """複数ユーザーの投稿カウントをまとめて加算する (granted=False のみ)。
+
+    ``(config_id, user_id) → 加算数`` を 1 つの
+    ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` で反映する。
+    挙動は increment_chat_role_progress と同じで、granted=True のレコードは
+    更新せず戻り値にも含まれない。SELECT 側で ChatRoleConfig と JOIN するため、
+    バッファ中に削除された設定の分は FK 違反にならず黙って捨てられる。
+
+    Returns:
+        更新 (または作成) された Progress のリスト。
+    """
+    if not deltas:
+        return []
+
+    rows = values(
+        column("config_id", Integer),
+        column("user_id", String),
+        column("delta", Integer),
+        name="deltas",
+    ).data([(config_id, user_id, n) for (config_id, user_id), n in deltas.items()])
+    source = select(rows.c.config_id, rows.c.user_id, rows.c.delta, false()).join(
+        ChatRoleConfig, ChatRoleConfig.id == rows.c.config_id
+    )
+    insert_stmt = pg_insert(ChatRoleProgress).from_select(
+        ["config_id", "user_id", "count", "granted"], source
+    )
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=["config_id", "user_id"],
+        set_={
+            "count": ChatRoleProgress.count + insert_stmt.excluded.count,
+            "updated_at": func.now(),
+        },
+        where=ChatRoleProgress.granted.is_(False),
+    ).returning(ChatRoleProgress)
+    result = await session.execute(stmt)
+    progresses = list(result.scalars().all())
+    await session.commit()
+    return progresses
+
+
 async def mark_chat_role_progress_granted(
     session: AsyncSession,
     progress_id: int,
@@ -191,6 +260,15 @@ async def get_expired_chat_role_progress(
     return [(p, c) for p, c in result.all()]
 
 
+async def get_next_chat_role_expiry(session: AsyncSession) -> datetime | None:
+    """付与済み Progress の最も早い有効期限を取得する (なければ None)。"""
+    stmt = select(func.min(ChatRoleProgress.expires_at)).where(
+        ChatRoleProgress.granted.is_(True)
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
 async def mark_chat_role_progress_expired(
     session: AsyncSession, progress_id: int
 ) -> bool:
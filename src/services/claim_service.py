@@ -0,0 +1,211 @@
+"""イベント claim (マルチインスタンス重複防止) のバックエンド。
+
+複数インスタンスが同じ Discord Gateway イベントを受信した際に、
+1 インスタンスだけが処理を実行するための claim ストア。
+``CLAIM_BACKEND`` 設定でバックエンドを切り替える。
+
+- ``memory``: プロセス内の TTL 付き辞書。DB に一切書き込まない
+  (シングルインスタンス構成向け)
+- ``postgres``: UNLOGGED テーブル ``processed_events`` への
+  ``INSERT ... ON CONFLICT`` (マルチインスタンス構成向け、デフォルト)
+
+どちらも ``claim_event(event_key)`` が True を返したインスタンスだけが
+処理を続行する、という同じ契約を持つ。
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.constants import CLAIM_TTL_SECONDS, RETENTION_BATCH_SIZE
+from src.database.models import ProcessedEvent
+
+__all__ = [
+    "ClaimStore",
+    "MemoryClaimStore",
+    "PostgresClaimStore",
+    "claim_event",
+    "cleanup_expired_events",
+    "create_claim_store",
+    "get_claim_store",
+    "set_claim_store",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimStore(ABC):
+    """claim ストアの基底クラス。"""
+
+    def __init__(self, ttl_seconds: int = CLAIM_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def claim(self, event_key: str) -> bool:
+        """イベントをアトミックに claim する。
+
+        Args:
+            event_key: イベントを一意に識別するキー。
+
+        Returns:
+            True: このインスタンスが claim に成功 (処理を続行すべき)。
+            False: 既に claim 済み (処理をスキップすべき)。
+        """
+
+    @abstractmethod
+    async def cleanup(self) -> int:
+        """TTL を過ぎた claim を削除し、削除件数を返す。"""
+
+
+class MemoryClaimStore(ClaimStore):
+    """プロセス内の TTL 付き claim ストア (シングルインスタンス用)。
+
+    event_key → 有効期限 (time.monotonic) の辞書で管理する。
+    期限切れのキーは再 claim でき、cleanup で削除される。
+    """
+
+    def __init__(self, ttl_seconds: int = CLAIM_TTL_SECONDS) -> None:
+        super().__init__(ttl_seconds)
+        self._expires_at: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    async def claim(self, event_key: str) -> bool:
+        now = time.monotonic()
+        expires_at = self._expires_at.get(event_key)
+        if expires_at is not None and expires_at > now:
+            return False
+        self._expires_at[event_key] = now + self.ttl_seconds
+        return True
+
+    async def cleanup(self) -> int:
+        now = time.monotonic()
+        expired = [k for k, exp in self._expires_at.items() if exp <= now]
+        for key in expired:
+            del self._expires_at[key]
+        return len(expired)
+
+
+class PostgresClaimStore(ClaimStore):
+    """UNLOGGED テーブルを使う claim ストア (マルチインスタンス用)。
+
+    ``INSERT ... ON CONFLICT (event_key) DO UPDATE ... WHERE 期限切れ``
+    の 1 文で判定するため、IntegrityError もロールバックも発生しない。
+    呼び出し側のトランザクションとは独立した短いセッションで実行する。
+    テーブルは UNLOGGED のため WAL を書かない (クラッシュ時に内容が
+    消えるが、claim は短命なので問題ない)。
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        ttl_seconds: int = CLAIM_TTL_SECONDS,
+    ) -> None:
+        super().__init__(ttl_seconds)
+        self._session_factory = session_factory
+
+    async def claim(self, event_key: str) -> bool:
+        now = datetime.now(UTC)
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        insert_stmt = pg_insert(ProcessedEvent).values(
+            event_key=event_key, created_at=now
+        )
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["event_key"],
+            set_={"created_at": insert_stmt.excluded.created_at},
+            # 期限切れ (cleanup 前) のキーだけ再 claim できる
+            where=ProcessedEvent.created_at < cutoff,
+        ).returning(ProcessedEvent.id)
+
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            claimed = result.scalar_one_or_none() is not None
+            await session.commit()
+        return claimed
+
+    async def cleanup(self) -> int:
+        # 溜まった claim を 1 文で消すと長いロックになるため、
+        # RETENTION_BATCH_SIZE 件ずつ別トランザクションで削除する
+        cutoff = datetime.now(UTC) - timedelta(seconds=self.ttl_seconds)
+        batch = (
+            select(ProcessedEvent.id)
+            .where(ProcessedEvent.created_at < cutoff)
+            .limit(RETENTION_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        stmt = delete(ProcessedEvent).where(ProcessedEvent.id.in_(batch))
+        total = 0
+        while True:
+            async with self._session_factory() as session:
+                result = await session.execute(stmt)
+                await session.commit()
+            deleted = int(result.rowcount)  # type: ignore[attr-defined]
+            total += deleted
+            if deleted < RETENTION_BATCH_SIZE:
+                return total
+
+
+def create_claim_store(backend: str) -> ClaimStore:
+    """設定名から claim ストアを作成する。
+
+    Args:
+        backend: ``"memory"`` または ``"postgres"``。
+
+    Raises:
+        ValueError: 未知のバックエンド名の場合。
+    """
+    if backend == "memory":
+        return MemoryClaimStore()
+    if backend == "postgres":
+        from src.database.engine import async_session
+
+        return PostgresClaimStore(async_session)
+    raise ValueError(f"Unknown claim backend: {backend!r}")
+
+
+_store: ClaimStore | None = None
+
+
+def get_claim_store() -> ClaimStore:
+    """設定 (CLAIM_BACKEND) に応じた共有 claim ストアを返す。"""
+    global _store
+    if _store is None:
+        _store = create_claim_store(settings.claim_backend)
+        logger.info("Using %s claim backend", settings.claim_backend)
+    return _store
+
+
+def set_claim_store(store: ClaimStore | None) -> None:
+    """共有 claim ストアを差し替える (None で次回アクセス時に再作成)。"""
+    global _store
+    _store = store
+
+
+async def claim_event(event_key: str) -> bool:
+    """イベントをアトミックに claim する。
+
+    Args:
+        event_key: イベントを一意に識別するキー。
+
+    Returns:
+        True: このインスタンスが claim に成功 (処理を続行すべき)。
+        False: 別インスタンスが既に claim 済み (処理をスキップすべき)。
+    """
+    return await get_claim_store().claim(event_key)
+
+
+async def cleanup_expired_events() -> int:
+    """期限切れの claim を削除する。
+
+    Returns:
+        削除された claim 数。
+    """
+    return await get_claim_store().cleanup()
@@ -4,10 +4,12 @@ from src.services.auto_reaction_service import *  # noqa: F401,F403
 from src.services.automod_service import *  # noqa: F401,F403
 from src.services.bump_service import *  # noqa: F401,F403
 from src.services.chatrole_service import *  # noqa: F401,F403
+from src.services.claim_service import *  # noqa: F401,F403
 from src.services.common_service import *  # noqa: F401,F403
 from src.services.discord_cache_service import *  # noqa: F401,F403
 from src.services.joinrole_service import *  # noqa: F401,F403
 from src.services.lobby_service import *  # noqa: F401,F403
+from src.services.retention_service import *  # noqa: F401,F403
 from src.services.role_panel_service import *  # noqa: F401,F403
 from src.services.sticky_service import *  # noqa: F401,F403
 from src.services.ticket_service import *  # noqa: F401,F403
@@ -1,11 +1,20 @@
 """DiscordRole, DiscordGuild, DiscordChannel の DB 操作。"""
 
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import TypedDict
+
 from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import DiscordChannel, DiscordGuild, DiscordRole
 
 __all__ = [
+    "DiscordChannelRow",
+    "DiscordRoleRow",
+    "bulk_sync_discord_channels",
+    "bulk_sync_discord_roles",
     "delete_discord_channel",
     "delete_discord_channels_by_guild",
     "delete_discord_guild",
@@ -20,6 +29,25 @@ __all__ = [
 ]
 
 
+class DiscordRoleRow(TypedDict):
+    """bulk_sync_discord_roles に渡す 1 ロール分のデータ。"""
+
+    role_id: str
+    role_name: str
+    color: int
+    position: int
+
+
+class DiscordChannelRow(TypedDict):
+    """bulk_sync_discord_channels に渡す 1 チャンネル分のデータ。"""
+
+    channel_id: str
+    channel_name: str
+    channel_type: int
+    position: int
+    category_id: str | None
+
+
 # =============================================================================
 # DiscordRole (Discord ロールキャッシュ) 操作
 # =============================================================================
@@ -76,6 +104,54 @@ async def upsert_discord_role(
     return role
 
 
+async def bulk_sync_discord_roles(
+    session: AsyncSession,
+    guild_id: str,
+    roles: Sequence[DiscordRoleRow],
+) -> int:
+    """サーバーの全ロール情報を一括で同期する。
+
+    1 つの INSERT ... ON CONFLICT DO UPDATE で全ロールを upsert し、
+    ``roles`` に含まれないロール (Discord 側で削除済み) を DELETE する。
+    コミットは最後に 1 回だけ行う。
+
+    Args:
+        session: DB セッション
+        guild_id: Discord サーバーの ID
+        roles: 同期するロールの一覧 (サーバーの全ロール)
+
+    Returns:
+        upsert したロール数
+    """
+    now = datetime.now(UTC)
+    role_ids = [r["role_id"] for r in roles]
+
+    if roles:
+        stmt = pg_insert(DiscordRole).values(
+            [{**r, "guild_id": guild_id, "updated_at": now} for r in roles]
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["guild_id", "role_id"],
+                set_={
+                    "role_name": stmt.excluded.role_name,
+                    "color": stmt.excluded.color,
+                    "position": stmt.excluded.position,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    await session.execute(
+        delete(DiscordRole).where(
+            DiscordRole.guild_id == guild_id,
+            DiscordRole.role_id.not_in(role_ids),
+        )
+    )
+    await session.commit()
+    return len(roles)
+
+
 async def delete_discord_role(
     session: AsyncSession,
     guild_id: str,
@@ -303,6 +379,55 @@ async def upsert_discord_channel(
     return channel
 
 
+async def bulk_sync_discord_channels(
+    session: AsyncSession,
+    guild_id: str,
+    channels: Sequence[DiscordChannelRow],
+) -> int:
+    """サーバーの全チャンネル情報を一括で同期する。
+
+    1 つの INSERT ... ON CONFLICT DO UPDATE で全チャンネルを upsert し、
+    ``channels`` に含まれないチャンネル (削除済み・閲覧不可) を DELETE する。
+    コミットは最後に 1 回だけ行う。
+
+    Args:
+        session: DB セッション
+        guild_id: Discord サーバーの ID
+        channels: 同期するチャンネルの一覧 (サーバーの同期対象全チャンネル)
+
+    Returns:
+        upsert したチャンネル数
+    """
+    now = datetime.now(UTC)
+    channel_ids = [c["channel_id"] for c in channels]
+
+    if channels:
+        stmt = pg_insert(DiscordChannel).values(
+            [{**c, "guild_id": guild_id, "updated_at": now} for c in channels]
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["guild_id", "channel_id"],
+                set_={
+                    "channel_name": stmt.excluded.channel_name,
+                    "channel_type": stmt.excluded.channel_type,
+                    "position": stmt.excluded.position,
+                    "category_id": stmt.excluded.category_id,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    await session.execute(
+        delete(DiscordChannel).where(
+            DiscordChannel.guild_id == guild_id,
+            DiscordChannel.channel_id.not_in(channel_ids),
+        )
+    )
+    await session.commit()
+    return len(channels)
+
+
 async def delete_discord_channel(
     session: AsyncSession,
     guild_id: str,
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import JoinRoleAssignment, JoinRoleConfig
@@ -16,6 +16,7 @@ __all__ = [
     "get_enabled_join_role_configs",
     "get_expired_join_role_assignments",
     "get_join_role_configs",
+    "get_next_join_role_expiry",
     "toggle_join_role_config",
 ]
 
@@ -165,6 +166,12 @@ async def get_expired_join_role_assignments(
     return list(result.scalars().all())
 
 
+async def get_next_join_role_expiry(session: AsyncSession) -> datetime | None:
+    """最も早い JoinRole 付与の有効期限を取得する (なければ None)。"""
+    result = await session.execute(select(func.min(JoinRoleAssignment.expires_at)))
+    return result.scalar_one_or_none()
+
+
 async def delete_join_role_assignment(
     session: AsyncSession, assignment_id: int
 ) -> bool:
@@ -0,0 +1,290 @@
+"""ログ系テーブルの保持期間 (retention) による削除・アーカイブ。
+
+仕組み:
+  - テーブルごとの保持日数は SiteSettings の ``retention_*_days`` 列で設定する
+    (None は無期限)。管理画面の設定ページから変更できる
+  - 期限切れの行は ``RETENTION_BATCH_SIZE`` 件ずつ、バッチごとに別の
+    トランザクションで処理する。1 文で大量に消すと行ロックと WAL が膨らみ、
+    Bot の書き込みを長く待たせるため。バッチの間は少し休んで接続を譲る
+  - automod_logs / ban_logs は ``retention_archive_logs`` が有効なら削除せずに
+    ``*_archive`` テーブルへ移す (``DELETE ... RETURNING`` を INSERT に渡す 1 文)
+  - automod_logs / ban_logs が月単位のパーティションに分割済み
+    (:mod:`src.database.partitioning`) なら、削除の前に期限より古い月の
+    パーティションを丸ごと DROP し、先の月のパーティションを補う
+  - tickets は行を残し、クローズ済みチケットの transcript だけを NULL にする
+  - chat_role_progress は未付与 (granted=False) で最後の投稿が古い行だけを削除する
+  - processed_events は claim の TTL で決まるため設定対象外
+    (:meth:`PostgresClaimStore.cleanup` が同じくバッチで削除する)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any, cast
+
+from sqlalchemy import (
+    ColumnElement,
+    Table,
+    and_,
+    delete,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.constants import RETENTION_BATCH_PAUSE_SECONDS, RETENTION_BATCH_SIZE
+from src.database import partitioning
+from src.database.models import (
+    AutoModIntroPost,
+    AutoModLog,
+    AutoModLogArchive,
+    BanLog,
+    BanLogArchive,
+    ChatRoleProgress,
+    SiteSettings,
+    Ticket,
+)
+from src.services.common_service import get_site_settings
+
+__all__ = [
+    "RetentionPolicy",
+    "get_retention_policy",
+    "run_retention",
+    "update_retention_policy",
+]
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """テーブルごとの保持日数 (None は無期限)。
+
+    各属性は SiteSettings の ``retention_<属性名>`` 列に対応する。
+    """
+
+    automod_logs_days: int | None = None
+    ban_logs_days: int | None = None
+    intro_posts_days: int | None = None
+    ticket_transcripts_days: int | None = None
+    chat_role_progress_days: int | None = None
+    archive_logs: bool = False
+
+    @classmethod
+    def from_site_settings(cls, site: SiteSettings | None) -> RetentionPolicy:
+        """SiteSettings から作る (レコードが無ければ全て無期限)。"""
+        if site is None:
+            return cls()
+        return cls(
+            **{f.name: getattr(site, f"retention_{f.name}") for f in fields(cls)}
+        )
+
+
+async def get_retention_policy(session: AsyncSession) -> RetentionPolicy:
+    """現在の保持期間の設定を取得する。"""
+    return RetentionPolicy.from_site_settings(await get_site_settings(session))
+
+
+async def update_retention_policy(
+    session: AsyncSession, policy: RetentionPolicy
+) -> SiteSettings:
+    """保持期間の設定を保存する (SiteSettings が無ければ作成する)。"""
+    site = await get_site_settings(session)
+    if site is None:
+        site = SiteSettings()
+        session.add(site)
+    for f in fields(policy):
+        setattr(site, f"retention_{f.name}", getattr(policy, f.name))
+    site.updated_at = datetime.now(UTC)
+    await session.commit()
+    return site
+
+
+# =============================================================================
+# バッチ処理
+# =============================================================================
+
+
+async def _run_batches(
+    session_factory: SessionFactory,
+    stmt: Any,
+    *,
+    batch_size: int,
+    pause: float,
+) -> int:
+    """stmt (1 回で最大 batch_size 行を処理する文) を処理件数が尽きるまで繰り返す。"""
+    total = 0
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        count = int(result.rowcount)  # type: ignore[attr-defined]
+        total += count
+        if count < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+def _batch_ids(model: Any, condition: ColumnElement[bool], batch_size: int) -> Any:
+    return select(model.id).where(condition).limit(batch_size).scalar_subquery()
+
+
+async def _prune_log_table(
+    session_factory: SessionFactory,
+    model: type[AutoModLog] | type[BanLog],
+    archive_model: type[AutoModLogArchive] | type[BanLogArchive],
+    cutoff: datetime,
+    *,
+    archive: bool,
+    now: datetime,
+    batch_size: int,
+    pause: float,
+) -> int:
+    """automod_logs / ban_logs の期限切れ行を削除 (またはアーカイブ) する。"""
+    table = model.__tablename__
+    dropped = 0
+    async with session_factory() as session:
+        conn = await session.connection()
+        if await partitioning.is_partitioned(conn, table):
+            await partitioning.ensure_partitions(conn, table, now=now)
+            if not archive:
+                # 丸ごと期限切れの月はパーティションの DROP で消す (行数は数えない)
+                dropped = len(
+                    await partitioning.drop_partitions_before(conn, table, cutoff)
+                )
+            await session.commit()
+
+    # created_at の条件は外側にも付け、パーティションの絞り込みを効かせる
+    expired = model.created_at < cutoff
+    where = and_(expired, model.id.in_(_batch_ids(model, expired, batch_size)))
+    if archive:
+        # WITH moved AS (DELETE ... RETURNING *) INSERT INTO <archive> SELECT ...
+        # データ変更を含む WITH は文の先頭に置く必要があるため add_cte で付ける
+        source = cast(Table, model.__table__)
+        columns = [c.name for c in source.columns]
+        moved = delete(source).where(where).returning(*source.c).cte("moved")
+        stmt: Any = (
+            insert(archive_model)
+            .from_select(columns, select(*(moved.c[name] for name in columns)))
+            .add_cte(moved)
+        )
+    else:
+        stmt = delete(model).where(where)
+    count = await _run_batches(
+        session_factory, stmt, batch_size=batch_size, pause=pause
+    )
+    if archive:
+        # 行を移し終えた古い月のパーティションは空なので、ここで片付ける
+        async with session_factory() as session:
+            conn = await session.connection()
+            if await partitioning.is_partitioned(conn, table):
+                await partitioning.drop_partitions_before(conn, table, cutoff)
+                await session.commit()
+    if dropped:
+        logger.info("Dropped %d expired partition(s) of %s", dropped, table)
+    return count
+
+
+async def run_retention(
+    session_factory: SessionFactory,
+    *,
+    now: datetime | None = None,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_BATCH_PAUSE_SECONDS,
+) -> dict[str, int]:
+    """設定された保持期間を過ぎた行を全テーブルについて処理する。
+
+    テーブルごとに独立して実行し、1 つが失敗しても残りは続ける。
+
+    Args:
+        session_factory: バッチごとに新しいセッションを作るファクトリ。
+        now: 基準時刻 (省略時は現在時刻)。
+        batch_size: 1 トランザクションで処理する最大行数。
+        pause: バッチの間に空ける秒数。
+
+    Returns:
+        テーブル名 → 削除・アーカイブ・クリアした行数
+        (パーティションの DROP で消えた行は含まない)。
+        保持期間が未設定のテーブルは含まない。
+    """
+    now = now or datetime.now(UTC)
+    async with session_factory() as session:
+        policy = await get_retention_policy(session)
+
+    def cutoff(days: int) -> datetime:
+        return now - timedelta(days=days)
+
+    batches = partial(_run_batches, session_factory, batch_size=batch_size, pause=pause)
+    prune_log_table = partial(
+        _prune_log_table,
+        session_factory,
+        archive=policy.archive_logs,
+        now=now,
+        batch_size=batch_size,
+        pause=pause,
+    )
+    jobs: dict[str, Callable[[], Awaitable[int]]] = {}
+    if policy.automod_logs_days is not None:
+        jobs["automod_logs"] = partial(
+            prune_log_table,
+            AutoModLog,
+            AutoModLogArchive,
+            cutoff(policy.automod_logs_days),
+        )
+    if policy.ban_logs_days is not None:
+        jobs["ban_logs"] = partial(
+            prune_log_table, BanLog, BanLogArchive, cutoff(policy.ban_logs_days)
+        )
+    if policy.intro_posts_days is not None:
+        expired = AutoModIntroPost.posted_at < cutoff(policy.intro_posts_days)
+        jobs["automod_intro_posts"] = partial(
+            batches,
+            delete(AutoModIntroPost).where(
+                AutoModIntroPost.id.in_(
+                    _batch_ids(AutoModIntroPost, expired, batch_size)
+                )
+            ),
+        )
+    if policy.ticket_transcripts_days is not None:
+        # ix_tickets_closed_at_with_transcript の部分インデックスと同じ条件
+        expired = and_(
+            Ticket.transcript.is_not(None),
+            Ticket.closed_at < cutoff(policy.ticket_transcripts_days),
+        )
+        jobs["tickets.transcript"] = partial(
+            batches,
+            update(Ticket)
+            .where(Ticket.id.in_(_batch_ids(Ticket, expired, batch_size)))
+            .values(transcript=None),
+        )
+    if policy.chat_role_progress_days is not None:
+        expired = and_(
+            ChatRoleProgress.granted.is_(False),
+            ChatRoleProgress.updated_at < cutoff(policy.chat_role_progress_days),
+        )
+        jobs["chat_role_progress"] = partial(
+            batches,
+            delete(ChatRoleProgress).where(
+                ChatRoleProgress.id.in_(
+                    _batch_ids(ChatRoleProgress, expired, batch_size)
+                ),
+                # バッチを選んだ後にカウントが増えた行は消さない
+                expired,
+            ),
+        )
+
+    results: dict[str, int] = {}
+    for name, job in jobs.items():
+        try:
+            results[name] = await job()
+        except Exception:
+            logger.exception("Retention failed for %s", name)
+    return results
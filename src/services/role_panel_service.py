@@ -15,6 +15,7 @@ __all__ = [
     "get_all_role_panels",
     "get_role_panel",
     "get_role_panel_by_message_id",
+    "get_role_panel_item",
     "get_role_panel_item_by_emoji",
     "get_role_panel_items",
     "get_role_panels_by_channel",
@@ -371,6 +372,22 @@ async def get_role_panel_items(
     return list(result.scalars().all())
 
 
+async def get_role_panel_item(
+    session: AsyncSession,
+    item_id: int,
+) -> RolePanelItem | None:
+    """アイテム ID からロールパネルアイテムを取得する。
+
+    Args:
+        session: DB セッション
+        item_id: アイテムの ID
+
+    Returns:
+        見つかった RolePanelItem、なければ None
+    """
+    return await session.get(RolePanelItem, item_id)
+
+
 async def get_role_panel_item_by_emoji(
     session: AsyncSession,
     panel_id: int,
@@ -34,6 +34,7 @@ __all__ = [
     "get_ticket_panels_by_guild",
     "get_tickets_by_guild",
     "remove_ticket_panel_category",
+    "set_ticket_transcript",
     "update_ticket_panel",
     "update_ticket_status",
 ]
@@ -400,3 +401,25 @@ async def update_ticket_status(
         ticket.channel_id = channel_id  # type: ignore[assignment]
     await session.commit()
     return ticket
+
+
+async def set_ticket_transcript(
+    session: AsyncSession,
+    ticket: Ticket,
+    *,
+    message_count: int,
+    channel_id: str | None = None,
+    message_id: str | None = None,
+    text: str | None = None,
+) -> Ticket:
+    """チケットのトランスクリプトの保存先を記録する。
+
+    クローズログに添付した場合は channel_id / message_id に参照を、
+    添付できなかった場合は text に本文を渡す。
+    """
+    ticket.transcript_message_count = message_count
+    ticket.transcript_channel_id = channel_id
+    ticket.transcript_message_id = message_id
+    ticket.transcript = text
+    await session.commit()
+    return ticket
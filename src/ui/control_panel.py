@@ -4,7 +4,8 @@
 オーナーがチャンネルの設定を変更するためのボタン・モーダル・セレクトメニューを提供する。
 
 UI の構成:
-  - ControlPanelView: メインのボタン群 (永続 View)
+  - ControlPanelView: メインのボタン群
+  - ControlPanelButton: パネルのボタン操作を受け付ける DynamicItem
   - Modal: テキスト入力フォーム (名前変更、人数制限)
   - SelectView: ドロップダウン選択 (譲渡、キック、ブロック、許可等)
 
@@ -20,11 +21,11 @@ discord.py の UI コンポーネント:
 import asyncio
 import contextlib
 import logging
+import re
 import time
-from typing import Any
+from typing import Any, Self
 
 import discord
-from discord.ext import commands
 
 from src.constants import DEFAULT_EMBED_COLOR
 from src.core.permissions import is_owner
@@ -217,10 +218,7 @@ async def refresh_panel_embed(
                 )
 
 
-async def repost_panel(
-    channel: discord.VoiceChannel,
-    bot: commands.Bot,
-) -> None:
+async def repost_panel(channel: discord.VoiceChannel) -> None:
     """旧パネルを削除し、新しいパネルを送信する。
 
     refresh_panel_embed() が既存メッセージを edit で更新するのに対し、
@@ -261,7 +259,6 @@ async def repost_panel(
             voice_session.is_hidden,
             channel.nsfw,
         )
-        bot.add_view(view)
         try:
             await channel.send(embed=embed, view=view)
             logger.debug("Reposted panel in channel %s", channel.id)
@@ -512,7 +509,7 @@ class TransferSelectMenu(discord.ui.Select[Any]):
             await channel.send(f"👑 {old} → {new} にオーナーが譲渡されました。")
 
             # パネルを再投稿 (旧パネル削除 → 新パネル送信 + ピン留め)
-            await repost_panel(channel, interaction.client)  # type: ignore[arg-type]
+            await repost_panel(channel)
 
 
 class KickSelectView(discord.ui.View):
@@ -960,8 +957,9 @@ class ControlPanelView(discord.ui.View):
       Row 3: [譲渡] [キック] [解散]
       Row 4: [ブロック] [許可] [カメラ禁止] [カメラ許可]
 
-    timeout=None: タイムアウトなし (永続 View)。
-    custom_id: Bot 再起動後もボタンを識別するための固定 ID。
+    custom_id はどのパネルでも同じ固定 ID。クリックは ControlPanelButton が
+    受け付け、その都度この View を作ってボタンの処理を呼ぶため、
+    この View 自体は View ストアに登録しない (is_dispatchable 参照)。
     """
 
     def __init__(
@@ -971,27 +969,41 @@ class ControlPanelView(discord.ui.View):
         is_hidden: bool = False,
         is_nsfw: bool = False,
     ) -> None:
-        # timeout=None で永続 View にする (タイムアウトしない)
         super().__init__(timeout=None)
+        self._apply_state(session_id, is_locked, is_hidden, is_nsfw)
+
+    def _apply_state(
+        self, session_id: int, is_locked: bool, is_hidden: bool, is_nsfw: bool
+    ) -> None:
+        """現在の状態に応じてボタンのラベルと絵文字を切り替える。"""
         self.session_id = session_id
+        self.lock_button.label = "解除" if is_locked else "ロック"
+        self.lock_button.emoji = "🔓" if is_locked else "🔒"
+        self.hide_button.label = "表示" if is_hidden else "非表示"
+        self.hide_button.emoji = "👁️" if is_hidden else "🙈"
+        self.nsfw_button.label = "制限解除" if is_nsfw else "年齢制限"
 
-        # 現在の状態に応じてボタンのラベルと絵文字を切り替える
-        if is_locked:
-            self.lock_button.label = "解除"
-            self.lock_button.emoji = "🔓"
+    def is_dispatchable(self) -> bool:
+        """送信・編集時に View ストアへ登録させない。
 
-        if is_hidden:
-            self.hide_button.label = "表示"
-            self.hide_button.emoji = "👁️"
+        チャンネルごとに View を登録するとセッション数に比例してメモリが
+        増えるため、ボタンの処理は ControlPanelButton にまとめている。
+        """
+        return False
 
-        if is_nsfw:
-            self.nsfw_button.label = "制限解除"
+    def button_for(self, custom_id: str) -> discord.ui.Button[Any] | None:
+        """custom_id に対応するボタンを返す。"""
+        for child in self.children:
+            if isinstance(child, discord.ui.Button) and child.custom_id == custom_id:
+                return child
+        return None
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """全ボタン共通の権限チェック。オーナーのみ操作可能。
 
-        discord.py が各ボタンのコールバック前に自動で呼ぶ。
-        False を返すとコールバックが実行されない。
+        ControlPanelButton がボタンの処理の前に呼ぶ。
+        False を返すとボタンの処理は実行されない。
+        True のときは DB のセッションとチャンネルの状態を View に反映する。
         """
         # クールダウンチェック (連打対策)
         if interaction.channel_id and is_control_panel_on_cooldown(
@@ -1020,6 +1032,14 @@ class ControlPanelView(discord.ui.View):
                 )
                 return False
 
+        # NSFW 状態は DB に保存していないため、チャンネルから取得する
+        channel = interaction.channel
+        self._apply_state(
+            voice_session.id,
+            voice_session.is_locked,
+            voice_session.is_hidden,
+            isinstance(channel, discord.VoiceChannel) and channel.nsfw,
+        )
         return True
 
     # =========================================================================
@@ -1524,3 +1544,40 @@ class ControlPanelView(discord.ui.View):
             view=view,
             ephemeral=True,
         )
+
+
+class ControlPanelButton(
+    discord.ui.DynamicItem[discord.ui.Button[Any]],
+    template=(
+        r"(?P<name>rename|limit|bitrate|region|lock|hide|nsfw"
+        r"|transfer|kick|dissolve|block|allow|camera)_button"
+    ),
+):
+    """コントロールパネルのボタン操作を受け付ける DynamicItem。
+
+    パネルの custom_id はチャンネルに依存しない固定 ID なので、
+    このテンプレートを 1 つ登録するだけで全パネルのボタンが動作する。
+    クリックのたびに ControlPanelView を作り、オーナーチェックで
+    DB から状態を読み込んでから該当ボタンの処理を呼ぶ。
+    """
+
+    def __init__(self, custom_id: str) -> None:
+        super().__init__(discord.ui.Button(custom_id=custom_id))
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        _interaction: discord.Interaction,
+        _item: discord.ui.Item[Any],
+        match: re.Match[str],
+        /,
+    ) -> Self:
+        return cls(match.group(0))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        view = ControlPanelView(0)
+        if not await view.interaction_check(interaction):
+            return
+        button = view.button_for(self.custom_id)
+        if button is not None:
+            await button.callback(interaction)
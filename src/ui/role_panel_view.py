@@ -4,7 +4,8 @@
 ボタンまたはリアクションでロールを付与/解除するパネルを提供する。
 
 UI の構成:
-  - RolePanelView: ロールボタン群 (永続 View)
+  - RolePanelView: ロールボタン群
+  - RoleButton: ロールボタン (DynamicItem。custom_id からパネルとアイテムを復元する)
   - RolePanelCreateModal: パネル作成時のタイトル入力
   - create_role_panel_embed(): Embed 生成関数
   - create_role_panel_content(): 通常テキスト生成関数
@@ -12,8 +13,9 @@ UI の構成:
 
 import json
 import logging
+import re
 import time
-from typing import Any
+from typing import Any, Self
 
 import discord
 
@@ -22,6 +24,7 @@ from src.database.engine import async_session
 from src.database.models import RolePanel, RolePanelItem
 from src.services.db_service import (
     get_role_panel,
+    get_role_panel_item,
     get_role_panel_item_by_emoji,
 )
 from src.utils import normalize_emoji
@@ -153,35 +156,67 @@ def create_role_panel_content(
     return "\n".join(lines)
 
 
-class RoleButton(discord.ui.Button[Any]):
+_BUTTON_STYLES = {
+    "primary": discord.ButtonStyle.primary,
+    "secondary": discord.ButtonStyle.secondary,
+    "success": discord.ButtonStyle.success,
+    "danger": discord.ButtonStyle.danger,
+}
+
+
+class RoleButton(
+    discord.ui.DynamicItem[discord.ui.Button[Any]],
+    template=r"role_panel:(?P<panel_id>[0-9]+):(?P<item_id>[0-9]+)",
+):
     """ロール付与/解除用のボタン。
 
     クリックするとロールをトグル (付与/解除) する。
     custom_id 形式: role_panel:{panel_id}:{item_id}
+
+    付与するロールはクリック時に item_id から DB で引く。
+    Web 管理画面から投稿したパネルも同じ custom_id なので、そのまま動作する。
     """
 
     def __init__(
         self,
         panel_id: int,
-        item: RolePanelItem,
+        item_id: int,
+        *,
+        label: str | None = None,
+        emoji: str | None = None,
+        style: discord.ButtonStyle = discord.ButtonStyle.secondary,
     ) -> None:
-        # ボタンスタイルの変換
-        style_map = {
-            "primary": discord.ButtonStyle.primary,
-            "secondary": discord.ButtonStyle.secondary,
-            "success": discord.ButtonStyle.success,
-            "danger": discord.ButtonStyle.danger,
-        }
-        style = style_map.get(item.style, discord.ButtonStyle.secondary)
-
         super().__init__(
+            discord.ui.Button(
+                label=label,
+                emoji=emoji,
+                style=style,
+                custom_id=f"role_panel:{panel_id}:{item_id}",
+            )
+        )
+        self.panel_id = panel_id
+        self.item_id = item_id
+
+    @classmethod
+    def from_item(cls, panel_id: int, item: RolePanelItem) -> Self:
+        """ロールアイテムから表示用のボタンを作る。"""
+        return cls(
+            panel_id,
+            item.id,
             label=item.label or "",
             emoji=item.emoji,
-            style=style,
-            custom_id=f"role_panel:{panel_id}:{item.id}",
+            style=_BUTTON_STYLES.get(item.style, discord.ButtonStyle.secondary),
         )
-        self.panel_id = panel_id
-        self.role_id = item.role_id
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        _interaction: discord.Interaction,
+        _item: discord.ui.Item[Any],
+        match: re.Match[str],
+        /,
+    ) -> Self:
+        return cls(int(match["panel_id"]), int(match["item_id"]))
 
     async def callback(self, interaction: discord.Interaction) -> None:
         """ボタンがクリックされたときの処理。ロールをトグルする。"""
@@ -206,8 +241,9 @@ class RoleButton(discord.ui.Button[Any]):
             )
             return
 
-        # 除外ロールチェック
         async with async_session() as db_session:
+            item = await get_role_panel_item(db_session, self.item_id)
+            # 除外ロールチェック
             panel_obj = await get_role_panel(db_session, self.panel_id)
             if panel_obj:
                 try:
@@ -224,7 +260,9 @@ class RoleButton(discord.ui.Button[Any]):
                         )
                         return
 
-        role = interaction.guild.get_role(int(self.role_id))
+        role = None
+        if item is not None and item.panel_id == self.panel_id:
+            role = interaction.guild.get_role(int(item.role_id))
         if role is None:
             await interaction.response.send_message(
                 "ロールが見つかりませんでした。削除された可能性があります。",
@@ -270,9 +308,10 @@ class RoleButton(discord.ui.Button[Any]):
 
 
 class RolePanelView(discord.ui.View):
-    """ロールパネルのボタン View (永続)。
+    """ロールパネルのボタン View。
 
-    timeout=None で Bot 再起動後もボタンが動作する。
+    メッセージ送信用。ボタンの処理は RoleButton (DynamicItem) が
+    custom_id から受け付けるため、この View を add_view する必要はない。
     """
 
     def __init__(self, panel_id: int, items: list[RolePanelItem]) -> None:
@@ -284,7 +323,7 @@ class RolePanelView(discord.ui.View):
             if len(self.children) >= 25:
                 logger.warning("Panel %d has more than 25 items, truncating", panel_id)
                 break
-            self.add_item(RoleButton(panel_id, item))
+            self.add_item(RoleButton.from_item(panel_id, item))
 
 
 class RolePanelCreateModal(discord.ui.Modal, title="ロールパネル作成"):
@@ -390,7 +429,6 @@ async def refresh_role_panel(
     channel: discord.TextChannel,
     panel: RolePanel,
     items: list[RolePanelItem],
-    bot: discord.Client,
 ) -> bool:
     """ロールパネルのメッセージを更新する。
 
@@ -398,7 +436,6 @@ async def refresh_role_panel(
         channel: パネルがあるテキストチャンネル
         panel: 更新するパネル
         items: パネルのロールアイテム
-        bot: Bot クライアント (View 登録用)
 
     Returns:
         更新できたら True、パネルが見つからなければ False
@@ -420,7 +457,6 @@ async def refresh_role_panel(
         embed = create_role_panel_embed(panel, items)
         if panel.panel_type == "button":
             view = RolePanelView(panel.id, items)
-            bot.add_view(view)
             await msg.edit(content=None, embed=embed, view=view)
         else:
             # リアクション式: リアクションを更新
@@ -436,7 +472,6 @@ async def refresh_role_panel(
         content = create_role_panel_content(panel, items)
         if panel.panel_type == "button":
             view = RolePanelView(panel.id, items)
-            bot.add_view(view)
             await msg.edit(content=content, embed=None, view=view)
         else:
             # リアクション式: リアクションを更新
@@ -4,21 +4,35 @@
 パネルのボタン、チケット操作ボタンを提供する。
 
 UI の構成:
-  - TicketPanelView: パネルのカテゴリボタン群 (永続 View)
+  - TicketPanelView: パネルのカテゴリボタン群
   - TicketCategoryButton: カテゴリ選択ボタン
-  - TicketControlView: チケットチャンネル内の操作ボタン (永続 View)
+  - TicketControlView: チケットチャンネル内の操作ボタン
+
+ボタンは DynamicItem で、状態 (パネル ID・カテゴリ ID・チケット ID) を
+custom_id から復元する。Bot 起動時に TICKET_DYNAMIC_ITEMS を add_dynamic_items
+するだけで、パネルやチケットの数に関係なく全てのボタンが動作する。
 """
 
 import contextlib
+import gzip
+import io
 import logging
+import re
+import tempfile
+from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from typing import IO, Any, Self, cast
 
 import discord
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
-from src.constants import DEFAULT_EMBED_COLOR
+from src.constants import (
+    DEFAULT_EMBED_COLOR,
+    TICKET_TRANSCRIPT_DB_MAX_BYTES,
+    TICKET_TRANSCRIPT_SPOOL_MAX_BYTES,
+)
 from src.database.engine import async_session
 from src.database.models import Ticket, TicketCategory, TicketPanel, TicketPanelCategory
 from src.services.db_service import (
@@ -26,12 +40,16 @@ from src.services.db_service import (
     get_next_ticket_number,
     get_ticket,
     get_ticket_category,
+    set_ticket_transcript,
     update_ticket_status,
 )
 from src.utils import format_datetime
 
 logger = logging.getLogger(__name__)
 
+# トランスクリプトを展開するときに一度に読むバイト数
+_TRANSCRIPT_READ_CHUNK_BYTES = 64 * 1024
+
 
 # =============================================================================
 # ヘルパー関数
@@ -84,14 +102,93 @@ def create_ticket_panel_embed(
     return embed
 
 
+@dataclass
+class TicketTranscript:
+    """gzip 圧縮済みのトランスクリプト。
+
+    本文は ``file`` に書き込み済み (小さければメモリ上、大きければ一時ファイル)。
+    使い終わったら ``close()`` する。
+    """
+
+    filename: str
+    file: IO[bytes]
+    message_count: int
+
+    def to_discord_file(self) -> discord.File:
+        """添付用の discord.File を返す (file 自体は閉じない)。"""
+        self.file.seek(0)
+        return discord.File(cast(io.BufferedIOBase, self.file), filename=self.filename)
+
+    @property
+    def size(self) -> int:
+        """圧縮後のバイト数。"""
+        return self.file.seek(0, io.SEEK_END)
+
+    def read_text(self, max_bytes: int | None = None) -> str:
+        """展開した本文を返す。
+
+        max_bytes を指定した場合は末尾の max_bytes バイトだけを残し、
+        省略したことを示す行を先頭に付ける (展開後の全文はメモリに載せない)。
+        """
+        self.file.seek(0)
+        with gzip.GzipFile(fileobj=self.file, mode="rb") as gz:
+            if max_bytes is None:
+                return gz.read().decode()
+            tail = bytearray()
+            total = 0
+            while chunk := gz.read(_TRANSCRIPT_READ_CHUNK_BYTES):
+                total += len(chunk)
+                tail += chunk
+                if len(tail) > max_bytes:
+                    del tail[: len(tail) - max_bytes]
+        if total <= max_bytes:
+            return tail.decode()
+        # 行の途中から始まらないよう最初の改行までを捨てる
+        newline = tail.find(b"\n")
+        body = tail[newline + 1 :] if newline >= 0 else tail
+        omitted = total - len(body)
+        marker = f"[Transcript truncated: first {omitted} bytes omitted]\n"
+        return marker + body.decode(errors="ignore")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _format_transcript_line(message: discord.Message) -> str | None:
+    """メッセージをトランスクリプトの 1 行に変換する。対象外なら None。"""
+    if message.author.bot and message.embeds:
+        # Bot の Embed メッセージはスキップ (開始 Embed など)
+        return None
+    timestamp = format_datetime(message.created_at, "%Y-%m-%d %H:%M:%S")
+    content = message.content or ""
+    if message.attachments:
+        attachment_urls = ", ".join(a.url for a in message.attachments)
+        if content:
+            content += f" [Attachments: {attachment_urls}]"
+        else:
+            content = f"[Attachments: {attachment_urls}]"
+    if message.stickers:
+        sticker_names = ", ".join(s.name for s in message.stickers)
+        if content:
+            content += f" [Stickers: {sticker_names}]"
+        else:
+            content = f"[Stickers: {sticker_names}]"
+    if not content:
+        return None
+    return f"[{timestamp}] {message.author.name}: {content}"
+
+
 async def generate_transcript(
     channel: discord.TextChannel,
     ticket: Ticket,
     category_name: str,
     closed_by_name: str,
-) -> str:
+) -> TicketTranscript:
     """チケットチャンネルのトランスクリプトを生成する。
 
+    履歴を古い順に読みながら 1 行ずつ gzip に書き込むため、件数の上限はなく
+    履歴全体をメモリに載せることもない。
+
     Args:
         channel: チケットチャンネル
         ticket: チケットオブジェクト
@@ -99,49 +196,78 @@ async def generate_transcript(
         closed_by_name: クローズしたユーザー名
 
     Returns:
-        トランスクリプト文字列
+        gzip 圧縮済みのトランスクリプト
     """
-    lines: list[str] = []
-    lines.append(f"=== Ticket #{ticket.ticket_number} - {category_name} ===")
-    lines.append(f"Created by: {ticket.username} ({ticket.user_id})")
-    lines.append(
-        f"Created at: {format_datetime(ticket.created_at, '%Y-%m-%d %H:%M:%S')}"
+    # 呼び出し側が close() するまで開いたままにする
+    buffer = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+        max_size=TICKET_TRANSCRIPT_SPOOL_MAX_BYTES
     )
-    lines.append("")
-
+    message_count = 0
     try:
-        messages = [msg async for msg in channel.history(limit=500)]
-        messages.reverse()  # oldest first
-
-        for message in messages:
-            if message.author.bot and message.embeds:
-                # Bot の Embed メッセージはスキップ (開始 Embed など)
-                continue
-            timestamp = format_datetime(message.created_at, "%Y-%m-%d %H:%M:%S")
-            content = message.content or ""
-            if message.attachments:
-                attachment_urls = ", ".join(a.url for a in message.attachments)
-                if content:
-                    content += f" [Attachments: {attachment_urls}]"
-                else:
-                    content = f"[Attachments: {attachment_urls}]"
-            if message.stickers:
-                sticker_names = ", ".join(s.name for s in message.stickers)
-                if content:
-                    content += f" [Stickers: {sticker_names}]"
-                else:
-                    content = f"[Stickers: {sticker_names}]"
-            if content:
-                lines.append(f"[{timestamp}] {message.author.name}: {content}")
-    except discord.HTTPException as e:
-        logger.warning("Failed to fetch messages for transcript: %s", e)
-        lines.append("[Failed to fetch message history]")
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+
+            def write(line: str) -> None:
+                gz.write(f"{line}\n".encode())
+
+            write(f"=== Ticket #{ticket.ticket_number} - {category_name} ===")
+            write(f"Created by: {ticket.username} ({ticket.user_id})")
+            write(
+                f"Created at: {format_datetime(ticket.created_at, '%Y-%m-%d %H:%M:%S')}"
+            )
+            write("")
+
+            try:
+                async for message in channel.history(limit=None, oldest_first=True):
+                    line = _format_transcript_line(message)
+                    if line is not None:
+                        write(line)
+                        message_count += 1
+            except discord.HTTPException as e:
+                logger.warning("Failed to fetch messages for transcript: %s", e)
+                write("[Failed to fetch message history]")
+
+            now = format_datetime(datetime.now(UTC), "%Y-%m-%d %H:%M:%S")
+            write("")
+            write(f"=== Closed by: {closed_by_name} at {now} ===")
+    except BaseException:
+        buffer.close()
+        raise
+
+    return TicketTranscript(
+        filename=f"ticket-{ticket.ticket_number}-transcript.txt.gz",
+        file=buffer,
+        message_count=message_count,
+    )
 
-    now = format_datetime(datetime.now(UTC), "%Y-%m-%d %H:%M:%S")
-    lines.append("")
-    lines.append(f"=== Closed by: {closed_by_name} at {now} ===")
 
-    return "\n".join(lines)
+async def save_transcript(
+    session: AsyncSession,
+    ticket: Ticket,
+    transcript: TicketTranscript,
+    log_message: discord.Message | None,
+) -> None:
+    """トランスクリプトの保存先を DB に記録する。
+
+    クローズログに添付できた場合はメッセージへの参照と件数だけを保存する。
+    ログチャンネルが未設定・送信に失敗した・添付サイズの上限を超えた場合は
+    本文を DB に保存する。DB に置く本文は末尾 TICKET_TRANSCRIPT_DB_MAX_BYTES
+    バイトまでに切り詰める。
+    """
+    if log_message is not None and log_message.attachments:
+        await set_ticket_transcript(
+            session,
+            ticket,
+            message_count=transcript.message_count,
+            channel_id=str(log_message.channel.id),
+            message_id=str(log_message.id),
+        )
+        return
+    await set_ticket_transcript(
+        session,
+        ticket,
+        message_count=transcript.message_count,
+        text=transcript.read_text(max_bytes=TICKET_TRANSCRIPT_DB_MAX_BYTES),
+    )
 
 
 async def send_close_log(
@@ -150,26 +276,36 @@ async def send_close_log(
     category: TicketCategory | None,
     closed_by_name: str,
     app_url: str,
-) -> None:
+    transcript: TicketTranscript | None = None,
+    close_reason: str | None = None,
+) -> discord.Message | None:
     """クローズログをログチャンネルに送信する。
 
+    トランスクリプトがギルドのアップロード上限を超える場合は添付せずに送る
+    (保存は save_transcript が DB 側にフォールバックする)。
+
     Args:
         guild: Discord ギルド
         ticket: クローズされたチケット
         category: チケットカテゴリ (None の場合はスキップ)
         closed_by_name: クローズしたユーザー名
         app_url: Web 管理画面のベース URL
+        transcript: 添付するトランスクリプト
+        close_reason: クローズ理由 (None の場合は ticket.close_reason)
+
+    Returns:
+        送信したメッセージ。送信しなかった・失敗した場合は None
     """
     if category is None or not category.log_channel_id:
-        return
+        return None
 
     try:
         channel = guild.get_channel(int(category.log_channel_id))
     except (ValueError, TypeError):
         logger.warning("Invalid log_channel_id: %r", category.log_channel_id)
-        return
+        return None
     if not isinstance(channel, discord.TextChannel):
-        return
+        return None
 
     category_name = category.name
     web_url = f"{app_url.rstrip('/')}/dashboard/tickets/{ticket.id}"
@@ -182,14 +318,34 @@ async def send_close_log(
     embed.add_field(name="Category", value=category_name, inline=True)
     embed.add_field(name="Created by", value=ticket.username, inline=True)
     embed.add_field(name="Closed by", value=closed_by_name, inline=True)
-    if ticket.close_reason:
-        embed.add_field(name="Reason", value=ticket.close_reason, inline=False)
+    reason = close_reason if close_reason is not None else ticket.close_reason
+    if reason:
+        embed.add_field(name="Reason", value=reason, inline=False)
     embed.add_field(name="Transcript", value=f"[View on Web]({web_url})", inline=False)
 
     try:
-        await channel.send(embed=embed)
+        if transcript is None:
+            return await channel.send(embed=embed)
+        embed.add_field(
+            name="Messages", value=str(transcript.message_count), inline=True
+        )
+        if transcript.size > guild.filesize_limit:
+            logger.warning(
+                "Transcript for ticket %d is too large to attach (%d > %d bytes)",
+                ticket.id,
+                transcript.size,
+                guild.filesize_limit,
+            )
+            return await channel.send(embed=embed)
+        file = transcript.to_discord_file()
+        try:
+            return await channel.send(embed=embed, file=file)
+        finally:
+            # discord.File は元のファイルの close() を差し替えるので戻しておく
+            file.close()
     except discord.HTTPException as e:
         logger.warning("Failed to send close log to channel %s: %s", channel.id, e)
+        return None
 
 
 # =============================================================================
@@ -197,7 +353,18 @@ async def send_close_log(
 # =============================================================================
 
 
-class TicketCategoryButton(discord.ui.Button[Any]):
+_BUTTON_STYLES = {
+    "primary": discord.ButtonStyle.primary,
+    "secondary": discord.ButtonStyle.secondary,
+    "success": discord.ButtonStyle.success,
+    "danger": discord.ButtonStyle.danger,
+}
+
+
+class TicketCategoryButton(
+    discord.ui.DynamicItem[discord.ui.Button[Any]],
+    template=r"ticket_panel:(?P<panel_id>[0-9]+):(?P<category_id>[0-9]+)",
+):
     """チケットカテゴリ選択ボタン。
 
     custom_id 形式: ticket_panel:{panel_id}:{category_id}
@@ -206,27 +373,50 @@ class TicketCategoryButton(discord.ui.Button[Any]):
     def __init__(
         self,
         panel_id: int,
-        association: TicketPanelCategory,
-        category_name: str,
+        category_id: int,
+        *,
+        label: str | None = None,
+        emoji: str | None = None,
+        style: discord.ButtonStyle = discord.ButtonStyle.primary,
     ) -> None:
-        style_map = {
-            "primary": discord.ButtonStyle.primary,
-            "secondary": discord.ButtonStyle.secondary,
-            "success": discord.ButtonStyle.success,
-            "danger": discord.ButtonStyle.danger,
-        }
-        style = style_map.get(association.button_style, discord.ButtonStyle.primary)
-
-        label = association.button_label or category_name
-
         super().__init__(
-            label=label,
-            emoji=association.button_emoji or None,
-            style=style,
-            custom_id=f"ticket_panel:{panel_id}:{association.category_id}",
+            discord.ui.Button(
+                label=label,
+                emoji=emoji,
+                style=style,
+                custom_id=f"ticket_panel:{panel_id}:{category_id}",
+            )
         )
         self.panel_id = panel_id
-        self.category_id = association.category_id
+        self.category_id = category_id
+
+    @classmethod
+    def from_association(
+        cls,
+        panel_id: int,
+        association: TicketPanelCategory,
+        category_name: str,
+    ) -> Self:
+        """パネルとカテゴリの関連付けから表示用のボタンを作る。"""
+        return cls(
+            panel_id,
+            association.category_id,
+            label=association.button_label or category_name,
+            emoji=association.button_emoji or None,
+            style=_BUTTON_STYLES.get(
+                association.button_style, discord.ButtonStyle.primary
+            ),
+        )
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        _interaction: discord.Interaction,
+        _item: discord.ui.Item[Any],
+        match: re.Match[str],
+        /,
+    ) -> Self:
+        return cls(int(match["panel_id"]), int(match["category_id"]))
 
     async def callback(self, interaction: discord.Interaction) -> None:
         """ボタンクリック時の処理。フォーム表示またはチケット直接作成。"""
@@ -316,9 +506,10 @@ class TicketCategoryButton(discord.ui.Button[Any]):
 
 
 class TicketPanelView(discord.ui.View):
-    """チケットパネルのボタン View (永続)。
+    """チケットパネルのボタン View。
 
-    timeout=None で Bot 再起動後もボタンが動作する。
+    メッセージ送信用。ボタンの処理は TicketCategoryButton (DynamicItem) が
+    custom_id から受け付けるため、この View を add_view する必要はない。
     """
 
     def __init__(
@@ -335,7 +526,7 @@ class TicketPanelView(discord.ui.View):
 
         for assoc in associations[:25]:
             name = category_names.get(assoc.category_id, "Ticket")
-            self.add_item(TicketCategoryButton(panel_id, assoc, name))
+            self.add_item(TicketCategoryButton.from_association(panel_id, assoc, name))
 
 
 # =============================================================================
@@ -349,9 +540,10 @@ class TicketPanelView(discord.ui.View):
 
 
 class TicketControlView(discord.ui.View):
-    """チケットチャンネル内の操作ボタン View (永続)。
+    """チケットチャンネル内の操作ボタン View。
 
-    Close と Claim ボタンを提供する。
+    Close と Claim ボタンを提供する。ボタンは DynamicItem なので
+    この View を add_view する必要はない。
     """
 
     def __init__(self, ticket_id: int) -> None:
@@ -366,7 +558,10 @@ class TicketControlView(discord.ui.View):
         )
 
 
-class TicketCloseButton(discord.ui.Button[Any]):
+class TicketCloseButton(
+    discord.ui.DynamicItem[discord.ui.Button[Any]],
+    template=r"ticket_ctrl:(?P<ticket_id>[0-9]+):close",
+):
     """チケットクローズボタン。
 
     custom_id 形式: ticket_ctrl:{ticket_id}:close
@@ -374,13 +569,25 @@ class TicketCloseButton(discord.ui.Button[Any]):
 
     def __init__(self, ticket_id: int) -> None:
         super().__init__(
-            label="Close",
-            emoji="\U0001f512",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"ticket_ctrl:{ticket_id}:close",
+            discord.ui.Button(
+                label="Close",
+                emoji="\U0001f512",
+                style=discord.ButtonStyle.danger,
+                custom_id=f"ticket_ctrl:{ticket_id}:close",
+            )
         )
         self.ticket_id = ticket_id
 
+    @classmethod
+    async def from_custom_id(
+        cls,
+        _interaction: discord.Interaction,
+        _item: discord.ui.Item[Any],
+        match: re.Match[str],
+        /,
+    ) -> Self:
+        return cls(int(match["ticket_id"]))
+
     async def callback(self, interaction: discord.Interaction) -> None:
         """クローズボタンの処理。"""
         if interaction.guild is None or interaction.channel is None:
@@ -389,46 +596,68 @@ class TicketCloseButton(discord.ui.Button[Any]):
         await interaction.response.defer()
 
         try:
+            # 読み取りだけで閉じ、履歴の取得やアップロード中は接続を保持しない
             async with async_session() as db_session:
                 ticket = await get_ticket(db_session, self.ticket_id)
-                if ticket is None or ticket.status == "closed":
-                    await interaction.followup.send(
-                        "このチケットは既にクローズされています。", ephemeral=True
-                    )
-                    return
-
-                category = await get_ticket_category(db_session, ticket.category_id)
-                category_name = category.name if category else "Unknown"
+                category = (
+                    await get_ticket_category(db_session, ticket.category_id)
+                    if ticket is not None and ticket.status != "closed"
+                    else None
+                )
+            if ticket is None or ticket.status == "closed":
+                await interaction.followup.send(
+                    "このチケットは既にクローズされています。", ephemeral=True
+                )
+                return
+            category_name = category.name if category else "Unknown"
 
-                # トランスクリプト生成
-                transcript_text = ""
-                if isinstance(interaction.channel, discord.TextChannel):
-                    transcript_text = await generate_transcript(
-                        interaction.channel,
-                        ticket,
-                        category_name,
-                        interaction.user.name,
-                    )
+            # トランスクリプト生成
+            transcript = None
+            if isinstance(interaction.channel, discord.TextChannel):
+                transcript = await generate_transcript(
+                    interaction.channel,
+                    ticket,
+                    category_name,
+                    interaction.user.name,
+                )
 
-                # チケットステータス更新
-                await update_ticket_status(
-                    db_session,
+            try:
+                # ログチャンネルに通知 (トランスクリプトを添付)
+                log_message = await send_close_log(
+                    interaction.guild,
                     ticket,
-                    status="closed",
-                    closed_by=interaction.user.name,
-                    transcript=transcript_text,
-                    closed_at=datetime.now(UTC),
-                    channel_id=None,
+                    category,
+                    interaction.user.name,
+                    settings.ticket_web_base_url,
+                    transcript=transcript,
                 )
 
-            # ログチャンネルに通知
-            await send_close_log(
-                interaction.guild,
-                ticket,
-                category,
-                interaction.user.name,
-                settings.ticket_web_base_url,
-            )
+                # 新しいセッションで読み直してから書き込む
+                async with async_session() as db_session:
+                    current = await get_ticket(db_session, self.ticket_id)
+                    if current is None or current.status == "closed":
+                        await interaction.followup.send(
+                            "このチケットは既にクローズされています。",
+                            ephemeral=True,
+                        )
+                        return
+
+                    # チケットステータス更新
+                    await update_ticket_status(
+                        db_session,
+                        current,
+                        status="closed",
+                        closed_by=interaction.user.name,
+                        closed_at=datetime.now(UTC),
+                        channel_id=None,
+                    )
+                    if transcript is not None:
+                        await save_transcript(
+                            db_session, current, transcript, log_message
+                        )
+            finally:
+                if transcript is not None:
+                    transcript.close()
 
             # チャンネル削除
             try:
@@ -454,7 +683,10 @@ class TicketCloseButton(discord.ui.Button[Any]):
                 )
 
 
-class TicketClaimButton(discord.ui.Button[Any]):
+class TicketClaimButton(
+    discord.ui.DynamicItem[discord.ui.Button[Any]],
+    template=r"ticket_ctrl:(?P<ticket_id>[0-9]+):claim",
+):
     """チケット担当ボタン。
 
     custom_id 形式: ticket_ctrl:{ticket_id}:claim
@@ -462,13 +694,25 @@ class TicketClaimButton(discord.ui.Button[Any]):
 
     def __init__(self, ticket_id: int) -> None:
         super().__init__(
-            label="Claim",
-            emoji="\u2705",
-            style=discord.ButtonStyle.success,
-            custom_id=f"ticket_ctrl:{ticket_id}:claim",
+            discord.ui.Button(
+                label="Claim",
+                emoji="\u2705",
+                style=discord.ButtonStyle.success,
+                custom_id=f"ticket_ctrl:{ticket_id}:claim",
+            )
         )
         self.ticket_id = ticket_id
 
+    @classmethod
+    async def from_custom_id(
+        cls,
+        _interaction: discord.Interaction,
+        _item: discord.ui.Item[Any],
+        match: re.Match[str],
+        /,
+    ) -> Self:
+        return cls(int(match["ticket_id"]))
+
     async def callback(self, interaction: discord.Interaction) -> None:
         """担当ボタンの処理。"""
         if interaction.guild is None:
@@ -526,6 +770,14 @@ class TicketClaimButton(discord.ui.Button[Any]):
                 pass
 
 
+# Bot 起動時に add_dynamic_items で登録するボタン
+TICKET_DYNAMIC_ITEMS: tuple[type[discord.ui.DynamicItem[Any]], ...] = (
+    TicketCategoryButton,
+    TicketCloseButton,
+    TicketClaimButton,
+)
+
+
 # =============================================================================
 # チケットチャンネル作成ヘルパー
 # =============================================================================
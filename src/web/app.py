@@ -14,7 +14,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import select
 
-from src.database.engine import async_session
+from src.core.loop_monitor import LoopLagProbe
+from src.core.metrics import install_db_metrics
+from src.database.engine import async_session, engine
 from src.database.engine import (
     check_database_connection as check_database_connection,  # noqa: F401
 )
@@ -41,6 +43,9 @@ from src.web.db_helpers import (
 from src.web.db_helpers import (
     get_or_create_admin as get_or_create_admin,
 )
+from src.web.db_helpers import (
+    get_read_db as get_read_db,
+)
 
 # ---------------------------------------------------------------------------
 # Re-exports: discord_api / email_service
@@ -48,6 +53,7 @@ from src.web.db_helpers import (
 from src.web.discord_api import (  # noqa: F401
     add_reactions_to_message as add_reactions_to_message,
 )
+from src.web.discord_api import close_http_client, open_http_client
 from src.web.discord_api import (
     delete_discord_message as delete_discord_message,
 )
@@ -165,7 +171,7 @@ logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+async def lifespan(fastapi_app: FastAPI) -> AsyncGenerator[None, None]:
     """FastAPI lifespan handler for startup/shutdown events."""
     logger.info("Starting web admin application...")
     if not await check_database_connection():
@@ -189,8 +195,17 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
                     )
         except Exception:
             logger.warning("Failed to load site settings from DB")
-    yield
-    logger.info("Shutting down web admin application...")
+    await open_http_client()
+    install_db_metrics(engine)
+    loop_probe = LoopLagProbe()
+    loop_probe.start()
+    fastapi_app.state.loop_probe = loop_probe
+    try:
+        yield
+    finally:
+        logger.info("Shutting down web admin application...")
+        await loop_probe.stop()
+        await close_http_client()
 
 
 # =============================================================================
@@ -237,6 +252,7 @@ from src.web.routes.bump import router as bump_router  # noqa: E402
 from src.web.routes.chatrole import router as chatrole_router  # noqa: E402
 from src.web.routes.joinrole import router as joinrole_router  # noqa: E402
 from src.web.routes.lobby import router as lobby_router  # noqa: E402
+from src.web.routes.metrics import router as metrics_router  # noqa: E402
 from src.web.routes.misc import router as misc_router  # noqa: E402
 from src.web.routes.rolepanel import router as rolepanel_router  # noqa: E402
 from src.web.routes.settings import router as settings_router  # noqa: E402
@@ -269,3 +285,4 @@ app.include_router(ticket_router)
 app.include_router(joinrole_router)
 app.include_router(chatrole_router)
 app.include_router(auto_reaction_router)
+app.include_router(metrics_router)
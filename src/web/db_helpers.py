@@ -4,11 +4,13 @@ import logging
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
 
+from fastapi import Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.web.security as _security
-from src.database.engine import async_session
+from src.database.change_feed import enable_change_notify
+from src.database.engine import async_session, read_session
 from src.database.models import (
     AdminUser,
     DiscordChannel,
@@ -22,8 +24,24 @@ _VALID_ACTIVITY_TYPES = {"playing", "listening", "watching", "competing"}
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Database session dependency."""
+    """Database session dependency.
+
+    書き込んだ変更は LISTEN/NOTIFY で Bot に通知され、キャッシュに即時反映される。
+    """
     async with async_session() as session:
+        enable_change_notify(session)
+        yield session
+
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),  # noqa: B008
+) -> AsyncGenerator[AsyncSession, None]:
+    """読み取り専用の Database session dependency.
+
+    リードレプリカが使えればレプリカのセッションを、使えなければ
+    get_db のセッションを返す。一覧表示など書き込みのないルートで使う。
+    """
+    async with read_session(db) as session:
         yield session
 
 
@@ -68,20 +86,24 @@ async def _get_discord_roles_by_guild(
 async def _get_discord_guilds_and_channels(
     db: AsyncSession,
 ) -> tuple[dict[str, str], dict[str, list[tuple[str, str]]]]:
-    """キャッシュされたギルドとチャンネル情報を取得する。"""
-    guilds_result = await db.execute(
-        select(DiscordGuild).order_by(DiscordGuild.guild_name)
-    )
+    """キャッシュされたギルドとチャンネル情報を取得する。
+
+    Bot が同期するキャッシュで多少古くても表示に影響しないため、
+    リードレプリカが使えればそちらから読む。
+    """
+    async with read_session(db) as session:
+        guilds_result = await session.execute(
+            select(DiscordGuild).order_by(DiscordGuild.guild_name)
+        )
+        channels_result = await session.execute(
+            select(DiscordChannel)
+            .where(DiscordChannel.channel_type != 4)
+            .order_by(DiscordChannel.guild_id, DiscordChannel.position)
+        )
     guilds_map: dict[str, str] = {
         g.guild_id: g.guild_name for g in guilds_result.scalars()
     }
 
-    channels_result = await db.execute(
-        select(DiscordChannel)
-        .where(DiscordChannel.channel_type != 4)
-        .order_by(DiscordChannel.guild_id, DiscordChannel.position)
-    )
-
     channels_map: dict[str, list[tuple[str, str]]] = {}
     for channel in channels_result.scalars():
         if channel.guild_id not in channels_map:
@@ -5,12 +5,16 @@ BotとWebアプリが別プロセスで動作するため、Discord REST APIを
 
 Notes:
     - Bot トークンは環境変数 DISCORD_TOKEN から取得
+    - HTTP クライアントは FastAPI の lifespan で 1 つだけ作成し、全リクエストで
+      共有する (keep-alive でコネクションを再利用)
     - メッセージ投稿には channels/{channel_id}/messages エンドポイントを使用
     - コンポーネント (ボタン) の custom_id は Bot 側で処理される
 """
 
-import asyncio
+import importlib.util
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 import httpx
@@ -23,12 +27,100 @@ from src.database.models import (
     TicketPanel,
     TicketPanelCategory,
 )
+from src.web.discord_ratelimit import DiscordRateLimiter
 
 logger = logging.getLogger(__name__)
 
 # Discord API base URL
 DISCORD_API_BASE = "https://discord.com/api/v10"
 
+# 共有 HTTP クライアントとレート制限 (open_http_client / close_http_client で管理)
+# None の場合 (lifespan 外のスクリプト等) はリクエストごとに一時的に作る
+_http_client: httpx.AsyncClient | None = None
+_rate_limiter: DiscordRateLimiter | None = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Discord REST API 用の HTTP クライアントを作成する。
+
+    h2 パッケージがインストールされている場合のみ HTTP/2 を有効にする。
+    """
+    return httpx.AsyncClient(
+        verify=False,
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=settings.discord_http_max_connections,
+            max_keepalive_connections=settings.discord_http_max_keepalive_connections,
+            keepalive_expiry=settings.discord_http_keepalive_expiry,
+        ),
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """アプリ共有の HTTP クライアントを作成する (起動時に 1 回呼ぶ)。
+
+    レート制限の状態もクライアントと同じ寿命で共有する。
+
+    Returns:
+        共有 HTTP クライアント (作成済みならそのまま返す)
+    """
+    global _http_client, _rate_limiter
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+        _rate_limiter = DiscordRateLimiter()
+        logger.info("Discord HTTP client opened")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """アプリ共有の HTTP クライアントを閉じる (終了時に呼ぶ)。"""
+    global _http_client, _rate_limiter
+    client, _http_client = _http_client, None
+    _rate_limiter = None
+    if client is not None:
+        await client.aclose()
+        logger.info("Discord HTTP client closed")
+
+
+def get_rate_limit_stats() -> dict[str, float]:
+    """共有レート制限のカウンターを返す (クライアント未作成時は空)。"""
+    return _rate_limiter.snapshot() if _rate_limiter is not None else {}
+
+
+class _DiscordREST:
+    """HTTP クライアントとレート制限をまとめた REST 呼び出し口。"""
+
+    __slots__ = ("client", "rate_limiter")
+
+    def __init__(
+        self, client: httpx.AsyncClient, rate_limiter: DiscordRateLimiter
+    ) -> None:
+        self.client = client
+        self.rate_limiter = rate_limiter
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """レート制限を守ってリクエストを送る。"""
+        return await self.rate_limiter.request(self.client, method, url, **kwargs)
+
+
+@asynccontextmanager
+async def _discord_client() -> AsyncIterator[_DiscordREST]:
+    """Discord REST API 呼び出しに使うクライアントを返す。
+
+    共有クライアントがあればそれを使い (終了時に閉じない)、
+    なければこの呼び出し専用のクライアントとレート制限を作成する。
+    """
+    if (
+        _http_client is not None
+        and not _http_client.is_closed
+        and _rate_limiter is not None
+    ):
+        yield _DiscordREST(_http_client, _rate_limiter)
+        return
+    async with _create_http_client() as client:
+        yield _DiscordREST(client, DiscordRateLimiter())
+
+
 # Button style mapping (discord.py style names to API integers)
 BUTTON_STYLE_MAP = {
     "primary": 1,
@@ -174,8 +266,10 @@ async def post_role_panel_to_discord(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.post(url, json=payload, headers=headers, timeout=30)
+        async with _discord_client() as client:
+            response = await client.request(
+                "POST", url, json=payload, headers=headers, timeout=30
+            )
 
             if response.status_code in (200, 201):
                 data = response.json()
@@ -261,9 +355,9 @@ async def edit_role_panel_in_discord(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.patch(
-                url, json=payload, headers=headers, timeout=30
+        async with _discord_client() as client:
+            response = await client.request(
+                "PATCH", url, json=payload, headers=headers, timeout=30
             )
 
             if response.status_code == 200:
@@ -324,8 +418,8 @@ async def delete_discord_message(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.delete(url, headers=headers, timeout=30)
+        async with _discord_client() as client:
+            response = await client.request("DELETE", url, headers=headers, timeout=30)
 
             if response.status_code == 204:
                 logger.info(
@@ -389,12 +483,12 @@ async def clear_reactions_from_message(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
+        async with _discord_client() as client:
             url = (
                 f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}"
                 "/reactions"
             )
-            response = await client.delete(url, headers=headers, timeout=10)
+            response = await client.request("DELETE", url, headers=headers, timeout=10)
 
             if response.status_code in (200, 204):
                 return True, None
@@ -440,10 +534,6 @@ async def add_reactions_to_message(
         if not clear_success:
             logger.warning("Failed to clear reactions: %s", clear_error)
             # クリア失敗は継続 (403 権限不足の場合もある)
-        else:
-            # クリア成功後、リアクション追加前にディレイを入れる
-            # (Discord のレート制限対策)
-            await asyncio.sleep(0.5)
 
     if not items:
         return True, None
@@ -453,8 +543,9 @@ async def add_reactions_to_message(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            for i, item in enumerate(items):
+        async with _discord_client() as client:
+            # レート制限は DiscordRateLimiter がヘッダーに従って待機する
+            for item in items:
                 # 絵文字をエンコード
                 if item.emoji.startswith("<"):
                     # カスタム絵文字: <:name:id> → name:id
@@ -470,7 +561,7 @@ async def add_reactions_to_message(
                     f"/reactions/{emoji_encoded}/@me"
                 )
 
-                response = await client.put(url, headers=headers, timeout=10)
+                response = await client.request("PUT", url, headers=headers, timeout=10)
 
                 if response.status_code not in (200, 204):
                     error_data = response.json() if response.content else {}
@@ -488,11 +579,6 @@ async def add_reactions_to_message(
 
                 logger.debug("Added reaction %s to message %s", item.emoji, message_id)
 
-                # Discord のレート制限対策: リアクション間にディレイを入れる
-                # (最後のアイテムの後は待たない)
-                if i < len(items) - 1:
-                    await asyncio.sleep(0.4)
-
         return True, None
 
     except httpx.TimeoutException:
@@ -571,8 +657,10 @@ async def post_ticket_panel_to_discord(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.post(url, json=payload, headers=headers, timeout=30)
+        async with _discord_client() as client:
+            response = await client.request(
+                "POST", url, json=payload, headers=headers, timeout=30
+            )
 
             if response.status_code in (200, 201):
                 data = response.json()
@@ -686,9 +774,9 @@ async def edit_ticket_panel_in_discord(
     }
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.patch(
-                url, json=payload, headers=headers, timeout=30
+        async with _discord_client() as client:
+            response = await client.request(
+                "PATCH", url, json=payload, headers=headers, timeout=30
             )
 
             if response.status_code == 200:
@@ -0,0 +1,299 @@
+"""Discord REST API rate limiter for the web admin.
+
+Web 管理画面から Discord REST API を呼ぶ際のレート制限制御。
+固定のスリープではなく、レスポンスの ``X-RateLimit-*`` ヘッダーを読んで
+バケット単位で待機する。
+
+Notes:
+    - バケットは「ルート (メソッド + パステンプレート)」で識別し、
+      レスポンスの ``X-RateLimit-Bucket`` が分かった後はそのハッシュと
+      メジャーパラメータ (channel_id / guild_id / webhook_id) で識別する
+    - 同じバケットへのリクエストは到着順に 1 つずつ送信する
+    - ``X-RateLimit-Remaining`` が 0 なら ``X-RateLimit-Reset-After`` 秒待つ
+    - 429 を受けた場合は ``Retry-After`` 秒待って再送する
+      (``X-RateLimit-Global`` ならすべてのバケットを止める)
+    - グローバル上限 (50 リクエスト/秒) を超えないよう送信側でも制限する
+    - 待機を含めたリクエストの所要時間と 429 の回数を /metrics に記録する
+
+See Also:
+    - https://discord.com/developers/docs/topics/rate-limits
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.metrics import DISCORD_REST_LATENCY, DISCORD_REST_RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+# Discord のグローバルレート制限 (Bot トークンあたり 1 秒間のリクエスト数)
+GLOBAL_RATE_LIMIT_PER_SECOND = 50
+
+# 429 を受けたときの最大再送回数
+MAX_RATE_LIMIT_RETRIES = 3
+
+# メジャーパラメータとして扱うパス要素 (この直後の ID はバケットを分ける)
+_MAJOR_PARAMETERS = frozenset({"channels", "guilds", "webhooks"})
+
+
+def _route_key(method: str, url: str) -> tuple[str, str]:
+    """URL からルートキーとメジャーパラメータを求める。
+
+    メジャーパラメータ以外の ID とリアクションの絵文字はプレースホルダに
+    置き換える (同じルートの別メッセージ・別絵文字は同じバケットになる)。
+
+    Args:
+        method: HTTP メソッド
+        url: リクエスト URL
+
+    Returns:
+        (ルートキー, メジャーパラメータ) のタプル
+
+    Examples:
+        PUT .../channels/1/messages/2/reactions/%F0%9F%8E%AE/@me
+        → ("PUT /channels/1/messages/{id}/reactions/{emoji}/@me", "1")
+    """
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    # /api/v10 を取り除く
+    if len(segments) >= 2 and segments[0] == "api":
+        segments = segments[2:]
+
+    major = ""
+    parts: list[str] = []
+    for i, segment in enumerate(segments):
+        previous = segments[i - 1] if i > 0 else ""
+        if previous in _MAJOR_PARAMETERS and not major:
+            major = segment
+            parts.append(segment)
+        elif previous == "reactions":
+            parts.append("{emoji}")
+        elif segment.isdigit():
+            parts.append("{id}")
+        else:
+            parts.append(segment)
+    return f"{method.upper()} /{'/'.join(parts)}", major
+
+
+def _header_float(headers: httpx.Headers, name: str) -> float | None:
+    """ヘッダーの値を float として取得する (なければ None)。"""
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class RateLimitStats:
+    """レート制限のカウンター。"""
+
+    # 送信したリクエスト数 (再送を含む)
+    requests: int = 0
+    # 429 を受けた回数
+    rate_limited: int = 0
+    # そのうちグローバルレート制限だった回数
+    global_rate_limited: int = 0
+    # 残り 0 またはグローバル上限で送信前に待機した回数
+    preemptive_waits: int = 0
+    # 待機した合計秒数
+    wait_seconds: float = 0.0
+
+
+class _Bucket:
+    """1 バケット分のレート制限状態。"""
+
+    __slots__ = ("lock", "remaining", "reset_at")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.remaining: int | None = None
+        self.reset_at = 0.0
+
+
+class DiscordRateLimiter:
+    """バケット単位で Discord REST API のレート制限を守るスケジューラ。
+
+    ``request`` は ``client.<method>(url, **kwargs)`` を呼び出す前後で
+    バケットの待機と状態更新を行う。インスタンスは HTTP クライアントと
+    同じ寿命で 1 つだけ作り、全リクエストで共有する。
+    """
+
+    def __init__(
+        self, global_limit_per_second: int = GLOBAL_RATE_LIMIT_PER_SECOND
+    ) -> None:
+        self._global_limit = global_limit_per_second
+        self._global_lock = asyncio.Lock()
+        self._global_window_start = 0.0
+        self._global_count = 0
+        self._global_reset_at = 0.0
+        # ルートキー → X-RateLimit-Bucket のハッシュ
+        self._route_buckets: dict[str, str] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self.stats = RateLimitStats()
+
+    def snapshot(self) -> dict[str, float]:
+        """カウンターの現在値を返す。"""
+        return asdict(self.stats)
+
+    def _bucket_for(self, route: str, major: str) -> _Bucket:
+        bucket_hash = self._route_buckets.get(route)
+        key = f"{bucket_hash}:{major}" if bucket_hash else f"{route}:{major}"
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    async def _sleep(self, seconds: float) -> None:
+        self.stats.wait_seconds += seconds
+        await asyncio.sleep(seconds)
+
+    async def _wait_global(self) -> None:
+        """グローバルレート制限 (429 と送信側の上限) を待つ。
+
+        ウィンドウの状態はロックの中で確認・更新する。ロックがないと、
+        同じウィンドウの終わりを待っていたリクエストが一斉に起きて
+        それぞれカウントを 0 に戻し、上限を超えて送信してしまう。
+        """
+        async with self._global_lock:
+            now = time.monotonic()
+            if now < self._global_reset_at:
+                self.stats.preemptive_waits += 1
+                await self._sleep(self._global_reset_at - now)
+                now = time.monotonic()
+
+            if now - self._global_window_start >= 1.0:
+                self._global_window_start = now
+                self._global_count = 0
+            if self._global_count >= self._global_limit:
+                self.stats.preemptive_waits += 1
+                await self._sleep(self._global_window_start + 1.0 - now)
+                self._global_window_start = time.monotonic()
+                self._global_count = 0
+            self._global_count += 1
+
+    def _update_bucket(
+        self, route: str, major: str, bucket: _Bucket, response: httpx.Response
+    ) -> None:
+        """レスポンスヘッダーからバケットの状態を更新する。
+
+        初めてバケットのハッシュが分かったルートは、以降ハッシュのバケットを
+        使う (同じハッシュのバケットがなければ現在の状態を引き継ぐ)。
+        """
+        headers = response.headers
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if (
+            isinstance(bucket_hash, str)
+            and bucket_hash
+            and self._route_buckets.get(route) != bucket_hash
+        ):
+            self._route_buckets[route] = bucket_hash
+            bucket = self._buckets.setdefault(f"{bucket_hash}:{major}", bucket)
+
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset_after = _header_float(headers, "X-RateLimit-Reset-After")
+        if remaining is not None:
+            bucket.remaining = int(remaining)
+        if reset_after is not None:
+            bucket.reset_at = time.monotonic() + reset_after
+
+    def _retry_after(self, response: httpx.Response) -> tuple[float, bool]:
+        """429 レスポンスから待機秒数とグローバルかどうかを取得する。"""
+        retry_after = _header_float(response.headers, "Retry-After")
+        is_global = response.headers.get("X-RateLimit-Global") == "true"
+        try:
+            data = response.json() if response.content else {}
+        except ValueError:
+            data = {}
+        if isinstance(data, dict):
+            if retry_after is None and "retry_after" in data:
+                retry_after = float(data["retry_after"])
+            is_global = is_global or bool(data.get("global"))
+        return (retry_after if retry_after is not None else 1.0), is_global
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """レート制限を守って Discord REST API にリクエストを送る。
+
+        Args:
+            client: HTTP クライアント
+            method: HTTP メソッド ("GET", "POST", "PUT", "PATCH", "DELETE")
+            url: リクエスト URL
+            **kwargs: ``client.<method>`` にそのまま渡す引数
+
+        Returns:
+            最終的なレスポンス (再送上限に達した場合は最後の 429 レスポンス)
+        """
+        started = time.monotonic()
+        try:
+            return await self._request(client, method, url, **kwargs)
+        finally:
+            DISCORD_REST_LATENCY.observe(
+                time.monotonic() - started, method=method.upper()
+            )
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        route, major = _route_key(method, url)
+        send = getattr(client, method.lower())
+
+        attempt = 0
+        while True:
+            bucket = self._bucket_for(route, major)
+            async with bucket.lock:
+                now = time.monotonic()
+                if bucket.remaining == 0 and now < bucket.reset_at:
+                    self.stats.preemptive_waits += 1
+                    logger.debug(
+                        "Rate limit bucket exhausted for %s, waiting %.2fs",
+                        route,
+                        bucket.reset_at - now,
+                    )
+                    await self._sleep(bucket.reset_at - now)
+                await self._wait_global()
+
+                self.stats.requests += 1
+                response: httpx.Response = await send(url, **kwargs)
+                self._update_bucket(route, major, bucket, response)
+
+                if response.status_code != 429:
+                    return response
+
+                retry_after, is_global = self._retry_after(response)
+                self.stats.rate_limited += 1
+                DISCORD_REST_RATE_LIMITED.inc(scope="global" if is_global else "bucket")
+                if is_global:
+                    self.stats.global_rate_limited += 1
+                    self._global_reset_at = time.monotonic() + retry_after
+                logger.warning(
+                    "Discord rate limited %s (global=%s, retry_after=%.2fs)",
+                    route,
+                    is_global,
+                    retry_after,
+                )
+                if attempt >= MAX_RATE_LIMIT_RETRIES:
+                    return response
+                attempt += 1
+                # 同じバケットの後続リクエストもこの待機の後に送る
+                if not is_global:
+                    await self._sleep(retry_after)
+            # グローバルの場合は _wait_global で全バケットが待機する
@@ -0,0 +1,97 @@
+"""Keyset (cursor) pagination for admin list endpoints.
+
+ログやチケットの一覧を (created_at, id) の新しい順にページ単位で返す。
+
+仕組み:
+  - 各ページの最後の行の (created_at, id) を ``next_cursor`` 文字列にして返す
+  - 次のページは ``WHERE (created_at, id) < (カーソルの値)`` で続きから読む。
+    OFFSET と違って読み飛ばす行がないため、何ページ目でもコストは同じ
+  - 各テーブルには絞り込み条件の列 + (created_at, id) の複合インデックスがあり、
+    インデックスを降順にたどって limit + 1 行読むだけで済む
+    (1 行多く読んで次のページがあるかを判定する)
+  - created_at が同じ行は id で順序を決めるため、ページの境目で行が
+    重複したり抜けたりしない
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.constants import LIST_PAGE_SIZE, LIST_PAGE_SIZE_MAX
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """(created_at, id) をカーソル文字列にする。"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """カーソル文字列を (created_at, id) に戻す。
+
+    Raises:
+        ValueError: カーソルの形式が正しくない場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, row_id = raw.rpartition("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+def clamp_page_size(limit: int) -> int:
+    """1 ページの件数を 1 〜 LIST_PAGE_SIZE_MAX に収める。"""
+    return max(1, min(limit, LIST_PAGE_SIZE_MAX))
+
+
+async def fetch_page[T](
+    db: AsyncSession,
+    query: Select[tuple[T]],
+    created_at: InstrumentedAttribute[datetime],
+    row_id: InstrumentedAttribute[int],
+    *,
+    cursor: str = "",
+    limit: int = LIST_PAGE_SIZE,
+) -> tuple[list[T], str | None]:
+    """query の結果を (created_at, id) の降順で 1 ページ分返す。
+
+    Args:
+        db: セッション
+        query: 絞り込み条件を付けた SELECT (並び順と件数はここで付ける)
+        created_at: 並び順に使う作成日時の列
+        row_id: 同じ作成日時の行の順序を決める主キーの列
+        cursor: 前のページの ``next_cursor`` (空なら最新から)
+        limit: 1 ページの件数 (LIST_PAGE_SIZE_MAX まで)
+
+    Returns:
+        tuple[list, str | None]: 行のリストと、次のページのカーソル
+        (最後のページなら None)
+
+    Raises:
+        ValueError: cursor の形式が正しくない場合
+    """
+    limit = clamp_page_size(limit)
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(created_at, row_id)
+            < tuple_(
+                literal(after_created_at, created_at.type),
+                literal(after_id, row_id.type),
+            )
+        )
+    query = query.order_by(created_at.desc(), row_id.desc()).limit(limit + 1)
+    rows = list((await db.execute(query)).scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last: Any = rows[-1]
+    return rows, encode_cursor(getattr(last, created_at.key), getattr(last, row_id.key))
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.web.db_helpers as _db
 import src.web.security as _security
+from src.constants import LIST_PAGE_SIZE
 from src.database.models import (
     AutoModBanList,
     AutoModConfig,
@@ -20,6 +21,7 @@ from src.database.models import (
 )
 from src.utils import get_resource_lock
 from src.web.jwt_auth import get_current_user_jwt
+from src.web.pagination import fetch_page
 
 router = APIRouter(prefix="/api/v1", tags=["api-automod"])
 
@@ -443,17 +445,33 @@ async def api_automod_form_data(
 
 @router.get("/automod/logs", response_model=None)
 async def api_automod_logs_list(
+    guild_id: str = "",
+    user_id: str = "",
+    cursor: str = "",
+    limit: int = LIST_PAGE_SIZE,
     user: dict[str, Any] | None = Depends(get_current_user_jwt),
-    db: AsyncSession = Depends(_db.get_db),
+    db: AsyncSession = Depends(_db.get_read_db),
 ) -> JSONResponse:
-    """List automod logs."""
+    """List automod logs, newest first, one page at a time."""
     if not user:
         return JSONResponse({"error": "Not authenticated"}, status_code=401)
 
-    result = await db.execute(
-        select(AutoModLog).order_by(AutoModLog.created_at.desc()).limit(100)
-    )
-    logs = list(result.scalars().all())
+    query = select(AutoModLog)
+    if guild_id:
+        query = query.where(AutoModLog.guild_id == guild_id)
+    if user_id:
+        query = query.where(AutoModLog.user_id == user_id)
+    try:
+        logs, next_cursor = await fetch_page(
+            db,
+            query,
+            AutoModLog.created_at,
+            AutoModLog.id,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError:
+        return JSONResponse({"error": "Invalid cursor"}, status_code=400)
     guilds_map, _ = await _db._get_discord_guilds_and_channels(db)
 
     return JSONResponse(
@@ -474,6 +492,7 @@ async def api_automod_logs_list(
                 for log in logs
             ],
             "guilds": guilds_map,
+            "next_cursor": next_cursor,
         }
     )
 
@@ -485,17 +504,28 @@ async def api_automod_logs_list(
 
 @router.get("/banlogs", response_model=None)
 async def api_banlogs_list(
+    guild_id: str = "",
+    user_id: str = "",
+    cursor: str = "",
+    limit: int = LIST_PAGE_SIZE,
     user: dict[str, Any] | None = Depends(get_current_user_jwt),
-    db: AsyncSession = Depends(_db.get_db),
+    db: AsyncSession = Depends(_db.get_read_db),
 ) -> JSONResponse:
-    """List ban logs."""
+    """List ban logs, newest first, one page at a time."""
     if not user:
         return JSONResponse({"error": "Not authenticated"}, status_code=401)
 
-    result = await db.execute(
-        select(BanLog).order_by(BanLog.created_at.desc()).limit(100)
-    )
-    logs = list(result.scalars().all())
+    query = select(BanLog)
+    if guild_id:
+        query = query.where(BanLog.guild_id == guild_id)
+    if user_id:
+        query = query.where(BanLog.user_id == user_id)
+    try:
+        logs, next_cursor = await fetch_page(
+            db, query, BanLog.created_at, BanLog.id, cursor=cursor, limit=limit
+        )
+    except ValueError:
+        return JSONResponse({"error": "Invalid cursor"}, status_code=400)
     guilds_map, _ = await _db._get_discord_guilds_and_channels(db)
 
     return JSONResponse(
@@ -515,6 +545,7 @@ async def api_banlogs_list(
                 for log in logs
             ],
             "guilds": guilds_map,
+            "next_cursor": next_cursor,
         }
     )
 
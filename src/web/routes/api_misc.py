@@ -13,8 +13,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.web.db_helpers as _db
 import src.web.security as _security
-from src.database.engine import check_database_connection
+from src.core.loop_monitor import LoopLagProbe
+from src.database.engine import (
+    check_database_connection,
+    engine,
+    read_engine,
+    replica_monitor,
+)
 from src.database.models import BotActivity, HealthConfig
+from src.database.pool import pool_status
 from src.utils import get_resource_lock
 from src.web.jwt_auth import get_current_user_jwt
 
@@ -27,11 +34,36 @@ router = APIRouter(prefix="/api/v1", tags=["api-misc"])
 
 
 @router.get("/health", response_model=None)
-async def api_health_check() -> JSONResponse:
-    """Health check endpoint."""
+async def api_health_check(request: Request) -> JSONResponse:
+    """Health check endpoint (with event loop lag and DB pool state of the web app).
+
+    ``web_event_loop`` is this web process's loop. The bot runs in another
+    process; its loop lag is shown in the heartbeat embed.
+    """
+    body: dict[str, Any] = {}
+    loop_probe = getattr(request.app.state, "loop_probe", None)
+    if isinstance(loop_probe, LoopLagProbe):
+        summary: dict[str, Any] = dict(loop_probe.summary().as_dict())
+        blocks = loop_probe.blocks
+        if blocks:
+            summary["last_block"] = {
+                "seconds": blocks[-1].seconds,
+                "at": blocks[-1].at.isoformat(),
+                "where": blocks[-1].where,
+            }
+        body["web_event_loop"] = summary
+    db_pool = pool_status(engine)
+    if db_pool is not None:
+        body["db_pool"] = db_pool
+    if replica_monitor is not None and read_engine is not None:
+        body["db_replica"] = {
+            **replica_monitor.status(),
+            "pool": pool_status(read_engine),
+        }
+
     if await check_database_connection():
-        return JSONResponse({"status": "ok"})
-    return JSONResponse({"status": "database unavailable"}, status_code=503)
+        return JSONResponse({"status": "ok", **body})
+    return JSONResponse({"status": "database unavailable", **body}, status_code=503)
 
 
 # =============================================================================
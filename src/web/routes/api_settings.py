@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import asdict
 from datetime import UTC, datetime
 from typing import Any
 
@@ -13,7 +14,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.web.db_helpers as _db
 import src.web.security as _security
-from src.constants import BCRYPT_MAX_PASSWORD_BYTES, PASSWORD_MIN_LENGTH
+from src.constants import (
+    BCRYPT_MAX_PASSWORD_BYTES,
+    PASSWORD_MIN_LENGTH,
+    RETENTION_DAYS_MAX,
+)
 from src.database.models import (
     BumpConfig,
     BumpReminder,
@@ -23,6 +28,10 @@ from src.database.models import (
     SiteSettings,
     StickyMessage,
 )
+from src.services.retention_service import (
+    RetentionPolicy,
+    update_retention_policy,
+)
 from src.utils import get_resource_lock, set_timezone_offset
 from src.web.jwt_auth import get_current_user_jwt
 
@@ -38,6 +47,16 @@ class _TimezoneRequest(BaseModel):
     timezone_offset: int
 
 
+class _RetentionRequest(BaseModel):
+    # 日数は None で無期限
+    automod_logs_days: int | None = None
+    ban_logs_days: int | None = None
+    intro_posts_days: int | None = None
+    ticket_transcripts_days: int | None = None
+    chat_role_progress_days: int | None = None
+    archive_logs: bool = False
+
+
 class _EmailRequest(BaseModel):
     new_email: str
 
@@ -73,7 +92,7 @@ async def api_settings_get(
     user: dict[str, Any] | None = Depends(get_current_user_jwt),
     db: AsyncSession = Depends(_db.get_db),
 ) -> JSONResponse:
-    """Return current settings (email, pending email, timezone)."""
+    """Return current settings (email, pending email, timezone, retention)."""
     if not user:
         return JSONResponse({"error": "Not authenticated"}, status_code=401)
 
@@ -89,6 +108,7 @@ async def api_settings_get(
             "email": admin.email,
             "pending_email": admin.pending_email,
             "timezone_offset": site.timezone_offset if site else 9,
+            "retention": asdict(RetentionPolicy.from_site_settings(site)),
         }
     )
 
@@ -133,6 +153,42 @@ async def api_settings_timezone(
     return JSONResponse({"ok": True})
 
 
+@router.put("/settings/retention", response_model=None)
+async def api_settings_retention(
+    request: Request,
+    body: _RetentionRequest,
+    user: dict[str, Any] | None = Depends(get_current_user_jwt),
+    db: AsyncSession = Depends(_db.get_db),
+) -> JSONResponse:
+    """Update per-table retention periods for log tables."""
+    if not user:
+        return JSONResponse({"error": "Not authenticated"}, status_code=401)
+
+    user_email = user.get("sub", "")
+    path = request.url.path
+
+    if _security.is_form_cooldown_active(user_email, path):
+        return JSONResponse({"error": "Too many requests"}, status_code=429)
+
+    policy = RetentionPolicy(**body.model_dump())
+    for name, value in asdict(policy).items():
+        if (
+            name.endswith("_days")
+            and value is not None
+            and not (1 <= value <= RETENTION_DAYS_MAX)
+        ):
+            return JSONResponse(
+                {"error": f"{name} must be between 1 and {RETENTION_DAYS_MAX}"},
+                status_code=400,
+            )
+
+    async with get_resource_lock("site_settings:update"):
+        await update_retention_policy(db, policy)
+        _security.record_form_submit(user_email, path)
+
+    return JSONResponse({"ok": True, "retention": asdict(policy)})
+
+
 @router.put("/settings/email", response_model=None)
 async def api_settings_email(
     request: Request,
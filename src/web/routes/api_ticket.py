@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 
 import src.web.db_helpers as _db
 import src.web.security as _security
+from src.constants import LIST_PAGE_SIZE
 from src.database.models import (
     Ticket,
     TicketCategory,
@@ -25,6 +26,7 @@ from src.web.discord_api import (
     post_ticket_panel_to_discord,
 )
 from src.web.jwt_auth import get_current_user_jwt
+from src.web.pagination import fetch_page
 
 router = APIRouter(prefix="/api/v1", tags=["api-tickets"])
 
@@ -50,6 +52,16 @@ def _serialize_ticket(ticket: Ticket) -> dict[str, Any]:
     }
 
 
+def _transcript_url(ticket: Ticket) -> str | None:
+    """クローズログに添付したトランスクリプトへの Discord リンク。"""
+    if not ticket.transcript_channel_id or not ticket.transcript_message_id:
+        return None
+    return (
+        f"https://discord.com/channels/{ticket.guild_id}/"
+        f"{ticket.transcript_channel_id}/{ticket.transcript_message_id}"
+    )
+
+
 def _serialize_panel(panel: TicketPanel) -> dict[str, Any]:
     return {
         "id": panel.id,
@@ -101,18 +113,30 @@ def _roles_payload(
 @router.get("/tickets", response_model=None)
 async def api_tickets_list(
     status: str = "",
+    guild_id: str = "",
+    user_id: str = "",
+    cursor: str = "",
+    limit: int = LIST_PAGE_SIZE,
     user: dict[str, Any] | None = Depends(get_current_user_jwt),
-    db: AsyncSession = Depends(_db.get_db),
+    db: AsyncSession = Depends(_db.get_read_db),
 ) -> JSONResponse:
-    """List tickets with optional status filter."""
+    """List tickets, newest first, with optional filters and cursor paging."""
     if not user:
         return JSONResponse({"error": "Not authenticated"}, status_code=401)
 
-    query = select(Ticket).order_by(Ticket.created_at.desc()).limit(100)
+    query = select(Ticket)
     if status:
         query = query.where(Ticket.status == status)
-    result = await db.execute(query)
-    tickets = list(result.scalars().all())
+    if guild_id:
+        query = query.where(Ticket.guild_id == guild_id)
+    if user_id:
+        query = query.where(Ticket.user_id == user_id)
+    try:
+        tickets, next_cursor = await fetch_page(
+            db, query, Ticket.created_at, Ticket.id, cursor=cursor, limit=limit
+        )
+    except ValueError:
+        return JSONResponse({"error": "Invalid cursor"}, status_code=400)
 
     guilds_map, _ = await _db._get_discord_guilds_and_channels(db)
 
@@ -120,6 +144,7 @@ async def api_tickets_list(
         {
             "tickets": [_serialize_ticket(t) for t in tickets],
             "guilds": guilds_map,
+            "next_cursor": next_cursor,
         }
     )
 
@@ -149,6 +174,8 @@ async def api_tickets_detail(
             "ticket": {
                 **_serialize_ticket(ticket),
                 "transcript": ticket.transcript,
+                "transcript_message_count": ticket.transcript_message_count,
+                "transcript_url": _transcript_url(ticket),
                 "form_answers": ticket.form_answers,
                 "category_id": ticket.category_id,
                 "category_name": category.name if category else "Unknown",
@@ -412,7 +412,7 @@ async def automod_toggle(
 @router.get("/automod/logs", response_model=None)
 async def automod_logs_view(
     user: dict[str, Any] | None = Depends(_app.get_current_user),
-    db: AsyncSession = Depends(_app.get_db),
+    db: AsyncSession = Depends(_app.get_read_db),
 ) -> Response:
     """AutoMod ログ一覧ページ。"""
     if not user:
@@ -435,7 +435,7 @@ async def automod_logs_view(
 @router.get("/banlogs", response_model=None)
 async def ban_logs_view(
     user: dict[str, Any] | None = Depends(_app.get_current_user),
-    db: AsyncSession = Depends(_app.get_db),
+    db: AsyncSession = Depends(_app.get_read_db),
 ) -> Response:
     """BAN ログ一覧ページ。"""
     if not user:
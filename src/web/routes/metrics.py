@@ -0,0 +1,26 @@
+"""Prometheus metrics endpoint for the web admin process."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from src.config import settings
+from src.constants import METRICS_CONTENT_TYPE
+from src.core.metrics import REGISTRY, is_authorized
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_model=None, include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    """Web プロセスのメトリクスを Prometheus のテキスト形式で返す。
+
+    Web 管理画面はインターネットに公開されるため、METRICS_TOKEN が
+    設定されていなければエンドポイントごと無効にする。
+    """
+    if not settings.metrics_token:
+        return Response(status_code=404)
+    if not is_authorized(request.headers.get("authorization"), settings.metrics_token):
+        return Response(status_code=401)
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
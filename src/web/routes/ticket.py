@@ -32,7 +32,7 @@ router = APIRouter()
 async def tickets_list(
     status: str = "",
     user: dict[str, Any] | None = Depends(_app.get_current_user),
-    db: AsyncSession = Depends(_app.get_db),
+    db: AsyncSession = Depends(_app.get_read_db),
 ) -> Response:
     """チケット一覧ページ。"""
     if not user:
@@ -337,6 +337,24 @@ def ticket_detail_page(
     transcript_html = ""
     if ticket.transcript:
         transcript_html = _render_discord_transcript(ticket.transcript)
+    elif ticket.transcript_message_id:
+        # 本文はクローズログの添付ファイルにある
+        jump_url = (
+            f"https://discord.com/channels/{escape(ticket.guild_id)}/"
+            f"{escape(ticket.transcript_channel_id or '')}/"
+            f"{escape(ticket.transcript_message_id)}"
+        )
+        message_count = ticket.transcript_message_count or 0
+        transcript_html = f"""
+        <div class="mt-6">
+            <h3 class="text-lg font-semibold mb-2">Transcript</h3>
+            <p class="text-gray-400 text-sm">
+                {message_count} messages, attached to the close log.
+                <a href="{jump_url}" class="text-blue-400 hover:underline"
+                   target="_blank" rel="noopener noreferrer">Open in Discord</a>
+            </p>
+        </div>
+        """
     elif ticket.status != "closed":
         transcript_html = """
         <div class="mt-6">
@@ -0,0 +1 @@
+"""Gateway event replay benchmarks."""
@@ -0,0 +1,10 @@
+"""``python -m tests.benchmarks`` でイベント再生ベンチマークを実行する。"""
+
+import os
+
+# src.config の読み込み前に設定する (tests/conftest.py と同じ)
+os.environ.setdefault("DISCORD_TOKEN", "benchmark-token")
+
+from tests.benchmarks.replay import main  # noqa: E402
+
+raise SystemExit(main())
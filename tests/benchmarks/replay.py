@@ -0,0 +1,943 @@
+"""Offline gateway event replay benchmark.
+
+Discord に接続せずに、ゲートウェイイベント (メッセージ・VC 状態更新・
+リアクション・メンバー参加) の列を本物の Cog に流し込み、Cog ごとの
+スループット・1 イベントあたりの DB クエリ数・p99 レイテンシを測る。
+sticky / automod / chatrole / role_panel / voice の性能改善を、
+デプロイ前に同じイベント列で比較するためのもの。
+
+仕組み:
+  - ``build_world`` で複数ギルド分の固定レイアウト (sticky チャンネル、
+    ChatRole 設定、AutoMod ルールと BAN リスト、リアクション式ロール
+    パネル、一時 VC) を作り、``seed_world`` で DB に投入する
+  - ``synthetic_events`` はシード付き乱数でイベント列を作る
+    (同じシードなら同じ列)。``dump_events`` / ``load_events`` で JSONL に
+    保存・読み込みできるので、記録したイベント列の再生にも使える
+  - Cog は各モジュールの ``setup()`` を ``FakeBot`` に対して呼んで読み込む
+    (本番と同じキャッシュのウォームアップを通る)。Discord のオブジェクトは
+    ``FakeDiscord`` が MagicMock で組み立て、API 呼び出しは AsyncMock で即座に返す
+  - DB は ``TEST_DATABASE_URL`` の PostgreSQL を使う。テーブルを作成・
+    TRUNCATE してから、``src`` 配下の ``async_session`` をベンチマーク用の
+    エンジンに差し替える (SQLite はモデルが PostgreSQL 固有の
+    ``INSERT ... ON CONFLICT`` を使うため対象外)
+  - メッセージは本物の ``MessageRouter`` に配り、他のイベントは各 Cog の
+    リスナーを順に呼ぶ。呼び出しごとの処理時間と、その中で実行された
+    SQL 文の数 (contextvar で Cog に帰属させる) を記録する。ハンドラーが
+    起動したバックグラウンドタスク (sticky の再投稿など) のクエリも
+    起動元の Cog に数え、最後にタスクの完了を待つ
+
+使い方::
+
+    python -m tests.benchmarks --events 5000 --guilds 3
+    python -m tests.benchmarks --record events.jsonl   # 生成した列を保存
+    python -m tests.benchmarks --replay events.jsonl   # 保存した列を再生
+
+TEST_DATABASE_URL の DB は作業用として TRUNCATE される (pytest と同じ扱い)。
+ロビー参加 (VC の作成) は Discord 側の処理が大半を占めるため対象外。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import importlib
+import itertools
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+from discord.ext import commands
+from sqlalchemy import event as sa_event
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.constants import (
+    DEFAULT_DB_MAX_OVERFLOW,
+    DEFAULT_DB_POOL_SIZE,
+    DEFAULT_TEST_DATABASE_URL,
+)
+from src.core.message_router import MessageRouter
+from src.database import engine as db_engine
+from src.database.models import (
+    AutoModBanList,
+    AutoModRule,
+    Base,
+    ChatRoleConfig,
+    Lobby,
+    RolePanel,
+    RolePanelItem,
+    StickyMessage,
+    VoiceSession,
+)
+from src.utils import normalize_emoji
+
+logger = logging.getLogger(__name__)
+
+# イベントの種類 (discord.py のイベント名から "on_" を除いたもの)
+MESSAGE = "message"
+VOICE_STATE_UPDATE = "voice_state_update"
+RAW_REACTION_ADD = "raw_reaction_add"
+MEMBER_JOIN = "member_join"
+
+# 合成イベント列の既定の比率
+DEFAULT_MIX: dict[str, float] = {
+    MESSAGE: 0.70,
+    VOICE_STATE_UPDATE: 0.15,
+    RAW_REACTION_ADD: 0.10,
+    MEMBER_JOIN: 0.05,
+}
+
+# 既定で読み込む Cog のモジュール
+DEFAULT_COGS = (
+    "src.cogs.sticky",
+    "src.cogs.automod",
+    "src.cogs.chatrole",
+    "src.cogs.role_panel",
+    "src.cogs.voice",
+)
+
+BOT_USER_ID = 1
+_GUILD_ID_BASE = 900_000_000_000_000_000
+_GUILD_ID_STRIDE = 1_000_000
+_PANEL_EMOJIS = ("🍎", "🍊", "🍇")
+# ハンドラーが起動したバックグラウンドタスクを待つ上限 (秒)
+_DRAIN_TIMEOUT_SECONDS = 10.0
+
+
+# =============================================================================
+# ワールド (ギルドのレイアウト) とイベント列
+# =============================================================================
+
+
+@dataclass(frozen=True, slots=True)
+class BenchGuild:
+    """ベンチマーク用ギルド 1 つ分のチャンネル・ロール・メンバーの ID。"""
+
+    id: int
+    text_channel_ids: tuple[int, ...]
+    sticky_channel_ids: tuple[int, ...]
+    chatrole_channel_id: int
+    chatrole_role_id: int
+    intro_channel_id: int
+    panel_channel_id: int
+    panel_message_id: int
+    panel_role_ids: tuple[int, ...]
+    lobby_channel_id: int
+    ephemeral_channel_ids: tuple[int, ...]
+    voice_channel_ids: tuple[int, ...]
+    member_ids: tuple[int, ...]
+    banned_user_ids: tuple[int, ...]
+    owner_id: int
+
+    @property
+    def role_ids(self) -> tuple[int, ...]:
+        return (self.chatrole_role_id, *self.panel_role_ids)
+
+    @property
+    def newcomer_id_base(self) -> int:
+        """member_join で参加する新規ユーザーの ID の起点。"""
+        return self.id + 100_000
+
+
+def build_world(guilds: int = 2, *, members: int = 200) -> tuple[BenchGuild, ...]:
+    """ギルドごとに同じ形のレイアウトを作る (ID は決定的)。"""
+    world = []
+    for index in range(guilds):
+        base = _GUILD_ID_BASE + index * _GUILD_ID_STRIDE
+        text_ids = tuple(base + 100 + k for k in range(20))
+        world.append(
+            BenchGuild(
+                id=base,
+                text_channel_ids=text_ids,
+                sticky_channel_ids=text_ids[:2],
+                chatrole_channel_id=text_ids[2],
+                chatrole_role_id=base + 800,
+                intro_channel_id=text_ids[3],
+                panel_channel_id=text_ids[4],
+                panel_message_id=base + 700,
+                panel_role_ids=tuple(base + 801 + k for k in range(3)),
+                lobby_channel_id=base + 500,
+                ephemeral_channel_ids=tuple(base + 510 + k for k in range(5)),
+                voice_channel_ids=tuple(base + 520 + k for k in range(3)),
+                member_ids=tuple(base + 10_000 + k for k in range(members)),
+                banned_user_ids=tuple(base + 90_000 + k for k in range(5)),
+                owner_id=base + 99_999,
+            )
+        )
+    return tuple(world)
+
+
+@dataclass(frozen=True, slots=True)
+class GatewayEvent:
+    """再生する 1 件のゲートウェイイベント。
+
+    ``channel_id`` はメッセージ/リアクションのチャンネル、VC 状態更新では
+    移動先の VC (0 は退出)。``before_channel_id`` は VC 状態更新の移動元。
+    """
+
+    kind: str
+    guild_id: int
+    user_id: int
+    channel_id: int = 0
+    before_channel_id: int = 0
+    message_id: int = 0
+    emoji: str = ""
+    bot: bool = False
+
+
+def synthetic_events(
+    count: int,
+    world: Iterable[BenchGuild],
+    *,
+    seed: int = 0,
+    mix: dict[str, float] | None = None,
+) -> list[GatewayEvent]:
+    """シード付き乱数でイベント列を作る。
+
+    VC 状態更新はユーザーごとの在室状態を追い、参加・移動・退出が
+    矛盾しない列にする。
+    """
+    guilds = list(world)
+    weights = mix or DEFAULT_MIX
+    kinds = list(weights)
+    rng = random.Random(seed)
+    in_voice: dict[tuple[int, int], int] = {}
+    newcomers = itertools.count()
+    events: list[GatewayEvent] = []
+
+    for _ in range(count):
+        kind = rng.choices(kinds, [weights[k] for k in kinds])[0]
+        guild = rng.choice(guilds)
+        if kind == MESSAGE:
+            events.append(
+                GatewayEvent(
+                    kind,
+                    guild.id,
+                    rng.choice(guild.member_ids),
+                    channel_id=rng.choice(guild.text_channel_ids),
+                    bot=rng.random() < 0.05,
+                )
+            )
+        elif kind == VOICE_STATE_UPDATE:
+            user_id = rng.choice(guild.member_ids)
+            before = in_voice.get((guild.id, user_id), 0)
+            if before and rng.random() < 0.6:
+                after = 0
+            else:
+                targets = guild.ephemeral_channel_ids + guild.voice_channel_ids
+                after = rng.choice([c for c in targets if c != before])
+            if after:
+                in_voice[(guild.id, user_id)] = after
+            else:
+                in_voice.pop((guild.id, user_id), None)
+            events.append(
+                GatewayEvent(
+                    kind,
+                    guild.id,
+                    user_id,
+                    channel_id=after,
+                    before_channel_id=before,
+                )
+            )
+        elif kind == RAW_REACTION_ADD:
+            on_panel = rng.random() < 0.7
+            events.append(
+                GatewayEvent(
+                    kind,
+                    guild.id,
+                    rng.choice(guild.member_ids),
+                    channel_id=guild.panel_channel_id,
+                    message_id=(
+                        guild.panel_message_id
+                        if on_panel
+                        else guild.id + 200_000 + rng.randrange(1000)
+                    ),
+                    emoji=rng.choice(_PANEL_EMOJIS),
+                )
+            )
+        else:
+            if rng.random() < 0.1:
+                user_id = rng.choice(guild.banned_user_ids)
+            else:
+                user_id = guild.newcomer_id_base + next(newcomers)
+            events.append(GatewayEvent(kind, guild.id, user_id))
+    return events
+
+
+def dump_events(path: Path, events: Iterable[GatewayEvent]) -> None:
+    """イベント列を JSONL で保存する。"""
+    with path.open("w", encoding="utf-8") as f:
+        for ev in events:
+            f.write(json.dumps(asdict(ev), ensure_ascii=False) + "\n")
+
+
+def load_events(path: Path) -> list[GatewayEvent]:
+    """JSONL のイベント列を読み込む。"""
+    with path.open(encoding="utf-8") as f:
+        return [GatewayEvent(**json.loads(line)) for line in f if line.strip()]
+
+
+# =============================================================================
+# DB
+# =============================================================================
+
+
+async def seed_world(
+    factory: async_sessionmaker[AsyncSession], world: Iterable[BenchGuild]
+) -> None:
+    """ワールドの設定 (sticky, ChatRole, AutoMod, ロールパネル, 一時 VC) を投入する。"""
+    # ルール作成前に参加したメンバーは自己紹介チェックの対象外になるため、
+    # 作成日時を過去にしておく (メッセージ投稿者は 30 日前に参加している)
+    created_at = datetime.now(UTC) - timedelta(days=1)
+    async with factory() as session:
+        for guild in world:
+            guild_id = str(guild.id)
+            lobby = Lobby(
+                guild_id=guild_id, lobby_channel_id=str(guild.lobby_channel_id)
+            )
+            panel = RolePanel(
+                guild_id=guild_id,
+                channel_id=str(guild.panel_channel_id),
+                message_id=str(guild.panel_message_id),
+                panel_type="reaction",
+                title="Roles",
+            )
+            session.add_all([lobby, panel])
+            await session.flush()
+
+            session.add_all(
+                VoiceSession(
+                    lobby_id=lobby.id,
+                    channel_id=str(channel_id),
+                    owner_id=str(guild.owner_id),
+                    name=f"vc-{channel_id}",
+                )
+                for channel_id in guild.ephemeral_channel_ids
+            )
+            session.add_all(
+                StickyMessage(
+                    channel_id=str(channel_id),
+                    guild_id=guild_id,
+                    message_id=str(channel_id + 1),
+                    message_type="text",
+                    title="",
+                    description="Please read the rules.",
+                    cooldown_seconds=0,
+                )
+                for channel_id in guild.sticky_channel_ids
+            )
+            session.add_all(
+                RolePanelItem(
+                    panel_id=panel.id,
+                    role_id=str(role_id),
+                    emoji=normalize_emoji(emoji),
+                    position=position,
+                )
+                for position, (role_id, emoji) in enumerate(
+                    zip(guild.panel_role_ids, _PANEL_EMOJIS, strict=True)
+                )
+            )
+            session.add(
+                ChatRoleConfig(
+                    guild_id=guild_id,
+                    channel_id=str(guild.chatrole_channel_id),
+                    role_id=str(guild.chatrole_role_id),
+                    threshold=3,
+                    created_at=created_at,
+                )
+            )
+            session.add_all(
+                [
+                    AutoModRule(
+                        guild_id=guild_id,
+                        rule_type="message_post",
+                        action="kick",
+                        threshold_seconds=300,
+                        created_at=created_at,
+                    ),
+                    AutoModRule(
+                        guild_id=guild_id,
+                        rule_type="vc_join",
+                        action="kick",
+                        threshold_seconds=300,
+                        created_at=created_at,
+                    ),
+                    AutoModRule(
+                        guild_id=guild_id,
+                        rule_type="msg_without_intro",
+                        action="kick",
+                        required_channel_id=str(guild.intro_channel_id),
+                        created_at=created_at,
+                    ),
+                ]
+            )
+            session.add_all(
+                AutoModBanList(guild_id=guild_id, user_id=str(user_id), reason="bench")
+                for user_id in guild.banned_user_ids
+            )
+        await session.commit()
+
+
+@contextlib.asynccontextmanager
+async def bench_database(
+    database_url: str | None = None,
+) -> AsyncIterator[tuple[AsyncEngine, async_sessionmaker[AsyncSession]]]:
+    """空のスキーマを用意し、``src`` の ``async_session`` をその DB に向ける。
+
+    プールは本番と同じ設定 (``DEFAULT_DB_POOL_SIZE``) にする。
+    """
+    url = database_url or os.environ.get("TEST_DATABASE_URL", DEFAULT_TEST_DATABASE_URL)
+    engine = create_async_engine(
+        url, pool_size=DEFAULT_DB_POOL_SIZE, max_overflow=DEFAULT_DB_MAX_OVERFLOW
+    )
+    truncate = text(
+        "TRUNCATE TABLE "
+        + ",".join(Base.metadata.tables.keys())
+        + " RESTART IDENTITY CASCADE"
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(truncate)
+        factory = db_engine.UnitOfWorkSessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        with _patched_async_session(factory):
+            yield engine, factory
+    finally:
+        await engine.dispose()
+
+
+@contextlib.contextmanager
+def _patched_async_session(factory: async_sessionmaker[AsyncSession]) -> Iterator[None]:
+    """``async_session`` を import した src 配下の全モジュールを差し替える。"""
+    original = db_engine.async_session
+    with contextlib.ExitStack() as stack:
+        for name, module in list(sys.modules.items()):
+            if name.startswith("src.") and (
+                getattr(module, "async_session", None) is original
+            ):
+                stack.enter_context(patch.object(module, "async_session", factory))
+        yield
+
+
+# =============================================================================
+# Discord のフェイク
+# =============================================================================
+
+
+class FakeDiscord:
+    """ワールドに対応する Discord のオブジェクト (MagicMock) を組み立てる。
+
+    ギルド・チャンネル・ロール・既存メンバーは最初に作って使い回す。
+    API 呼び出し (send, add_roles, ban など) は AsyncMock で即座に返る。
+    """
+
+    def __init__(self, world: Iterable[BenchGuild]) -> None:
+        self._channels: dict[int, MagicMock] = {}
+        self._roles: dict[int, MagicMock] = {}
+        self._members: dict[tuple[int, int], MagicMock] = {}
+        self._sent_ids = itertools.count(1)
+        self._member_joined_at = datetime.now(UTC) - timedelta(days=30)
+        self._guilds = {g.id: self._make_guild(g) for g in world}
+
+    def guild(self, guild_id: int) -> MagicMock | None:
+        return self._guilds.get(guild_id)
+
+    def channel(self, channel_id: int) -> MagicMock | None:
+        return self._channels.get(channel_id)
+
+    def member(
+        self, guild_id: int, user_id: int, *, joined_at: datetime | None = None
+    ) -> MagicMock:
+        """メンバーを返す (初出なら作る)。"""
+        key = (guild_id, user_id)
+        member = self._members.get(key)
+        if member is None:
+            member = self._members[key] = self._make_member(
+                self._guilds[guild_id], user_id, joined_at or self._member_joined_at
+            )
+        return member
+
+    # --- イベント引数 ---------------------------------------------------------
+
+    def message(self, ev: GatewayEvent) -> MagicMock:
+        message = MagicMock(spec=discord.Message)
+        message.id = next(self._sent_ids)
+        message.type = discord.MessageType.default
+        message.created_at = datetime.now(UTC)
+        message.guild = self._guilds[ev.guild_id]
+        message.channel = self._channels[ev.channel_id]
+        author = self.member(ev.guild_id, ev.user_id)
+        author.bot = ev.bot
+        message.author = author
+        return message
+
+    def voice_state_update(
+        self, ev: GatewayEvent
+    ) -> tuple[MagicMock, MagicMock, MagicMock]:
+        member = self.member(ev.guild_id, ev.user_id)
+        before = MagicMock(spec=discord.VoiceState)
+        before.channel = self._channels.get(ev.before_channel_id)
+        after = MagicMock(spec=discord.VoiceState)
+        after.channel = self._channels.get(ev.channel_id)
+        member.voice = after if after.channel is not None else None
+        return member, before, after
+
+    def raw_reaction_add(self, ev: GatewayEvent) -> MagicMock:
+        payload = MagicMock(spec=discord.RawReactionActionEvent)
+        payload.guild_id = ev.guild_id
+        payload.channel_id = ev.channel_id
+        payload.message_id = ev.message_id
+        payload.user_id = ev.user_id
+        payload.emoji = discord.PartialEmoji(name=ev.emoji)
+        payload.event_type = "REACTION_ADD"
+        self.member(ev.guild_id, ev.user_id)
+        return payload
+
+    def member_join(self, ev: GatewayEvent) -> MagicMock:
+        return self.member(ev.guild_id, ev.user_id, joined_at=datetime.now(UTC))
+
+    # --- 組み立て -------------------------------------------------------------
+
+    def _make_guild(self, layout: BenchGuild) -> MagicMock:
+        guild = MagicMock(spec=discord.Guild)
+        guild.id = layout.id
+        guild.name = f"guild-{layout.id}"
+        guild.ban = AsyncMock()
+        guild.fetch_member = AsyncMock(side_effect=discord.NotFound(MagicMock(), ""))
+        for channel_id in layout.text_channel_ids:
+            self._channels[channel_id] = self._make_text_channel(guild, channel_id)
+        owner = self._make_member(guild, layout.owner_id, self._member_joined_at)
+        self._members[(layout.id, layout.owner_id)] = owner
+        for channel_id in (
+            layout.lobby_channel_id,
+            *layout.ephemeral_channel_ids,
+            *layout.voice_channel_ids,
+        ):
+            self._channels[channel_id] = self._make_voice_channel(
+                guild, channel_id, [owner]
+            )
+        for role_id in layout.role_ids:
+            role = MagicMock(spec=discord.Role)
+            role.id = role_id
+            role.name = f"role-{role_id}"
+            self._roles[role_id] = role
+        guild.get_channel.side_effect = self._channels.get
+        guild.get_role.side_effect = self._roles.get
+        guild.get_member.side_effect = lambda user_id: self._members.get(
+            (layout.id, user_id)
+        )
+        return guild
+
+    def _make_text_channel(self, guild: MagicMock, channel_id: int) -> MagicMock:
+        channel = MagicMock(spec=discord.TextChannel)
+        channel.id = channel_id
+        channel.guild = guild
+        channel.send = AsyncMock(side_effect=self._sent_message)
+        channel.fetch_message = AsyncMock(side_effect=self._fetched_message)
+        return channel
+
+    def _make_voice_channel(
+        self, guild: MagicMock, channel_id: int, members: list[MagicMock]
+    ) -> MagicMock:
+        channel = MagicMock(spec=discord.VoiceChannel)
+        channel.id = channel_id
+        channel.guild = guild
+        channel.category = None
+        # 所有者が常に在室しているので、一時 VC が空になって削除されることはない
+        channel.members = members
+        channel.overwrites_for.return_value = discord.PermissionOverwrite()
+        return channel
+
+    def _make_member(
+        self, guild: MagicMock, user_id: int, joined_at: datetime
+    ) -> MagicMock:
+        member = MagicMock(spec=discord.Member)
+        member.id = user_id
+        member.bot = False
+        member.guild = guild
+        member.name = member.display_name = f"user-{user_id}"
+        member.joined_at = joined_at
+        member.created_at = joined_at - timedelta(days=365)
+        member.roles = []
+        member.voice = None
+        member.display_avatar = None
+        member.guild_permissions = discord.Permissions.none()
+        for method in ("add_roles", "remove_roles", "kick", "ban", "timeout", "send"):
+            setattr(member, method, AsyncMock())
+        member.move_to = AsyncMock()
+        return member
+
+    async def _sent_message(self, *_args: Any, **_kwargs: Any) -> MagicMock:
+        message = MagicMock(spec=discord.Message)
+        message.id = next(self._sent_ids)
+        return message
+
+    async def _fetched_message(self, message_id: int) -> MagicMock:
+        message = MagicMock(spec=discord.Message)
+        message.id = message_id
+        message.delete = AsyncMock()
+        message.remove_reaction = AsyncMock()
+        return message
+
+
+class FakeBot:
+    """Cog の ``setup()`` が必要とする範囲だけの Bot。
+
+    Discord には接続しない。``wait_until_ready`` は返らないので、
+    Cog の定期タスクは before_loop で待機したままになる
+    (ベンチマーク中に定期同期のクエリが混ざらない)。
+    """
+
+    def __init__(self, fake: FakeDiscord, *, user_id: int = BOT_USER_ID) -> None:
+        self.fake = fake
+        self.user = MagicMock(spec=discord.ClientUser)
+        self.user.id = user_id
+        self.user.bot = True
+        self.cogs: dict[str, commands.Cog] = {}
+        self.message_router = MessageRouter(self)  # type: ignore[arg-type]
+        self._ready = asyncio.Event()
+
+    async def add_cog(self, cog: commands.Cog, /, **_kwargs: Any) -> None:
+        self.cogs[cog.qualified_name] = cog
+        await cog.cog_load()
+
+    async def close(self) -> None:
+        """読み込んだ Cog を逆順にアンロードする。"""
+        for name in reversed(list(self.cogs)):
+            cog = self.cogs.pop(name)
+            try:
+                await cog.cog_unload()
+            except Exception:
+                logger.exception("Failed to unload %s", name)
+
+    def get_cog(self, name: str) -> commands.Cog | None:
+        return self.cogs.get(name)
+
+    def get_guild(self, guild_id: int) -> MagicMock | None:
+        return self.fake.guild(guild_id)
+
+    def get_channel(self, channel_id: int) -> MagicMock | None:
+        return self.fake.channel(channel_id)
+
+    def add_dynamic_items(self, *_items: Any) -> None:
+        pass
+
+    def remove_dynamic_items(self, *_items: Any) -> None:
+        pass
+
+    def add_view(self, *_args: Any, **_kwargs: Any) -> None:
+        pass
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    async def wait_until_ready(self) -> None:
+        await self._ready.wait()
+
+
+# =============================================================================
+# 計測
+# =============================================================================
+
+# 実行中のハンドラーの SQL 文カウンター (ハンドラーが起動したタスクにも引き継がれる)
+_query_counter: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "bench_query_counter", default=None
+)
+
+
+def _percentile(sorted_samples: list[float], q: int) -> float:
+    if not sorted_samples:
+        return 0.0
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    return statistics.quantiles(sorted_samples, n=100, method="inclusive")[q - 1]
+
+
+@dataclass(slots=True)
+class _HandlerRecord:
+    samples: list[float] = field(default_factory=list)
+    errors: int = 0
+    queries: list[int] = field(default_factory=lambda: [0])
+
+
+@dataclass(frozen=True, slots=True)
+class HandlerReport:
+    """1 つの (Cog, イベント) の計測結果 (秒)。"""
+
+    cog: str
+    event: str
+    calls: int
+    errors: int
+    queries: int
+    busy_seconds: float
+    p50: float
+    p99: float
+    max: float
+
+    @property
+    def queries_per_call(self) -> float:
+        return self.queries / self.calls if self.calls else 0.0
+
+    @property
+    def calls_per_second(self) -> float:
+        """ハンドラーの処理時間だけで見た 1 秒あたりの処理件数。"""
+        return self.calls / self.busy_seconds if self.busy_seconds else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class BenchReport:
+    """ベンチマーク 1 回分の結果。
+
+    ``seconds`` はイベントの配信にかかった時間の合計 (イベント引数の
+    組み立ては含まない)。``queries`` はハンドラーに帰属しないクエリも含む。
+    """
+
+    events: int
+    seconds: float
+    queries: int
+    handlers: tuple[HandlerReport, ...]
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+    def handler(self, cog: str, event: str) -> HandlerReport | None:
+        return next(
+            (h for h in self.handlers if h.cog == cog and h.event == event), None
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "events": self.events,
+            "seconds": self.seconds,
+            "events_per_second": self.events_per_second,
+            "queries": self.queries,
+            "handlers": [
+                {
+                    **asdict(h),
+                    "queries_per_call": h.queries_per_call,
+                    "calls_per_second": h.calls_per_second,
+                }
+                for h in self.handlers
+            ],
+        }
+
+    def format_table(self) -> str:
+        lines = [
+            f"{'cog':<14} {'event':<22} {'calls':>6} {'err':>4} {'q/call':>7} "
+            f"{'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        ]
+        for h in self.handlers:
+            lines.append(
+                f"{h.cog:<14} {h.event:<22} {h.calls:>6} {h.errors:>4} "
+                f"{h.queries_per_call:>7.2f} {h.calls_per_second:>9.0f} "
+                f"{h.p50 * 1000:>8.2f} {h.p99 * 1000:>8.2f} {h.max * 1000:>8.2f}"
+            )
+        per_event = self.queries / self.events if self.events else 0.0
+        lines.append(
+            f"events={self.events} seconds={self.seconds:.3f} "
+            f"events/s={self.events_per_second:.0f} "
+            f"queries={self.queries} ({per_event:.2f}/event)"
+        )
+        return "\n".join(lines)
+
+
+class BenchRecorder:
+    """(Cog, イベント) ごとの処理時間・例外数・SQL 文の数を記録する。"""
+
+    def __init__(self) -> None:
+        self._records: dict[tuple[str, str], _HandlerRecord] = {}
+        self._unattributed = [0]
+
+    def count_query(self, *_args: Any) -> None:
+        """SQLAlchemy の before_cursor_execute から呼ばれる。"""
+        counter = _query_counter.get()
+        (counter if counter is not None else self._unattributed)[0] += 1
+
+    async def call(
+        self,
+        cog: str,
+        event: str,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> None:
+        """ハンドラーを 1 回呼んで記録する (例外はログに出して数える)。"""
+        record = self._records.get((cog, event))
+        if record is None:
+            record = self._records[(cog, event)] = _HandlerRecord()
+        token = _query_counter.set(record.queries)
+        started = time.perf_counter()
+        try:
+            await func(*args)
+        except Exception:
+            record.errors += 1
+            logger.exception("Handler %s.%s failed", cog, event)
+        finally:
+            record.samples.append(time.perf_counter() - started)
+            _query_counter.reset(token)
+
+    def wrap(
+        self, cog: str, event: str, func: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[None]]:
+        async def wrapper(*args: Any) -> None:
+            await self.call(cog, event, func, *args)
+
+        return wrapper
+
+    def report(self, events: int, seconds: float) -> BenchReport:
+        handlers = []
+        for (cog, event), record in sorted(self._records.items()):
+            samples = sorted(record.samples)
+            handlers.append(
+                HandlerReport(
+                    cog=cog,
+                    event=event,
+                    calls=len(samples),
+                    errors=record.errors,
+                    queries=record.queries[0],
+                    busy_seconds=sum(samples),
+                    p50=_percentile(samples, 50),
+                    p99=_percentile(samples, 99),
+                    max=samples[-1] if samples else 0.0,
+                )
+            )
+        queries = self._unattributed[0] + sum(h.queries for h in handlers)
+        return BenchReport(events, seconds, queries, tuple(handlers))
+
+
+# =============================================================================
+# 再生
+# =============================================================================
+
+
+def _listeners(bot: FakeBot) -> dict[str, list[tuple[str, Callable[..., Any]]]]:
+    """イベント名 → (Cog 名, リスナー) の一覧。"""
+    table: dict[str, list[tuple[str, Callable[..., Any]]]] = {}
+    for cog in bot.cogs.values():
+        for name, method in cog.get_listeners():
+            table.setdefault(name, []).append((cog.qualified_name, method))
+    return table
+
+
+async def replay(
+    events: Iterable[GatewayEvent],
+    world: Iterable[BenchGuild],
+    *,
+    cogs: Iterable[str] = DEFAULT_COGS,
+    database_url: str | None = None,
+) -> BenchReport:
+    """イベント列を Cog に流し、(Cog, イベント) ごとの計測結果を返す。"""
+    world = tuple(world)
+    modules = [importlib.import_module(name) for name in cogs]
+    fake = FakeDiscord(world)
+    bot = FakeBot(fake)
+    recorder = BenchRecorder()
+
+    async with bench_database(database_url) as (engine, factory):
+        await seed_world(factory, world)
+        for module in modules:
+            await module.setup(bot)
+        for route in bot.message_router.routes:
+            owner = getattr(route.handler, "__self__", None)
+            name = owner.qualified_name if owner is not None else route.name
+            route.handler = recorder.wrap(name, "on_message", route.handler)
+        listeners = _listeners(bot)
+        # ここより前 (投入・キャッシュのウォームアップ) のクエリは数えない
+        sa_event.listen(
+            engine.sync_engine, "before_cursor_execute", recorder.count_query
+        )
+        baseline = asyncio.all_tasks()
+
+        count = 0
+        seconds = 0.0
+        try:
+            for ev in events:
+                count += 1
+                if ev.kind == MESSAGE:
+                    message = fake.message(ev)
+                    started = time.perf_counter()
+                    await bot.message_router.dispatch(message)
+                    seconds += time.perf_counter() - started
+                    continue
+                args = getattr(fake, ev.kind)(ev)
+                if not isinstance(args, tuple):
+                    args = (args,)
+                event_name = f"on_{ev.kind}"
+                started = time.perf_counter()
+                for cog_name, method in listeners.get(event_name, ()):
+                    await recorder.call(cog_name, event_name, method, *args)
+                seconds += time.perf_counter() - started
+
+            # ハンドラーが起動したタスク (sticky の再投稿など) の完了を待つ
+            started = time.perf_counter()
+            pending = asyncio.all_tasks() - baseline - {asyncio.current_task()}
+            if pending:
+                await asyncio.wait(pending, timeout=_DRAIN_TIMEOUT_SECONDS)
+            seconds += time.perf_counter() - started
+        finally:
+            sa_event.remove(
+                engine.sync_engine, "before_cursor_execute", recorder.count_query
+            )
+            await bot.close()
+
+    return recorder.report(count, seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """コマンドラインから実行する。"""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Replay gateway events through the cogs and report latency.",
+    )
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--guilds", type=int, default=2)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", type=Path, help="write the generated stream")
+    parser.add_argument("--replay", type=Path, help="replay a recorded stream")
+    parser.add_argument("--database-url", help="defaults to TEST_DATABASE_URL")
+    parser.add_argument("--cog", action="append", help="cog module to load")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    world = build_world(args.guilds, members=args.members)
+    if args.replay:
+        events = load_events(args.replay)
+    else:
+        events = synthetic_events(args.events, world, seed=args.seed)
+    if args.record:
+        dump_events(args.record, events)
+
+    report = asyncio.run(
+        replay(
+            events,
+            world,
+            cogs=args.cog or DEFAULT_COGS,
+            database_url=args.database_url,
+        )
+    )
+    print(
+        json.dumps(report.as_dict(), indent=2) if args.json else report.format_table()
+    )
+    return 0
@@ -0,0 +1,173 @@
+"""Tests for the gateway event replay benchmark harness."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from tests.benchmarks.replay import (
+    MEMBER_JOIN,
+    MESSAGE,
+    RAW_REACTION_ADD,
+    VOICE_STATE_UPDATE,
+    BenchRecorder,
+    build_world,
+    dump_events,
+    load_events,
+    replay,
+    synthetic_events,
+)
+
+
+class TestSyntheticEvents:
+    """Tests for synthetic_events."""
+
+    def test_same_seed_same_stream(self) -> None:
+        world = build_world(2)
+        assert synthetic_events(200, world, seed=7) == synthetic_events(
+            200, world, seed=7
+        )
+
+    def test_different_seed_different_stream(self) -> None:
+        world = build_world(2)
+        assert synthetic_events(200, world, seed=1) != synthetic_events(
+            200, world, seed=2
+        )
+
+    def test_covers_every_kind(self) -> None:
+        events = synthetic_events(500, build_world(1))
+        assert {e.kind for e in events} == {
+            MESSAGE,
+            VOICE_STATE_UPDATE,
+            RAW_REACTION_ADD,
+            MEMBER_JOIN,
+        }
+
+    def test_mix_restricts_kinds(self) -> None:
+        events = synthetic_events(50, build_world(1), mix={MESSAGE: 1.0})
+        assert {e.kind for e in events} == {MESSAGE}
+
+    def test_voice_updates_follow_membership(self) -> None:
+        """退出・移動は直前に参加した VC からになる。"""
+        location: dict[tuple[int, int], int] = {}
+        events = synthetic_events(
+            1000, build_world(2), mix={VOICE_STATE_UPDATE: 1.0}, seed=3
+        )
+        for ev in events:
+            key = (ev.guild_id, ev.user_id)
+            assert ev.before_channel_id == location.get(key, 0)
+            assert ev.channel_id != ev.before_channel_id
+            location[key] = ev.channel_id
+
+    def test_events_stay_inside_world(self) -> None:
+        world = build_world(3)
+        guild_ids = {g.id for g in world}
+        assert all(
+            e.guild_id in guild_ids for e in synthetic_events(300, world, seed=5)
+        )
+
+
+class TestEventFiles:
+    """Tests for dump_events / load_events."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        events = synthetic_events(100, build_world(2), seed=4)
+        path = tmp_path / "events.jsonl"
+        dump_events(path, events)
+        assert load_events(path) == events
+
+    def test_skips_blank_lines(self, tmp_path: Path) -> None:
+        events = synthetic_events(3, build_world(1))
+        path = tmp_path / "events.jsonl"
+        dump_events(path, events)
+        path.write_text(path.read_text() + "\n\n")
+        assert load_events(path) == events
+
+
+class TestBenchRecorder:
+    """Tests for BenchRecorder."""
+
+    async def test_records_calls_and_errors(self) -> None:
+        recorder = BenchRecorder()
+
+        async def ok() -> None:
+            recorder.count_query()
+
+        async def fail() -> None:
+            raise RuntimeError("boom")
+
+        await recorder.call("Cog", "on_x", ok)
+        await recorder.call("Cog", "on_x", fail)
+        recorder.count_query()
+
+        report = recorder.report(events=2, seconds=0.5)
+        handler = report.handler("Cog", "on_x")
+        assert handler is not None
+        assert handler.calls == 2
+        assert handler.errors == 1
+        assert handler.queries == 1
+        # ハンドラー外のクエリも合計には含める
+        assert report.queries == 2
+        assert report.events_per_second == 4
+
+    def test_empty_report(self) -> None:
+        report = BenchRecorder().report(events=0, seconds=0.0)
+        assert report.handlers == ()
+        assert report.events_per_second == 0.0
+        assert "events=0" in report.format_table()
+
+
+class TestReplay:
+    """End-to-end replay through the real cogs (PostgreSQL required)."""
+
+    async def test_replay_reports_every_cog(self) -> None:
+        world = build_world(2, members=30)
+        events = synthetic_events(300, world, seed=11)
+
+        report = await replay(events, world)
+
+        assert report.events == 300
+        assert report.seconds > 0
+        assert {h.cog for h in report.handlers} == {
+            "AutoModCog",
+            "ChatRoleCog",
+            "RolePanelCog",
+            "StickyCog",
+            "VoiceCog",
+        }
+        assert all(h.errors == 0 for h in report.handlers)
+        assert report.queries > 0
+
+    async def test_cache_hits_cost_no_queries(self) -> None:
+        """ロールパネル以外のメッセージへのリアクションは DB を引かない。"""
+        world = build_world(1)
+        guild = world[0]
+        events = [
+            ev
+            for ev in synthetic_events(200, world, mix={RAW_REACTION_ADD: 1.0})
+            if ev.message_id != guild.panel_message_id
+        ]
+
+        report = await replay(events, world, cogs=["src.cogs.role_panel"])
+
+        handler = report.handler("RolePanelCog", "on_raw_reaction_add")
+        assert handler is not None
+        assert handler.calls == len(events)
+        assert handler.queries == 0
+
+    async def test_panel_reactions_query_db(self) -> None:
+        world = build_world(1)
+        guild = world[0]
+        events = [
+            ev
+            for ev in synthetic_events(20, world, mix={RAW_REACTION_ADD: 1.0})
+            if ev.message_id == guild.panel_message_id
+        ]
+
+        report = await replay(events, world, cogs=["src.cogs.role_panel"])
+
+        handler = report.handler("RolePanelCog", "on_raw_reaction_add")
+        assert handler is not None
+        assert handler.errors == 0
+        assert handler.queries_per_call >= 1
+        assert "RolePanelCog" in report.format_table()
+        assert report.as_dict()["handlers"][0]["cog"] == "RolePanelCog"
@@ -9,6 +9,7 @@ import pytest
 from discord.ext import commands
 
 from src.cogs.auto_reaction import AutoReactionCog
+from src.database.change_feed import ChangeBatch, ChangeEvent
 
 
 def _make_cog() -> AutoReactionCog:
@@ -44,24 +45,7 @@ def _make_message(
 
 
 class TestOnMessage:
-    """on_message イベントのテスト。"""
-
-    @pytest.mark.asyncio
-    async def test_ignores_bot_messages(self) -> None:
-        cog = _make_cog()
-        cog._configs = {"555": [discord.PartialEmoji.from_str("👍")]}
-        message = _make_message(is_bot=True)
-        await cog.on_message(message)
-        message.add_reaction.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_ignores_dm(self) -> None:
-        cog = _make_cog()
-        cog._configs = {"555": [discord.PartialEmoji.from_str("👍")]}
-        message = _make_message()
-        message.guild = None
-        await cog.on_message(message)
-        message.add_reaction.assert_not_called()
+    """handle_message (MessageRouter 経由) のテスト。"""
 
     @pytest.mark.asyncio
     async def test_no_op_when_cache_uninitialized(self) -> None:
@@ -69,7 +53,7 @@ class TestOnMessage:
         cog = _make_cog()
         assert cog._configs is None
         message = _make_message()
-        await cog.on_message(message)
+        await cog.handle_message(message)
         message.add_reaction.assert_not_called()
 
     @pytest.mark.asyncio
@@ -77,7 +61,7 @@ class TestOnMessage:
         cog = _make_cog()
         cog._configs = {"999": [discord.PartialEmoji.from_str("👍")]}
         message = _make_message(channel_id=555)
-        await cog.on_message(message)
+        await cog.handle_message(message)
         message.add_reaction.assert_not_called()
 
     @pytest.mark.asyncio
@@ -87,7 +71,7 @@ class TestOnMessage:
             "555": [discord.PartialEmoji.from_str(e) for e in ("👍", "❤️", "🎉")]
         }
         message = _make_message()
-        await cog.on_message(message)
+        await cog.handle_message(message)
 
         assert message.add_reaction.await_count == 3
         called = [c.args[0] for c in message.add_reaction.await_args_list]
@@ -100,7 +84,7 @@ class TestOnMessage:
             "555": [discord.PartialEmoji.from_str("<:custom:123456789012345678>")]
         }
         message = _make_message()
-        await cog.on_message(message)
+        await cog.handle_message(message)
 
         message.add_reaction.assert_awaited_once()
         emoji = message.add_reaction.await_args.args[0]
@@ -116,7 +100,7 @@ class TestOnMessage:
             "555": [discord.PartialEmoji.from_str("<a:dance:111222333444555666>")]
         }
         message = _make_message()
-        await cog.on_message(message)
+        await cog.handle_message(message)
 
         emoji = message.add_reaction.await_args.args[0]
         assert isinstance(emoji, discord.PartialEmoji)
@@ -134,7 +118,7 @@ class TestOnMessage:
                 None,
             ]
         )
-        await cog.on_message(message)
+        await cog.handle_message(message)
         assert message.add_reaction.await_count == 2
 
 
@@ -164,6 +148,44 @@ class TestRefreshCache:
         )
         assert [str(e) for e in cog._configs["555"]] == ["👍", "❤️"]
 
+    @pytest.mark.asyncio
+    async def test_db_change_reloads_cache(self) -> None:
+        """Web で設定が変更されたらキャッシュを再構築する。"""
+        cog = _make_cog()
+        batch = ChangeBatch(
+            events=(ChangeEvent("auto_reaction_configs", "update", "1", "2"),)
+        )
+        with patch(
+            "src.cogs.auto_reaction.get_enabled_auto_reaction_emoji_map",
+            new_callable=AsyncMock,
+            return_value={"555": ["👍"]},
+        ):
+            await cog.on_db_change(batch)
+        assert cog._configs is not None
+        assert [str(e) for e in cog._configs["555"]] == ["👍"]
+
+    @pytest.mark.asyncio
+    async def test_db_change_ignores_other_tables(self) -> None:
+        cog = _make_cog()
+        batch = ChangeBatch(events=(ChangeEvent("sticky_messages", "update", "1"),))
+        with patch(
+            "src.cogs.auto_reaction.get_enabled_auto_reaction_emoji_map",
+            new_callable=AsyncMock,
+        ) as mock_get:
+            await cog.on_db_change(batch)
+        mock_get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_db_change_error_is_swallowed(self) -> None:
+        cog = _make_cog()
+        with patch(
+            "src.cogs.auto_reaction.get_enabled_auto_reaction_emoji_map",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("DB error"),
+        ):
+            await cog.on_db_change(ChangeBatch(resync=True))
+        assert cog._configs is None
+
     @pytest.mark.asyncio
     async def test_before_loop_waits_until_ready(self) -> None:
         cog = _make_cog()
@@ -184,6 +206,29 @@ class TestCogLifecycle:
             await cog.cog_load()
             mock_start.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_cog_load_registers_message_route(self) -> None:
+        cog = _make_cog()
+        with patch.object(cog._refresh_cache, "start"):
+            await cog.cog_load()
+        router = cog.bot.message_router
+        assert router.routes == (cog._message_route,)
+
+        with patch.object(cog._refresh_cache, "is_running", return_value=False):
+            await cog.cog_unload()
+        assert router.routes == ()
+
+    @pytest.mark.asyncio
+    async def test_reload_routes_only_channels_with_emojis(self) -> None:
+        cog = _make_cog()
+        with patch(
+            "src.cogs.auto_reaction.get_enabled_auto_reaction_emoji_map",
+            new_callable=AsyncMock,
+            return_value={"555": ["👍"], "556": []},
+        ):
+            await cog._reload_configs()
+        assert cog._message_route.ids == frozenset({555})
+
     @pytest.mark.asyncio
     async def test_cog_unload_cancels_task(self) -> None:
         cog = _make_cog()
@@ -220,6 +265,7 @@ class TestCogLifecycle:
         cog = bot.add_cog.call_args.args[0]
         assert cog._configs is not None
         assert [str(e) for e in cog._configs["555"]] == ["👍"]
+        assert cog._message_route.ids == frozenset({555})
 
     @pytest.mark.asyncio
     async def test_setup_swallows_cache_init_error(self) -> None:
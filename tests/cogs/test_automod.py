@@ -11,7 +11,14 @@ import discord
 import pytest
 from discord.ext import commands
 
+from src.cogs._automod_rules import (
+    EMPTY_RULE_SET,
+    AutoModRuleCache,
+    CompiledRule,
+    GuildRuleSet,
+)
 from src.cogs.automod import AutoModCog
+from src.database.change_feed import ChangeBatch, ChangeEvent
 
 # ---------------------------------------------------------------------------
 # テスト用ヘルパー
@@ -88,6 +95,11 @@ def _make_rule(
     return rule
 
 
+def _compile(rule: MagicMock) -> CompiledRule:
+    """Compile a mock AutoModRule into the evaluator used by the cog."""
+    return CompiledRule.from_model(rule)
+
+
 def _make_interaction(*, guild_id: int = 789) -> MagicMock:
     """Create a mock Discord interaction."""
     interaction = MagicMock(spec=discord.Interaction)
@@ -110,7 +122,7 @@ class TestCheckUsernameMatch:
         cog = _make_cog()
         rule = _make_rule(pattern="spammer")
         member = _make_member(name="spammer")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched
         assert "exact match" in reason
 
@@ -118,14 +130,14 @@ class TestCheckUsernameMatch:
         cog = _make_cog()
         rule = _make_rule(pattern="SPAMMER")
         member = _make_member(name="spammer")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched
 
     def test_exact_no_match(self) -> None:
         cog = _make_cog()
         rule = _make_rule(pattern="spammer")
         member = _make_member(name="gooduser")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert not matched
 
     def test_exact_no_partial_match(self) -> None:
@@ -133,14 +145,14 @@ class TestCheckUsernameMatch:
         cog = _make_cog()
         rule = _make_rule(pattern="spam")
         member = _make_member(name="spammer123")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert not matched
 
     def test_wildcard_match(self) -> None:
         cog = _make_cog()
         rule = _make_rule(pattern="spam", use_wildcard=True)
         member = _make_member(name="totalspammer")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched
         assert "wildcard match" in reason
 
@@ -148,21 +160,21 @@ class TestCheckUsernameMatch:
         cog = _make_cog()
         rule = _make_rule(pattern="SPAM", use_wildcard=True)
         member = _make_member(name="totalspammer")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert matched
 
     def test_wildcard_no_match(self) -> None:
         cog = _make_cog()
         rule = _make_rule(pattern="badword", use_wildcard=True)
         member = _make_member(name="gooduser")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert not matched
 
     def test_no_pattern_returns_false(self) -> None:
         cog = _make_cog()
         rule = _make_rule(pattern=None)
         member = _make_member(name="testuser")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert not matched
 
 
@@ -177,7 +189,7 @@ class TestCheckAccountAge:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC) - timedelta(hours=1))
-        matched, reason = cog._check_account_age(rule, member)
+        matched, reason = cog._check_account_age(_compile(rule), member)
         assert matched
         assert "less than threshold" in reason
 
@@ -189,7 +201,7 @@ class TestCheckAccountAge:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC) - timedelta(days=30))
-        matched, _ = cog._check_account_age(rule, member)
+        matched, _ = cog._check_account_age(_compile(rule), member)
         assert not matched
 
     def test_no_threshold_returns_false(self) -> None:
@@ -200,7 +212,7 @@ class TestCheckAccountAge:
             pattern=None,
         )
         member = _make_member()
-        matched, _ = cog._check_account_age(rule, member)
+        matched, _ = cog._check_account_age(_compile(rule), member)
         assert not matched
 
 
@@ -228,7 +240,7 @@ class TestCheckRule:
         cog = _make_cog()
         rule = _make_rule(rule_type="username_match", pattern="baduser")
         member = _make_member(name="baduser")
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert matched
 
     def test_dispatches_account_age(self) -> None:
@@ -239,21 +251,21 @@ class TestCheckRule:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC) - timedelta(hours=1))
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert matched
 
     def test_dispatches_no_avatar(self) -> None:
         cog = _make_cog()
         rule = _make_rule(rule_type="no_avatar", pattern=None)
         member = _make_member(avatar=None)
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert matched
 
     def test_unknown_type_returns_false(self) -> None:
         cog = _make_cog()
         rule = _make_rule(rule_type="unknown_type", pattern=None)
         member = _make_member()
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert not matched
 
     def test_skips_role_acquired(self) -> None:
@@ -265,7 +277,7 @@ class TestCheckRule:
             pattern=None,
             threshold_seconds=10,
         )
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert not matched
 
     def test_skips_vc_join(self) -> None:
@@ -273,7 +285,7 @@ class TestCheckRule:
         cog = _make_cog()
         member = _make_member(joined_at=datetime.now(UTC) - timedelta(seconds=3))
         rule = _make_rule(rule_type="vc_join", pattern=None, threshold_seconds=60)
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert not matched
 
     def test_skips_message_post(self) -> None:
@@ -281,7 +293,7 @@ class TestCheckRule:
         cog = _make_cog()
         member = _make_member(joined_at=datetime.now(UTC) - timedelta(seconds=1))
         rule = _make_rule(rule_type="message_post", pattern=None, threshold_seconds=30)
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert not matched
 
     def test_skips_role_count(self) -> None:
@@ -289,7 +301,7 @@ class TestCheckRule:
         cog = _make_cog()
         member = _make_member()
         rule = _make_rule(rule_type="role_count", pattern=None, threshold_seconds=2)
-        matched, _ = cog._check_rule(rule, member)
+        matched, _ = cog._check_rule(_compile(rule), member)
         assert not matched
 
 
@@ -300,7 +312,7 @@ class TestCheckJoinTiming:
         cog = _make_cog()
         member = _make_member(joined_at=datetime.now(UTC) - timedelta(seconds=5))
         rule = _make_rule(rule_type="role_acquired", pattern=None, threshold_seconds=60)
-        matched, reason = cog._check_join_timing(rule, member)
+        matched, reason = cog._check_join_timing(_compile(rule), member)
         assert matched
         assert "threshold" in reason.lower()
 
@@ -308,21 +320,21 @@ class TestCheckJoinTiming:
         cog = _make_cog()
         member = _make_member(joined_at=datetime.now(UTC) - timedelta(hours=1))
         rule = _make_rule(rule_type="vc_join", pattern=None, threshold_seconds=60)
-        matched, _ = cog._check_join_timing(rule, member)
+        matched, _ = cog._check_join_timing(_compile(rule), member)
         assert not matched
 
     def test_no_threshold_returns_false(self) -> None:
         cog = _make_cog()
         member = _make_member(joined_at=datetime.now(UTC))
         rule = _make_rule(rule_type="vc_join", pattern=None, threshold_seconds=None)
-        matched, _ = cog._check_join_timing(rule, member)
+        matched, _ = cog._check_join_timing(_compile(rule), member)
         assert not matched
 
     def test_no_joined_at_returns_false(self) -> None:
         cog = _make_cog()
         member = _make_member(joined_at=None)
         rule = _make_rule(rule_type="vc_join", pattern=None, threshold_seconds=60)
-        matched, _ = cog._check_join_timing(rule, member)
+        matched, _ = cog._check_join_timing(_compile(rule), member)
         assert not matched
 
 
@@ -816,7 +828,7 @@ class TestAccountAgeBoundary:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC) - timedelta(hours=24))
-        matched, reason = cog._check_account_age(rule, member)
+        matched, reason = cog._check_account_age(_compile(rule), member)
         assert matched is False
         assert reason == ""
 
@@ -831,7 +843,7 @@ class TestAccountAgeBoundary:
         member = _make_member(
             created_at=datetime.now(UTC) - timedelta(hours=24) + timedelta(seconds=1)
         )
-        matched, reason = cog._check_account_age(rule, member)
+        matched, reason = cog._check_account_age(_compile(rule), member)
         assert matched is True
         assert "less than threshold" in reason
 
@@ -849,7 +861,7 @@ class TestUsernameMatchSpecialChars:
         cog = _make_cog()
         rule = _make_rule(pattern="user[bot]", use_wildcard=True)
         member = _make_member(name="user[bot]test")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched is True
         assert "wildcard match" in reason
 
@@ -858,7 +870,7 @@ class TestUsernameMatchSpecialChars:
         cog = _make_cog()
         rule = _make_rule(pattern="spam.bot", use_wildcard=True)
         member = _make_member(name="spamXbot")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched is False
         assert reason == ""
 
@@ -951,7 +963,7 @@ class TestUsernameMatchEdgeCases:
         cog = _make_cog()
         rule = _make_rule(pattern="")
         member = _make_member(name="testuser")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert not matched
 
     def test_unicode_pattern_exact_match(self) -> None:
@@ -959,7 +971,7 @@ class TestUsernameMatchEdgeCases:
         cog = _make_cog()
         rule = _make_rule(pattern="スパマー")
         member = _make_member(name="スパマー")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched is True
         assert "exact match" in reason
 
@@ -968,7 +980,7 @@ class TestUsernameMatchEdgeCases:
         cog = _make_cog()
         rule = _make_rule(pattern="スパム", use_wildcard=True)
         member = _make_member(name="テストスパム送信者123")
-        matched, reason = cog._check_username_match(rule, member)
+        matched, reason = cog._check_username_match(_compile(rule), member)
         assert matched is True
         assert "wildcard match" in reason
 
@@ -977,7 +989,7 @@ class TestUsernameMatchEdgeCases:
         cog = _make_cog()
         rule = _make_rule(pattern="スパム", use_wildcard=True)
         member = _make_member(name="正常ユーザー")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert matched is False
 
     def test_whitespace_pattern_no_match_without_wildcard(self) -> None:
@@ -985,7 +997,7 @@ class TestUsernameMatchEdgeCases:
         cog = _make_cog()
         rule = _make_rule(pattern="  ", use_wildcard=False)
         member = _make_member(name="user  name")
-        matched, _ = cog._check_username_match(rule, member)
+        matched, _ = cog._check_username_match(_compile(rule), member)
         assert matched is False
 
     def test_identical_name_case_variants(self) -> None:
@@ -994,7 +1006,7 @@ class TestUsernameMatchEdgeCases:
         rule = _make_rule(pattern="SpAmMeR")
         for name in ["spammer", "SPAMMER", "Spammer", "sPaMMeR"]:
             member = _make_member(name=name)
-            matched, _ = cog._check_username_match(rule, member)
+            matched, _ = cog._check_username_match(_compile(rule), member)
             assert matched is True
 
 
@@ -1010,7 +1022,7 @@ class TestAccountAgeEdgeCases:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC))
-        matched, reason = cog._check_account_age(rule, member)
+        matched, reason = cog._check_account_age(_compile(rule), member)
         assert matched is True
         assert "less than threshold" in reason
 
@@ -1023,7 +1035,7 @@ class TestAccountAgeEdgeCases:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC))
-        matched, _ = cog._check_account_age(rule, member)
+        matched, _ = cog._check_account_age(_compile(rule), member)
         assert matched is False
 
     def test_max_threshold_seconds(self) -> None:
@@ -1035,7 +1047,7 @@ class TestAccountAgeEdgeCases:
             pattern=None,
         )
         member = _make_member(created_at=datetime.now(UTC) - timedelta(days=13))
-        matched, _ = cog._check_account_age(rule, member)
+        matched, _ = cog._check_account_age(_compile(rule), member)
         assert matched is True
 
 
@@ -1848,7 +1860,7 @@ class TestOnVoiceStateUpdate:
 
 
 class TestOnMessage:
-    """on_message イベントのテスト。"""
+    """handle_message (MessageRouter 経由) のテスト。"""
 
     def _make_message(
         self,
@@ -1882,15 +1894,7 @@ class TestOnMessage:
         cog = _make_cog()
         msg = self._make_message(has_guild=False)
         with patch("src.cogs.automod.get_enabled_automod_rules_by_guild") as mock_get:
-            await cog.on_message(msg)
-            mock_get.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_bot_message_skips(self) -> None:
-        cog = _make_cog()
-        msg = self._make_message(is_bot=True)
-        with patch("src.cogs.automod.get_enabled_automod_rules_by_guild") as mock_get:
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock_get.assert_not_called()
 
     @pytest.mark.asyncio
@@ -1899,7 +1903,7 @@ class TestOnMessage:
         cog = _make_cog()
         msg = self._make_message(message_type=discord.MessageType.new_member)
         with patch("src.cogs.automod.get_enabled_automod_rules_by_guild") as mock_get:
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock_get.assert_not_called()
 
     @pytest.mark.asyncio
@@ -1913,7 +1917,7 @@ class TestOnMessage:
         msg.author = MagicMock(spec=discord.User)  # Not a Member
         msg.author.bot = False
         with patch("src.cogs.automod.get_enabled_automod_rules_by_guild") as mock_get:
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock_get.assert_not_called()
 
     @pytest.mark.asyncio
@@ -1930,7 +1934,7 @@ class TestOnMessage:
             new_callable=AsyncMock,
             return_value=[],
         ):
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
 
     @pytest.mark.asyncio
     async def test_matching_message_post_bans(self) -> None:
@@ -1950,7 +1954,7 @@ class TestOnMessage:
             ),
             patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock,
         ):
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock.assert_called_once()
 
     @pytest.mark.asyncio
@@ -1973,7 +1977,7 @@ class TestOnMessage:
             ),
             patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock,
         ):
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock.assert_not_called()
 
 
@@ -2136,7 +2140,7 @@ class TestCheckIntroMissing:
             pattern=None,
         )
         member = _make_member(joined_at=datetime.now(UTC))
-        matched, _ = await cog._check_intro_missing(rule, member)
+        matched, _ = await cog._check_intro_missing(_compile(rule), member)
         assert matched is False
 
     @pytest.mark.asyncio
@@ -2149,7 +2153,7 @@ class TestCheckIntroMissing:
             pattern=None,
         )
         member = _make_member(joined_at=None)
-        matched, _ = await cog._check_intro_missing(rule, member)
+        matched, _ = await cog._check_intro_missing(_compile(rule), member)
         assert matched is False
 
     @pytest.mark.asyncio
@@ -2165,7 +2169,7 @@ class TestCheckIntroMissing:
         member = _make_member(
             joined_at=datetime.now(UTC) - timedelta(days=7),
         )
-        matched, _ = await cog._check_intro_missing(rule, member)
+        matched, _ = await cog._check_intro_missing(_compile(rule), member)
         assert matched is False
 
     @pytest.mark.asyncio
@@ -2196,7 +2200,7 @@ class TestCheckIntroMissing:
                 return_value=config_mock,
             ),
         ):
-            matched, reason = await cog._check_intro_missing(rule, member)
+            matched, reason = await cog._check_intro_missing(_compile(rule), member)
         assert matched is True
         assert "#intro-channel" in reason
 
@@ -2242,7 +2246,7 @@ class TestCheckIntroMissing:
                 new_callable=AsyncMock,
             ) as mock_record,
         ):
-            matched, _ = await cog._check_intro_missing(rule, member)
+            matched, _ = await cog._check_intro_missing(_compile(rule), member)
         assert matched is False
         mock_record.assert_awaited_once()
 
@@ -2285,7 +2289,7 @@ class TestCheckIntroMissing:
                 return_value=config_mock,
             ),
         ):
-            matched, reason = await cog._check_intro_missing(rule, member)
+            matched, reason = await cog._check_intro_missing(_compile(rule), member)
         assert matched is True
         assert "#intro-channel" in reason
 
@@ -2305,7 +2309,7 @@ class TestCheckIntroMissing:
             new_callable=AsyncMock,
             return_value=True,
         ):
-            matched, _ = await cog._check_intro_missing(rule, member)
+            matched, _ = await cog._check_intro_missing(_compile(rule), member)
         assert matched is False
 
 
@@ -2431,7 +2435,7 @@ class TestMsgWithoutIntro:
             ),
             patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock_exec,
         ):
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock_exec.assert_called_once()
 
     @pytest.mark.asyncio
@@ -2461,7 +2465,7 @@ class TestMsgWithoutIntro:
             ),
             patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock_exec,
         ):
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock_exec.assert_not_called()
 
     @pytest.mark.asyncio
@@ -2489,7 +2493,7 @@ class TestMsgWithoutIntro:
             ) as mock_record,
             patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock_exec,
         ):
-            await cog.on_message(msg)
+            await cog.handle_message(msg)
             mock_record.assert_called_once()
             mock_exec.assert_not_called()
 
@@ -2817,7 +2821,7 @@ class TestCheckRoleCount:
             self._role(200, "B"),
             self._role(300, "C"),
         ]
-        matched, reason = cog._check_role_count(rule, member)
+        matched, reason = cog._check_role_count(_compile(rule), member)
         assert matched is True
         assert "3" in reason
 
@@ -2831,14 +2835,14 @@ class TestCheckRoleCount:
         )
         member = _make_member()
         member.roles = [self._role(100, "A")]
-        matched, _ = cog._check_role_count(rule, member)
+        matched, _ = cog._check_role_count(_compile(rule), member)
         assert matched is False
 
     def test_no_threshold_returns_false(self) -> None:
         cog = _make_cog()
         rule = _make_rule(rule_type="role_count", pattern=None, threshold_seconds=None)
         member = _make_member()
-        matched, _ = cog._check_role_count(rule, member)
+        matched, _ = cog._check_role_count(_compile(rule), member)
         assert matched is False
 
     def test_no_target_role_ids_returns_false(self) -> None:
@@ -2852,7 +2856,7 @@ class TestCheckRoleCount:
         )
         member = _make_member()
         member.roles = [self._role(100, "A")]
-        matched, _ = cog._check_role_count(rule, member)
+        matched, _ = cog._check_role_count(_compile(rule), member)
         assert matched is False
 
     def test_exact_boundary_matches(self) -> None:
@@ -2870,7 +2874,7 @@ class TestCheckRoleCount:
             self._role(200, "B"),
             self._role(300, "C"),
         ]
-        matched, _ = cog._check_role_count(rule, member)
+        matched, _ = cog._check_role_count(_compile(rule), member)
         assert matched is True
 
     def test_one_below_boundary_no_match(self) -> None:
@@ -2884,7 +2888,7 @@ class TestCheckRoleCount:
         )
         member = _make_member()
         member.roles = [self._role(100, "A"), self._role(200, "B")]
-        matched, _ = cog._check_role_count(rule, member)
+        matched, _ = cog._check_role_count(_compile(rule), member)
         assert matched is False
 
     def test_reason_includes_role_names(self) -> None:
@@ -2898,7 +2902,7 @@ class TestCheckRoleCount:
         )
         member = _make_member()
         member.roles = [self._role(100, "VIP"), self._role(999, "Other")]
-        matched, reason = cog._check_role_count(rule, member)
+        matched, reason = cog._check_role_count(_compile(rule), member)
         assert matched is True
         assert "VIP" in reason
 
@@ -2914,7 +2918,7 @@ class TestCheckRoleCount:
         member = _make_member()
         # target外のロール999を持っていてもカウントされない
         member.roles = [self._role(100, "A"), self._role(999, "X")]
-        matched, _ = cog._check_role_count(rule, member)
+        matched, _ = cog._check_role_count(_compile(rule), member)
         assert matched is False
 
 
@@ -3025,7 +3029,7 @@ class TestOnMemberUpdateRoleCount:
             await cog.on_member_update(before, after)
             # role_acquired が先にマッチし、1回だけ呼ばれる
             mock.assert_called_once()
-            assert mock.call_args[0][1] == rule_timing
+            assert mock.call_args[0][1].id == rule_timing.id
 
     @pytest.mark.asyncio
     async def test_role_count_fires_when_role_acquired_not_matched(self) -> None:
@@ -3063,7 +3067,7 @@ class TestOnMemberUpdateRoleCount:
         ):
             await cog.on_member_update(before, after)
             mock.assert_called_once()
-            assert mock.call_args[0][1] == rule_count
+            assert mock.call_args[0][1].id == rule_count.id
 
 
 # ---------------------------------------------------------------------------
@@ -3192,3 +3196,341 @@ class TestAutomodListRoleCountDisplay:
             field_values = [f.value for f in embed.fields]
             assert any("5個以上" in v for v in field_values)
             assert any("5ロール" in v for v in field_values)
+
+
+# ---------------------------------------------------------------------------
+# ルールキャッシュ
+# ---------------------------------------------------------------------------
+
+
+def _make_session_ctx() -> MagicMock:
+    ctx = MagicMock()
+    ctx.__aenter__ = AsyncMock(return_value=MagicMock())
+    ctx.__aexit__ = AsyncMock(return_value=None)
+    return ctx
+
+
+class TestCompiledRule:
+    """CompiledRule / GuildRuleSet の前処理テスト。"""
+
+    def test_target_role_ids_are_presplit(self) -> None:
+        rule = _compile(
+            _make_rule(
+                rule_type="role_count", pattern=None, target_role_ids=" 1, 2,,3 "
+            )
+        )
+        assert rule.target_role_ids == frozenset({"1", "2", "3"})
+
+    def test_username_pattern_is_lowercased_literal(self) -> None:
+        rule = _compile(_make_rule(pattern="A.B", use_wildcard=True))
+        assert rule.username_pattern == "a.b"
+        assert rule.username_pattern in "xa.bx"
+        assert rule.username_pattern not in "axb"
+
+    def test_username_pattern_none_when_empty(self) -> None:
+        rule = _compile(_make_rule(pattern=None))
+        assert rule.username_pattern is None
+
+    def test_compiled_rule_is_immutable(self) -> None:
+        rule = _compile(_make_rule())
+        with pytest.raises(AttributeError):
+            rule.action = "kick"  # type: ignore[misc]
+
+    def test_rule_set_groups_by_event(self) -> None:
+        rules = [
+            _make_rule(rule_id=1, rule_type="username_match"),
+            _make_rule(rule_id=2, rule_type="role_count", pattern=None),
+            _make_rule(
+                rule_id=3,
+                rule_type="vc_without_intro",
+                pattern=None,
+                required_channel_id="555",
+            ),
+            _make_rule(
+                rule_id=4,
+                rule_type="msg_without_intro",
+                pattern=None,
+                required_channel_id="666",
+            ),
+        ]
+        rule_set = GuildRuleSet.from_rules(rules)
+        assert [r.id for r in rule_set.join_rules] == [1]
+        assert [r.id for r in rule_set.member_update_rules] == [2]
+        assert [r.id for r in rule_set.voice_rules] == [3]
+        assert [r.id for r in rule_set.message_rules] == [4]
+        assert rule_set.intro_channel_ids == frozenset({"555", "666"})
+        assert rule_set.rule_ids == frozenset({1, 2, 3, 4})
+
+
+class TestAutoModRuleCache:
+    """AutoModRuleCache のバージョン付き無効化テスト。"""
+
+    def test_unloaded_returns_none(self) -> None:
+        cache = AutoModRuleCache()
+        assert cache.get("789") is None
+
+    def test_loaded_missing_guild_returns_empty(self) -> None:
+        cache = AutoModRuleCache()
+        cache.replace_all([], cache.snapshot_versions())
+        assert cache.get("789") is EMPTY_RULE_SET
+
+    def test_store_with_stale_version_is_discarded(self) -> None:
+        cache = AutoModRuleCache()
+        cache.replace_all([], cache.snapshot_versions())
+        stale = cache.invalidate("789")
+        fresh = cache.invalidate("789")
+
+        assert not cache.store("789", [_make_rule(rule_id=1)], stale)
+        assert cache.get("789") is EMPTY_RULE_SET
+        assert cache.store("789", [_make_rule(rule_id=2)], fresh)
+        rule_set = cache.get("789")
+        assert rule_set is not None
+        assert rule_set.rule_ids == frozenset({2})
+
+    def test_replace_all_keeps_guild_invalidated_during_reload(self) -> None:
+        cache = AutoModRuleCache()
+        cache.replace_all([], cache.snapshot_versions())
+        version = cache.invalidate("789")
+        cache.store("789", [_make_rule(rule_id=2)], version)
+
+        # 再読み込み開始後に別の無効化が入った場合、読み込んだ古い行は使わない
+        snapshot = cache.snapshot_versions()
+        version = cache.invalidate("789")
+        cache.replace_all(
+            [_make_rule(rule_id=1), _make_rule(rule_id=9, guild_id="111")], snapshot
+        )
+
+        rule_set = cache.get("789")
+        assert rule_set is not None
+        assert rule_set.rule_ids == frozenset({2})
+        other = cache.get("111")
+        assert other is not None
+        assert other.rule_ids == frozenset({9})
+        assert cache.store("789", [_make_rule(rule_id=3)], version)
+
+
+class TestRuleCacheIntegration:
+    """キャッシュロード済みのときのイベント処理テスト。"""
+
+    def _loaded_cog(self, rules: list[MagicMock]) -> AutoModCog:
+        cog = _make_cog()
+        cog._rule_cache.replace_all(rules, cog._rule_cache.snapshot_versions())
+        return cog
+
+    @pytest.mark.asyncio
+    async def test_load_rules_routes_only_message_rule_guilds(self) -> None:
+        cog = _make_cog()
+        assert cog._message_route.scope == "all"
+        rules = [
+            _make_rule(rule_id=1, guild_id="111", rule_type="message_post"),
+            _make_rule(rule_id=2, guild_id="222", rule_type="username_match"),
+            _make_rule(
+                rule_id=3,
+                guild_id="333",
+                rule_type="vc_without_intro",
+                required_channel_id="444",
+            ),
+        ]
+
+        with (
+            patch("src.cogs.automod.async_session", return_value=_make_session_ctx()),
+            patch(
+                "src.cogs.automod.get_all_enabled_automod_rules",
+                new_callable=AsyncMock,
+                return_value=rules,
+            ),
+        ):
+            await cog._load_rules()
+
+        assert cog._message_route.scope == "guilds"
+        assert cog._message_route.ids == frozenset({111, 333})
+
+    @pytest.mark.asyncio
+    async def test_on_message_without_message_rules_skips_db(self) -> None:
+        cog = self._loaded_cog([_make_rule(rule_type="username_match")])
+        msg = TestOnMessage()._make_message(
+            joined_at=datetime.now(UTC) - timedelta(seconds=5)
+        )
+        msg.channel = MagicMock()
+        msg.channel.id = 456
+
+        with (
+            patch("src.cogs.automod.async_session") as mock_session,
+            patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock_exec,
+        ):
+            await cog.handle_message(msg)
+
+        mock_session.assert_not_called()
+        mock_exec.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_on_message_uses_cached_rules(self) -> None:
+        cog = self._loaded_cog(
+            [_make_rule(rule_type="message_post", pattern=None, threshold_seconds=60)]
+        )
+        msg = TestOnMessage()._make_message(
+            joined_at=datetime.now(UTC) - timedelta(seconds=5)
+        )
+        msg.channel = MagicMock()
+        msg.channel.id = 456
+
+        with (
+            patch(
+                "src.cogs.automod.get_enabled_automod_rules_by_guild",
+                new_callable=AsyncMock,
+            ) as mock_get,
+            patch.object(cog, "_execute_action", new_callable=AsyncMock) as mock_exec,
+        ):
+            await cog.handle_message(msg)
+
+        mock_get.assert_not_awaited()
+        mock_exec.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_on_member_join_unknown_guild_skips_rule_query(self) -> None:
+        cog = self._loaded_cog([])
+        member = _make_member(name="spammer")
+
+        with (
+            patch("src.cogs.automod.async_session", return_value=_make_session_ctx()),
+            patch(
+                "src.cogs.automod.is_user_in_ban_list",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch(
+                "src.cogs.automod.get_enabled_automod_rules_by_guild",
+                new_callable=AsyncMock,
+            ) as mock_get,
+        ):
+            await cog.on_member_join(member)
+
+        mock_get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_add_reloads_guild_rules(self) -> None:
+        cog = self._loaded_cog([])
+        interaction = _make_interaction()
+        new_rule = _make_rule(rule_id=7, pattern="bad")
+
+        with (
+            patch("src.cogs.automod.async_session", return_value=_make_session_ctx()),
+            patch(
+                "src.cogs.automod.create_automod_rule",
+                new_callable=AsyncMock,
+                return_value=new_rule,
+            ),
+            patch(
+                "src.cogs.automod.get_enabled_automod_rules_by_guild",
+                new_callable=AsyncMock,
+                return_value=[new_rule],
+            ),
+        ):
+            await cog.automod_add.callback(
+                cog, interaction, rule_type="username_match", pattern="bad"
+            )
+
+        rule_set = cog._rule_cache.get("789")
+        assert rule_set is not None
+        assert rule_set.rule_ids == frozenset({7})
+
+    @pytest.mark.asyncio
+    async def test_remove_reloads_guilds_containing_rule(self) -> None:
+        cog = self._loaded_cog([_make_rule(rule_id=5, guild_id="111")])
+        interaction = _make_interaction()
+
+        with (
+            patch("src.cogs.automod.async_session", return_value=_make_session_ctx()),
+            patch(
+                "src.cogs.automod.delete_automod_rule",
+                new_callable=AsyncMock,
+                return_value=True,
+            ),
+            patch(
+                "src.cogs.automod.get_enabled_automod_rules_by_guild",
+                new_callable=AsyncMock,
+                return_value=[],
+            ) as mock_get,
+        ):
+            await cog.automod_remove.callback(cog, interaction, rule_id=5)
+
+        reloaded = {c.args[1] for c in mock_get.await_args_list}
+        assert reloaded == {"789", "111"}
+        assert cog._rule_cache.get("111") is EMPTY_RULE_SET
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_cache_on_error(self) -> None:
+        cog = self._loaded_cog([_make_rule(rule_id=5)])
+
+        with patch(
+            "src.cogs.automod.async_session", side_effect=RuntimeError("db down")
+        ):
+            await cog._refresh_rules()
+
+        rule_set = cog._rule_cache.get("789")
+        assert rule_set is not None
+        assert rule_set.rule_ids == frozenset({5})
+
+    @pytest.mark.asyncio
+    async def test_db_change_reloads_changed_guilds(self) -> None:
+        """Web でルールが変更されたギルドだけ読み直す。"""
+        cog = self._loaded_cog([_make_rule(rule_id=5)])
+        batch = ChangeBatch(
+            events=(ChangeEvent("automod_rules", "insert", "6", "789"),)
+        )
+
+        with (
+            patch("src.cogs.automod.async_session", return_value=_make_session_ctx()),
+            patch(
+                "src.cogs.automod.get_enabled_automod_rules_by_guild",
+                new_callable=AsyncMock,
+                return_value=[_make_rule(rule_id=5), _make_rule(rule_id=6)],
+            ) as mock_get,
+        ):
+            await cog.on_db_change(batch)
+
+        assert mock_get.await_args is not None
+        assert mock_get.await_args.args[1] == "789"
+        rule_set = cog._rule_cache.get("789")
+        assert rule_set is not None
+        assert rule_set.rule_ids == frozenset({5, 6})
+
+    @pytest.mark.asyncio
+    async def test_db_change_resync_reloads_all(self) -> None:
+        cog = self._loaded_cog([_make_rule(rule_id=5)])
+
+        with patch.object(cog, "_load_rules", new_callable=AsyncMock) as mock_load:
+            await cog.on_db_change(ChangeBatch(resync=True))
+
+        mock_load.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_db_change_ignores_other_tables(self) -> None:
+        cog = self._loaded_cog([_make_rule(rule_id=5)])
+        batch = ChangeBatch(events=(ChangeEvent("sticky_messages", "insert", "1"),))
+
+        with patch.object(cog, "_load_rules", new_callable=AsyncMock) as mock_load:
+            await cog.on_db_change(batch)
+
+        mock_load.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_setup_loads_rule_cache(self) -> None:
+        from src.cogs.automod import setup
+
+        bot = MagicMock(spec=commands.Bot)
+        bot.add_cog = AsyncMock()
+
+        with (
+            patch("src.cogs.automod.async_session", return_value=_make_session_ctx()),
+            patch(
+                "src.cogs.automod.get_all_enabled_automod_rules",
+                new_callable=AsyncMock,
+                return_value=[_make_rule(rule_id=3)],
+            ),
+        ):
+            await setup(bot)
+
+        cog = bot.add_cog.call_args[0][0]
+        assert cog._rule_cache.loaded
+        assert len(cog._rule_cache) == 1
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import time
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import discord
@@ -360,7 +361,7 @@ class TestHasTargetRole:
 
 
 # ---------------------------------------------------------------------------
-# on_message テスト
+# handle_message テスト
 # ---------------------------------------------------------------------------
 
 
@@ -373,7 +374,7 @@ def _make_bump_config(*, guild_id: str = "12345", channel_id: str = "456") -> Ma
 
 
 class TestOnMessage:
-    """Tests for on_message listener."""
+    """Tests for handle_message (MessageRouter handler)."""
 
     @pytest.fixture
     def mock_db_session(self) -> MagicMock:
@@ -394,7 +395,7 @@ class TestOnMessage:
         message.guild = None  # DM
 
         with patch("src.cogs.bump.claim_bump_detection") as mock_claim:
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_not_called()
 
@@ -422,7 +423,7 @@ class TestOnMessage:
             ),
             patch("src.cogs.bump.claim_bump_detection") as mock_claim,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_not_called()
 
@@ -453,7 +454,7 @@ class TestOnMessage:
             ),
             patch("src.cogs.bump.claim_bump_detection") as mock_claim,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_not_called()
 
@@ -470,7 +471,7 @@ class TestOnMessage:
 
         # Bot ID が違うので get_bump_config は呼ばれない
         with patch("src.cogs.bump.claim_bump_detection") as mock_claim:
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_not_called()
 
@@ -500,7 +501,7 @@ class TestOnMessage:
             ),
             patch("src.cogs.bump.claim_bump_detection") as mock_claim,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_not_called()
 
@@ -537,7 +538,7 @@ class TestOnMessage:
                 return_value=mock_reminder,
             ) as mock_claim,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_awaited_once()
         call_kwargs = mock_claim.call_args[1]
@@ -552,6 +553,74 @@ class TestOnMessage:
         assert "Bump 検知" in send_kwargs["embed"].title
         assert isinstance(send_kwargs["view"], BumpNotificationView)
 
+    async def test_detection_schedules_reminder(
+        self, mock_db_session: MagicMock
+    ) -> None:
+        """bump 検知で保存した remind_at をスケジューラに知らせる。"""
+        cog = _make_cog()
+        member = _make_member(has_target_role=True)
+        message = _make_message(
+            author_id=DISBOARD_BOT_ID,
+            channel_id=456,
+            guild_id=12345,
+            embed_description=DISBOARD_SUCCESS_KEYWORD,
+            interaction_user=member,
+        )
+        message.channel.send = AsyncMock()
+        mock_config = _make_bump_config(guild_id="12345", channel_id="456")
+
+        with (
+            patch("src.cogs.bump.async_session", return_value=mock_db_session),
+            patch(
+                "src.cogs.bump.get_bump_config",
+                new_callable=AsyncMock,
+                return_value=mock_config,
+            ),
+            patch(
+                "src.cogs.bump.claim_bump_detection",
+                new_callable=AsyncMock,
+                return_value=_make_reminder(is_enabled=True),
+            ) as mock_claim,
+            patch.object(cog._reminder_scheduler, "schedule") as mock_schedule,
+        ):
+            await cog.handle_message(message)
+
+        mock_schedule.assert_called_once_with(mock_claim.call_args[1]["remind_at"])
+
+    async def test_disabled_reminder_not_scheduled(
+        self, mock_db_session: MagicMock
+    ) -> None:
+        """通知が無効なリマインダーはスケジューラに登録しない。"""
+        cog = _make_cog()
+        member = _make_member(has_target_role=True)
+        message = _make_message(
+            author_id=DISBOARD_BOT_ID,
+            channel_id=456,
+            guild_id=12345,
+            embed_description=DISBOARD_SUCCESS_KEYWORD,
+            interaction_user=member,
+        )
+        message.channel.send = AsyncMock()
+        mock_config = _make_bump_config(guild_id="12345", channel_id="456")
+
+        with (
+            patch("src.cogs.bump.async_session", return_value=mock_db_session),
+            patch(
+                "src.cogs.bump.get_bump_config",
+                new_callable=AsyncMock,
+                return_value=mock_config,
+            ),
+            patch(
+                "src.cogs.bump.claim_bump_detection",
+                new_callable=AsyncMock,
+                return_value=_make_reminder(is_enabled=False),
+            ),
+            patch.object(cog._reminder_scheduler, "schedule") as mock_schedule,
+        ):
+            await cog.handle_message(message)
+
+        mock_schedule.assert_not_called()
+
     async def test_creates_reminder_shows_default_role_in_embed(
         self, mock_db_session: MagicMock
     ) -> None:
@@ -584,7 +653,7 @@ class TestOnMessage:
                 return_value=mock_reminder,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         send_kwargs = message.channel.send.call_args[1]
         embed = send_kwargs["embed"]
@@ -629,7 +698,7 @@ class TestOnMessage:
                 return_value=mock_reminder,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # guild.get_role が呼ばれることを確認
         message.guild.get_role.assert_called_once_with(999)
@@ -811,7 +880,22 @@ class TestOnMessageEdit:
 
 
 class TestReminderCheck:
-    """Tests for _reminder_check loop."""
+    """Tests for _reminder_check (called by the reminder scheduler)."""
+
+    async def test_next_reminder_at_reads_db(self) -> None:
+        """スケジューラには DB の次の remind_at を渡す。"""
+        from datetime import UTC, datetime, timedelta
+
+        cog = _make_cog()
+        remind_at = datetime.now(UTC) + timedelta(hours=1)
+        reminder = _make_reminder()
+        reminder.remind_at = remind_at
+        with patch(
+            "src.cogs.bump.get_next_bump_reminder_at",
+            new_callable=AsyncMock,
+            return_value=remind_at,
+        ):
+            assert await cog._next_reminder_at() == remind_at
 
     async def test_sends_reminder_for_due_reminders(self) -> None:
         """期限が来たリマインダーを Embed と View で送信する。"""
@@ -930,21 +1014,48 @@ class TestCogLifecycle:
     """Tests for cog_load and cog_unload."""
 
     async def test_cog_load_starts_loop(self) -> None:
-        """cog_load でループが開始される。"""
+        """cog_load でスケジューラが開始される。"""
         cog = _make_cog()
-        with patch.object(cog._reminder_check, "start") as mock_start:
+        with patch.object(cog._reminder_scheduler, "start") as mock_start:
             await cog.cog_load()
             mock_start.assert_called_once()
 
     async def test_cog_unload_cancels_loop(self) -> None:
-        """cog_unload でループが停止される。"""
+        """cog_unload でスケジューラが停止される。"""
         cog = _make_cog()
         with (
-            patch.object(cog._reminder_check, "is_running", return_value=True),
-            patch.object(cog._reminder_check, "cancel") as mock_cancel,
+            patch.object(cog._reminder_scheduler, "is_running", return_value=True),
+            patch.object(
+                cog._reminder_scheduler, "stop", new_callable=AsyncMock
+            ) as mock_stop,
         ):
             await cog.cog_unload()
-            mock_cancel.assert_called_once()
+            mock_stop.assert_awaited_once()
+
+    async def test_cog_load_registers_message_route(self) -> None:
+        """cog_load でルートを登録し、cog_unload で登録解除する。"""
+        cog = _make_cog()
+        with patch.object(cog._reminder_scheduler, "start"):
+            await cog.cog_load()
+        router = cog.bot.message_router
+        assert router.routes == (cog._message_route,)
+        assert cog._message_route.include_bots
+
+        await cog.cog_unload()
+        assert router.routes == ()
+
+    async def test_guild_cache_updates_route(self) -> None:
+        """ギルドキャッシュの更新がルートに反映される。"""
+        cog = _make_cog()
+        assert cog._message_route.scope == "all"
+
+        cog._set_bump_guild_cache({"100"})
+        cog._cache_add_guild("200")
+        cog._cache_discard_guild("100")
+
+        assert cog._bump_guild_ids == {"200"}
+        assert cog._message_route.scope == "guilds"
+        assert cog._message_route.ids == frozenset({200})
 
 
 # ---------------------------------------------------------------------------
@@ -1151,6 +1262,83 @@ class TestBumpNotificationView:
         assert view.toggle_button.label == "通知を有効にする"
         assert view.toggle_button.style == discord.ButtonStyle.success
 
+    async def test_reenable_schedules_reminder(self) -> None:
+        """再度有効にしたら remind_at を BumpCog のスケジューラに知らせる。"""
+        view = BumpNotificationView("12345", "DISBOARD", False)
+        cog = _make_cog()
+        remind_at = datetime.now(UTC) + timedelta(hours=1)
+        reminder = _make_reminder()
+        reminder.remind_at = remind_at
+
+        mock_interaction = MagicMock(spec=discord.Interaction)
+        mock_interaction.client = cog.bot
+        cog.bot.get_cog = MagicMock(return_value=cog)
+        mock_interaction.response = MagicMock()
+        mock_interaction.response.defer = AsyncMock()
+        mock_interaction.message = MagicMock()
+        mock_interaction.message.edit = AsyncMock()
+        mock_interaction.followup = MagicMock()
+        mock_interaction.followup.send = AsyncMock()
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch("src.cogs.bump.async_session", return_value=mock_session),
+            patch(
+                "src.cogs.bump.toggle_bump_reminder",
+                new_callable=AsyncMock,
+                return_value=True,
+            ),
+            patch(
+                "src.cogs.bump.get_bump_reminder",
+                new_callable=AsyncMock,
+                return_value=reminder,
+            ),
+            patch.object(cog._reminder_scheduler, "schedule") as mock_schedule,
+        ):
+            await view.toggle_button.callback(mock_interaction)
+
+        cog.bot.get_cog.assert_called_once_with("BumpCog")
+        mock_schedule.assert_called_once_with(remind_at)
+
+    async def test_disable_does_not_schedule(self) -> None:
+        """無効にしたときは DB を読み直さずスケジューラにも触れない。"""
+        view = BumpNotificationView("12345", "DISBOARD", True)
+        cog = _make_cog()
+
+        mock_interaction = MagicMock(spec=discord.Interaction)
+        mock_interaction.client = cog.bot
+        cog.bot.get_cog = MagicMock(return_value=cog)
+        mock_interaction.response = MagicMock()
+        mock_interaction.response.defer = AsyncMock()
+        mock_interaction.message = MagicMock()
+        mock_interaction.message.edit = AsyncMock()
+        mock_interaction.followup = MagicMock()
+        mock_interaction.followup.send = AsyncMock()
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch("src.cogs.bump.async_session", return_value=mock_session),
+            patch(
+                "src.cogs.bump.toggle_bump_reminder",
+                new_callable=AsyncMock,
+                return_value=False,
+            ),
+            patch(
+                "src.cogs.bump.get_bump_reminder", new_callable=AsyncMock
+            ) as mock_get,
+            patch.object(cog._reminder_scheduler, "schedule") as mock_schedule,
+        ):
+            await view.toggle_button.callback(mock_interaction)
+
+        mock_get.assert_not_called()
+        mock_schedule.assert_not_called()
+
     async def test_view_has_role_button(self) -> None:
         """ロール変更ボタンが存在する。"""
         view = BumpNotificationView("12345", "DISBOARD", True)
@@ -2346,7 +2534,7 @@ class TestBumpWithFaker:
                 return_value=mock_reminder,
             ) as mock_claim,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         mock_claim.assert_awaited_once()
         call_kwargs = mock_claim.call_args[1]
@@ -2504,17 +2692,17 @@ class TestBumpRoleSelectViewResetButton:
 
 
 class TestCogUnloadWhenNotRunning:
-    """cog_unload でループが実行中でない場合のテスト。"""
+    """cog_unload でスケジューラが実行中でない場合のテスト。"""
 
     async def test_cog_unload_when_loop_not_running(self) -> None:
-        """ループが実行中でない場合、cancel は呼ばれない。"""
+        """スケジューラが実行中でない場合、stop は呼ばれない。"""
         cog = _make_cog()
-        cog._reminder_check.is_running = MagicMock(return_value=False)
-        cog._reminder_check.cancel = MagicMock()
+        cog._reminder_scheduler.is_running = MagicMock(return_value=False)
+        cog._reminder_scheduler.stop = AsyncMock()
 
         await cog.cog_unload()
 
-        cog._reminder_check.cancel.assert_not_called()
+        cog._reminder_scheduler.stop.assert_not_called()
 
 
 class TestProcessBumpMessageNoEmbeds:
@@ -3921,7 +4109,7 @@ class TestBumpDetectionDuplicateGuard:
                 return_value=None,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # claim 失敗 → メッセージ送信されない
         message.channel.send.assert_not_awaited()
@@ -3959,7 +4147,7 @@ class TestBumpDetectionDuplicateGuard:
                 return_value=mock_reminder,
             ) as mock_claim,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # claim 成功 → メッセージ送信される
         mock_claim.assert_awaited_once()
@@ -4047,7 +4235,7 @@ class TestBumpCacheIntegration:
         message.author = MagicMock()
         message.author.id = 302050872383242240  # DISBOARD
 
-        await cog.on_message(message)
+        await cog.handle_message(message)
         # DB にアクセスしないことを暗黙的に検証 (例外が出ない)
 
     @patch("src.cogs.bump.async_session")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -9,7 +10,8 @@ import discord
 import pytest
 from discord.ext import commands
 
-from src.cogs.chatrole import ChatRoleCog
+from src.cogs.chatrole import ChatRoleCog, ChatRoleProgressBuffer
+from src.database.change_feed import ChangeBatch, ChangeEvent
 
 # ---------------------------------------------------------------------------
 # テスト用ヘルパー
@@ -96,17 +98,7 @@ def _make_progress(
 
 
 class TestOnMessage:
-    """on_message イベントのテスト。"""
-
-    @pytest.mark.asyncio
-    async def test_ignores_bot_messages(self) -> None:
-        cog = _make_cog()
-        message = _make_message(is_bot=True)
-        with patch(
-            "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel"
-        ) as mock_get:
-            await cog.on_message(message)
-            mock_get.assert_not_called()
+    """handle_message (MessageRouter 経由) のテスト。"""
 
     @pytest.mark.asyncio
     async def test_ignores_non_default_messages(self) -> None:
@@ -115,7 +107,7 @@ class TestOnMessage:
         with patch(
             "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel"
         ) as mock_get:
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_get.assert_not_called()
 
     @pytest.mark.asyncio
@@ -126,7 +118,7 @@ class TestOnMessage:
         with patch(
             "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel"
         ) as mock_get:
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_get.assert_not_called()
 
     @pytest.mark.asyncio
@@ -137,7 +129,7 @@ class TestOnMessage:
             "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel",
             return_value=[],
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             message.author.add_roles.assert_not_called()
 
     @pytest.mark.asyncio
@@ -149,7 +141,7 @@ class TestOnMessage:
         with patch(
             "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel"
         ) as mock_get:
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_get.assert_not_called()
 
     @pytest.mark.asyncio
@@ -162,7 +154,7 @@ class TestOnMessage:
             "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel",
             return_value=[],
         ) as mock_get:
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_get.assert_called_once()
 
     @pytest.mark.asyncio
@@ -179,7 +171,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=progress,
             ),
@@ -188,7 +180,7 @@ class TestOnMessage:
                 new_callable=AsyncMock,
             ) as mock_grant,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_grant.assert_not_called()
             message.author.add_roles.assert_not_called()
 
@@ -207,7 +199,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=progress,
             ),
@@ -217,7 +209,7 @@ class TestOnMessage:
                 return_value=True,
             ) as mock_grant,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_grant.assert_called_once()
             message.author.add_roles.assert_called_once_with(
                 role, reason="ChatRole: 投稿ロール付与"
@@ -225,7 +217,7 @@ class TestOnMessage:
 
     @pytest.mark.asyncio
     async def test_skips_when_already_granted(self) -> None:
-        """increment が None を返した場合 (granted=True) は付与処理スキップ。"""
+        """バッファが None を返した場合 (granted=True) は付与処理スキップ。"""
         cog = _make_cog()
         message = _make_message()
         config = _make_config(threshold=3)
@@ -236,7 +228,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
@@ -245,7 +237,7 @@ class TestOnMessage:
                 new_callable=AsyncMock,
             ) as mock_grant,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_grant.assert_not_called()
             message.author.add_roles.assert_not_called()
 
@@ -263,11 +255,11 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
             ) as mock_inc,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_inc.assert_not_called()
 
     @pytest.mark.asyncio
@@ -284,7 +276,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=progress,
             ),
@@ -293,7 +285,7 @@ class TestOnMessage:
                 new_callable=AsyncMock,
             ) as mock_grant,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             mock_grant.assert_not_called()
             message.author.add_roles.assert_not_called()
 
@@ -313,7 +305,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=progress,
             ),
@@ -323,7 +315,7 @@ class TestOnMessage:
                 return_value=False,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             message.author.add_roles.assert_not_called()
 
     @pytest.mark.asyncio
@@ -342,7 +334,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=progress,
             ),
@@ -352,9 +344,69 @@ class TestOnMessage:
                 return_value=True,
             ) as mock_grant,
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             assert mock_grant.call_args.kwargs["expires_at"] is None
 
+    @pytest.mark.asyncio
+    async def test_grant_schedules_expiry(self) -> None:
+        """期限付きで付与したら expires_at をスケジューラに知らせる。"""
+        cog = _make_cog()
+        message = _make_message()
+        message.guild.get_role.return_value = MagicMock(spec=discord.Role)
+        config = _make_config(threshold=1, duration_hours=24)
+        progress = _make_progress(count=1, granted=False)
+
+        with (
+            patch(
+                "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel",
+                return_value=[config],
+            ),
+            patch(
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
+                new_callable=AsyncMock,
+                return_value=progress,
+            ),
+            patch(
+                "src.cogs.chatrole.mark_chat_role_progress_granted",
+                new_callable=AsyncMock,
+                return_value=True,
+            ) as mock_grant,
+            patch.object(cog._expiry_scheduler, "schedule") as mock_schedule,
+        ):
+            await cog.handle_message(message)
+
+        mock_schedule.assert_called_once_with(mock_grant.call_args.kwargs["expires_at"])
+
+    @pytest.mark.asyncio
+    async def test_permanent_grant_not_scheduled(self) -> None:
+        """永続付与 (duration_hours=None) は期限を登録しない。"""
+        cog = _make_cog()
+        message = _make_message()
+        message.guild.get_role.return_value = MagicMock(spec=discord.Role)
+        config = _make_config(threshold=1, duration_hours=None)
+        progress = _make_progress(count=1, granted=False)
+
+        with (
+            patch(
+                "src.cogs.chatrole.get_enabled_chat_role_configs_for_channel",
+                return_value=[config],
+            ),
+            patch(
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
+                new_callable=AsyncMock,
+                return_value=progress,
+            ),
+            patch(
+                "src.cogs.chatrole.mark_chat_role_progress_granted",
+                new_callable=AsyncMock,
+                return_value=True,
+            ),
+            patch.object(cog._expiry_scheduler, "schedule") as mock_schedule,
+        ):
+            await cog.handle_message(message)
+
+        mock_schedule.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_add_roles_http_error(self) -> None:
         cog = _make_cog()
@@ -373,7 +425,7 @@ class TestOnMessage:
                 return_value=[config],
             ),
             patch(
-                "src.cogs.chatrole.increment_chat_role_progress",
+                "src.cogs.chatrole.ChatRoleProgressBuffer.add",
                 new_callable=AsyncMock,
                 return_value=progress,
             ),
@@ -384,7 +436,7 @@ class TestOnMessage:
             ),
         ):
             # 例外を握りつぶす (logger.exception で記録) ことを確認
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
 
 # ---------------------------------------------------------------------------
@@ -393,7 +445,7 @@ class TestOnMessage:
 
 
 class TestCheckExpiredRoles:
-    """_check_expired_roles バックグラウンドタスクのテスト。"""
+    """_check_expired_roles (スケジューラから呼ばれる期限切れ処理) のテスト。"""
 
     @pytest.fixture(autouse=True)
     def _patch_channel_cache(self) -> AsyncMock:
@@ -430,12 +482,14 @@ class TestCheckExpiredRoles:
                 new_callable=AsyncMock,
                 return_value=True,
             ) as mock_expire,
+            patch.object(cog._progress_buffer, "forget") as mock_forget,
         ):
             await cog._check_expired_roles()
             member.remove_roles.assert_called_once_with(
                 role, reason="ChatRole: 期限切れロール削除"
             )
             mock_expire.assert_called_once()
+            mock_forget.assert_called_once_with(progress.config_id, progress.user_id)
 
     @pytest.mark.asyncio
     async def test_guild_not_found(self) -> None:
@@ -514,13 +568,43 @@ class TestCheckExpiredRoles:
         """バックグラウンドタスク実行時にチャンネルキャッシュが更新される。"""
         cog = _make_cog()
         _patch_channel_cache.return_value = {"555", "777"}
+        await cog._refresh_channel_cache()
+        assert cog._chatrole_channels == {"555", "777"}
+
+    @pytest.mark.asyncio
+    async def test_db_change_refreshes_cache(
+        self, _patch_channel_cache: AsyncMock
+    ) -> None:
+        """Web で ChatRole 設定が変更されたらチャンネルキャッシュを更新する。"""
+        cog = _make_cog()
+        _patch_channel_cache.return_value = {"555"}
+        batch = ChangeBatch(
+            events=(ChangeEvent("chat_role_configs", "insert", "1", "789"),)
+        )
+        await cog.on_db_change(batch)
+        assert cog._chatrole_channels == {"555"}
+
+    @pytest.mark.asyncio
+    async def test_db_change_ignores_other_tables(
+        self, _patch_channel_cache: AsyncMock
+    ) -> None:
+        cog = _make_cog()
+        batch = ChangeBatch(events=(ChangeEvent("chat_role_progress", "update", "1"),))
+        await cog.on_db_change(batch)
+        _patch_channel_cache.assert_not_awaited()
+        assert cog._chatrole_channels is None
+
+    @pytest.mark.asyncio
+    async def test_next_expiry_reads_db(self) -> None:
+        """スケジューラには DB の最も早い有効期限を渡す。"""
+        cog = _make_cog()
+        expires_at = datetime.now(UTC) + timedelta(hours=1)
         with patch(
-            "src.cogs.chatrole.get_expired_chat_role_progress",
+            "src.cogs.chatrole.get_next_chat_role_expiry",
             new_callable=AsyncMock,
-            return_value=[],
+            return_value=expires_at,
         ):
-            await cog._check_expired_roles()
-        assert cog._chatrole_channels == {"555", "777"}
+            assert await cog._next_expiry() == expires_at
 
     @pytest.mark.asyncio
     async def test_no_expired_progress(self) -> None:
@@ -577,30 +661,88 @@ class TestCogLifecycle:
     @pytest.mark.asyncio
     async def test_cog_load_starts_task(self) -> None:
         cog = _make_cog()
-        with patch.object(cog._check_expired_roles, "start") as mock_start:
+        with (
+            patch.object(cog._refresh_channel_cache, "start") as mock_start,
+            patch.object(cog._flush_progress, "start") as mock_flush_start,
+            patch.object(cog._expiry_scheduler, "start") as mock_scheduler_start,
+        ):
             await cog.cog_load()
             mock_start.assert_called_once()
+            mock_flush_start.assert_called_once()
+            mock_scheduler_start.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_cog_unload_cancels_task(self) -> None:
         cog = _make_cog()
         with (
-            patch.object(cog._check_expired_roles, "is_running", return_value=True),
-            patch.object(cog._check_expired_roles, "cancel") as mock_cancel,
+            patch.object(cog._refresh_channel_cache, "is_running", return_value=True),
+            patch.object(cog._refresh_channel_cache, "cancel") as mock_cancel,
+            patch.object(cog._flush_progress, "is_running", return_value=True),
+            patch.object(cog._flush_progress, "cancel") as mock_flush_cancel,
+            patch.object(cog._expiry_scheduler, "is_running", return_value=True),
+            patch.object(
+                cog._expiry_scheduler, "stop", new_callable=AsyncMock
+            ) as mock_stop,
         ):
             await cog.cog_unload()
             mock_cancel.assert_called_once()
+            mock_flush_cancel.assert_called_once()
+            mock_stop.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_cog_unload_not_running(self) -> None:
         cog = _make_cog()
         with (
-            patch.object(cog._check_expired_roles, "is_running", return_value=False),
-            patch.object(cog._check_expired_roles, "cancel") as mock_cancel,
+            patch.object(cog._refresh_channel_cache, "is_running", return_value=False),
+            patch.object(cog._refresh_channel_cache, "cancel") as mock_cancel,
+            patch.object(cog._flush_progress, "is_running", return_value=False),
         ):
             await cog.cog_unload()
             mock_cancel.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_cog_unload_flushes_buffer(self) -> None:
+        """アンロード時に溜めた投稿カウントを DB に反映する。"""
+        cog = _make_cog()
+        with (
+            patch.object(cog._refresh_channel_cache, "is_running", return_value=False),
+            patch.object(cog._flush_progress, "is_running", return_value=False),
+            patch.object(
+                cog._progress_buffer, "flush", new_callable=AsyncMock
+            ) as mock_flush,
+        ):
+            await cog.cog_unload()
+            mock_flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cog_unload_flush_error_is_logged(self) -> None:
+        """アンロード時の反映失敗は例外を送出しない。"""
+        cog = _make_cog()
+        with (
+            patch.object(cog._refresh_channel_cache, "is_running", return_value=False),
+            patch.object(cog._flush_progress, "is_running", return_value=False),
+            patch.object(
+                cog._progress_buffer,
+                "flush",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+        ):
+            await cog.cog_unload()
+
+    @pytest.mark.asyncio
+    async def test_flush_progress_task_swallows_errors(self) -> None:
+        """定期反映タスクは例外でループを止めない。"""
+        cog = _make_cog()
+        with patch.object(
+            cog._progress_buffer,
+            "flush",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("db down"),
+        ) as mock_flush:
+            await cog._flush_progress()
+            mock_flush.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_setup_adds_cog(self) -> None:
         from src.cogs.chatrole import setup
@@ -616,6 +758,7 @@ class TestCogLifecycle:
         bot.add_cog.assert_called_once()
         cog = bot.add_cog.call_args.args[0]
         assert cog._chatrole_channels == {"555"}
+        assert cog._message_route.ids == frozenset({555})
 
     @pytest.mark.asyncio
     async def test_before_loop_waits_until_ready(self) -> None:
@@ -623,3 +766,270 @@ class TestCogLifecycle:
         cog.bot.wait_until_ready = AsyncMock()
         await cog._before_check_expired_roles()
         cog.bot.wait_until_ready.assert_awaited_once()
+
+
+# ---------------------------------------------------------------------------
+# TestChatRoleProgressBuffer
+# ---------------------------------------------------------------------------
+
+
+class TestChatRoleProgressBuffer:
+    """ChatRoleProgressBuffer (投稿カウントの write-behind) のテスト。"""
+
+    @pytest.fixture
+    def mock_get(self) -> Iterator[AsyncMock]:
+        """DB 上の Progress (既定はレコードなし = カウント 0)。"""
+        with patch(
+            "src.cogs.chatrole.get_chat_role_progress",
+            new_callable=AsyncMock,
+            return_value=None,
+        ) as mock:
+            yield mock
+
+    @pytest.fixture
+    def mock_add_counts(self) -> Iterator[AsyncMock]:
+        with patch(
+            "src.cogs.chatrole.add_chat_role_progress_counts",
+            new_callable=AsyncMock,
+            return_value=[],
+        ) as mock:
+            yield mock
+
+    @pytest.mark.asyncio
+    async def test_first_message_is_buffered(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """初めて見るキーも DB を読むだけで、書き込みは flush を待つ。"""
+        buffer = ChatRoleProgressBuffer()
+
+        result = await buffer.add(1, "u1", threshold=5)
+
+        assert result is None
+        mock_get.assert_awaited_once()
+        mock_add_counts.assert_not_called()
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_following_messages_are_buffered(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """2 回目以降の投稿は DB に触れずメモリ上で加算する。"""
+        buffer = ChatRoleProgressBuffer()
+
+        for _ in range(3):
+            await buffer.add(1, "u1", threshold=10)
+
+        mock_get.assert_awaited_once()
+        mock_add_counts.assert_not_called()
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_first_message_counts_from_db(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """初めて見るキーは DB のカウントに加算して threshold を判定する。"""
+        mock_get.return_value = _make_progress(user_id="u1", count=4)
+        progress = _make_progress(user_id="u1", count=5)
+        mock_add_counts.return_value = [progress]
+        buffer = ChatRoleProgressBuffer()
+
+        result = await buffer.add(1, "u1", threshold=5)
+
+        assert result is progress
+        assert mock_add_counts.call_args.args[1] == {(1, "u1"): 1}
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_all_pending_in_one_call(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """flush は溜めた加算を 1 回の呼び出しでまとめて反映する。"""
+        buffer = ChatRoleProgressBuffer()
+        for user_id in ("u1", "u2"):
+            for _ in range(3):
+                await buffer.add(1, user_id, threshold=10)
+        mock_add_counts.return_value = [
+            _make_progress(user_id="u1", count=3),
+            _make_progress(user_id="u2", count=3),
+        ]
+
+        flushed = await buffer.flush()
+
+        assert flushed == 2
+        mock_add_counts.assert_awaited_once()
+        assert mock_add_counts.call_args.args[1] == {(1, "u1"): 3, (1, "u2"): 3}
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_threshold_flushes_key_immediately(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """ローカルのカウントが threshold に達したら即時反映して Progress を返す。"""
+        buffer = ChatRoleProgressBuffer()
+        progress = _make_progress(count=3)
+        mock_add_counts.return_value = [progress]
+
+        assert await buffer.add(1, "u1", threshold=3) is None
+        assert await buffer.add(1, "u1", threshold=3) is None
+        result = await buffer.add(1, "u1", threshold=3)
+
+        assert result is progress
+        mock_add_counts.assert_awaited_once()
+        assert mock_add_counts.call_args.args[1] == {(1, "u1"): 3}
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_granted_key_is_not_counted(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """付与済みのキーはその後の投稿を加算しない。"""
+        mock_get.return_value = _make_progress(user_id="u1", granted=True)
+        buffer = ChatRoleProgressBuffer()
+
+        await buffer.add(1, "u1", threshold=3)
+        await buffer.add(1, "u1", threshold=3)
+
+        mock_get.assert_awaited_once()
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_forget_reloads_from_db(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """期限切れでリセットしたキーは forget 後に DB から取り直す。"""
+        mock_get.return_value = _make_progress(user_id="u1", granted=True)
+        buffer = ChatRoleProgressBuffer()
+        await buffer.add(1, "u1", threshold=3)
+
+        buffer.forget(1, "u1")
+        mock_get.return_value = _make_progress(user_id="u1", count=0)
+        await buffer.add(1, "u1", threshold=3)
+
+        assert mock_get.await_count == 2
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_max_entries_triggers_flush(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """未反映のキー数が上限に達したら間隔を待たずに反映する。"""
+        buffer = ChatRoleProgressBuffer(max_entries=2)
+
+        await buffer.add(1, "u1", threshold=10)
+        mock_add_counts.assert_not_called()
+        await buffer.add(1, "u2", threshold=10)
+
+        mock_add_counts.assert_awaited_once()
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_keeps_pending(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """反映に失敗した加算は次回の flush で再試行する。"""
+        buffer = ChatRoleProgressBuffer()
+        await buffer.add(1, "u1", threshold=10)
+        await buffer.add(1, "u1", threshold=10)
+        mock_add_counts.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+
+        assert len(buffer) == 1
+        mock_add_counts.side_effect = None
+        await buffer.flush()
+        assert mock_add_counts.call_args.args[1] == {(1, "u1"): 2}
+
+    @pytest.mark.asyncio
+    async def test_known_counts_survive_flush(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """flush をまたいでも把握済みのキーは DB を読み直さない。"""
+        buffer = ChatRoleProgressBuffer()
+        await buffer.add(1, "u1", threshold=10)
+        await buffer.flush()
+        await buffer.flush()
+
+        await buffer.add(1, "u1", threshold=10)
+
+        mock_get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_known_counts_expire_after_ttl(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        buffer = ChatRoleProgressBuffer(known_ttl=0)
+
+        await buffer.add(1, "u1", threshold=10)
+        await buffer.add(1, "u1", threshold=10)
+
+        assert mock_get.await_count == 2
+        # 読み直しても未反映の加算は失わない
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_known_counts_are_bounded(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """上限を超えたら最も長く使われていないキーから忘れる。"""
+        buffer = ChatRoleProgressBuffer(known_max_entries=2)
+        for user_id in ("u1", "u2", "u1", "u3"):
+            await buffer.add(1, user_id, threshold=10)
+        assert mock_get.await_count == 3
+
+        await buffer.add(1, "u1", threshold=10)
+        assert mock_get.await_count == 3
+        await buffer.add(1, "u2", threshold=10)
+        assert mock_get.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_evicted_key_keeps_pending_in_count(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """忘れたキーを取り直すときは未反映の加算も数に含める。"""
+        progress = _make_progress(user_id="u1", count=3)
+        mock_add_counts.return_value = [progress]
+        buffer = ChatRoleProgressBuffer(known_ttl=0)
+
+        await buffer.add(1, "u1", threshold=3)
+        await buffer.add(1, "u1", threshold=3)
+        result = await buffer.add(1, "u1", threshold=3)
+
+        assert result is progress
+        assert mock_add_counts.call_args.args[1] == {(1, "u1"): 3}
+
+    @pytest.mark.asyncio
+    async def test_flush_keeps_keys_added_concurrently(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """flush の待ち中に初めて見たキーを flush が消さない。"""
+        buffer = ChatRoleProgressBuffer()
+        await buffer.add(1, "u1", threshold=10)
+
+        async def add_during_flush(*_: object) -> list[MagicMock]:
+            await buffer.add(1, "u2", threshold=10)
+            return [_make_progress(user_id="u1", count=1)]
+
+        mock_add_counts.side_effect = add_during_flush
+        await buffer.flush()
+        await buffer.add(1, "u2", threshold=10)
+
+        assert mock_get.await_count == 2
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_refreshes_count_from_db(
+        self, mock_get: AsyncMock, mock_add_counts: AsyncMock
+    ) -> None:
+        """flush で返った DB のカウント (他インスタンス分を含む) を引き継ぐ。"""
+        buffer = ChatRoleProgressBuffer()
+        await buffer.add(1, "u1", threshold=10)
+        await buffer.add(1, "u1", threshold=10)
+        # 他インスタンスの加算で DB 上は 9
+        mock_add_counts.return_value = [_make_progress(user_id="u1", count=9)]
+        await buffer.flush()
+
+        progress = _make_progress(user_id="u1", count=10)
+        mock_add_counts.return_value = [progress]
+        result = await buffer.add(1, "u1", threshold=10)
+
+        assert result is progress
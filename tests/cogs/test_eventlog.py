@@ -9,18 +9,35 @@ import discord
 import pytest
 from discord.ext import commands
 
+from src.cogs._eventlog_queue import EventLogSendQueue
 from src.cogs.eventlog import EventLogCog
+from src.database.change_feed import ChangeBatch, ChangeEvent
 
 # ---------------------------------------------------------------------------
 # テスト用ヘルパー
 # ---------------------------------------------------------------------------
 
 
+class _DirectSendQueue:
+    """送信キューの代わりにその場で channel.send する (Embed の検証用)。
+
+    まとめ送信そのものは tests/cogs/test_eventlog_queue.py で検証する。
+    """
+
+    async def put(self, channel: MagicMock, embed: discord.Embed) -> bool:
+        await channel.send(embed=embed)
+        return True
+
+    async def close(self) -> None:
+        pass
+
+
 def _make_cog() -> EventLogCog:
     """Create an EventLogCog with a mock bot."""
     bot = MagicMock(spec=commands.Bot)
     bot.guilds = []
     cog = EventLogCog(bot)
+    cog._send_queue = _DirectSendQueue()  # type: ignore[assignment]
     return cog
 
 
@@ -824,18 +841,38 @@ class TestOnVoiceStateUpdate:
 class TestSendLog:
     """_send_log の共通テスト。"""
 
+    @pytest.mark.asyncio
+    async def test_puts_embed_to_each_channel_queue(self) -> None:
+        """設定された全チャンネルの送信キューに Embed を積む。"""
+        cog = _make_cog()
+        cog._send_queue = MagicMock()
+        cog._send_queue.put = AsyncMock(return_value=True)
+        guild, ch = _make_guild()
+
+        cog._cache[("789", "message_delete")] = ["100", "200"]
+
+        embed = discord.Embed(title="Test")
+        await cog._send_log(guild, "message_delete", embed)
+
+        assert cog._send_queue.put.await_count == 2
+        cog._send_queue.put.assert_awaited_with(ch, embed)
+        ch.send.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_handles_forbidden(self) -> None:
         """権限不足でも例外を上げない。"""
         cog = _make_cog()
+        cog._send_queue = EventLogSendQueue(flush_delay=0)
         guild, ch = _make_guild()
+        ch.id = 100
         ch.send = AsyncMock(side_effect=discord.Forbidden(MagicMock(), ""))
 
         cog._cache[("789", "message_delete")] = ["100"]
 
         embed = discord.Embed(title="Test")
         await cog._send_log(guild, "message_delete", embed)
-        # No exception raised
+        await cog._send_queue.close()
+        ch.send.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_handles_missing_channel(self) -> None:
@@ -879,6 +916,55 @@ class TestRefreshCache:
 
         assert cog._cache == {("789", "message_delete"): ["100"]}
 
+    @pytest.mark.asyncio
+    async def test_db_change_reloads_only_changed_guild(self) -> None:
+        """変更のあったギルドのエントリだけを読み直す。"""
+        cog = _make_cog()
+        cog._cache = {
+            ("789", "message_delete"): ["100"],
+            ("999", "member_join"): ["300"],
+        }
+        mock_config = MagicMock()
+        mock_config.event_type = "member_leave"
+        mock_config.channel_id = "200"
+        batch = ChangeBatch(
+            events=(ChangeEvent("event_log_configs", "update", "1", "789"),)
+        )
+
+        with patch(
+            "src.cogs.eventlog.get_enabled_event_log_configs",
+            return_value=[mock_config],
+        ) as mock_get:
+            await cog.on_db_change(batch)
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[1] == "789"
+        assert cog._cache == {
+            ("789", "member_leave"): ["200"],
+            ("999", "member_join"): ["300"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_db_change_without_guild_refreshes_all(self) -> None:
+        """ギルドを特定できない変更では全件を読み直す。"""
+        cog = _make_cog()
+        batch = ChangeBatch(events=(ChangeEvent("event_log_configs", "delete"),))
+
+        with patch.object(cog, "_refresh_cache", new_callable=AsyncMock) as mock:
+            await cog.on_db_change(batch)
+
+        mock.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_db_change_ignores_other_tables(self) -> None:
+        cog = _make_cog()
+        batch = ChangeBatch(events=(ChangeEvent("automod_rules", "insert", "1"),))
+
+        with patch.object(cog, "_refresh_cache", new_callable=AsyncMock) as mock:
+            await cog.on_db_change(batch)
+
+        mock.assert_not_awaited()
+
 
 # ---------------------------------------------------------------------------
 # TestInviteCache
@@ -1372,6 +1458,16 @@ class TestCogLifecycle:
         await cog.cog_unload()
         cog._sync_cache_task.cancel.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_cog_unload_closes_send_queue(self) -> None:
+        """cog_unload で送信キューを送り切る。"""
+        cog = _make_cog()
+        cog._sync_cache_task = MagicMock()
+        cog._send_queue = MagicMock()
+        cog._send_queue.close = AsyncMock()
+        await cog.cog_unload()
+        cog._send_queue.close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_on_ready_refreshes_invite_cache(self) -> None:
         cog = _make_cog()
@@ -1412,7 +1508,9 @@ class TestSendLogHTTPException:
     @pytest.mark.asyncio
     async def test_handles_http_exception(self) -> None:
         cog = _make_cog()
+        cog._send_queue = EventLogSendQueue(flush_delay=0)
         guild, ch = _make_guild()
+        ch.id = 100
         ch.send = AsyncMock(
             side_effect=discord.HTTPException(MagicMock(), "Server error")
         )
@@ -1420,7 +1518,8 @@ class TestSendLogHTTPException:
         cog._cache[("789", "message_delete")] = ["100"]
         embed = discord.Embed(title="Test")
         await cog._send_log(guild, "message_delete", embed)
-        # No exception raised
+        await cog._send_queue.close()
+        ch.send.assert_awaited_once()
 
 
 # ---------------------------------------------------------------------------
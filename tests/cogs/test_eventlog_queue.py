@@ -0,0 +1,169 @@
+"""Tests for the EventLog per-channel send queue."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+from src.cogs._eventlog_queue import (
+    MAX_EMBED_CHARS_PER_MESSAGE,
+    MAX_EMBEDS_PER_MESSAGE,
+    EventLogSendQueue,
+    chunk_embeds,
+)
+
+
+def _make_channel(channel_id: int = 100) -> MagicMock:
+    ch = MagicMock(spec=discord.TextChannel)
+    ch.id = channel_id
+    ch.send = AsyncMock()
+    return ch
+
+
+def _sent_embeds(ch: MagicMock) -> list[discord.Embed]:
+    """channel.send に渡された Embed を送信順に並べる。"""
+    sent: list[discord.Embed] = []
+    for call in ch.send.call_args_list:
+        if "embed" in call.kwargs:
+            sent.append(call.kwargs["embed"])
+        else:
+            sent.extend(call.kwargs["embeds"])
+    return sent
+
+
+class TestChunkEmbeds:
+    """Tests for chunk_embeds."""
+
+    def test_splits_by_embed_count(self) -> None:
+        embeds = [discord.Embed(title=f"e{i}") for i in range(25)]
+        chunks = list(chunk_embeds(embeds))
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        assert [e for c in chunks for e in c] == embeds
+
+    def test_splits_by_total_chars(self) -> None:
+        """合計文字数が上限を超える手前で分割する。"""
+        big = MAX_EMBED_CHARS_PER_MESSAGE // 3 + 1
+        embeds = [discord.Embed(description="x" * big) for _ in range(4)]
+        chunks = list(chunk_embeds(embeds))
+        assert [len(c) for c in chunks] == [2, 2]
+        for chunk in chunks:
+            assert sum(len(e) for e in chunk) <= MAX_EMBED_CHARS_PER_MESSAGE
+
+    def test_empty(self) -> None:
+        assert list(chunk_embeds([])) == []
+
+
+class TestEventLogSendQueue:
+    """Tests for EventLogSendQueue."""
+
+    async def test_single_embed_uses_embed_kwarg(self) -> None:
+        queue = EventLogSendQueue(flush_delay=0)
+        ch = _make_channel()
+        embed = discord.Embed(title="one")
+
+        assert await queue.put(ch, embed) is True
+        await queue.close()
+
+        ch.send.assert_awaited_once_with(embed=embed)
+        assert queue.sent_messages == 1
+        assert queue.sent_embeds == 1
+
+    async def test_coalesces_burst_into_one_message(self) -> None:
+        """flush_delay 内に届いた Embed は 1 メッセージにまとめる。"""
+        queue = EventLogSendQueue(flush_delay=0.05)
+        ch = _make_channel()
+        embeds = [discord.Embed(title=f"e{i}") for i in range(5)]
+
+        for embed in embeds:
+            await queue.put(ch, embed)
+        await queue.close()
+
+        ch.send.assert_awaited_once_with(embeds=embeds)
+
+    async def test_burst_over_limit_is_split(self) -> None:
+        queue = EventLogSendQueue(flush_delay=0.05)
+        ch = _make_channel()
+        embeds = [discord.Embed(title=f"e{i}") for i in range(15)]
+
+        for embed in embeds:
+            await queue.put(ch, embed)
+        await queue.close()
+
+        assert ch.send.await_count == 2
+        first = ch.send.call_args_list[0].kwargs["embeds"]
+        assert len(first) == MAX_EMBEDS_PER_MESSAGE
+        assert _sent_embeds(ch) == embeds
+
+    async def test_full_queue_drops_and_counts(self) -> None:
+        queue = EventLogSendQueue(max_size=2, flush_delay=0)
+        ch = _make_channel()
+
+        results = [await queue.put(ch, discord.Embed(title=f"e{i}")) for i in range(5)]
+        await queue.close()
+
+        assert results == [True, True, False, False, False]
+        assert queue.dropped == 3
+        assert len(_sent_embeds(ch)) == 2
+
+    async def test_channels_send_concurrently(self) -> None:
+        """1 チャンネルの送信が詰まっても他のチャンネルは送れる。"""
+        queue = EventLogSendQueue(flush_delay=0)
+        release = asyncio.Event()
+        slow = _make_channel(100)
+
+        async def _blocked_send(**_: object) -> None:
+            await release.wait()
+
+        slow.send = AsyncMock(side_effect=_blocked_send)
+        fast = _make_channel(200)
+
+        await queue.put(slow, discord.Embed(title="slow"))
+        await queue.put(fast, discord.Embed(title="fast"))
+        await asyncio.sleep(0.05)
+
+        fast.send.assert_awaited_once()
+        release.set()
+        await queue.close()
+        slow.send.assert_awaited_once()
+
+    async def test_forbidden_is_swallowed(self) -> None:
+        queue = EventLogSendQueue(flush_delay=0)
+        ch = _make_channel()
+        ch.send = AsyncMock(side_effect=discord.Forbidden(MagicMock(), ""))
+
+        await queue.put(ch, discord.Embed(title="e"))
+        await queue.close()
+
+        ch.send.assert_awaited_once()
+        assert queue.sent_messages == 0
+
+    async def test_http_exception_continues_with_next_chunk(self) -> None:
+        queue = EventLogSendQueue(flush_delay=0.05)
+        ch = _make_channel()
+        ch.send = AsyncMock(
+            side_effect=[discord.HTTPException(MagicMock(), "error"), None]
+        )
+
+        for i in range(12):
+            await queue.put(ch, discord.Embed(title=f"e{i}"))
+        await queue.close()
+
+        assert ch.send.await_count == 2
+        assert queue.sent_messages == 1
+        assert queue.sent_embeds == 2
+
+    async def test_worker_survives_unexpected_error(self) -> None:
+        queue = EventLogSendQueue(flush_delay=0)
+        ch = _make_channel()
+        ch.send = AsyncMock(side_effect=[RuntimeError("boom"), None])
+
+        await queue.put(ch, discord.Embed(title="a"))
+        await asyncio.sleep(0.01)
+        await queue.put(ch, discord.Embed(title="b"))
+        await queue.close()
+
+        assert ch.send.await_count == 2
+
+    async def test_close_without_puts(self) -> None:
+        queue = EventLogSendQueue()
+        await queue.close()
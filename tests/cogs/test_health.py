@@ -8,6 +8,8 @@ import discord
 from discord.ext import commands
 
 from src.cogs.health import HealthCog
+from src.core.instrumentation import ListenerMetrics
+from src.core.loop_monitor import LoopLagProbe
 
 # ---------------------------------------------------------------------------
 # テスト用ヘルパー
@@ -112,6 +114,60 @@ class TestBuildEmbed:
         assert embed.footer is not None
         assert "Boot" in (embed.footer.text or "")
 
+    def test_embed_has_handler_fields_when_metrics_present(self) -> None:
+        """listener_metrics があればハンドラーと遅い呼び出しの欄が付く。"""
+        cog = _make_cog()
+        metrics = ListenerMetrics(slow_seconds=1.0)
+        metrics.record("VoiceCog", "on_voice_state_update", 0.02)
+        metrics.record("StickyCog", "on_message", 1.5)
+        cog.bot.listener_metrics = metrics
+
+        embed = cog._build_embed(
+            status="Healthy",
+            uptime_str="0h 0m 0s",
+            latency_ms=10,
+            guild_count=1,
+        )
+
+        fields = {f.name: f.value or "" for f in embed.fields}
+        handlers = fields["Handlers (p50/p95/p99)"]
+        assert handlers.index("StickyCog.on_message") < handlers.index(
+            "VoiceCog.on_voice_state_update"
+        )
+        assert "StickyCog.on_message" in fields["Slow calls (>= 1s)"]
+
+    def test_embed_has_event_loop_field_when_probe_present(self) -> None:
+        """loop_probe があればループ遅延と最後に塞いだ場所の欄が付く。"""
+        cog = _make_cog()
+        probe = LoopLagProbe(block_threshold=0.1)
+        probe.observe(0.01)
+        probe._pending = ("bot.py:10 in render", "stack")
+        probe.observe(0.3)
+        cog.bot.loop_probe = probe
+
+        embed = cog._build_embed(
+            status="Healthy",
+            uptime_str="0h 0m 0s",
+            latency_ms=10,
+            guild_count=1,
+        )
+
+        value = {f.name: f.value or "" for f in embed.fields}["Event loop"]
+        assert "blocks=1" in value
+        assert "bot.py:10 in render" in value
+
+    def test_embed_has_no_handler_fields_without_metrics(self) -> None:
+        """listener_metrics がなければハンドラーの欄は付かない。"""
+        cog = _make_cog()
+        embed = cog._build_embed(
+            status="Healthy",
+            uptime_str="0h 0m 0s",
+            latency_ms=10,
+            guild_count=1,
+        )
+
+        assert [f.name for f in embed.fields] == ["Uptime", "Latency", "Guilds"]
+
 
 # ---------------------------------------------------------------------------
 # _heartbeat テスト
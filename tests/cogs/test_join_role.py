@@ -130,6 +130,54 @@ class TestOnMemberJoin:
             )
             mock_create.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_assign_schedules_expiry(self) -> None:
+        """付与したら有効期限をスケジューラに知らせる。"""
+        cog = _make_cog()
+        member = _make_member()
+        member.guild.get_role.return_value = MagicMock(spec=discord.Role)
+        config = _make_config()
+
+        with (
+            patch(
+                "src.cogs.join_role.get_enabled_join_role_configs",
+                return_value=[config],
+            ),
+            patch(
+                "src.cogs.join_role.claim_join_role_assignment",
+                new_callable=AsyncMock,
+            ) as mock_claim,
+            patch.object(cog._expiry_scheduler, "schedule") as mock_schedule,
+        ):
+            await cog.on_member_join(member)
+
+        expires_at = mock_claim.call_args.kwargs["expires_at"]
+        mock_schedule.assert_called_once_with(expires_at)
+
+    @pytest.mark.asyncio
+    async def test_unclaimed_assignment_not_scheduled(self) -> None:
+        """別インスタンスが処理済みなら期限を登録しない。"""
+        cog = _make_cog()
+        member = _make_member()
+        member.guild.get_role.return_value = MagicMock(spec=discord.Role)
+        config = _make_config()
+
+        with (
+            patch(
+                "src.cogs.join_role.get_enabled_join_role_configs",
+                return_value=[config],
+            ),
+            patch(
+                "src.cogs.join_role.claim_join_role_assignment",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch.object(cog._expiry_scheduler, "schedule") as mock_schedule,
+        ):
+            await cog.on_member_join(member)
+
+        mock_schedule.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_role_not_found(self) -> None:
         """ロールが見つからない場合はスキップ。"""
@@ -208,7 +256,19 @@ class TestOnMemberJoin:
 
 
 class TestCheckExpiredRoles:
-    """_check_expired_roles バックグラウンドタスクのテスト。"""
+    """_check_expired_roles (スケジューラから呼ばれる期限切れ処理) のテスト。"""
+
+    @pytest.mark.asyncio
+    async def test_next_expiry_reads_db(self) -> None:
+        """スケジューラには DB の最も早い有効期限を渡す。"""
+        cog = _make_cog()
+        expires_at = datetime.now(UTC) + timedelta(hours=1)
+        with patch(
+            "src.cogs.join_role.get_next_join_role_expiry",
+            new_callable=AsyncMock,
+            return_value=expires_at,
+        ):
+            assert await cog._next_expiry() == expires_at
 
     @pytest.mark.asyncio
     async def test_removes_expired_role(self) -> None:
@@ -412,33 +472,37 @@ class TestCogLifecycle:
 
     @pytest.mark.asyncio
     async def test_cog_load_starts_task(self) -> None:
-        """cog_load でバックグラウンドタスクが開始される。"""
+        """cog_load で期限切れスケジューラが開始される。"""
         cog = _make_cog()
-        with patch.object(cog._check_expired_roles, "start") as mock_start:
+        with patch.object(cog._expiry_scheduler, "start") as mock_start:
             await cog.cog_load()
             mock_start.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_cog_unload_cancels_task(self) -> None:
-        """cog_unload でバックグラウンドタスクが停止される。"""
+        """cog_unload で期限切れスケジューラが停止される。"""
         cog = _make_cog()
         with (
-            patch.object(cog._check_expired_roles, "is_running", return_value=True),
-            patch.object(cog._check_expired_roles, "cancel") as mock_cancel,
+            patch.object(cog._expiry_scheduler, "is_running", return_value=True),
+            patch.object(
+                cog._expiry_scheduler, "stop", new_callable=AsyncMock
+            ) as mock_stop,
         ):
             await cog.cog_unload()
-            mock_cancel.assert_called_once()
+            mock_stop.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_cog_unload_not_running(self) -> None:
-        """タスク未実行時の cog_unload は cancel しない。"""
+        """スケジューラ未実行時の cog_unload は stop しない。"""
         cog = _make_cog()
         with (
-            patch.object(cog._check_expired_roles, "is_running", return_value=False),
-            patch.object(cog._check_expired_roles, "cancel") as mock_cancel,
+            patch.object(cog._expiry_scheduler, "is_running", return_value=False),
+            patch.object(
+                cog._expiry_scheduler, "stop", new_callable=AsyncMock
+            ) as mock_stop,
         ):
             await cog.cog_unload()
-            mock_cancel.assert_not_called()
+            mock_stop.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
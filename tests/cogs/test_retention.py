@@ -0,0 +1,117 @@
+"""Tests for RetentionCog (periodic log pruning)."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from discord.ext import commands
+
+from src.cogs.retention import RetentionCog, setup
+
+
+def _make_cog() -> RetentionCog:
+    bot = MagicMock(spec=commands.Bot)
+    bot.wait_until_ready = AsyncMock()
+    return RetentionCog(bot)
+
+
+class TestPrune:
+    """_prune ループ本体のテスト。"""
+
+    async def test_runs_when_claimed(self) -> None:
+        """claim できたインスタンスだけが run_retention を呼ぶ。"""
+        cog = _make_cog()
+        with (
+            patch(
+                "src.cogs.retention.claim_event", new_callable=AsyncMock
+            ) as mock_claim,
+            patch(
+                "src.cogs.retention.run_retention",
+                new_callable=AsyncMock,
+                return_value={"automod_logs": 3, "ban_logs": 0},
+            ) as mock_run,
+        ):
+            mock_claim.return_value = True
+            await cog._prune()
+
+        assert mock_claim.await_args.args[0].startswith("retention:")
+        mock_run.assert_awaited_once()
+
+    async def test_skips_when_claimed_elsewhere(self) -> None:
+        cog = _make_cog()
+        with (
+            patch(
+                "src.cogs.retention.claim_event",
+                new_callable=AsyncMock,
+                return_value=False,
+            ),
+            patch(
+                "src.cogs.retention.run_retention", new_callable=AsyncMock
+            ) as mock_run,
+        ):
+            await cog._prune()
+
+        mock_run.assert_not_awaited()
+
+    async def test_skips_when_claim_fails(self) -> None:
+        """claim の DB エラー時は次の周期まで実行しない。"""
+        cog = _make_cog()
+        with (
+            patch(
+                "src.cogs.retention.claim_event",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+            patch(
+                "src.cogs.retention.run_retention", new_callable=AsyncMock
+            ) as mock_run,
+        ):
+            await cog._prune()
+
+        mock_run.assert_not_awaited()
+
+    async def test_run_error_is_logged_not_raised(self) -> None:
+        """run_retention の例外でループを止めない。"""
+        cog = _make_cog()
+        with (
+            patch(
+                "src.cogs.retention.claim_event",
+                new_callable=AsyncMock,
+                return_value=True,
+            ),
+            patch(
+                "src.cogs.retention.run_retention",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("boom"),
+            ),
+            patch("src.cogs.retention.logger") as mock_logger,
+        ):
+            await cog._prune()
+
+        mock_logger.exception.assert_called_once()
+
+
+class TestLifecycle:
+    """Cog の読み込み・停止。"""
+
+    async def test_load_and_unload(self) -> None:
+        cog = _make_cog()
+        with (
+            patch.object(cog._prune, "start") as mock_start,
+            patch.object(cog._prune, "cancel") as mock_cancel,
+        ):
+            await cog.cog_load()
+            await cog.cog_unload()
+        mock_start.assert_called_once()
+        mock_cancel.assert_called_once()
+
+    async def test_before_loop_waits_until_ready(self) -> None:
+        cog = _make_cog()
+        await cog._before_prune()
+        cog.bot.wait_until_ready.assert_awaited_once()  # type: ignore[attr-defined]
+
+    async def test_setup_adds_cog(self) -> None:
+        bot = MagicMock(spec=commands.Bot)
+        bot.add_cog = AsyncMock()
+        await setup(bot)
+        assert isinstance(bot.add_cog.await_args.args[0], RetentionCog)
@@ -7,8 +7,16 @@ import pytest
 from discord.ext import commands
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cogs.role_panel import RolePanelCog
+from src.database.change_feed import ChangeBatch, ChangeEvent
 from src.database.models import DiscordRole, RolePanel, RolePanelItem
 
+
+def _bulk_sync_len(_session: object, _guild_id: str, rows: list[object]) -> int:
+    """bulk_sync_discord_* のモック: 渡された行数を返す。"""
+    return len(rows)
+
+
 # =============================================================================
 # Database Model Tests
 # =============================================================================
@@ -437,11 +445,11 @@ class TestRoleButton:
             position=0,
         )
 
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
-        assert button.label == "Gamer"
+        assert button.item.label == "Gamer"
         assert button.custom_id == "role_panel:1:1"
-        assert button.style == discord.ButtonStyle.primary
+        assert button.item.style == discord.ButtonStyle.primary
 
 
 class TestRolePanelView:
@@ -486,196 +494,141 @@ class TestRolePanelCog:
     @pytest.fixture
     def mock_bot(self) -> MagicMock:
         """Mock Bot."""
-        bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
-        return bot
+        return MagicMock(spec=commands.Bot)
 
-    async def test_cog_load_registers_views(self, mock_bot: MagicMock) -> None:
-        """cog_load が永続 View を登録する。"""
-        from src.cogs.role_panel import RolePanelCog
+    async def test_cog_load_registers_dynamic_item(self, mock_bot: MagicMock) -> None:
+        """cog_load がパネルの数に関係なく RoleButton を 1 回だけ登録する。"""
+        from src.ui.role_panel_view import RoleButton
 
-        mock_panel = RolePanel(
-            id=1,
-            guild_id="123",
-            channel_id="456",
-            panel_type="button",
-            title="Test",
-            message_id="999",
-        )
-        mock_items = [
-            RolePanelItem(id=1, panel_id=1, role_id="111", emoji="🎮", position=0),
+        panels = [
+            RolePanel(
+                id=i,
+                guild_id="123",
+                channel_id="456",
+                panel_type="button",
+                title=f"P{i}",
+                message_id=str(900 + i),
+            )
+            for i in range(1, 4)
         ]
 
-        with patch("src.cogs.role_panel.async_session") as mock_session:
-            mock_db = AsyncMock()
-            mock_session.return_value.__aenter__.return_value = mock_db
-
-            with patch("src.cogs.role_panel.get_all_role_panels") as mock_get_panels:
-                mock_get_panels.return_value = [mock_panel]
-
-                with patch(
-                    "src.cogs.role_panel.get_role_panel_items"
-                ) as mock_get_items:
-                    mock_get_items.return_value = mock_items
-
-                    cog = RolePanelCog(mock_bot)
-                    cog._sync_views_task.start = MagicMock()
-                    await cog.cog_load()
+        with (
+            patch("src.cogs.role_panel.async_session"),
+            patch("src.cogs.role_panel.get_all_role_panels", return_value=panels),
+        ):
+            cog = RolePanelCog(mock_bot)
+            cog._sync_cache_task.start = MagicMock()
+            await cog.cog_load()
 
-        mock_bot.add_view.assert_called()
+        mock_bot.add_dynamic_items.assert_called_once_with(RoleButton)
+        mock_bot.add_view.assert_not_called()
 
     async def test_cog_load_starts_sync_task(self, mock_bot: MagicMock) -> None:
         """cog_load が定期同期タスクを開始する。"""
-        from src.cogs.role_panel import RolePanelCog
-
-        with patch("src.cogs.role_panel.async_session") as mock_session:
-            mock_db = AsyncMock()
-            mock_session.return_value.__aenter__.return_value = mock_db
-
-            with patch("src.cogs.role_panel.get_all_role_panels") as mock_get_panels:
-                mock_get_panels.return_value = []
-
-                cog = RolePanelCog(mock_bot)
-                cog._sync_views_task.start = MagicMock()
-                await cog.cog_load()
+        with (
+            patch("src.cogs.role_panel.async_session"),
+            patch("src.cogs.role_panel.get_all_role_panels", return_value=[]),
+        ):
+            cog = RolePanelCog(mock_bot)
+            cog._sync_cache_task.start = MagicMock()
+            await cog.cog_load()
 
-        cog._sync_views_task.start.assert_called_once()
+        cog._sync_cache_task.start.assert_called_once()
 
-    async def test_cog_unload_cancels_sync_task(self, mock_bot: MagicMock) -> None:
-        """cog_unload が定期同期タスクを停止する。"""
-        from src.cogs.role_panel import RolePanelCog
+    async def test_cog_unload(self, mock_bot: MagicMock) -> None:
+        """cog_unload が定期同期タスクを停止し、RoleButton の登録を外す。"""
+        from src.ui.role_panel_view import RoleButton
 
         cog = RolePanelCog(mock_bot)
-        cog._sync_views_task.cancel = MagicMock()
+        cog._sync_cache_task.cancel = MagicMock()
         await cog.cog_unload()
 
-        cog._sync_views_task.cancel.assert_called_once()
+        cog._sync_cache_task.cancel.assert_called_once()
+        mock_bot.remove_dynamic_items.assert_called_once_with(RoleButton)
 
-    async def test_cog_load_skips_reaction_panels(self, mock_bot: MagicMock) -> None:
-        """cog_load がリアクション式パネルをスキップする。"""
-        from src.cogs.role_panel import RolePanelCog
-
-        mock_panel = RolePanel(
-            id=1, guild_id="123", channel_id="456", panel_type="reaction", title="Test"
-        )
-
-        with patch("src.cogs.role_panel.async_session") as mock_session:
-            mock_db = AsyncMock()
-            mock_session.return_value.__aenter__.return_value = mock_db
-
-            with patch("src.cogs.role_panel.get_all_role_panels") as mock_get_panels:
-                mock_get_panels.return_value = [mock_panel]
-
-                cog = RolePanelCog(mock_bot)
-                cog._sync_views_task.start = MagicMock()
-                await cog.cog_load()
+    async def test_load_panel_message_ids(self, mock_bot: MagicMock) -> None:
+        """ボタン式・リアクション式どちらの message_id もキャッシュされる。"""
+        panels = [
+            RolePanel(
+                id=1,
+                guild_id="123",
+                channel_id="456",
+                panel_type="button",
+                title="B",
+                message_id="999",
+            ),
+            RolePanel(
+                id=2,
+                guild_id="123",
+                channel_id="456",
+                panel_type="reaction",
+                title="R",
+                message_id="888",
+            ),
+            RolePanel(
+                id=3,
+                guild_id="123",
+                channel_id="456",
+                panel_type="reaction",
+                title="未送信",
+            ),
+        ]
 
-        # リアクション式は add_view が呼ばれない
-        mock_bot.add_view.assert_not_called()
+        with (
+            patch("src.cogs.role_panel.async_session"),
+            patch("src.cogs.role_panel.get_all_role_panels", return_value=panels),
+        ):
+            cog = RolePanelCog(mock_bot)
+            await cog._load_panel_message_ids()
 
-    async def test_sync_views_task_calls_register(self, mock_bot: MagicMock) -> None:
-        """_sync_views_task が _register_all_views を呼ぶ。"""
-        from src.cogs.role_panel import RolePanelCog
+        assert cog._panel_message_ids == {"999", "888"}
 
+    async def test_sync_cache_task_calls_load(self, mock_bot: MagicMock) -> None:
+        """_sync_cache_task が _load_panel_message_ids を呼ぶ。"""
         cog = RolePanelCog(mock_bot)
 
         with patch.object(
-            cog, "_register_all_views", new_callable=AsyncMock
-        ) as mock_register:
-            await cog._sync_views_task()
-            mock_register.assert_called_once()
-
-    async def test_sync_views_task_handles_error(self, mock_bot: MagicMock) -> None:
-        """_sync_views_task が例外発生時にクラッシュしない。"""
-        from src.cogs.role_panel import RolePanelCog
+            cog, "_load_panel_message_ids", new_callable=AsyncMock
+        ) as mock_load:
+            await cog._sync_cache_task()
+            mock_load.assert_called_once()
 
+    async def test_sync_cache_task_handles_error(self, mock_bot: MagicMock) -> None:
+        """_sync_cache_task が例外発生時にクラッシュしない。"""
         cog = RolePanelCog(mock_bot)
 
         with patch.object(
-            cog, "_register_all_views", side_effect=Exception("DB error")
+            cog, "_load_panel_message_ids", side_effect=Exception("DB error")
         ):
             # 例外が飛ばずに正常終了する
-            await cog._sync_views_task()
-
-    async def test_register_views_mixed_panels(self, mock_bot: MagicMock) -> None:
-        """ボタン式とリアクション式が混在する場合、ボタン式のみ登録される。"""
-        from src.cogs.role_panel import RolePanelCog
-
-        button_panel = RolePanel(
-            id=1,
-            guild_id="123",
-            channel_id="456",
-            panel_type="button",
-            title="B",
-            message_id="999",
-        )
-        reaction_panel = RolePanel(
-            id=2,
-            guild_id="123",
-            channel_id="456",
-            panel_type="reaction",
-            title="R",
-            message_id="888",
-        )
-        mock_items = [
-            RolePanelItem(id=1, panel_id=1, role_id="111", emoji="🎮", position=0),
-        ]
-
-        with patch("src.cogs.role_panel.async_session") as mock_session:
-            mock_db = AsyncMock()
-            mock_session.return_value.__aenter__.return_value = mock_db
-
-            with patch("src.cogs.role_panel.get_all_role_panels") as mock_get_panels:
-                mock_get_panels.return_value = [button_panel, reaction_panel]
+            await cog._sync_cache_task()
 
-                with patch(
-                    "src.cogs.role_panel.get_role_panel_items"
-                ) as mock_get_items:
-                    mock_get_items.return_value = mock_items
-
-                    cog = RolePanelCog(mock_bot)
-                    await cog._register_all_views()
-
-        # ボタン式の1パネルのみ add_view される
-        assert mock_bot.add_view.call_count == 1
-        # get_role_panel_items はボタン式の1パネル分のみ呼ばれる
-        mock_get_items.assert_called_once_with(mock_db, 1)
+    async def test_db_change_reloads_cache(self, mock_bot: MagicMock) -> None:
+        """Web でパネルが作成/削除されたら message_id キャッシュを読み直す。"""
+        cog = RolePanelCog(mock_bot)
+        batch = ChangeBatch(events=(ChangeEvent("role_panels", "insert", "1"),))
 
-    async def test_register_views_multiple_button_panels(
-        self, mock_bot: MagicMock
-    ) -> None:
-        """複数のボタン式パネルが全て登録される。"""
-        from src.cogs.role_panel import RolePanelCog
+        with patch.object(
+            cog, "_load_panel_message_ids", new_callable=AsyncMock
+        ) as mock_load:
+            await cog.on_db_change(batch)
+            mock_load.assert_called_once()
 
-        panels = [
-            RolePanel(
-                id=i,
-                guild_id="123",
-                channel_id="456",
-                panel_type="button",
-                title=f"P{i}",
-                message_id=str(900 + i),
+    async def test_db_change_ignores_other_tables(self, mock_bot: MagicMock) -> None:
+        """アイテムの変更はボタンのクリック時に DB から読むので何もしない。"""
+        cog = RolePanelCog(mock_bot)
+        batch = ChangeBatch(
+            events=(
+                ChangeEvent("role_panel_items", "insert", "1"),
+                ChangeEvent("sticky_messages", "insert", "1"),
             )
-            for i in range(1, 4)
-        ]
-
-        with patch("src.cogs.role_panel.async_session") as mock_session:
-            mock_db = AsyncMock()
-            mock_session.return_value.__aenter__.return_value = mock_db
-
-            with patch("src.cogs.role_panel.get_all_role_panels") as mock_get_panels:
-                mock_get_panels.return_value = panels
-
-                with patch(
-                    "src.cogs.role_panel.get_role_panel_items"
-                ) as mock_get_items:
-                    mock_get_items.return_value = []
-
-                    cog = RolePanelCog(mock_bot)
-                    await cog._register_all_views()
+        )
 
-        # 3 パネル全て add_view される
-        assert mock_bot.add_view.call_count == 3
+        with patch.object(
+            cog, "_load_panel_message_ids", new_callable=AsyncMock
+        ) as mock_load:
+            await cog.on_db_change(batch)
+            mock_load.assert_not_called()
 
 
 class TestSetupFunction:
@@ -698,20 +651,19 @@ class TestCogLoad:
 
     async def test_cog_load_does_not_raise_on_db_error(self) -> None:
         """DB エラーでも cog_load が例外を出さずに完了する."""
-        from src.cogs.role_panel import RolePanelCog
-
         bot = MagicMock(spec=commands.Bot)
         cog = RolePanelCog(bot)
 
-        # _register_all_views が例外を投げても cog_load は失敗しない
+        # _load_panel_message_ids が例外を投げても cog_load は失敗しない
         with patch.object(
-            cog, "_register_all_views", side_effect=Exception("DB error")
+            cog, "_load_panel_message_ids", side_effect=Exception("DB error")
         ):
-            cog._sync_views_task = MagicMock()
+            cog._sync_cache_task = MagicMock()
             await cog.cog_load()
 
-        # _sync_views_task は開始される
-        cog._sync_views_task.start.assert_called_once()
+        # ボタンは登録され、_sync_cache_task も開始される
+        bot.add_dynamic_items.assert_called_once()
+        cog._sync_cache_task.start.assert_called_once()
 
 
 # =============================================================================
@@ -1473,8 +1425,14 @@ class TestRoleButtonCallback:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch(
-                "src.ui.role_panel_view.get_role_panel", return_value=mock_panel
+            with (
+                patch("src.ui.role_panel_view.get_role_panel", return_value=mock_panel),
+                patch(
+                    "src.ui.role_panel_view.get_role_panel_item",
+                    return_value=RolePanelItem(
+                        id=1, panel_id=1, role_id="123", emoji="🎮", position=0
+                    ),
+                ),
             ):
                 yield
 
@@ -1485,7 +1443,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         interaction = MagicMock(spec=discord.Interaction)
         interaction.guild = None
@@ -1506,7 +1464,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         interaction = MagicMock(spec=discord.Interaction)
         interaction.guild = MagicMock(spec=discord.Guild)
@@ -1528,7 +1486,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="999", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         interaction = MagicMock(spec=discord.Interaction)
         interaction.guild = MagicMock(spec=discord.Guild)
@@ -1551,7 +1509,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         mock_role = MagicMock(spec=discord.Role)
         mock_role.position = 10
@@ -1585,7 +1543,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         mock_role = MagicMock(spec=discord.Role)
         mock_role.position = 5
@@ -1627,7 +1585,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         mock_role = MagicMock(spec=discord.Role)
         mock_role.position = 5
@@ -1669,7 +1627,7 @@ class TestRoleButtonCallback:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         mock_role = MagicMock(spec=discord.Role)
         mock_role.position = 5
@@ -1727,9 +1685,8 @@ class TestRefreshRolePanel:
             message_id=None,
         )
         channel = MagicMock(spec=discord.TextChannel)
-        bot = MagicMock(spec=discord.Client)
 
-        result = await refresh_role_panel(channel, panel, [], bot)
+        result = await refresh_role_panel(channel, panel, [])
 
         assert result is False
 
@@ -1753,9 +1710,8 @@ class TestRefreshRolePanel:
         channel.fetch_message = AsyncMock(
             side_effect=discord.NotFound(mock_response, "Not found")
         )
-        bot = MagicMock(spec=discord.Client)
 
-        result = await refresh_role_panel(channel, panel, [], bot)
+        result = await refresh_role_panel(channel, panel, [])
 
         assert result is False
 
@@ -1781,13 +1737,9 @@ class TestRefreshRolePanel:
         channel = MagicMock(spec=discord.TextChannel)
         channel.fetch_message = AsyncMock(return_value=mock_msg)
 
-        bot = MagicMock(spec=discord.Client)
-        bot.add_view = MagicMock()
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
-        bot.add_view.assert_called_once()
         mock_msg.edit.assert_awaited_once()
 
     async def test_reaction_panel_updates_reactions(self) -> None:
@@ -1815,9 +1767,7 @@ class TestRefreshRolePanel:
         channel = MagicMock(spec=discord.TextChannel)
         channel.fetch_message = AsyncMock(return_value=mock_msg)
 
-        bot = MagicMock(spec=discord.Client)
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         mock_msg.edit.assert_awaited_once()
@@ -1843,9 +1793,8 @@ class TestRefreshRolePanel:
         channel.fetch_message = AsyncMock(
             side_effect=discord.HTTPException(mock_response, "Server error")
         )
-        bot = MagicMock(spec=discord.Client)
 
-        result = await refresh_role_panel(channel, panel, [], bot)
+        result = await refresh_role_panel(channel, panel, [])
 
         assert result is False
 
@@ -1883,9 +1832,7 @@ class TestRefreshRolePanel:
         channel = MagicMock(spec=discord.TextChannel)
         channel.fetch_message = AsyncMock(return_value=mock_msg)
 
-        bot = MagicMock(spec=discord.Client)
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         assert mock_msg.add_reaction.await_count == 2
@@ -3020,8 +2967,14 @@ class TestRoleButtonHTTPException:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch(
-                "src.ui.role_panel_view.get_role_panel", return_value=mock_panel
+            with (
+                patch("src.ui.role_panel_view.get_role_panel", return_value=mock_panel),
+                patch(
+                    "src.ui.role_panel_view.get_role_panel_item",
+                    return_value=RolePanelItem(
+                        id=1, panel_id=1, role_id="123", emoji="🎮", position=0
+                    ),
+                ),
             ):
                 yield
 
@@ -3032,7 +2985,7 @@ class TestRoleButtonHTTPException:
         item = RolePanelItem(
             id=1, panel_id=1, role_id="123", emoji="🎮", position=0, style="primary"
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         mock_role = MagicMock(spec=discord.Role)
         mock_role.position = 5
@@ -3320,12 +3273,27 @@ class TestRoleSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_role") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_roles",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_roles(mock_guild)
 
-        # 通常のロールのみ (1件) が同期される
+        # 通常のロールのみ (1件) が 1 回の一括同期で渡される
         assert count == 1
-        mock_upsert.assert_called_once()
+        mock_role = mock_guild.roles[2]
+        mock_bulk.assert_awaited_once_with(
+            mock_db,
+            str(mock_guild.id),
+            [
+                {
+                    "role_id": str(mock_role.id),
+                    "role_name": mock_role.name,
+                    "color": mock_role.color.value,
+                    "position": mock_role.position,
+                }
+            ],
+        )
 
     async def test_on_ready_syncs_all_guilds(self, mock_bot: MagicMock) -> None:
         """on_ready が全ギルドの情報を同期する。"""
@@ -3364,6 +3332,40 @@ class TestRoleSyncEventListeners:
         assert mock_sync_roles.call_count == 2
         assert mock_sync_channels.call_count == 2
 
+    async def test_on_ready_continues_after_guild_failure(
+        self, mock_bot: MagicMock
+    ) -> None:
+        """on_ready は 1 ギルドの同期失敗で他のギルドの同期を止めない。"""
+        from src.cogs.role_panel import RolePanelCog
+
+        guild1 = MagicMock(spec=discord.Guild)
+        guild1.id = 1
+        guild1.name = "Guild 1"
+        guild2 = MagicMock(spec=discord.Guild)
+        guild2.id = 2
+        guild2.name = "Guild 2"
+        mock_bot.guilds = [guild1, guild2]
+
+        cog = RolePanelCog(mock_bot)
+
+        async def sync_roles(guild: discord.Guild) -> int:
+            if guild is guild1:
+                raise RuntimeError("db down")
+            return 5
+
+        with (
+            patch.object(cog, "_sync_guild_info", new_callable=AsyncMock),
+            patch.object(cog, "_sync_guild_roles", side_effect=sync_roles),
+            patch.object(
+                cog, "_sync_guild_channels", new_callable=AsyncMock
+            ) as mock_sync_channels,
+        ):
+            mock_sync_channels.return_value = 3
+
+            await cog.on_ready()
+
+        mock_sync_channels.assert_awaited_once_with(guild2)
+
     async def test_on_guild_join_syncs_roles(
         self, mock_bot: MagicMock, mock_guild: MagicMock
     ) -> None:
@@ -3575,11 +3577,15 @@ class TestRoleSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_role") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_roles",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_roles(guild)
 
         assert count == 0
-        mock_upsert.assert_not_called()
+        # 対象ロールがなくても一括同期は呼ばれ、削除済みロールが消される
+        mock_bulk.assert_awaited_once_with(mock_db, "123", [])
 
     async def test_on_guild_role_update_with_managed_role(
         self, mock_bot: MagicMock
@@ -3649,11 +3655,16 @@ class TestRoleSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_role") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_roles",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_roles(guild)
 
         assert count == 3
-        assert mock_upsert.call_count == 3
+        mock_bulk.assert_awaited_once()
+        rows = mock_bulk.call_args.args[2]
+        assert [r["role_id"] for r in rows] == ["100", "101", "102"]
 
 
 # =============================================================================
@@ -3797,18 +3808,25 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         assert count == 1
-        mock_upsert.assert_called_once_with(
+        mock_bulk.assert_awaited_once_with(
             mock_db,
-            guild_id=str(mock_guild.id),
-            channel_id=str(mock_text_channel.id),
-            channel_name=mock_text_channel.name,
-            channel_type=mock_text_channel.type.value,
-            position=mock_text_channel.position,
-            category_id=None,
+            str(mock_guild.id),
+            [
+                {
+                    "channel_id": str(mock_text_channel.id),
+                    "channel_name": mock_text_channel.name,
+                    "channel_type": mock_text_channel.type.value,
+                    "position": mock_text_channel.position,
+                    "category_id": None,
+                }
+            ],
         )
 
     async def test_sync_guild_channels_syncs_news_channel(
@@ -3836,14 +3854,17 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         assert count == 1
-        mock_upsert.assert_called_once()
-        call_args = mock_upsert.call_args
-        assert call_args.kwargs["channel_type"] == discord.ChannelType.news.value
-        assert call_args.kwargs["category_id"] == "789"
+        mock_bulk.assert_awaited_once()
+        (row,) = mock_bulk.call_args.args[2]
+        assert row["channel_type"] == discord.ChannelType.news.value
+        assert row["category_id"] == "789"
 
     async def test_sync_guild_channels_syncs_forum_channel(
         self, mock_bot: MagicMock, mock_guild: MagicMock
@@ -3870,13 +3891,16 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         assert count == 1
-        mock_upsert.assert_called_once()
-        call_args = mock_upsert.call_args
-        assert call_args.kwargs["channel_type"] == discord.ChannelType.forum.value
+        mock_bulk.assert_awaited_once()
+        (row,) = mock_bulk.call_args.args[2]
+        assert row["channel_type"] == discord.ChannelType.forum.value
 
     async def test_sync_guild_channels_syncs_voice_channel(
         self, mock_bot: MagicMock, mock_guild: MagicMock
@@ -3903,11 +3927,14 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         assert count == 1
-        mock_upsert.assert_called_once()
+        mock_bulk.assert_awaited_once()
 
     async def test_sync_guild_channels_includes_category(
         self, mock_bot: MagicMock, mock_guild: MagicMock
@@ -3934,11 +3961,14 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         assert count == 1
-        mock_upsert.assert_called_once()
+        mock_bulk.assert_awaited_once()
 
     async def test_sync_guild_channels_skips_no_view_permission(
         self, mock_bot: MagicMock, mock_guild: MagicMock, mock_text_channel: MagicMock
@@ -3959,11 +3989,14 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         assert count == 0
-        mock_upsert.assert_not_called()
+        mock_bulk.assert_awaited_once_with(mock_db, str(mock_guild.id), [])
 
     async def test_sync_guild_channels_with_multiple_channels(
         self, mock_bot: MagicMock, mock_guild: MagicMock
@@ -4000,12 +4033,16 @@ class TestGuildInfoAndChannelSyncEventListeners:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.cogs.role_panel.upsert_discord_channel") as mock_upsert:
+            with patch(
+                "src.cogs.role_panel.bulk_sync_discord_channels",
+                side_effect=_bulk_sync_len,
+            ) as mock_bulk:
                 count = await cog._sync_guild_channels(mock_guild)
 
         # text, voice, news, forum の 4 つ
         assert count == 4
-        assert mock_upsert.call_count == 4
+        mock_bulk.assert_awaited_once()
+        assert len(mock_bulk.call_args.args[2]) == 4
 
     async def test_sync_guild_channels_with_empty_guild(
         self, mock_bot: MagicMock, mock_guild: MagicMock
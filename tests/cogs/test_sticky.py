@@ -18,7 +18,9 @@ from src.cogs.sticky import (
     StickyTextModal,
     StickyTypeSelect,
     StickyTypeView,
+    _StickySnapshot,
 )
+from src.database.change_feed import ChangeBatch, ChangeEvent
 from src.utils import clear_resource_locks
 
 fake = Faker("ja_JP")
@@ -101,6 +103,11 @@ def _make_sticky(
     return sticky
 
 
+def _make_cache(*channel_ids: str, guild_id: str = "789") -> dict[str, _StickySnapshot]:
+    """Create a populated sticky cache for the given channel IDs."""
+    return {cid: _StickySnapshot(cid, guild_id, 5) for cid in channel_ids}
+
+
 def _make_interaction(
     *,
     guild_id: int = 789,
@@ -148,24 +155,12 @@ class TestBuildEmbed:
 
 
 # ---------------------------------------------------------------------------
-# on_message テスト
+# handle_message テスト
 # ---------------------------------------------------------------------------
 
 
 class TestOnMessage:
-    """Tests for on_message listener."""
-
-    async def test_ignores_own_bot_messages(self) -> None:
-        """自分自身の Bot メッセージは無視する（無限ループ防止）。"""
-        bot_user_id = 99999
-        cog = _make_cog(bot_user_id=bot_user_id)
-        # メッセージの author.id を bot.user.id と同じにする
-        message = _make_message(author_id=bot_user_id, is_bot=True)
-
-        with patch("src.cogs.sticky.get_sticky_message") as mock_get:
-            await cog.on_message(message)
-
-        mock_get.assert_not_called()
+    """Tests for handle_message (MessageRouter handler)."""
 
     async def test_triggers_on_other_bot_messages(self) -> None:
         """他の Bot のメッセージでも sticky を再投稿する。"""
@@ -182,7 +177,7 @@ class TestOnMessage:
             patch("src.cogs.sticky.async_session", return_value=mock_session),
             patch("src.cogs.sticky.get_sticky_message", return_value=sticky),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # タスクがスケジュールされていることを確認
         channel_id = str(message.channel.id)
@@ -204,7 +199,7 @@ class TestOnMessage:
             patch("src.cogs.sticky.async_session", return_value=mock_session),
             patch("src.cogs.sticky.get_sticky_message", return_value=sticky),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # タスクがスケジュールされていることを確認
         channel_id = str(message.channel.id)
@@ -226,23 +221,12 @@ class TestOnMessage:
             patch("src.cogs.sticky.get_sticky_message", return_value=sticky),
         ):
             # エラーなく実行される
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # bot.user が None の場合、全てのメッセージが処理される
         channel_id = str(message.channel.id)
         assert channel_id in cog._pending_tasks
 
-    async def test_ignores_dm_messages(self) -> None:
-        """DM メッセージは無視する。"""
-        cog = _make_cog()
-        message = _make_message()
-        message.guild = None
-
-        with patch("src.cogs.sticky.get_sticky_message") as mock_get:
-            await cog.on_message(message)
-
-        mock_get.assert_not_called()
-
     async def test_ignores_when_no_sticky_configured(self) -> None:
         """sticky 設定がない場合は無視する。"""
         cog = _make_cog()
@@ -260,7 +244,7 @@ class TestOnMessage:
                 return_value=None,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # タスクがスケジュールされていない
         assert len(cog._pending_tasks) == 0
@@ -284,7 +268,7 @@ class TestOnMessage:
                 return_value=sticky,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # タスクがスケジュールされている
         assert "456" in cog._pending_tasks
@@ -311,11 +295,11 @@ class TestOnMessage:
             ),
         ):
             # 1回目のメッセージ
-            await cog.on_message(message)
+            await cog.handle_message(message)
             first_task = cog._pending_tasks["456"]
 
             # 2回目のメッセージ
-            await cog.on_message(message)
+            await cog.handle_message(message)
             second_task = cog._pending_tasks["456"]
 
         # 1回目のタスクはキャンセルされている
@@ -2515,13 +2499,13 @@ class TestOnMessageDebounce:
                 return_value=sticky,
             ),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
             task1 = cog._pending_tasks["456"]
 
-            await cog.on_message(message)
+            await cog.handle_message(message)
             task2 = cog._pending_tasks["456"]
 
-            await cog.on_message(message)
+            await cog.handle_message(message)
             task3 = cog._pending_tasks["456"]
 
         # 前の 2 つはキャンセルされている
@@ -2540,12 +2524,12 @@ class TestOnMessageDebounce:
 
 
 class TestStickyCacheIntegration:
-    """_sticky_channels キャッシュが非 None の場合のブランチテスト。"""
+    """_sticky_cache キャッシュが非 None の場合のブランチテスト。"""
 
     async def test_text_modal_adds_to_cache(self) -> None:
         """テキスト modal 完了時にキャッシュに追加される。"""
         cog = _make_cog()
-        cog._sticky_channels = set()
+        cog._sticky_cache = {}
 
         interaction = _make_interaction()
         modal = StickyTextModal(cog)
@@ -2573,12 +2557,12 @@ class TestStickyCacheIntegration:
         ):
             await modal.on_submit(interaction)
 
-        assert "456" in cog._sticky_channels
+        assert "456" in cog._sticky_cache
 
     async def test_remove_discards_from_cache(self) -> None:
         """sticky_remove でキャッシュからも削除される。"""
         cog = _make_cog()
-        cog._sticky_channels = {"123", "456"}
+        cog._sticky_cache = _make_cache("123", "456")
 
         sticky = _make_sticky(message_id="999")
 
@@ -2605,13 +2589,13 @@ class TestStickyCacheIntegration:
         ):
             await cog.sticky_remove.callback(cog, interaction)
 
-        assert "456" not in cog._sticky_channels
-        assert "123" in cog._sticky_channels
+        assert "456" not in cog._sticky_cache
+        assert "123" in cog._sticky_cache
 
     async def test_repost_not_found_discards_from_cache(self) -> None:
         """再投稿で NotFound 時にキャッシュからも削除される。"""
         cog = _make_cog()
-        cog._sticky_channels = {"456"}
+        cog._sticky_cache = _make_cache("456")
 
         channel = MagicMock()
         channel.send = AsyncMock()
@@ -2638,12 +2622,12 @@ class TestStickyCacheIntegration:
         ):
             await cog._delayed_repost(channel, "456", 5)
 
-        assert "456" not in cog._sticky_channels
+        assert "456" not in cog._sticky_cache
 
     async def test_repost_http_exception_discards_from_cache(self) -> None:
         """再投稿で HTTPException 時にキャッシュからも削除される。"""
         cog = _make_cog()
-        cog._sticky_channels = {"456"}
+        cog._sticky_cache = _make_cache("456")
 
         channel = MagicMock()
         channel.send = AsyncMock()
@@ -2672,12 +2656,12 @@ class TestStickyCacheIntegration:
         ):
             await cog._delayed_repost(channel, "456", 5)
 
-        assert "456" not in cog._sticky_channels
+        assert "456" not in cog._sticky_cache
 
     async def test_repost_no_message_id_discards_from_cache(self) -> None:
         """message_id なしの場合にキャッシュからも削除される。"""
         cog = _make_cog()
-        cog._sticky_channels = {"456"}
+        cog._sticky_cache = _make_cache("456")
 
         channel = MagicMock()
 
@@ -2702,7 +2686,79 @@ class TestStickyCacheIntegration:
         ):
             await cog._delayed_repost(channel, "456", 5)
 
-        assert "456" not in cog._sticky_channels
+        assert "456" not in cog._sticky_cache
+
+
+class TestOnDbChange:
+    """Web 管理画面での変更通知 (on_db_change) のテスト。"""
+
+    async def test_reloads_changed_channels(self) -> None:
+        """行を特定できる変更は該当チャンネルだけ読み直す。"""
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("123", "456")
+        batch = ChangeBatch(
+            events=(
+                ChangeEvent("sticky_messages", "update", "123", "789"),
+                ChangeEvent("sticky_messages", "delete", "456", "789"),
+                ChangeEvent("sticky_messages", "insert", "777", "789"),
+            )
+        )
+        stickies = {
+            "123": _make_sticky(channel_id="123", cooldown_seconds=30),
+            "777": _make_sticky(channel_id="777"),
+        }
+
+        async def _get(_session: object, channel_id: str) -> MagicMock | None:
+            return stickies.get(channel_id)
+
+        with (
+            patch("src.cogs.sticky.async_session"),
+            patch("src.cogs.sticky.get_sticky_message", side_effect=_get),
+            patch(
+                "src.cogs.sticky.get_all_sticky_messages", new_callable=AsyncMock
+            ) as mock_all,
+        ):
+            await cog.on_db_change(batch)
+
+        mock_all.assert_not_awaited()
+        assert set(cog._sticky_cache) == {"123", "777"}
+        assert cog._sticky_cache["123"].cooldown_seconds == 30
+
+    async def test_bulk_change_reloads_all(self) -> None:
+        """行を特定できない変更では全件を読み直す。"""
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("123")
+        batch = ChangeBatch(events=(ChangeEvent("sticky_messages", "delete"),))
+
+        with (
+            patch("src.cogs.sticky.async_session"),
+            patch(
+                "src.cogs.sticky.get_all_sticky_messages",
+                new_callable=AsyncMock,
+                return_value=[_make_sticky(channel_id="456")],
+            ),
+        ):
+            await cog.on_db_change(batch)
+
+        assert set(cog._sticky_cache) == {"456"}
+
+    async def test_ignores_other_tables(self) -> None:
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("123")
+        batch = ChangeBatch(events=(ChangeEvent("role_panels", "insert", "1"),))
+
+        with patch("src.cogs.sticky.get_sticky_message") as mock_get:
+            await cog.on_db_change(batch)
+
+        mock_get.assert_not_called()
+        assert set(cog._sticky_cache) == {"123"}
+
+    async def test_error_is_swallowed(self) -> None:
+        cog = _make_cog()
+        with patch(
+            "src.cogs.sticky.async_session", side_effect=RuntimeError("db down")
+        ):
+            await cog.on_db_change(ChangeBatch(resync=True))
 
 
 class TestClaimStickyRepostFalse:
@@ -3002,22 +3058,11 @@ class TestOnMessageEdgeCases:
             patch("src.cogs.sticky.async_session", return_value=mock_session),
             patch("src.cogs.sticky.get_sticky_message", return_value=None),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         channel_id = str(message.channel.id)
         assert channel_id not in cog._pending_tasks
 
-    async def test_no_guild_no_repost(self) -> None:
-        """DM メッセージでは sticky 処理をスキップ。"""
-        cog = _make_cog()
-        message = _make_message(author_id=12345)
-        message.guild = None
-
-        with patch("src.cogs.sticky.get_sticky_message") as mock_get:
-            await cog.on_message(message)
-
-        mock_get.assert_not_called()
-
     async def test_pending_task_cancelled_on_new_message(self) -> None:
         """新しいメッセージで既存のペンディングタスクがキャンセルされる。"""
         cog = _make_cog()
@@ -3037,7 +3082,7 @@ class TestOnMessageEdgeCases:
             patch("src.cogs.sticky.async_session", return_value=mock_session),
             patch("src.cogs.sticky.get_sticky_message", return_value=sticky),
         ):
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # 既存のタスクがキャンセルされた
         assert existing_task.cancelled()
@@ -3081,7 +3126,7 @@ class TestStickySetupCacheVerification:
         mock_get_all: AsyncMock,
         mock_session: MagicMock,
     ) -> None:
-        """setup が _sticky_channels キャッシュを構築する."""
+        """setup が _sticky_cache キャッシュを構築する."""
         from src.cogs.sticky import setup
 
         bot = MagicMock(spec=commands.Bot)
@@ -3101,8 +3146,9 @@ class TestStickySetupCacheVerification:
         await setup(bot)
 
         cog = bot.add_cog.call_args[0][0]
-        assert hasattr(cog, "_sticky_channels")
-        assert cog._sticky_channels == {111, 222}
+        assert cog._sticky_cache is not None
+        assert set(cog._sticky_cache) == {111, 222}
+        assert cog._message_route.ids == frozenset({111, 222})
 
     @patch("src.cogs.sticky.async_session")
     @patch("src.cogs.sticky.get_all_sticky_messages")
@@ -3127,17 +3173,16 @@ class TestStickySetupCacheVerification:
         await setup(bot)
 
         cog = bot.add_cog.call_args[0][0]
-        assert hasattr(cog, "_sticky_channels")
-        assert len(cog._sticky_channels) == 0
+        assert cog._sticky_cache == {}
 
 
 # ---------------------------------------------------------------------------
-# _sticky_channels キャッシュ統合テスト
+# _sticky_cache キャッシュ統合テスト
 # ---------------------------------------------------------------------------
 
 
 class TestStickyChannelsCache:
-    """_sticky_channels キャッシュが初期化されている場合のテスト。"""
+    """_sticky_cache キャッシュが初期化されている場合のテスト。"""
 
     @patch("src.cogs.sticky.async_session")
     @patch("src.cogs.sticky.delete_sticky_message")
@@ -3148,7 +3193,7 @@ class TestStickyChannelsCache:
     ) -> None:
         """チャンネル削除時にキャッシュから channel_id を削除する (line 343)。"""
         cog = _make_cog()
-        cog._sticky_channels = {"456", "789"}
+        cog._sticky_cache = _make_cache("456", "789")
 
         mock_delete.return_value = True
         mock_session_ctx = MagicMock()
@@ -3163,22 +3208,162 @@ class TestStickyChannelsCache:
 
         await cog.on_guild_channel_delete(channel)
 
-        assert "456" not in cog._sticky_channels
-        assert "789" in cog._sticky_channels
+        assert "456" not in cog._sticky_cache
+        assert "789" in cog._sticky_cache
 
     async def test_on_message_cache_miss_returns_early(self) -> None:
         """キャッシュ未登録チャンネルは DB アクセスなしで無視する。"""
         cog = _make_cog()
-        cog._sticky_channels = {"999"}  # channel 456 は含まない
+        cog._sticky_cache = _make_cache("999")  # channel 456 は含まない
 
         message = _make_message(channel_id=456)
 
         with patch("src.cogs.sticky.async_session") as mock_session:
-            await cog.on_message(message)
+            await cog.handle_message(message)
 
         # DB にアクセスしていないことを確認
         mock_session.assert_not_called()
 
+    async def test_on_message_cache_hit_schedules_without_db(self) -> None:
+        """キャッシュ登録済みチャンネルも DB アクセスなしで再投稿を予約する。"""
+        cog = _make_cog()
+        cog._sticky_cache = {"456": _StickySnapshot("456", "789", 12)}
+
+        message = _make_message(channel_id=456)
+
+        with (
+            patch("src.cogs.sticky.async_session") as mock_session,
+            patch.object(cog, "_delayed_repost", new_callable=AsyncMock) as mock_repost,
+        ):
+            await cog.handle_message(message)
+            await cog._pending_tasks["456"]
+
+        mock_session.assert_not_called()
+        mock_repost.assert_awaited_once_with(message.channel, "456", 12)
+
+    async def test_guild_remove_purges_guild_entries(self) -> None:
+        """ギルド退出時にそのギルドのキャッシュと保留タスクだけを破棄する。"""
+        cog = _make_cog()
+        cog._sticky_cache = {
+            **_make_cache("456", guild_id="789"),
+            **_make_cache("111", guild_id="222"),
+        }
+        pending = MagicMock()
+        cog._pending_tasks["456"] = pending
+
+        guild = MagicMock(spec=discord.Guild)
+        guild.id = 789
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch("src.cogs.sticky.async_session", return_value=mock_session),
+            patch(
+                "src.cogs.sticky.delete_sticky_messages_by_guild",
+                new_callable=AsyncMock,
+                return_value=1,
+            ),
+        ):
+            await cog.on_guild_remove(guild)
+
+        assert set(cog._sticky_cache) == {"111"}
+        pending.cancel.assert_called_once()
+        assert "456" not in cog._pending_tasks
+
+    async def test_repost_discards_stale_entry_when_deleted_in_db(self) -> None:
+        """再投稿時に DB から消えていればキャッシュの古いエントリを破棄する。"""
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("456")
+
+        channel = MagicMock()
+        channel.send = AsyncMock()
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch("src.cogs.sticky.async_session", return_value=mock_session),
+            patch(
+                "src.cogs.sticky.get_sticky_message",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await cog._delayed_repost(channel, "456", 5)
+
+        assert "456" not in cog._sticky_cache
+        channel.send.assert_not_awaited()
+
+    async def test_repost_refreshes_snapshot_from_db(self) -> None:
+        """再投稿時に DB の最新設定 (cooldown など) をキャッシュへ反映する。"""
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("456")
+
+        channel = MagicMock()
+        channel.send = AsyncMock(return_value=MagicMock(id=1000))
+        channel.fetch_message = AsyncMock(return_value=MagicMock(delete=AsyncMock()))
+
+        sticky = _make_sticky(cooldown_seconds=30)
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch("src.cogs.sticky.async_session", return_value=mock_session),
+            patch(
+                "src.cogs.sticky.get_sticky_message",
+                new_callable=AsyncMock,
+                return_value=sticky,
+            ),
+            patch(
+                "src.cogs.sticky.update_sticky_message_id",
+                new_callable=AsyncMock,
+            ),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await cog._delayed_repost(channel, "456", 5)
+
+        assert cog._sticky_cache["456"].cooldown_seconds == 30
+
+    async def test_refresh_cache_rebuilds_from_db(self) -> None:
+        """定期更新で Web 側の追加・削除がキャッシュに反映される。"""
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("456")
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch("src.cogs.sticky.async_session", return_value=mock_session),
+            patch(
+                "src.cogs.sticky.get_all_sticky_messages",
+                new_callable=AsyncMock,
+                return_value=[_make_sticky(channel_id="111", cooldown_seconds=8)],
+            ),
+        ):
+            await cog._refresh_cache()
+
+        assert set(cog._sticky_cache) == {"111"}
+        assert cog._sticky_cache["111"].cooldown_seconds == 8
+
+    async def test_refresh_cache_keeps_old_cache_on_error(self) -> None:
+        """定期更新で DB エラーが起きても既存キャッシュを維持する。"""
+        cog = _make_cog()
+        cog._sticky_cache = _make_cache("456")
+
+        with patch(
+            "src.cogs.sticky.async_session", side_effect=RuntimeError("db down")
+        ):
+            await cog._refresh_cache()
+
+        assert set(cog._sticky_cache) == {"456"}
+
 
 # ---------------------------------------------------------------------------
 # ロックによる同時実行制御テスト
@@ -3245,7 +3430,7 @@ class TestStickySetConcurrency:
     async def test_concurrent_embed_set_serialized(self) -> None:
         """同チャンネルで同時に Embed 設定しても、ロックでシリアライズされる。"""
         cog = _make_cog()
-        cog._sticky_channels = set()
+        cog._sticky_cache = {}
 
         execution_order: list[str] = []
 
@@ -7,6 +7,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import discord
 from discord.ext import commands
 
+from src.ui.ticket_view import TICKET_DYNAMIC_ITEMS, TicketTranscript
+
 # =============================================================================
 # Helper factories
 # =============================================================================
@@ -70,24 +72,6 @@ def _make_category(category_id: int = 1, name: str = "General") -> MagicMock:
     return category
 
 
-def _make_panel(panel_id: int = 1) -> MagicMock:
-    """テスト用の TicketPanel モックを作成する。"""
-    panel = MagicMock()
-    panel.id = panel_id
-    return panel
-
-
-def _make_association(category_id: int = 1) -> MagicMock:
-    """テスト用の TicketPanelCategory モックを作成する。"""
-    assoc = MagicMock()
-    assoc.category_id = category_id
-    assoc.button_label = None
-    assoc.button_style = "primary"
-    assoc.button_emoji = None
-    assoc.position = 0
-    return assoc
-
-
 # =============================================================================
 # Cog のロード/アンロード
 # =============================================================================
@@ -96,126 +80,29 @@ def _make_association(category_id: int = 1) -> MagicMock:
 class TestCogLoadUnload:
     """TicketCog の cog_load/cog_unload テスト。"""
 
-    async def test_cog_load_registers_views_and_starts_task(self) -> None:
-        """cog_load で View 登録とタスク開始が行われる。"""
+    async def test_cog_load_registers_dynamic_items(self) -> None:
+        """cog_load でボタンのテンプレートだけを登録する (DB は読まない)。"""
         from src.cogs.ticket import TicketCog
 
         bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
         cog = TicketCog(bot)
 
-        mock_factory, mock_session = _mock_async_session()
-        with (
-            patch("src.cogs.ticket.async_session", mock_factory),
-            patch(
-                "src.cogs.ticket.get_all_ticket_panels",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
-            patch(
-                "src.cogs.ticket.get_all_tickets",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
-        ):
+        with patch("src.cogs.ticket.async_session") as mock_factory:
             await cog.cog_load()
 
-        assert cog._sync_views_task.is_running()
-        cog._sync_views_task.cancel()
+        bot.add_dynamic_items.assert_called_once_with(*TICKET_DYNAMIC_ITEMS)
+        mock_factory.assert_not_called()
 
-    async def test_cog_unload_cancels_task(self) -> None:
-        """cog_unload でタスクが停止される。"""
+    async def test_cog_unload_removes_dynamic_items(self) -> None:
+        """cog_unload でボタンの登録を外す。"""
         from src.cogs.ticket import TicketCog
 
         bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
         cog = TicketCog(bot)
 
-        # cancel をモックして呼び出しを検証 (role_panel と同パターン)
-        cog._sync_views_task.cancel = MagicMock()
         await cog.cog_unload()
-        cog._sync_views_task.cancel.assert_called_once()
-
-
-# =============================================================================
-# View 登録
-# =============================================================================
-
-
-class TestRegisterAllViews:
-    """_register_all_views のテスト。"""
-
-    async def test_registers_panel_views(self) -> None:
-        """パネルの View が登録される。"""
-        from src.cogs.ticket import TicketCog
-
-        bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
-        cog = TicketCog(bot)
-
-        panel = _make_panel(panel_id=1)
-        assoc = _make_association(category_id=1)
-        category = _make_category(category_id=1, name="General")
-
-        mock_factory, _ = _mock_async_session()
-        with (
-            patch("src.cogs.ticket.async_session", mock_factory),
-            patch(
-                "src.cogs.ticket.get_all_ticket_panels",
-                new_callable=AsyncMock,
-                return_value=[panel],
-            ),
-            patch(
-                "src.cogs.ticket.get_ticket_panel_categories",
-                new_callable=AsyncMock,
-                return_value=[assoc],
-            ),
-            patch(
-                "src.cogs.ticket.get_ticket_category",
-                new_callable=AsyncMock,
-                return_value=category,
-            ),
-            patch(
-                "src.cogs.ticket.get_all_tickets",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
-        ):
-            await cog._register_all_views()
-
-        # パネル View 1 つ
-        assert bot.add_view.call_count == 1
-
-    async def test_registers_ticket_control_views(self) -> None:
-        """open/claimed チケットの ControlView が登録される。"""
-        from src.cogs.ticket import TicketCog
-
-        bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
-        cog = TicketCog(bot)
-
-        ticket1 = _make_ticket(ticket_id=1, status="open", channel_id="100")
-        ticket2 = _make_ticket(ticket_id=2, status="claimed", channel_id="200")
-        ticket3 = _make_ticket(ticket_id=3, status="closed", channel_id=None)
-
-        mock_factory, _ = _mock_async_session()
-        with (
-            patch("src.cogs.ticket.async_session", mock_factory),
-            patch(
-                "src.cogs.ticket.get_all_ticket_panels",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
-            patch(
-                "src.cogs.ticket.get_all_tickets",
-                new_callable=AsyncMock,
-                return_value=[ticket1, ticket2, ticket3],
-            ),
-        ):
-            await cog._register_all_views()
 
-        # open + claimed = 2 views (closed は除外)
-        assert bot.add_view.call_count == 2
+        bot.remove_dynamic_items.assert_called_once_with(*TICKET_DYNAMIC_ITEMS)
 
 
 # =============================================================================
@@ -313,12 +200,16 @@ class TestTicketCloseCommand:
             patch(
                 "src.cogs.ticket.generate_transcript",
                 new_callable=AsyncMock,
-                return_value="transcript text",
+                return_value=MagicMock(spec=TicketTranscript),
             ),
             patch(
                 "src.cogs.ticket.update_ticket_status",
                 new_callable=AsyncMock,
             ) as mock_update,
+            patch(
+                "src.cogs.ticket.save_transcript",
+                new_callable=AsyncMock,
+            ) as mock_save,
             patch(
                 "src.cogs.ticket.send_close_log",
                 new_callable=AsyncMock,
@@ -329,8 +220,50 @@ class TestTicketCloseCommand:
         interaction.response.defer.assert_awaited_once()
         mock_update.assert_awaited_once()
         mock_log.assert_awaited_once()
+        assert mock_log.call_args.kwargs["close_reason"] == "done"
+        mock_save.assert_awaited_once()
         interaction.channel.delete.assert_awaited_once()
 
+    async def test_close_skips_update_when_closed_meanwhile(self) -> None:
+        """履歴取得中に別経路でクローズされていたら更新しない。"""
+        from src.cogs.ticket import TicketCog
+
+        bot = MagicMock(spec=commands.Bot)
+        cog = TicketCog(bot)
+        interaction = _make_interaction()
+        transcript = MagicMock(spec=TicketTranscript)
+
+        mock_factory, _ = _mock_async_session()
+        with (
+            patch("src.cogs.ticket.async_session", mock_factory),
+            patch(
+                "src.cogs.ticket.get_ticket_by_channel_id",
+                new_callable=AsyncMock,
+                side_effect=[_make_ticket(status="open"), None],
+            ),
+            patch(
+                "src.cogs.ticket.get_ticket_category",
+                new_callable=AsyncMock,
+                return_value=_make_category(),
+            ),
+            patch(
+                "src.cogs.ticket.generate_transcript",
+                new_callable=AsyncMock,
+                return_value=transcript,
+            ),
+            patch(
+                "src.cogs.ticket.update_ticket_status",
+                new_callable=AsyncMock,
+            ) as mock_update,
+            patch("src.cogs.ticket.save_transcript", new_callable=AsyncMock),
+            patch("src.cogs.ticket.send_close_log", new_callable=AsyncMock),
+        ):
+            await cog.ticket_close.callback(cog, interaction, reason=None)
+
+        mock_update.assert_not_awaited()
+        transcript.close.assert_called_once()
+        interaction.channel.delete.assert_not_awaited()
+
 
 # =============================================================================
 # /ticket claim コマンド
@@ -806,12 +739,16 @@ class TestTicketCloseChannelDeleteFailure:
             patch(
                 "src.cogs.ticket.generate_transcript",
                 new_callable=AsyncMock,
-                return_value="transcript",
+                return_value=MagicMock(spec=TicketTranscript),
             ),
             patch(
                 "src.cogs.ticket.update_ticket_status",
                 new_callable=AsyncMock,
             ),
+            patch(
+                "src.cogs.ticket.save_transcript",
+                new_callable=AsyncMock,
+            ),
             patch(
                 "src.cogs.ticket.send_close_log",
                 new_callable=AsyncMock,
@@ -889,31 +826,6 @@ class TestTicketAddRemoveNonTextChannel:
         assert "この操作を実行できません" in msg
 
 
-# =============================================================================
-# _sync_views_task 例外ハンドリング
-# =============================================================================
-
-
-class TestSyncViewsTaskException:
-    """_sync_views_task の例外ハンドリングテスト。"""
-
-    async def test_sync_task_catches_exception(self) -> None:
-        """_sync_views_task は例外をキャッチしてクラッシュしない。"""
-        from src.cogs.ticket import TicketCog
-
-        bot = MagicMock(spec=commands.Bot)
-        cog = TicketCog(bot)
-
-        with patch.object(
-            cog,
-            "_register_all_views",
-            new_callable=AsyncMock,
-            side_effect=RuntimeError("DB connection failed"),
-        ):
-            # 例外がキャッチされ、外に漏れないことを確認
-            await cog._sync_views_task.coro(cog)
-
-
 # =============================================================================
 # /ticket close カテゴリなし
 # =============================================================================
@@ -947,12 +859,16 @@ class TestTicketCloseNoCategoryCommand:
             patch(
                 "src.cogs.ticket.generate_transcript",
                 new_callable=AsyncMock,
-                return_value="transcript",
+                return_value=MagicMock(spec=TicketTranscript),
             ) as mock_transcript,
             patch(
                 "src.cogs.ticket.update_ticket_status",
                 new_callable=AsyncMock,
             ),
+            patch(
+                "src.cogs.ticket.save_transcript",
+                new_callable=AsyncMock,
+            ) as mock_save,
             patch(
                 "src.cogs.ticket.send_close_log",
                 new_callable=AsyncMock,
@@ -964,6 +880,8 @@ class TestTicketCloseNoCategoryCommand:
         assert mock_transcript.call_args[0][2] == "Unknown"
         # send_close_log には category=None が渡される
         assert mock_log.call_args[0][2] is None
+        # ログを送れなくてもトランスクリプトは保存する
+        mock_save.assert_awaited_once()
 
 
 # =============================================================================
@@ -971,121 +889,6 @@ class TestTicketCloseNoCategoryCommand:
 # =============================================================================
 
 
-class TestCogLoadException:
-    """cog_load の例外ハンドリングテスト。"""
-
-    async def test_cog_load_catches_register_exception(self) -> None:
-        """_register_all_views で例外が発生しても cog_load はクラッシュしない。"""
-        from src.cogs.ticket import TicketCog
-
-        bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
-        cog = TicketCog(bot)
-
-        with patch.object(
-            cog,
-            "_register_all_views",
-            new_callable=AsyncMock,
-            side_effect=RuntimeError("DB connection failed"),
-        ):
-            # 例外がキャッチされ、タスクはそれでも開始される
-            await cog.cog_load()
-
-        assert cog._sync_views_task.is_running()
-        cog._sync_views_task.cancel()
-
-
-class TestRegisterAllViewsPanelException:
-    """_register_all_views のパネル View 登録例外テスト。"""
-
-    async def test_panel_view_exception_is_caught(self) -> None:
-        """個別パネルの View 登録で例外が発生しても他のパネルは処理される。"""
-        from src.cogs.ticket import TicketCog
-
-        bot = MagicMock(spec=commands.Bot)
-        bot.add_view = MagicMock()
-        cog = TicketCog(bot)
-
-        panel1 = _make_panel(panel_id=1)
-        panel2 = _make_panel(panel_id=2)
-        assoc = _make_association(category_id=1)
-        category = _make_category(category_id=1, name="General")
-
-        call_count = 0
-
-        async def _get_panel_categories_side_effect(_session, _panel_id):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise RuntimeError("DB error on panel 1")
-            return [assoc]
-
-        mock_factory, _ = _mock_async_session()
-        with (
-            patch("src.cogs.ticket.async_session", mock_factory),
-            patch(
-                "src.cogs.ticket.get_all_ticket_panels",
-                new_callable=AsyncMock,
-                return_value=[panel1, panel2],
-            ),
-            patch(
-                "src.cogs.ticket.get_ticket_panel_categories",
-                new_callable=AsyncMock,
-                side_effect=_get_panel_categories_side_effect,
-            ),
-            patch(
-                "src.cogs.ticket.get_ticket_category",
-                new_callable=AsyncMock,
-                return_value=category,
-            ),
-            patch(
-                "src.cogs.ticket.get_all_tickets",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
-        ):
-            await cog._register_all_views()
-
-        # panel1 は失敗、panel2 は成功 → 1 回だけ add_view
-        assert bot.add_view.call_count == 1
-
-
-class TestRegisterAllViewsTicketControlException:
-    """_register_all_views のチケット ControlView 登録例外テスト。"""
-
-    async def test_ticket_control_view_exception_is_caught(self) -> None:
-        """個別チケットの ControlView 登録で例外が発生しても他は処理される。"""
-        from src.cogs.ticket import TicketCog
-
-        bot = MagicMock(spec=commands.Bot)
-        # 最初の add_view 呼び出しで例外、2番目は成功
-        bot.add_view = MagicMock(side_effect=[RuntimeError("view error"), None])
-        cog = TicketCog(bot)
-
-        ticket1 = _make_ticket(ticket_id=1, status="open", channel_id="100")
-        ticket2 = _make_ticket(ticket_id=2, status="claimed", channel_id="200")
-
-        mock_factory, _ = _mock_async_session()
-        with (
-            patch("src.cogs.ticket.async_session", mock_factory),
-            patch(
-                "src.cogs.ticket.get_all_ticket_panels",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
-            patch(
-                "src.cogs.ticket.get_all_tickets",
-                new_callable=AsyncMock,
-                return_value=[ticket1, ticket2],
-            ),
-        ):
-            # 例外がキャッチされ、外に漏れないことを確認
-            await cog._register_all_views()
-
-        # 両方の add_view が呼ばれた (1つ目は例外、2つ目は成功)
-        assert bot.add_view.call_count == 2
-
-
 class TestOnGuildChannelDeleteException:
     """on_guild_channel_delete の例外ハンドリングテスト。"""
 
@@ -989,7 +989,7 @@ class TestTransferOwnership:
                 mock_session, voice_session, old_owner, channel
             )
 
-            mock_repost.assert_awaited_once_with(channel, cog.bot)
+            mock_repost.assert_awaited_once_with(channel)
 
     async def test_sends_notification(self) -> None:
         """引き継ぎ通知がチャンネルに送信される。"""
@@ -1697,7 +1697,7 @@ class TestVcPanelCommand:
             await cog.vc_panel.callback(cog, interaction)
 
             # repost_panel が呼ばれる
-            mock_repost.assert_awaited_once_with(channel, cog.bot)
+            mock_repost.assert_awaited_once_with(channel)
             # ephemeral で応答
             interaction.response.send_message.assert_awaited_once()
             call_kwargs = interaction.response.send_message.call_args[1]
@@ -1726,7 +1726,7 @@ class TestVcPanelCommand:
         ):
             await cog.vc_panel.callback(cog, interaction)
 
-            mock_repost.assert_awaited_once_with(channel, cog.bot)
+            mock_repost.assert_awaited_once_with(channel)
             interaction.response.send_message.assert_awaited_once()
             call_kwargs = interaction.response.send_message.call_args[1]
             assert call_kwargs["ephemeral"] is True
@@ -103,7 +103,9 @@ if _xdist_worker:
 
     atexit.register(_cleanup_worker_db)
 
+import contextlib
 import logging
+from collections.abc import Callable, Iterator
 
 import pytest
 from sqlalchemy import create_engine, text
@@ -111,7 +113,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
 
 from src.constants import DEFAULT_TEST_DATABASE_URL_SYNC
+from src.database.engine import QueryLog, count_queries
 from src.database.models import Base, Lobby
+from src.services.claim_service import MemoryClaimStore, set_claim_store
 
 logger = logging.getLogger(__name__)
 
@@ -169,3 +173,69 @@ def db_session() -> Session:
         session.add(lobby)
         session.commit()
         yield session
+
+
+@pytest.fixture(autouse=True)
+def memory_claim_store() -> Iterator[MemoryClaimStore]:
+    """claim_event をプロセス内ストアに差し替える (本番 DB に接続しない)。"""
+    store = MemoryClaimStore()
+    set_claim_store(store)
+    yield store
+    set_claim_store(None)
+
+
+def _format_query_log(log: QueryLog, problems: list[str]) -> str:
+    lines = ["Query budget exceeded: " + "; ".join(problems)]
+    repeated = log.repeated()
+    if repeated:
+        lines.append("Repeated statement shapes (possible N+1):")
+        lines.extend(f"  {count}x {shape}" for shape, count in repeated.items())
+    lines.append("Statements:")
+    lines.extend(f"  {i}. {s}" for i, s in enumerate(log.statements, 1))
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def _query_budget(
+    *,
+    statements: int | None = None,
+    sessions: int | None = None,
+    max_repeats: int | None = 1,
+) -> Iterator[QueryLog]:
+    """ブロック内の SQL 文・トランザクションの数が上限以内であることを検証する。
+
+    Args:
+        statements: SQL 文の上限 (None で検証しない)
+        sessions: トランザクションの上限 (None で検証しない)
+        max_repeats: 同じ形の SQL 文を実行してよい回数。超えたら N+1 として
+            失敗させる (None で検証しない)
+    """
+    with count_queries() as log:
+        yield log
+    problems = []
+    if statements is not None and len(log.statements) > statements:
+        problems.append(f"{len(log.statements)} statements (budget {statements})")
+    if sessions is not None and log.sessions > sessions:
+        problems.append(f"{log.sessions} sessions (budget {sessions})")
+    if max_repeats is not None:
+        worst = max(log.shapes().values(), default=0)
+        if worst > max_repeats:
+            problems.append(f"a statement ran {worst} times (max {max_repeats})")
+    if problems:
+        raise AssertionError(_format_query_log(log, problems))
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., contextlib.AbstractContextManager[QueryLog]]:
+    """ハンドラーの DB アクセス回数の上限を検証するコンテキストマネージャ。
+
+    対象のエンジンには ``install_query_counter`` が必要
+    (アプリのエンジンと tests/database の ``bind_async_session`` は取り付け済み)。
+
+    Examples:
+        ::
+
+            with query_budget(statements=1, sessions=1):
+                await cog.handle_message(message)
+    """
+    return _query_budget
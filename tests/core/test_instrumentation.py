@@ -0,0 +1,146 @@
+"""Tests for listener latency instrumentation."""
+
+import logging
+
+import discord
+import pytest
+from discord import app_commands
+from discord.ext import commands
+
+from src.core.instrumentation import (
+    HandlerStats,
+    ListenerMetrics,
+    _count_session,
+    _session_counter,
+)
+
+
+class _SampleCog(commands.Cog):
+    group = app_commands.Group(name="sample", description="sample")
+
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        self.seen.append("join")
+
+    @commands.Cog.listener("on_raw_reaction_add")
+    async def _on_reaction(self, payload: object) -> None:
+        raise RuntimeError("boom")
+
+    @group.command(name="ping", description="ping")
+    async def ping(self, interaction: discord.Interaction) -> None:
+        self.seen.append("ping")
+
+
+class TestHandlerStats:
+    """Tests for histogram percentiles."""
+
+    def test_empty_stats_are_zero(self) -> None:
+        stats = HandlerStats("cog", "on_message")
+
+        assert stats.p50 == 0.0
+        assert stats.p99 == 0.0
+        assert stats.mean_seconds == 0.0
+
+    def test_percentiles_use_bucket_upper_bounds(self) -> None:
+        stats = HandlerStats("cog", "on_message", buckets=(0.01, 0.1, 1.0))
+        for _ in range(90):
+            stats.observe(0.005, failed=False, db_sessions=1)
+        for _ in range(10):
+            stats.observe(0.5, failed=False, db_sessions=0)
+
+        assert stats.p50 == 0.01
+        assert stats.p95 == 0.5  # バケット上限 1.0 より最大値の方が小さい
+        assert stats.calls == 100
+        assert stats.sessions_per_call == 0.9
+
+    def test_overflow_bucket_reports_max(self) -> None:
+        stats = HandlerStats("cog", "on_message", buckets=(0.01,))
+        stats.observe(3.0, failed=True, db_sessions=0)
+
+        assert stats.p99 == 3.0
+        assert stats.errors == 1
+
+
+class TestListenerMetrics:
+    """Tests for recording, slow-call log and session counting."""
+
+    def test_record_logs_slow_calls(self, caplog: pytest.LogCaptureFixture) -> None:
+        metrics = ListenerMetrics(slow_seconds=0.1, slow_log_size=2)
+
+        with caplog.at_level(logging.WARNING, logger="src.core.instrumentation"):
+            metrics.record("Voice", "on_voice_state_update", 0.05)
+            for _ in range(3):
+                metrics.record("Voice", "on_voice_state_update", 0.2)
+
+        assert metrics.stats("Voice", "on_voice_state_update").calls == 4
+        assert len(metrics.slow_calls) == 2
+        assert "Slow handler Voice.on_voice_state_update" in caplog.text
+
+    def test_track_counts_sessions_and_errors(self) -> None:
+        metrics = ListenerMetrics()
+
+        with pytest.raises(RuntimeError), metrics.track("Cog", "on_member_join"):
+            _count_session()
+            _count_session()
+            raise RuntimeError("boom")
+
+        stats = metrics.stats("Cog", "on_member_join")
+        assert stats.db_sessions == 2
+        assert stats.errors == 1
+        assert _session_counter.get() is None
+
+    def test_sessions_outside_track_are_ignored(self) -> None:
+        _count_session()
+
+        assert _session_counter.get() is None
+
+    def test_snapshot_orders_by_p95(self) -> None:
+        metrics = ListenerMetrics()
+        metrics.record("A", "on_message", 0.001)
+        metrics.record("B", "on_message", 2.0)
+        metrics.stats("C", "on_message")  # 呼び出し実績なし
+
+        assert [s.cog for s in metrics.snapshot()] == ["B", "A"]
+
+
+class TestInstrumentCog:
+    """Tests for wrapping cog listeners and app commands."""
+
+    async def test_wraps_listeners(self) -> None:
+        metrics = ListenerMetrics()
+        cog = _SampleCog()
+
+        metrics.instrument_cog(cog)
+        await cog.on_member_join(object())  # type: ignore[arg-type]
+        with pytest.raises(RuntimeError):
+            await cog._on_reaction(object())
+
+        assert cog.seen == ["join"]
+        assert metrics.stats("_SampleCog", "on_member_join").calls == 1
+        assert metrics.stats("_SampleCog", "on_raw_reaction_add").errors == 1
+
+    async def test_wraps_app_commands(self) -> None:
+        metrics = ListenerMetrics()
+        cog = _SampleCog()
+
+        metrics.instrument_cog(cog)
+        (command,) = [
+            c for c in cog.walk_app_commands() if isinstance(c, app_commands.Command)
+        ]
+        await command.callback(cog, object())  # type: ignore[arg-type]
+
+        assert cog.seen == ["ping"]
+        assert metrics.stats("_SampleCog", "/sample ping").calls == 1
+
+    async def test_instrumenting_twice_does_not_double_count(self) -> None:
+        metrics = ListenerMetrics()
+        cog = _SampleCog()
+
+        metrics.instrument_cog(cog)
+        metrics.instrument_cog(cog)
+        await cog.on_member_join(object())  # type: ignore[arg-type]
+
+        assert metrics.stats("_SampleCog", "on_member_join").calls == 1
@@ -0,0 +1,76 @@
+"""Tests for the event loop lag probe."""
+
+import asyncio
+import time
+
+from src.core.loop_monitor import LoopLagProbe
+from src.core.metrics import EVENT_LOOP_LAG
+
+
+class TestLoopLagProbe:
+    """Tests for LoopLagProbe."""
+
+    async def test_records_lag(self) -> None:
+        before = EVENT_LOOP_LAG.count()
+        probe = LoopLagProbe(interval=0.01)
+
+        probe.start()
+        await asyncio.sleep(0.05)
+        await probe.stop()
+
+        assert EVENT_LOOP_LAG.count() > before
+        assert probe.last_lag >= 0
+        assert not probe.running
+
+    async def test_start_is_idempotent(self) -> None:
+        probe = LoopLagProbe(interval=10)
+
+        probe.start()
+        task = probe._task
+        probe.start()
+
+        assert probe._task is task
+        await probe.stop()
+
+    async def test_captures_stack_of_blocking_callback(self) -> None:
+        probe = LoopLagProbe(interval=0.01, block_threshold=0.05)
+
+        probe.start()
+        await asyncio.sleep(0.02)
+        _block_loop(0.2)
+        await asyncio.sleep(0.05)
+        await probe.stop()
+
+        assert probe.block_count >= 1
+        block = probe.blocks[-1]
+        assert block.seconds >= 0.05
+        assert "_block_loop" in block.stack
+        assert probe.summary().blocks == probe.block_count
+
+    async def test_lag_below_threshold_is_not_a_block(self) -> None:
+        probe = LoopLagProbe(interval=10, block_threshold=0.5)
+
+        probe.observe(0.1)
+
+        assert probe.blocks == ()
+        assert probe.block_count == 0
+
+    def test_summary_percentiles(self) -> None:
+        probe = LoopLagProbe(window=100)
+        for i in range(100):
+            probe.observe(i / 1000)
+
+        summary = probe.summary()
+
+        assert summary.samples == 100
+        assert summary.max == 0.099
+        assert 0.049 <= summary.p50 <= 0.05
+        assert summary.p95 >= 0.094
+        assert summary.p99 >= summary.p95
+
+    def test_empty_summary(self) -> None:
+        assert LoopLagProbe().summary().samples == 0
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
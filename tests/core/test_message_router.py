@@ -0,0 +1,361 @@
+"""Tests for core message router."""
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, MagicMock, PropertyMock
+
+import discord
+import pytest
+from discord.ext import commands
+
+from src.core.instrumentation import ListenerMetrics
+from src.core.message_router import MessageRoute, MessageRouter, get_message_router
+
+BOT_USER_ID = 1
+
+
+def _make_router(slow_seconds: float = 60) -> MessageRouter:
+    bot = MagicMock(spec=commands.Bot)
+    bot.user = MagicMock()
+    bot.user.id = BOT_USER_ID
+    return MessageRouter(bot, slow_seconds=slow_seconds)
+
+
+def _make_message(
+    *,
+    guild_id: int | None = 100,
+    channel_id: int = 200,
+    author_id: int = 300,
+    is_bot: bool = False,
+) -> MagicMock:
+    message = MagicMock(spec=discord.Message)
+    message.id = 999
+    if guild_id is None:
+        message.guild = None
+    else:
+        message.guild = MagicMock()
+        message.guild.id = guild_id
+    message.channel = MagicMock()
+    message.channel.id = channel_id
+    message.author = MagicMock()
+    message.author.id = author_id
+    message.author.bot = is_bot
+    return message
+
+
+def _make_route(name: str = "test", *, include_bots: bool = False) -> MessageRoute:
+    return MessageRoute(name, AsyncMock(), include_bots=include_bots)
+
+
+class TestRouting:
+    """Tests for channel/guild index lookups."""
+
+    async def test_dispatches_only_to_interested_channel(self) -> None:
+        """Test that only routes watching the channel receive the message."""
+        router = _make_router()
+        watching = _make_route("watching")
+        other = _make_route("other")
+        watching.set_channels({200})
+        other.set_channels({201})
+        router.add_route(watching)
+        router.add_route(other)
+
+        await router.dispatch(_make_message(channel_id=200))
+
+        watching.handler.assert_awaited_once()
+        other.handler.assert_not_awaited()
+
+    async def test_dispatches_to_guild_routes(self) -> None:
+        """Test that guild-scoped routes receive messages in any channel."""
+        router = _make_router()
+        route = _make_route()
+        route.set_guilds({"100"})
+        router.add_route(route)
+
+        await router.dispatch(_make_message(guild_id=100, channel_id=555))
+        await router.dispatch(_make_message(guild_id=101, channel_id=555))
+
+        route.handler.assert_awaited_once()
+
+    async def test_watch_all_receives_every_guild_message(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        route.watch_all()
+        router.add_route(route)
+
+        await router.dispatch(_make_message(channel_id=1))
+        await router.dispatch(_make_message(channel_id=2))
+
+        assert route.handler.await_count == 2
+
+    async def test_new_route_receives_nothing(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        router.add_route(route)
+
+        await router.dispatch(_make_message())
+
+        route.handler.assert_not_awaited()
+
+    async def test_uninteresting_channel_skips_filters(self) -> None:
+        """Test that a message nobody watches never touches the author."""
+        router = _make_router()
+        route = _make_route()
+        route.set_channels({201})
+        router.add_route(route)
+        message = _make_message(channel_id=200)
+        author = PropertyMock()
+        type(message).author = author
+
+        await router.dispatch(message)
+
+        author.assert_not_called()
+
+    async def test_dispatches_to_all_interested_routes(self) -> None:
+        router = _make_router()
+        by_channel = _make_route("channel")
+        by_guild = _make_route("guild")
+        by_channel.set_channels({200})
+        by_guild.set_guilds({100})
+        router.add_route(by_channel)
+        router.add_route(by_guild)
+
+        await router.dispatch(_make_message())
+
+        by_channel.handler.assert_awaited_once()
+        by_guild.handler.assert_awaited_once()
+
+
+class TestFiltering:
+    """Tests for the common filters applied once per message."""
+
+    async def test_ignores_dm(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        route.watch_all()
+        router.add_route(route)
+
+        await router.dispatch(_make_message(guild_id=None))
+
+        route.handler.assert_not_awaited()
+
+    async def test_ignores_own_messages_even_with_include_bots(self) -> None:
+        """Test that the bot's own messages are dropped (loop prevention)."""
+        router = _make_router()
+        route = _make_route(include_bots=True)
+        route.watch_all()
+        router.add_route(route)
+
+        await router.dispatch(_make_message(author_id=BOT_USER_ID, is_bot=True))
+
+        route.handler.assert_not_awaited()
+
+    async def test_other_bots_only_reach_include_bots_routes(self) -> None:
+        router = _make_router()
+        humans_only = _make_route("humans")
+        with_bots = _make_route("bots", include_bots=True)
+        humans_only.watch_all()
+        with_bots.watch_all()
+        router.add_route(humans_only)
+        router.add_route(with_bots)
+
+        await router.dispatch(_make_message(author_id=88888, is_bot=True))
+
+        humans_only.handler.assert_not_awaited()
+        with_bots.handler.assert_awaited_once()
+
+    async def test_bot_user_none_dispatches(self) -> None:
+        """Test that messages are routed before the bot has logged in."""
+        router = _make_router()
+        router._bot.user = None
+        route = _make_route()
+        route.watch_all()
+        router.add_route(route)
+
+        await router.dispatch(_make_message())
+
+        route.handler.assert_awaited_once()
+
+
+class TestIndexUpdates:
+    """Tests for incremental index maintenance."""
+
+    async def test_add_and_discard_channel(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        route.set_channels(())
+        router.add_route(route)
+
+        route.add("200")
+        await router.dispatch(_make_message(channel_id=200))
+        route.discard(200)
+        await router.dispatch(_make_message(channel_id=200))
+
+        route.handler.assert_awaited_once()
+        assert router._by_channel == {}
+
+    def test_add_ignored_when_watching_all(self) -> None:
+        route = _make_route()
+        route.watch_all()
+
+        route.add(200)
+
+        assert route.scope == "all"
+        assert route.ids == frozenset()
+
+    def test_replacing_scope_moves_index_entries(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        router.add_route(route)
+
+        route.set_channels({1, 2})
+        assert set(router._by_channel) == {1, 2}
+
+        route.set_guilds({3})
+        assert router._by_channel == {}
+        assert set(router._by_guild) == {3}
+
+        route.watch_all()
+        assert router._by_guild == {}
+        assert router._all == (route,)
+
+    def test_remove_route_clears_index(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        route.set_channels({1})
+        router.add_route(route)
+
+        router.remove_route(route)
+        route.set_channels({2})
+
+        assert router._by_channel == {}
+        assert router.routes == ()
+
+    def test_shared_channel_keeps_other_route(self) -> None:
+        router = _make_router()
+        first = _make_route("first")
+        second = _make_route("second")
+        first.set_channels({1})
+        second.set_channels({1})
+        router.add_route(first)
+        router.add_route(second)
+
+        first.discard(1)
+
+        assert router._by_channel == {1: (second,)}
+
+    def test_add_route_twice_is_noop(self) -> None:
+        router = _make_router()
+        route = _make_route()
+        route.watch_all()
+
+        router.add_route(route)
+        router.add_route(route)
+
+        assert router.routes == (route,)
+        assert router._all == (route,)
+
+
+class TestHandlerIsolation:
+    """Tests for per-handler error handling and timing."""
+
+    async def test_failing_handler_does_not_block_others(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        router = _make_router()
+        failing = MessageRoute("failing", AsyncMock(side_effect=RuntimeError("boom")))
+        ok = _make_route("ok")
+        failing.watch_all()
+        ok.watch_all()
+        router.add_route(failing)
+        router.add_route(ok)
+
+        with caplog.at_level(logging.ERROR, logger="src.core.message_router"):
+            await router.dispatch(_make_message())
+
+        ok.handler.assert_awaited_once()
+        assert failing.errors == 1
+        assert failing.calls == 1
+        assert "failing" in caplog.text
+
+    async def test_handlers_run_concurrently(self) -> None:
+        """Test that a slow handler does not delay the others."""
+        router = _make_router()
+        release = asyncio.Event()
+        fast_done = asyncio.Event()
+
+        async def _slow(_message: discord.Message) -> None:
+            await release.wait()
+
+        async def _fast(_message: discord.Message) -> None:
+            fast_done.set()
+
+        slow = MessageRoute("slow", _slow)
+        fast = MessageRoute("fast", _fast)
+        slow.watch_all()
+        fast.watch_all()
+        router.add_route(slow)
+        router.add_route(fast)
+
+        task = asyncio.create_task(router.dispatch(_make_message()))
+        await asyncio.wait_for(fast_done.wait(), 1)
+        release.set()
+        await task
+
+    async def test_slow_handler_is_logged(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        router = _make_router(slow_seconds=0)
+        route = _make_route("slowpoke")
+        route.watch_all()
+        router.add_route(route)
+
+        with caplog.at_level(logging.WARNING, logger="src.core.message_router"):
+            await router.dispatch(_make_message())
+
+        assert "Slow message handler slowpoke" in caplog.text
+        assert route.calls == 1
+        assert route.total_seconds >= 0
+
+    async def test_records_into_listener_metrics(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        bot = MagicMock(spec=commands.Bot)
+        bot.user = MagicMock()
+        bot.user.id = BOT_USER_ID
+        metrics = ListenerMetrics(slow_seconds=0)
+        router = MessageRouter(bot, metrics=metrics)
+        ok = _make_route("sticky")
+        failing = MessageRoute("automod", AsyncMock(side_effect=RuntimeError("boom")))
+        ok.watch_all()
+        failing.watch_all()
+        router.add_route(ok)
+        router.add_route(failing)
+
+        with caplog.at_level(logging.WARNING, logger="src.core.instrumentation"):
+            await router.dispatch(_make_message())
+
+        assert metrics.stats("sticky", "on_message").calls == 1
+        assert metrics.stats("automod", "on_message").errors == 1
+        assert failing.errors == 1
+        assert "Slow handler sticky.on_message" in caplog.text
+
+
+class TestGetMessageRouter:
+    """Tests for get_message_router."""
+
+    def test_creates_and_registers_listener_once(self) -> None:
+        bot = MagicMock(spec=commands.Bot)
+
+        router = get_message_router(bot)
+
+        assert get_message_router(bot) is router
+        bot.add_listener.assert_called_once_with(router.dispatch, "on_message")
+
+    def test_returns_existing_router(self) -> None:
+        bot = MagicMock(spec=commands.Bot)
+        existing = MessageRouter(bot)
+        bot.message_router = existing
+
+        assert get_message_router(bot) is existing
+        bot.add_listener.assert_not_called()
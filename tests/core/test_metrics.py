@@ -0,0 +1,230 @@
+"""Tests for the Prometheus metrics registry."""
+
+import asyncio
+import contextlib
+import math
+from unittest.mock import patch
+
+import pytest
+
+from src.constants import METRICS_MAX_HEADER_LINES, METRICS_MAX_LINE_BYTES
+from src.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    MetricsServer,
+    _Metric,
+    classify_statement,
+    format_sample,
+    is_authorized,
+)
+
+
+def _registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+class TestMetricTypes:
+    """Tests for counter / gauge / histogram rendering."""
+
+    def test_counter_renders_labels(self) -> None:
+        registry = _registry()
+        counter = Counter("jobs_total", "Jobs", ("kind",), registry=registry)
+        counter.inc(kind="a")
+        counter.inc(2, kind="b")
+
+        text = registry.render()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="a"} 1' in text
+        assert 'jobs_total{kind="b"} 2' in text
+
+    def test_wrong_labels_raise(self) -> None:
+        counter = Counter("x_total", "X", ("kind",), registry=_registry())
+
+        with pytest.raises(ValueError):
+            counter.inc(other="a")
+
+    def test_metric_without_render_cannot_be_created(self) -> None:
+        class Incomplete(_Metric):
+            kind = "gauge"
+
+        with pytest.raises(TypeError):
+            Incomplete("incomplete", "Incomplete", registry=_registry())  # type: ignore[abstract]
+
+    def test_duplicate_name_raises(self) -> None:
+        registry = _registry()
+        Counter("dup_total", "Dup", registry=registry)
+
+        with pytest.raises(ValueError):
+            Counter("dup_total", "Dup", registry=registry)
+
+    def test_gauge_function_is_read_at_render(self) -> None:
+        registry = _registry()
+        gauge = Gauge("entries", "Entries", ("cache",), registry=registry)
+        cache: dict[str, int] = {}
+        gauge.set_function(lambda: len(cache), cache="sticky")
+
+        cache["a"] = 1
+        assert 'entries{cache="sticky"} 1' in registry.render()
+
+        gauge.remove(cache="sticky")
+        assert 'entries{cache="sticky"}' not in registry.render()
+
+    def test_failing_gauge_function_is_skipped(self) -> None:
+        registry = _registry()
+        gauge = Gauge("broken", "Broken", registry=registry)
+        gauge.set_function(lambda: 1 / 0)
+
+        lines = registry.render().splitlines()
+        assert not [line for line in lines if line.startswith("broken ")]
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        registry = _registry()
+        histogram = Histogram(
+            "lag_seconds", "Lag", buckets=(0.1, 1.0), registry=registry
+        )
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        text = registry.render()
+
+        assert 'lag_seconds_bucket{le="0.1"} 1' in text
+        assert 'lag_seconds_bucket{le="1"} 2' in text
+        assert 'lag_seconds_bucket{le="+Inf"} 3' in text
+        assert "lag_seconds_count 3" in text
+        assert histogram.count() == 3
+
+    def test_special_values_and_escaping(self) -> None:
+        assert format_sample("g", math.inf) == "g +Inf"
+        assert format_sample("g", math.nan) == "g NaN"
+        assert format_sample("g", 1, ("l",), ('a"b',)) == 'g{l="a\\"b"} 1'
+
+    def test_collectors_are_appended(self) -> None:
+        registry = _registry()
+        registry.add_collector(lambda: ["custom_metric 1"])
+
+        assert "custom_metric 1" in registry.render()
+
+
+class TestClassifyStatement:
+    """Tests for per-table query classification."""
+
+    @pytest.mark.parametrize(
+        ("statement", "expected"),
+        [
+            (
+                "SELECT sticky_messages.id \nFROM sticky_messages WHERE x = $1",
+                ("sticky_messages", "select"),
+            ),
+            ('INSERT INTO "tickets" (id) VALUES ($1)', ("tickets", "insert")),
+            ("UPDATE bump_reminders SET x=$1", ("bump_reminders", "update")),
+            ("DELETE FROM processed_events WHERE 1", ("processed_events", "delete")),
+            ("SELECT 1", ("other", "select")),
+        ],
+    )
+    def test_classify(self, statement: str, expected: tuple[str, str]) -> None:
+        assert classify_statement(statement) == expected
+
+
+class TestAuthorization:
+    """Tests for bearer token checks."""
+
+    def test_no_token_allows_everything(self) -> None:
+        assert is_authorized(None, "")
+
+    def test_token_is_required(self) -> None:
+        assert not is_authorized(None, "secret")
+        assert not is_authorized("Bearer wrong", "secret")
+        assert is_authorized("Bearer secret", "secret")
+
+
+class TestMetricsServer:
+    """Tests for the bot-side HTTP listener."""
+
+    async def _get(self, port: int, path: str, headers: str = "") -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.0\r\n{headers}\r\n".encode())
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data
+
+    async def test_serves_metrics(self) -> None:
+        registry = _registry()
+        Counter("served_total", "Served", registry=registry).inc()
+        server = MetricsServer("127.0.0.1", 0, registry=registry)
+        await server.start()
+        try:
+            ok = await self._get(server.port, "/metrics")
+            missing = await self._get(server.port, "/other")
+        finally:
+            await server.stop()
+
+        assert ok.startswith(b"HTTP/1.0 200 OK")
+        assert b"served_total 1" in ok
+        assert missing.startswith(b"HTTP/1.0 404")
+
+    async def test_requires_token(self) -> None:
+        server = MetricsServer("127.0.0.1", 0, token="secret", registry=_registry())
+        await server.start()
+        try:
+            denied = await self._get(server.port, "/metrics")
+            allowed = await self._get(
+                server.port, "/metrics", "Authorization: Bearer secret\r\n"
+            )
+        finally:
+            await server.stop()
+
+        assert denied.startswith(b"HTTP/1.0 401")
+        assert allowed.startswith(b"HTTP/1.0 200")
+
+    async def test_rejects_too_many_headers(self) -> None:
+        server = MetricsServer("127.0.0.1", 0, registry=_registry())
+        await server.start()
+        try:
+            headers = "".join(
+                f"X-Filler-{i}: x\r\n" for i in range(METRICS_MAX_HEADER_LINES + 1)
+            )
+            response = await self._get(server.port, "/metrics", headers)
+        finally:
+            await server.stop()
+
+        assert response.startswith(b"HTTP/1.0 431")
+
+    async def test_closes_slow_client(self) -> None:
+        """ヘッダーを少しずつ送り続けても全体のタイムアウトで切断する。"""
+        server = MetricsServer("127.0.0.1", 0, registry=_registry())
+        await server.start()
+        try:
+            with patch("src.core.metrics.METRICS_REQUEST_TIMEOUT_SECONDS", 0.2):
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(b"GET /metrics HTTP/1.0\r\n")
+                # 1 行ずつは行ごとのタイムアウトに収まる間隔で送る
+                with contextlib.suppress(ConnectionError):
+                    for i in range(10):
+                        await asyncio.sleep(0.05)
+                        writer.write(f"X-Slow-{i}: x\r\n".encode())
+                        await writer.drain()
+                # 書き込み中に切断されると read は ConnectionError になる
+                data = b""
+                with contextlib.suppress(ConnectionError):
+                    data = await asyncio.wait_for(reader.read(), timeout=2)
+                writer.close()
+        finally:
+            await server.stop()
+
+        assert data == b""
+
+    async def test_closes_oversized_line(self) -> None:
+        server = MetricsServer("127.0.0.1", 0, registry=_registry())
+        await server.start()
+        try:
+            header = f"X-Big: {'x' * (METRICS_MAX_LINE_BYTES + 1)}\r\n"
+            response = await self._get(server.port, "/metrics", header)
+        finally:
+            await server.stop()
+
+        assert response == b""
@@ -0,0 +1,171 @@
+"""Tests for core deadline scheduler."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+from src.core.scheduler import DeadlineScheduler
+
+
+def _make_scheduler(
+    next_deadline: AsyncMock | None = None,
+    run_due: AsyncMock | None = None,
+    resync_seconds: float = 60,
+) -> DeadlineScheduler:
+    return DeadlineScheduler(
+        "test",
+        next_deadline=next_deadline or AsyncMock(return_value=None),
+        run_due=run_due or AsyncMock(),
+        resync_seconds=resync_seconds,
+    )
+
+
+class TestSchedule:
+    """Tests for DeadlineScheduler.schedule."""
+
+    def test_keeps_earliest_deadline_first(self) -> None:
+        """Test that the earliest deadline is due next."""
+        scheduler = _make_scheduler()
+        now = datetime.now(UTC)
+
+        scheduler.schedule(now + timedelta(hours=2))
+        scheduler.schedule(now + timedelta(minutes=5))
+        scheduler.schedule(now + timedelta(hours=1))
+
+        assert scheduler.next_due() == now + timedelta(minutes=5)
+
+    def test_duplicate_deadline_ignored(self) -> None:
+        """Test that the same deadline is only kept once."""
+        scheduler = _make_scheduler()
+        when = datetime.now(UTC) + timedelta(minutes=5)
+
+        scheduler.schedule(when)
+        scheduler.schedule(when)
+
+        assert len(scheduler._heap) == 1
+
+    def test_earlier_deadline_wakes_loop(self) -> None:
+        """Test that only a new earliest deadline wakes the loop."""
+        scheduler = _make_scheduler()
+        now = datetime.now(UTC)
+        scheduler.schedule(now + timedelta(minutes=5))
+        scheduler._wakeup.clear()
+
+        scheduler.schedule(now + timedelta(hours=1))
+        assert not scheduler._wakeup.is_set()
+
+        scheduler.schedule(now + timedelta(minutes=1))
+        assert scheduler._wakeup.is_set()
+
+
+class TestLoop:
+    """Tests for the DeadlineScheduler loop."""
+
+    async def test_runs_job_at_deadline(self) -> None:
+        """Test that the job runs once the loaded deadline passes."""
+        ran = asyncio.Event()
+        run_due = AsyncMock(side_effect=lambda: ran.set())
+        next_deadline = AsyncMock(
+            side_effect=[datetime.now(UTC) + timedelta(seconds=0.05), None]
+        )
+        scheduler = _make_scheduler(next_deadline, run_due)
+
+        scheduler.start()
+        await asyncio.wait_for(ran.wait(), 2)
+        await scheduler.stop()
+
+        run_due.assert_awaited_once()
+        # 起動時と処理後に DB から期限を読み直す
+        assert next_deadline.await_count == 2
+
+    async def test_idle_does_not_query(self) -> None:
+        """Test that an idle scheduler does not poll before resync."""
+        next_deadline = AsyncMock(return_value=None)
+        run_due = AsyncMock()
+        scheduler = _make_scheduler(next_deadline, run_due, resync_seconds=60)
+
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        next_deadline.assert_awaited_once()
+        run_due.assert_not_awaited()
+
+    async def test_schedule_wakes_sleeping_loop(self) -> None:
+        """Test that schedule() wakes the loop for a new earlier deadline."""
+        ran = asyncio.Event()
+        run_due = AsyncMock(side_effect=lambda: ran.set())
+        scheduler = _make_scheduler(run_due=run_due, resync_seconds=60)
+
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        scheduler.schedule(datetime.now(UTC) + timedelta(seconds=0.05))
+        await asyncio.wait_for(ran.wait(), 2)
+        await scheduler.stop()
+
+        run_due.assert_awaited_once()
+
+    async def test_resync_reloads_deadline(self) -> None:
+        """Test that the DB is re-read after resync_seconds."""
+        next_deadline = AsyncMock(return_value=None)
+        scheduler = _make_scheduler(next_deadline, resync_seconds=0.05)
+
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        assert next_deadline.await_count >= 2
+
+    async def test_job_failure_does_not_stop_loop(self) -> None:
+        """Test that a failing job is retried later instead of spinning."""
+        now = datetime.now(UTC)
+        run_due = AsyncMock(side_effect=RuntimeError("boom"))
+        # 処理に失敗して期限切れの行が残っている
+        next_deadline = AsyncMock(return_value=now)
+        scheduler = _make_scheduler(next_deadline, run_due)
+
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        assert scheduler.is_running()
+        await scheduler.stop()
+
+        run_due.assert_awaited_once()
+        next_due = scheduler.next_due()
+        assert next_due is not None
+        assert next_due > datetime.now(UTC)
+
+    async def test_load_failure_is_logged(self) -> None:
+        """Test that a failing deadline query does not stop the loop."""
+        next_deadline = AsyncMock(side_effect=RuntimeError("db down"))
+        scheduler = _make_scheduler(next_deadline)
+
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert scheduler.is_running()
+        await scheduler.stop()
+
+    async def test_waits_for_before_start(self) -> None:
+        """Test that the loop waits for before_start before loading."""
+        ready = asyncio.Event()
+        next_deadline = AsyncMock(return_value=None)
+        scheduler = DeadlineScheduler(
+            "test",
+            next_deadline=next_deadline,
+            run_due=AsyncMock(),
+            before_start=ready.wait,
+        )
+
+        scheduler.start()
+        await asyncio.sleep(0.02)
+        next_deadline.assert_not_awaited()
+        ready.set()
+        await asyncio.sleep(0.02)
+        await scheduler.stop()
+
+        next_deadline.assert_awaited_once()
+
+    async def test_stop_when_not_started(self) -> None:
+        """Test that stop() is a no-op before start()."""
+        scheduler = _make_scheduler()
+        await scheduler.stop()
+        assert not scheduler.is_running()
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
+import sys
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 from faker import Faker
@@ -18,6 +21,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import NullPool
 
 from src.constants import DEFAULT_TEST_DATABASE_URL
+from src.database import engine as db_engine
 from src.database.models import (
     Base,
     BumpConfig,
@@ -37,7 +41,7 @@ from src.services.db_service import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Iterator
 
 logger = logging.getLogger(__name__)
 fake = Faker()
@@ -100,6 +104,29 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture
+def bind_async_session(
+    db_session: AsyncSession,
+) -> Iterator[async_sessionmaker[AsyncSession]]:
+    """src 配下の ``async_session`` をテスト DB に向ける。
+
+    Cog やサービスを実際の DB に対して動かし、``query_budget`` で
+    クエリ数を検証するために使う。対象モジュールは事前に import しておくこと。
+    """
+    db_engine.install_query_counter(_engine)
+    factory = db_engine.UnitOfWorkSessionmaker(
+        _engine, class_=AsyncSession, expire_on_commit=False
+    )
+    original = db_engine.async_session
+    with contextlib.ExitStack() as stack:
+        for name, module in list(sys.modules.items()):
+            if name.startswith("src.") and (
+                getattr(module, "async_session", None) is original
+            ):
+                stack.enter_context(patch.object(module, "async_session", factory))
+        yield factory
+
+
 @pytest.fixture
 async def lobby(db_session: AsyncSession) -> Lobby:
     """テスト用ロビーを1つ作成して返す。"""
@@ -0,0 +1,237 @@
+"""Tests for the LISTEN/NOTIFY change feed."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text, update
+
+from src.database.change_feed import (
+    ChangeBatch,
+    ChangeEvent,
+    ChangeFeedListener,
+    enable_change_notify,
+)
+from src.database.models import StickyMessage
+
+from .conftest import TEST_DATABASE_URL, _engine, snowflake
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class _Collector:
+    """受け取った ChangeBatch を溜めるコールバック。"""
+
+    def __init__(self) -> None:
+        self.batches: list[ChangeBatch] = []
+        self.received = asyncio.Event()
+
+    def __call__(self, batch: ChangeBatch) -> None:
+        self.batches.append(batch)
+        self.received.set()
+
+    @property
+    def events(self) -> list[ChangeEvent]:
+        return [e for b in self.batches for e in b.events]
+
+
+async def _start_listener(collector: _Collector) -> ChangeFeedListener:
+    listener = ChangeFeedListener(collector, url=TEST_DATABASE_URL, batch_delay=0.05)
+    listener.start()
+    await asyncio.wait_for(listener.wait_connected(), 5)
+    return listener
+
+
+def _sticky(guild_id: str, channel_id: str) -> StickyMessage:
+    return StickyMessage(
+        channel_id=channel_id,
+        guild_id=guild_id,
+        title="t",
+        description="d",
+    )
+
+
+class TestChangeEvent:
+    """ChangeEvent の payload 変換のテスト。"""
+
+    def test_round_trip(self) -> None:
+        event = ChangeEvent(table="role_panels", op="update", id="1", guild_id="2")
+        assert ChangeEvent.from_payload(event.to_payload()) == event
+
+    def test_malformed_payload(self) -> None:
+        assert ChangeEvent.from_payload("not json") is None
+        assert ChangeEvent.from_payload('{"op": "insert"}') is None
+        assert ChangeEvent.from_payload('{"table": 1, "op": "insert"}') is None
+
+
+class TestChangeBatch:
+    """ChangeBatch のテスト。"""
+
+    def test_guild_ids(self) -> None:
+        batch = ChangeBatch(
+            events=(
+                ChangeEvent("automod_rules", "insert", "1", "10"),
+                ChangeEvent("automod_rules", "delete", "2", "20"),
+                ChangeEvent("sticky_messages", "update", "3", None),
+            )
+        )
+        assert batch.touches("automod_rules")
+        assert not batch.touches("role_panels")
+        assert batch.guild_ids("automod_rules") == {"10", "20"}
+        # ギルドを特定できない変更があれば全件読み直し
+        assert batch.guild_ids("sticky_messages") is None
+
+    def test_resync_touches_everything(self) -> None:
+        batch = ChangeBatch(resync=True)
+        assert batch.touches("role_panels")
+        assert batch.guild_ids("role_panels") is None
+
+
+class TestChangeFeed:
+    """Web 側の NOTIFY と Bot 側の LISTEN の結合テスト。"""
+
+    async def test_committed_rows_are_delivered(self, db_session: AsyncSession) -> None:
+        """commit した行の変更がまとめて届く。"""
+        collector = _Collector()
+        listener = await _start_listener(collector)
+        try:
+            enable_change_notify(db_session)
+            guild_id = snowflake()
+            db_session.add(_sticky(guild_id, "100"))
+            db_session.add(_sticky(guild_id, "200"))
+            await db_session.commit()
+
+            await asyncio.wait_for(collector.received.wait(), 5)
+        finally:
+            await listener.stop()
+
+        assert len(collector.batches) == 1
+        assert set(collector.events) == {
+            ChangeEvent("sticky_messages", "insert", "100", guild_id),
+            ChangeEvent("sticky_messages", "insert", "200", guild_id),
+        }
+
+    async def test_update_and_delete(self, db_session: AsyncSession) -> None:
+        collector = _Collector()
+        sticky = _sticky("1", "100")
+        db_session.add(sticky)
+        await db_session.commit()
+
+        listener = await _start_listener(collector)
+        try:
+            enable_change_notify(db_session)
+            sticky.title = "changed"
+            await db_session.commit()
+            await asyncio.wait_for(collector.received.wait(), 5)
+            collector.received.clear()
+
+            await db_session.delete(sticky)
+            await db_session.commit()
+            await asyncio.wait_for(collector.received.wait(), 5)
+        finally:
+            await listener.stop()
+
+        assert collector.events == [
+            ChangeEvent("sticky_messages", "update", "100", "1"),
+            ChangeEvent("sticky_messages", "delete", "100", "1"),
+        ]
+
+    async def test_bulk_statement_notifies_table(
+        self, db_session: AsyncSession
+    ) -> None:
+        """一括 UPDATE はテーブル単位で通知する。"""
+        collector = _Collector()
+        listener = await _start_listener(collector)
+        try:
+            enable_change_notify(db_session)
+            await db_session.execute(
+                update(StickyMessage)
+                .where(StickyMessage.guild_id == "1")
+                .values(title="x")
+            )
+            await db_session.commit()
+            await asyncio.wait_for(collector.received.wait(), 5)
+        finally:
+            await listener.stop()
+
+        assert collector.events == [ChangeEvent("sticky_messages", "update")]
+
+    async def test_rollback_is_not_delivered(self, db_session: AsyncSession) -> None:
+        collector = _Collector()
+        listener = await _start_listener(collector)
+        try:
+            enable_change_notify(db_session)
+            db_session.add(_sticky("1", "100"))
+            await db_session.flush()
+            await db_session.rollback()
+            await asyncio.sleep(0.3)
+        finally:
+            await listener.stop()
+
+        assert collector.batches == []
+
+    async def test_session_without_flag_does_not_notify(
+        self, db_session: AsyncSession
+    ) -> None:
+        """enable_change_notify していないセッション (Bot 側) は通知しない。"""
+        collector = _Collector()
+        listener = await _start_listener(collector)
+        try:
+            db_session.add(_sticky("1", "100"))
+            await db_session.commit()
+            await asyncio.sleep(0.3)
+        finally:
+            await listener.stop()
+
+        assert collector.batches == []
+
+
+class TestChangeFeedListener:
+    """ChangeFeedListener 単体のテスト。"""
+
+    async def test_reconnect_delivers_resync(self) -> None:
+        """接続が切れて再接続したら resync バッチを渡す。"""
+        collector = _Collector()
+        listener = ChangeFeedListener(
+            collector, url=TEST_DATABASE_URL, reconnect_max_delay=0.1
+        )
+        listener.start()
+        try:
+            await asyncio.wait_for(listener.wait_connected(), 5)
+            # LISTEN 中の接続を外から切断する
+            async with _engine.connect() as conn:
+                await conn.execute(
+                    text(
+                        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                        "WHERE query LIKE 'LISTEN%' AND pid <> pg_backend_pid() "
+                        "AND datname = current_database()"
+                    )
+                )
+                await conn.commit()
+            await asyncio.wait_for(collector.received.wait(), 10)
+        finally:
+            await listener.stop()
+
+        assert collector.batches[-1].resync is True
+
+    async def test_handler_error_is_logged(self) -> None:
+        def broken(_batch: ChangeBatch) -> None:
+            raise RuntimeError("boom")
+
+        listener = ChangeFeedListener(broken, url=TEST_DATABASE_URL)
+        # 例外は外に漏れない
+        listener._deliver(ChangeBatch(resync=True))
+
+    async def test_malformed_notification_ignored(self) -> None:
+        collector = _Collector()
+        listener = ChangeFeedListener(collector, batch_delay=0)
+        listener._on_notify(None, 0, "ch", "garbage")
+        await asyncio.sleep(0.01)
+        assert collector.batches == []
+
+    async def test_stop_when_not_started(self) -> None:
+        listener = ChangeFeedListener(_Collector())
+        await listener.stop()
+        assert not listener.is_running()
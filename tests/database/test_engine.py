@@ -3,14 +3,40 @@
 from __future__ import annotations
 
 import ssl
+from collections.abc import Iterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
 
+import src.database.engine as engine_module
 from src.database.models import Base
+from src.database.pool import instrumented_pool
 
 from .conftest import TEST_DATABASE_URL
 
+
+@pytest.fixture(autouse=True)
+def _restore_engine_module() -> Iterator[None]:
+    """テスト内で reload した engine モジュールを元に戻す。
+
+    reload すると async_session などが別オブジェクトになり、import 済みの
+    モジュールとずれる。count_queries() のリスナーも Session に追加で
+    登録されるため、後続のテストでトランザクションが重複して数えられる。
+    """
+    saved = dict(engine_module.__dict__)
+    yield
+    record_session = engine_module.__dict__.get("_record_session")
+    if record_session is not saved["_record_session"] and event.contains(
+        Session, "after_begin", record_session
+    ):
+        event.remove(Session, "after_begin", record_session)
+    engine_module.__dict__.clear()
+    engine_module.__dict__.update(saved)
+
+
 # ===========================================================================
 # Heroku / SSL configuration テスト
 # ===========================================================================
@@ -89,6 +115,42 @@ class TestConnectionPoolConfiguration:
             assert engine_module.POOL_SIZE == 10
             assert engine_module.MAX_OVERFLOW == 20
 
+    def test_adaptive_pool(self) -> None:
+        """DB_POOL_ADAPTIVE=true で上限までオーバーフローを許し、limiter を付ける。"""
+        env = {
+            "DB_POOL_SIZE": "3",
+            "DB_POOL_ADAPTIVE": "true",
+            "DB_POOL_MAX_CONNECTIONS": "8",
+            "DB_POOL_QUEUE_TIMEOUT": "15",
+        }
+        with patch.dict("os.environ", env):
+            import importlib
+
+            import src.database.engine as engine_module
+
+            importlib.reload(engine_module)
+
+            pool = instrumented_pool(engine_module.engine)
+            assert pool is not None
+            assert pool.size() == 3
+            assert pool._max_overflow == 5
+            assert pool.limiter is not None
+            assert pool.limiter.limit == 3
+            assert pool.limiter.maximum == 8
+            assert pool.limiter.timeout == 15
+
+    def test_pool_is_instrumented_without_limiter_by_default(self) -> None:
+        with patch.dict("os.environ", {}, clear=True):
+            import importlib
+
+            import src.database.engine as engine_module
+
+            importlib.reload(engine_module)
+
+            pool = instrumented_pool(engine_module.engine)
+            assert pool is not None
+            assert pool.limiter is None
+
 
 class TestParseIntEnv:
     """_parse_int_env 関数のテスト (Linux 互換性)。"""
@@ -0,0 +1,312 @@
+"""Tests for the query counter and per-handler query budgets."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from discord.ext import commands
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.cogs.automod import AutoModCog
+from src.cogs.role_panel import RolePanelCog
+from src.database.engine import QueryLog, count_queries, statement_shape
+from src.database.models import AutoModIntroPost, AutoModRule, StickyMessage
+from src.services.db_service import (
+    add_role_panel_item,
+    create_automod_rule,
+    create_role_panel,
+    create_sticky_message,
+    get_sticky_message,
+)
+
+from .conftest import snowflake
+
+# ===========================================================================
+# ヘルパー
+# ===========================================================================
+
+
+def _make_member(guild: MagicMock, *, joined_days_ago: int = 30) -> MagicMock:
+    member = MagicMock(spec=discord.Member)
+    member.id = int(snowflake())
+    member.bot = False
+    member.guild = guild
+    member.joined_at = datetime.now(UTC) - timedelta(days=joined_days_ago)
+    member.roles = []
+    member.add_roles = AsyncMock()
+    return member
+
+
+def _make_guild(guild_id: str) -> MagicMock:
+    guild = MagicMock(spec=discord.Guild)
+    guild.id = int(guild_id)
+    return guild
+
+
+def _make_message(guild: MagicMock, channel_id: str) -> MagicMock:
+    message = MagicMock(spec=discord.Message)
+    message.id = int(snowflake())
+    message.guild = guild
+    message.type = discord.MessageType.default
+    message.channel = MagicMock()
+    message.channel.id = int(channel_id)
+    message.author = _make_member(guild)
+    return message
+
+
+def _make_bot() -> MagicMock:
+    bot = MagicMock(spec=commands.Bot)
+    bot.user = MagicMock()
+    bot.user.id = 1
+    return bot
+
+
+# ===========================================================================
+# statement_shape / count_queries
+# ===========================================================================
+
+
+class TestStatementShape:
+    """Tests for statement_shape."""
+
+    def test_replaces_placeholders(self) -> None:
+        assert statement_shape("SELECT a FROM t WHERE id = $1 AND b = $2") == (
+            "SELECT a FROM t WHERE id = ? AND b = ?"
+        )
+
+    def test_collapses_in_lists(self) -> None:
+        two = statement_shape("SELECT a FROM t WHERE id IN ($1, $2)")
+        three = statement_shape("SELECT a FROM t WHERE id IN ($1, $2, $3)")
+        assert two == three == "SELECT a FROM t WHERE id IN (?)"
+
+    def test_normalizes_pyformat_and_whitespace(self) -> None:
+        assert statement_shape("SELECT a\n  FROM t WHERE id = %(id_1)s") == (
+            "SELECT a FROM t WHERE id = ?"
+        )
+
+
+class TestQueryLog:
+    """Tests for QueryLog."""
+
+    def test_repeated_shapes(self) -> None:
+        log = QueryLog(
+            statements=[
+                "SELECT a FROM t WHERE id = $1",
+                "SELECT a FROM t WHERE id = $1",
+                "SELECT b FROM u",
+            ]
+        )
+        assert log.repeated() == {"SELECT a FROM t WHERE id = ?": 2}
+        assert log.repeated(threshold=3) == {}
+
+
+class TestCountQueries:
+    """Tests for count_queries against the test database."""
+
+    async def test_counts_statements_and_sessions(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        with count_queries() as log:
+            async with bind_async_session() as session:
+                await session.execute(select(StickyMessage))
+                await session.execute(select(AutoModRule))
+        assert len(log.statements) == 2
+        assert log.sessions == 1
+
+    async def test_ignores_queries_outside_block(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        with count_queries() as log:
+            pass
+        async with bind_async_session() as session:
+            await session.execute(select(StickyMessage))
+        assert log.statements == []
+
+    async def test_nested_blocks_both_record(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        with count_queries() as outer:
+            async with bind_async_session() as session:
+                await session.execute(select(StickyMessage))
+                with count_queries() as inner:
+                    await session.execute(select(AutoModRule))
+        assert len(outer.statements) == 2
+        assert len(inner.statements) == 1
+
+
+class TestQueryBudget:
+    """Tests for the query_budget fixture."""
+
+    async def test_passes_within_budget(
+        self, bind_async_session: async_sessionmaker[AsyncSession], query_budget
+    ) -> None:
+        with query_budget(statements=1, sessions=1):
+            async with bind_async_session() as session:
+                await session.execute(select(StickyMessage))
+
+    async def test_fails_over_statement_budget(
+        self, bind_async_session: async_sessionmaker[AsyncSession], query_budget
+    ) -> None:
+        with (
+            pytest.raises(AssertionError, match=r"2 statements \(budget 1\)"),
+            query_budget(statements=1),
+        ):
+            async with bind_async_session() as session:
+                await session.execute(select(StickyMessage))
+                await session.execute(select(AutoModRule))
+
+    async def test_fails_over_session_budget(
+        self, bind_async_session: async_sessionmaker[AsyncSession], query_budget
+    ) -> None:
+        with (
+            pytest.raises(AssertionError, match=r"2 sessions \(budget 1\)"),
+            query_budget(sessions=1),
+        ):
+            for model in (StickyMessage, AutoModRule):
+                async with bind_async_session() as session:
+                    await session.execute(select(model))
+
+    async def test_reports_n_plus_one(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        """ループ内で同じ形のクエリを繰り返すと、その形と回数を報告する。"""
+        channel_ids = [snowflake() for _ in range(3)]
+        for channel_id in channel_ids:
+            await create_sticky_message(
+                db_session, channel_id, snowflake(), "title", "description"
+            )
+
+        with pytest.raises(AssertionError) as exc_info, query_budget():
+            async with bind_async_session() as session:
+                for channel_id in channel_ids:
+                    await get_sticky_message(session, channel_id)
+
+        message = str(exc_info.value)
+        assert "a statement ran 3 times (max 1)" in message
+        assert "possible N+1" in message
+        assert "3x SELECT" in message
+        assert "sticky_messages.channel_id = ?" in message
+
+
+# ===========================================================================
+# ハンドラーごとのクエリ数の上限
+# ===========================================================================
+
+
+class TestAutoModMessageBudget:
+    """AutoModCog.handle_message のクエリ数。"""
+
+    async def test_cached_rules_cost_no_queries(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        guild_id = snowflake()
+        await create_automod_rule(
+            db_session, guild_id, "message_post", threshold_seconds=300
+        )
+        cog = AutoModCog(_make_bot())
+        await cog._load_rules()
+        message = _make_message(_make_guild(guild_id), snowflake())
+
+        with query_budget(statements=0, sessions=0):
+            await cog.handle_message(message)
+
+    async def test_uncached_rules_cost_one_query(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        guild_id = snowflake()
+        await create_automod_rule(
+            db_session, guild_id, "message_post", threshold_seconds=300
+        )
+        cog = AutoModCog(_make_bot())
+        message = _make_message(_make_guild(guild_id), snowflake())
+
+        with query_budget(statements=1, sessions=1):
+            await cog.handle_message(message)
+
+    async def test_intro_post_is_one_session(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        guild_id = snowflake()
+        intro_channel_id = snowflake()
+        db_session.add(
+            AutoModRule(
+                guild_id=guild_id,
+                rule_type="msg_without_intro",
+                action="kick",
+                required_channel_id=intro_channel_id,
+            )
+        )
+        await db_session.commit()
+        cog = AutoModCog(_make_bot())
+        await cog._load_rules()
+        message = _make_message(_make_guild(guild_id), intro_channel_id)
+
+        with query_budget(statements=2, sessions=1):
+            await cog.handle_message(message)
+
+        posts = await db_session.execute(
+            select(AutoModIntroPost).where(AutoModIntroPost.guild_id == guild_id)
+        )
+        assert len(posts.scalars().all()) == 1
+
+
+class TestRolePanelReactionBudget:
+    """RolePanelCog._handle_reaction のクエリ数。"""
+
+    async def _setup(self, db_session: AsyncSession) -> tuple[RolePanelCog, str]:
+        guild_id = snowflake()
+        panel = await create_role_panel(
+            db_session, guild_id, snowflake(), "reaction", "Roles"
+        )
+        panel.message_id = snowflake()
+        await db_session.commit()
+        await add_role_panel_item(db_session, panel.id, snowflake(), "🍎")
+        cog = RolePanelCog(_make_bot())
+        await cog._load_panel_message_ids()
+        return cog, panel.message_id
+
+    def _payload(self, message_id: str) -> MagicMock:
+        payload = MagicMock(spec=discord.RawReactionActionEvent)
+        payload.user_id = int(snowflake())
+        payload.guild_id = None
+        payload.message_id = int(message_id)
+        payload.emoji = discord.PartialEmoji(name="🍎")
+        return payload
+
+    async def test_non_panel_message_costs_no_queries(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        cog, _ = await self._setup(db_session)
+
+        with query_budget(statements=0, sessions=0):
+            await cog._handle_reaction(self._payload(snowflake()), "add")
+
+    async def test_panel_reaction_is_one_session(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        cog, message_id = await self._setup(db_session)
+
+        with query_budget(statements=2, sessions=1):
+            await cog._handle_reaction(self._payload(message_id), "add")
@@ -0,0 +1,351 @@
+"""Query plan regression tests for hot service queries.
+
+大きめのテーブルを用意して ANALYZE し、サービス関数が実際に発行した SQL を
+``EXPLAIN`` して、対象テーブルを Seq Scan していないことを確認する。
+インデックスの削除や、インデックスが使えない形へのクエリの変更を検出する。
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import DateTime, bindparam, event, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.database.models import AutoModLog, BanLog, Ticket
+from src.services import claim_service
+from src.services.automod_service import (
+    claim_automod_log,
+    claim_ban_log,
+    create_automod_rule,
+    get_all_automod_logs,
+    get_automod_logs_by_guild,
+    get_ban_logs,
+)
+from src.services.bump_service import (
+    get_due_bump_reminders,
+    get_next_bump_reminder_at,
+)
+from src.services.chatrole_service import (
+    create_chat_role_config,
+    get_expired_chat_role_progress,
+    get_next_chat_role_expiry,
+)
+from src.services.joinrole_service import (
+    get_expired_join_role_assignments,
+    get_next_join_role_expiry,
+)
+from src.services.ticket_service import (
+    create_ticket_category,
+    get_all_tickets,
+    get_next_ticket_number,
+    get_tickets_by_guild,
+)
+from src.web.pagination import encode_cursor, fetch_page
+
+# 各テーブルに入れる行数。Seq Scan の方が安く見えない程度に多くする
+ROWS = 20_000
+
+# 対象テーブルの行が何ギルドに分かれているか
+GUILDS = 100
+
+NOW = datetime(2026, 10, 17, tzinfo=UTC)
+
+
+# ===========================================================================
+# ヘルパー
+# ===========================================================================
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    """with ブロック内で実行された SQL 文とパラメータを記録する。"""
+    captured: list[tuple[str, Any]] = []
+
+    def record(
+        _conn: Any,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        _context: Any,
+        _many: bool,
+    ) -> None:
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def _plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _explain(
+    engine: AsyncEngine, statement: str, parameters: Any
+) -> dict[str, Any]:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        raw = result.scalar_one()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+async def assert_no_seq_scan(
+    engine: AsyncEngine, captured: list[tuple[str, Any]], table: str
+) -> None:
+    """記録した SQL 文のうち table を読むものが Seq Scan していないことを確認する。"""
+    checked = 0
+    for statement, parameters in captured:
+        if table not in statement or statement.lstrip().startswith("INSERT"):
+            continue
+        plan = await _explain(engine, statement, parameters)
+        scans = [
+            node
+            for node in _plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table
+        ]
+        assert not scans, (
+            f"Seq Scan on {table} ({ROWS} rows) for:\n{statement}\n\n"
+            f"{json.dumps(plan, indent=2)}"
+        )
+        checked += 1
+    assert checked, f"no statement read {table}"
+
+
+@asynccontextmanager
+async def explained(
+    session: AsyncSession, table: str
+) -> AsyncIterator[list[tuple[str, Any]]]:
+    """ブロック内の SQL 文を記録し、抜けたときに table の Seq Scan を検査する。"""
+    engine = session.bind
+    assert isinstance(engine, AsyncEngine)
+    with capture_statements(engine) as captured:
+        yield captured
+    await assert_no_seq_scan(engine, captured, table)
+
+
+async def seed(session: AsyncSession, table: str, sql: str) -> None:
+    """INSERT ... SELECT で行を作り、統計情報を更新する。"""
+    stmt = text(sql)
+    params: dict[str, Any] = {"rows": ROWS, "guilds": GUILDS}
+    if ":now" in sql:
+        stmt = stmt.bindparams(bindparam("now", type_=DateTime(timezone=True)))
+        params["now"] = NOW
+    await session.execute(stmt, params)
+    await session.commit()
+    await session.execute(text(f"ANALYZE {table}"))
+    await session.commit()
+
+
+# ===========================================================================
+# 期限付きジョブ
+# ===========================================================================
+
+
+class TestDeadlineQueryPlans:
+    """スケジューラが期限を探すクエリ。"""
+
+    async def test_bump_reminders(self, db_session: AsyncSession) -> None:
+        # ほとんどは送信済み (remind_at = NULL)、一部が送信待ち、数件が期限切れ
+        await seed(
+            db_session,
+            "bump_reminders",
+            """
+            INSERT INTO bump_reminders
+                (guild_id, channel_id, service_name, remind_at, is_enabled)
+            SELECT 'g' || i, 'c' || i, 'DISBOARD',
+                CASE
+                    WHEN i % 10 = 0 THEN :now + (i || ' seconds')::interval
+                    WHEN i % 1000 = 1 THEN :now - interval '1 minute'
+                END,
+                i % 50 <> 0
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        async with explained(db_session, "bump_reminders"):
+            due = await get_due_bump_reminders(db_session, NOW)
+            await get_next_bump_reminder_at(db_session)
+        assert len(due) == ROWS // 1000
+
+    async def test_chat_role_progress(self, db_session: AsyncSession) -> None:
+        config = await create_chat_role_config(
+            db_session, "1", "2", "3", threshold=10, duration_hours=24
+        )
+        await seed(
+            db_session,
+            "chat_role_progress",
+            f"""
+            INSERT INTO chat_role_progress
+                (config_id, user_id, count, granted, granted_at, expires_at)
+            SELECT {config.id}, 'u' || i, i % 10, i % 50 = 0,
+                CASE WHEN i % 50 = 0 THEN :now END,
+                CASE
+                    WHEN i % 5000 = 0 THEN :now - interval '1 hour'
+                    WHEN i % 50 = 0 THEN :now + (i || ' seconds')::interval
+                END
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        async with explained(db_session, "chat_role_progress"):
+            expired = await get_expired_chat_role_progress(db_session, NOW)
+            await get_next_chat_role_expiry(db_session)
+        assert len(expired) == ROWS // 5000
+
+    async def test_join_role_assignments(self, db_session: AsyncSession) -> None:
+        await seed(
+            db_session,
+            "join_role_assignments",
+            """
+            INSERT INTO join_role_assignments
+                (guild_id, user_id, role_id, assigned_at, expires_at)
+            SELECT 'g' || (i % :guilds), 'u' || i, 'r', :now,
+                :now + ((i - 5) || ' minutes')::interval
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        async with explained(db_session, "join_role_assignments"):
+            expired = await get_expired_join_role_assignments(db_session, NOW)
+            await get_next_join_role_expiry(db_session)
+        assert len(expired) == 5
+
+    async def test_processed_events_cleanup(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+    ) -> None:
+        await seed(
+            db_session,
+            "processed_events",
+            """
+            INSERT INTO processed_events (event_key, created_at)
+            SELECT 'e' || i,
+                CASE WHEN i % 2000 = 0 THEN now() - interval '1 day' ELSE now() END
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        claim_service.set_claim_store(
+            claim_service.PostgresClaimStore(bind_async_session)
+        )
+        try:
+            async with explained(db_session, "processed_events"):
+                deleted = await claim_service.cleanup_expired_events()
+        finally:
+            claim_service.set_claim_store(None)
+        assert deleted == ROWS // 2000
+
+
+# ===========================================================================
+# ログ・チケット
+# ===========================================================================
+
+
+class TestLogQueryPlans:
+    """AutoMod ログ・BAN ログの書き込み時の重複確認と一覧。"""
+
+    async def test_automod_logs(self, db_session: AsyncSession) -> None:
+        rule = await create_automod_rule(db_session, "g1", "no_avatar")
+        await seed(
+            db_session,
+            "automod_logs",
+            f"""
+            INSERT INTO automod_logs
+                (guild_id, user_id, username, rule_id, action_taken, reason,
+                 created_at)
+            SELECT 'g' || (i % :guilds), 'u' || (i % 5000), 'user', {rule.id},
+                'banned', 'No avatar set', :now - (i || ' minutes')::interval
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        async with explained(db_session, "automod_logs"):
+            logs = await get_automod_logs_by_guild(db_session, "g1")
+            await get_all_automod_logs(db_session)
+            await fetch_page(
+                db_session,
+                select(AutoModLog).where(AutoModLog.guild_id == "g1"),
+                AutoModLog.created_at,
+                AutoModLog.id,
+                cursor=encode_cursor(logs[-1].created_at, logs[-1].id),
+            )
+            await claim_automod_log(
+                db_session, "g1", "u1", "user", rule.id, "banned", "No avatar set"
+            )
+        assert len(logs) == 50
+
+    async def test_ban_logs(self, db_session: AsyncSession) -> None:
+        await seed(
+            db_session,
+            "ban_logs",
+            """
+            INSERT INTO ban_logs
+                (guild_id, user_id, username, reason, is_automod, created_at)
+            SELECT 'g' || (i % :guilds), 'u' || (i % 5000), 'user', NULL, false,
+                :now - (i || ' minutes')::interval
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        async with explained(db_session, "ban_logs"):
+            await get_ban_logs(db_session)
+            await fetch_page(
+                db_session,
+                select(BanLog).where(BanLog.user_id == "u1"),
+                BanLog.created_at,
+                BanLog.id,
+            )
+            log = await claim_ban_log(db_session, "g1", "u1", "user")
+        assert log is not None
+
+    async def test_tickets(self, db_session: AsyncSession) -> None:
+        category = await create_ticket_category(db_session, "g1", "General", "999")
+        await seed(
+            db_session,
+            "tickets",
+            f"""
+            INSERT INTO tickets
+                (guild_id, user_id, username, category_id, status, ticket_number,
+                 created_at)
+            SELECT 'g' || (i % :guilds), 'u' || i, 'user', {category.id},
+                (ARRAY['open', 'claimed', 'closed'])[i % 3 + 1], i,
+                :now - (i || ' minutes')::interval
+            FROM generate_series(1, :rows) AS i
+            """,
+        )
+
+        async with explained(db_session, "tickets"):
+            open_tickets = await get_tickets_by_guild(db_session, "g1", status="open")
+            await get_tickets_by_guild(db_session, "g1")
+            await get_all_tickets(db_session, status="closed")
+            number = await get_next_ticket_number(db_session, "g1")
+        assert open_tickets
+        assert all(t.status == "open" for t in open_tickets)
+        assert number > 1
+
+        # user_id での絞り込みは (created_at, id) を新しい順にたどって
+        # 1 行ずつ捨てるのではなく、user_id の複合インデックスを引く
+        engine = db_session.bind
+        assert isinstance(engine, AsyncEngine)
+        with capture_statements(engine) as captured:
+            await fetch_page(
+                db_session,
+                select(Ticket).where(Ticket.user_id == "u1"),
+                Ticket.created_at,
+                Ticket.id,
+            )
+        plan = await _explain(engine, *captured[0])
+        indexes = {node.get("Index Name") for node in _plan_nodes(plan)}
+        assert "ix_tickets_user_id_created_at_id" in indexes, json.dumps(plan)
@@ -0,0 +1,418 @@
+"""Tests for log table retention and optional monthly partitioning."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import tests.database.conftest as db_conftest
+from src.database import partitioning
+from src.database.models import (
+    AutoModIntroPost,
+    AutoModLog,
+    AutoModLogArchive,
+    AutoModRule,
+    BanLog,
+    BanLogArchive,
+    ChatRoleProgress,
+    SiteSettings,
+    Ticket,
+    TicketCategory,
+)
+from src.services.chatrole_service import (
+    create_chat_role_config,
+    increment_chat_role_progress,
+)
+from src.services.retention_service import (
+    RetentionPolicy,
+    get_retention_policy,
+    run_retention,
+    update_retention_policy,
+)
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=UTC)
+
+RunRetention = Callable[[], Awaitable[dict[str, int]]]
+
+
+async def _count(session: AsyncSession, model: type) -> int:
+    result = await session.execute(select(func.count()).select_from(model))
+    return int(result.scalar_one())
+
+
+async def _set_policy(session: AsyncSession, **values: Any) -> None:
+    await update_retention_policy(session, RetentionPolicy(**values))
+
+
+async def _add_automod_logs(
+    session: AsyncSession, ages_in_days: list[float]
+) -> list[AutoModLog]:
+    rule = AutoModRule(guild_id="1", rule_type="no_avatar", action="ban")
+    session.add(rule)
+    await session.flush()
+    logs = [
+        AutoModLog(
+            guild_id="1",
+            user_id=str(i),
+            username=f"user{i}",
+            rule_id=rule.id,
+            action_taken="banned",
+            reason="No avatar set",
+            created_at=NOW - timedelta(days=age),
+        )
+        for i, age in enumerate(ages_in_days)
+    ]
+    session.add_all(logs)
+    await session.commit()
+    return logs
+
+
+@pytest.fixture
+def run(bind_async_session: async_sessionmaker[AsyncSession]) -> RunRetention:
+    """小さいバッチ・待ちなしで run_retention を呼ぶ関数。"""
+
+    async def _run() -> dict[str, int]:
+        return await run_retention(bind_async_session, now=NOW, batch_size=2, pause=0)
+
+    return _run
+
+
+class TestRetentionPolicy:
+    """保持期間の設定の読み書き。"""
+
+    async def test_defaults_keep_everything(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        await _add_automod_logs(db_session, [1000])
+
+        assert await get_retention_policy(db_session) == RetentionPolicy()
+        assert await run() == {}
+        assert await _count(db_session, AutoModLog) == 1
+
+    async def test_update_round_trip(self, db_session: AsyncSession) -> None:
+        policy = RetentionPolicy(
+            automod_logs_days=30, ticket_transcripts_days=7, archive_logs=True
+        )
+        site = await update_retention_policy(db_session, policy)
+
+        assert site.timezone_offset == 9
+        assert await get_retention_policy(db_session) == policy
+        assert await _count(db_session, SiteSettings) == 1
+
+
+class TestLogRetention:
+    """automod_logs / ban_logs の削除とアーカイブ。"""
+
+    async def test_deletes_expired_rows_in_batches(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        logs = await _add_automod_logs(db_session, [1, 29, 31, 40, 50, 60, 90])
+        await _set_policy(db_session, automod_logs_days=30)
+
+        assert await run() == {"automod_logs": 5}
+        result = await db_session.execute(select(AutoModLog.id).order_by(AutoModLog.id))
+        assert result.scalars().all() == [logs[0].id, logs[1].id]
+
+    async def test_archives_expired_rows(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        logs = await _add_automod_logs(db_session, [1, 31, 45, 60])
+        db_session.add_all(
+            [
+                BanLog(
+                    guild_id="1",
+                    user_id="9",
+                    username="banned",
+                    reason="spam",
+                    is_automod=True,
+                    created_at=NOW - timedelta(days=days),
+                )
+                for days in (5, 400)
+            ]
+        )
+        await db_session.commit()
+        await _set_policy(
+            db_session, automod_logs_days=30, ban_logs_days=365, archive_logs=True
+        )
+
+        assert await run() == {"automod_logs": 3, "ban_logs": 1}
+        archived = (
+            (await db_session.execute(select(AutoModLogArchive).order_by("id")))
+            .scalars()
+            .all()
+        )
+        assert [a.id for a in archived] == [log.id for log in logs[1:]]
+        assert archived[0].reason == "No avatar set"
+        assert archived[0].archived_at is not None
+        ban_archive = (await db_session.execute(select(BanLogArchive))).scalar_one()
+        assert ban_archive.reason == "spam"
+        assert ban_archive.is_automod is True
+        assert await _count(db_session, AutoModLog) == 1
+        assert await _count(db_session, BanLog) == 1
+
+    async def test_failure_in_one_table_does_not_stop_others(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        db_session.add(
+            AutoModIntroPost(
+                guild_id="1",
+                user_id="2",
+                channel_id="3",
+                posted_at=NOW - timedelta(days=100),
+            )
+        )
+        await db_session.commit()
+        await _set_policy(db_session, automod_logs_days=30, intro_posts_days=90)
+
+        with patch(
+            "src.services.retention_service._prune_log_table",
+            AsyncMock(side_effect=RuntimeError("boom")),
+        ):
+            results = await run()
+
+        assert results == {"automod_intro_posts": 1}
+
+
+class TestOtherTableRetention:
+    """intro posts / ticket transcripts / chat role progress。"""
+
+    async def test_intro_posts(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        db_session.add_all(
+            [
+                AutoModIntroPost(
+                    guild_id="1",
+                    user_id=str(i),
+                    channel_id="3",
+                    posted_at=NOW - timedelta(days=days),
+                )
+                for i, days in enumerate([10, 100, 200])
+            ]
+        )
+        await db_session.commit()
+        await _set_policy(db_session, intro_posts_days=90)
+
+        assert await run() == {"automod_intro_posts": 2}
+        remaining = (await db_session.execute(select(AutoModIntroPost))).scalar_one()
+        assert remaining.user_id == "0"
+
+    async def test_ticket_transcripts(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        category = TicketCategory(guild_id="1", name="General", staff_role_id="999")
+        db_session.add(category)
+        await db_session.flush()
+
+        def ticket(number: int, *, closed_days_ago: int | None) -> Ticket:
+            return Ticket(
+                guild_id="1",
+                user_id="2",
+                username="user",
+                category_id=category.id,
+                ticket_number=number,
+                status="open" if closed_days_ago is None else "closed",
+                transcript="hello",
+                created_at=NOW - timedelta(days=400),
+                closed_at=(
+                    None
+                    if closed_days_ago is None
+                    else NOW - timedelta(days=closed_days_ago)
+                ),
+            )
+
+        db_session.add_all(
+            [
+                ticket(1, closed_days_ago=None),
+                ticket(2, closed_days_ago=10),
+                ticket(3, closed_days_ago=100),
+                ticket(4, closed_days_ago=200),
+            ]
+        )
+        await db_session.commit()
+        await _set_policy(db_session, ticket_transcripts_days=30)
+
+        assert await run() == {"tickets.transcript": 2}
+        result = await db_session.execute(
+            select(Ticket.ticket_number, Ticket.transcript).order_by(
+                Ticket.ticket_number
+            )
+        )
+        assert result.all() == [(1, "hello"), (2, "hello"), (3, None), (4, None)]
+
+    async def test_chat_role_progress(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        config = await create_chat_role_config(
+            db_session, "1", "2", "3", threshold=10, duration_hours=None
+        )
+        for user_id in ("stale", "granted", "active"):
+            await increment_chat_role_progress(db_session, config.id, user_id)
+        await db_session.execute(
+            text(
+                "UPDATE chat_role_progress SET updated_at = :old, "
+                "granted = (user_id = 'granted')"
+            ),
+            {"old": NOW - timedelta(days=60)},
+        )
+        await db_session.commit()
+        # 投稿があると updated_at が更新され、削除対象から外れる
+        await increment_chat_role_progress(db_session, config.id, "active")
+        await _set_policy(db_session, chat_role_progress_days=30)
+
+        assert await run() == {"chat_role_progress": 1}
+        result = await db_session.execute(
+            select(ChatRoleProgress.user_id).order_by(ChatRoleProgress.user_id)
+        )
+        assert result.scalars().all() == ["active", "granted"]
+
+
+class TestPartitioning:
+    """automod_logs / ban_logs の月単位パーティション。"""
+
+    @pytest.fixture(autouse=True)
+    def _recreate_schema_afterwards(self) -> Iterator[None]:
+        """変換したテーブルを次のテストのために作り直させる。"""
+        yield
+        db_conftest._schema_created = False
+
+    async def _convert(self, session: AsyncSession, table: str) -> bool:
+        conn = await session.connection()
+        converted = await partitioning.convert_to_partitioned(conn, table, now=NOW)
+        await session.commit()
+        return converted
+
+    async def _partition_of(self, session: AsyncSession, log_id: int) -> str:
+        result = await session.execute(
+            text("SELECT tableoid::regclass::text FROM automod_logs WHERE id = :id"),
+            {"id": log_id},
+        )
+        return str(result.scalar_one())
+
+    def test_month_helpers(self) -> None:
+        month = partitioning.month_start(NOW)
+        assert month == datetime(2026, 10, 1, tzinfo=UTC)
+        assert partitioning.add_months(month, 3) == datetime(2027, 1, 1, tzinfo=UTC)
+        assert partitioning.add_months(month, -10) == datetime(2025, 12, 1, tzinfo=UTC)
+        assert partitioning.partition_name("ban_logs", month) == "ban_logs_p202610"
+
+    async def test_convert_keeps_rows_sequence_indexes_and_foreign_key(
+        self, db_session: AsyncSession
+    ) -> None:
+        logs = await _add_automod_logs(db_session, [1, 40, 70])
+
+        assert await self._convert(db_session, "automod_logs") is True
+        assert await self._convert(db_session, "automod_logs") is False
+
+        conn = await db_session.connection()
+        assert await partitioning.is_partitioned(conn, "automod_logs")
+        assert sorted(await partitioning.list_partitions(conn, "automod_logs")) == [
+            datetime(2026, month, 1, tzinfo=UTC) for month in (8, 9, 10, 11, 12)
+        ]
+        assert await self._partition_of(db_session, logs[1].id) == (
+            "automod_logs_p202609"
+        )
+
+        # 新しい行は同じシーケンスから採番され、今月のパーティションに入る
+        new_log = AutoModLog(
+            guild_id="1",
+            user_id="new",
+            username="new",
+            rule_id=logs[0].rule_id,
+            action_taken="banned",
+            reason="No avatar set",
+            created_at=NOW,
+        )
+        db_session.add(new_log)
+        await db_session.commit()
+        assert new_log.id == logs[-1].id + 1
+        assert await self._partition_of(db_session, new_log.id) == (
+            "automod_logs_p202610"
+        )
+
+        indexes = await db_session.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'automod_logs'")
+        )
+        assert {
+            "automod_logs_pkey",
+            "ix_automod_logs_created_at_id",
+            "ix_automod_logs_guild_id_created_at_id",
+            "ix_automod_logs_user_id_created_at_id",
+        } <= set(indexes.scalars().all())
+
+        # ルール削除時のカスケードも残る
+        await db_session.execute(text("DELETE FROM automod_rules"))
+        await db_session.commit()
+        assert await _count(db_session, AutoModLog) == 0
+
+    async def test_ensure_partitions_moves_rows_out_of_default(
+        self, db_session: AsyncSession
+    ) -> None:
+        await _add_automod_logs(db_session, [1])
+        await self._convert(db_session, "automod_logs")
+        [far] = await _add_automod_logs(db_session, [-200])
+        assert await self._partition_of(db_session, far.id) == "automod_logs_default"
+
+        conn = await db_session.connection()
+        created = await partitioning.ensure_partitions(
+            conn, "automod_logs", now=NOW + timedelta(days=200), months_ahead=0
+        )
+        await db_session.commit()
+
+        assert created == ["automod_logs_p202705"]
+        assert await self._partition_of(db_session, far.id) == "automod_logs_p202705"
+
+    async def test_unsupported_table(self, db_session: AsyncSession) -> None:
+        conn = await db_session.connection()
+        with pytest.raises(ValueError, match="Unsupported partitioned table"):
+            await partitioning.convert_to_partitioned(conn, "tickets", now=NOW)
+
+    async def test_retention_drops_whole_months_and_batches_the_rest(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        # cutoff = 2026-09-17 12:00: 8 月以前は DROP、9 月の前半はバッチ削除
+        logs = await _add_automod_logs(db_session, [1, 20, 31, 35, 50, 70, 100])
+        await self._convert(db_session, "automod_logs")
+        await _set_policy(db_session, automod_logs_days=30)
+
+        assert await run() == {"automod_logs": 2}
+        remaining = await db_session.execute(
+            select(AutoModLog.id).order_by(AutoModLog.id)
+        )
+        assert remaining.scalars().all() == [logs[0].id, logs[1].id]
+        conn = await db_session.connection()
+        months = await partitioning.list_partitions(conn, "automod_logs")
+        assert min(months) == datetime(2026, 9, 1, tzinfo=UTC)
+
+    async def test_retention_archives_partitioned_ban_logs(
+        self, db_session: AsyncSession, run: RunRetention
+    ) -> None:
+        db_session.add_all(
+            [
+                BanLog(
+                    guild_id="1",
+                    user_id=str(days),
+                    username="user",
+                    created_at=NOW - timedelta(days=days),
+                )
+                for days in (1, 45, 90)
+            ]
+        )
+        await db_session.commit()
+        await self._convert(db_session, "ban_logs")
+        await _set_policy(db_session, ban_logs_days=30, archive_logs=True)
+
+        assert await run() == {"ban_logs": 2}
+        archived = await db_session.execute(
+            select(BanLogArchive.user_id).order_by(BanLogArchive.user_id)
+        )
+        assert archived.scalars().all() == ["45", "90"]
+        conn = await db_session.connection()
+        months = await partitioning.list_partitions(conn, "ban_logs")
+        assert min(months) == datetime(2026, 9, 1, tzinfo=UTC)
@@ -0,0 +1,214 @@
+"""Tests for unit_of_work session sharing."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from discord.ext import commands
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.cogs._automod_rules import CompiledRule
+from src.cogs.automod import AutoModCog
+from src.cogs.chatrole import ChatRoleCog
+from src.database.engine import unit_of_work
+from src.database.models import AutoModRule, ChatRoleProgress, StickyMessage
+from src.services.db_service import create_chat_role_config
+
+from .conftest import snowflake
+
+# ===========================================================================
+# セッションの共有
+# ===========================================================================
+
+
+class TestUnitOfWork:
+    """Tests for unit_of_work and UnitOfWorkSessionmaker."""
+
+    async def test_new_session_outside_unit_of_work(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with bind_async_session() as first, bind_async_session() as second:
+            assert first is not second
+
+    async def test_nested_calls_share_session(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with unit_of_work(bind_async_session) as outer:
+            async with bind_async_session() as inner:
+                assert inner is outer
+            async with unit_of_work(bind_async_session) as nested:
+                assert nested is outer
+
+    async def test_inner_block_keeps_transaction_open(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with unit_of_work(bind_async_session) as outer:
+            async with bind_async_session() as inner:
+                await inner.execute(select(StickyMessage))
+            assert outer.in_transaction()
+
+    async def test_one_transaction_for_nested_reads(
+        self, bind_async_session: async_sessionmaker[AsyncSession], query_budget
+    ) -> None:
+        with query_budget(sessions=1, max_repeats=2):
+            async with unit_of_work(bind_async_session):
+                for _ in range(2):
+                    async with bind_async_session() as session:
+                        await session.execute(select(StickyMessage))
+
+    async def test_explicit_commit(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+    ) -> None:
+        guild_id = snowflake()
+        async with unit_of_work(bind_async_session) as session:
+            session.add(AutoModRule(guild_id=guild_id, rule_type="no_avatar"))
+            async with bind_async_session() as inner:
+                await inner.commit()
+
+        result = await db_session.execute(
+            select(AutoModRule).where(AutoModRule.guild_id == guild_id)
+        )
+        assert len(result.scalars().all()) == 1
+
+    async def test_uncommitted_changes_discarded_on_exit(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+    ) -> None:
+        guild_id = snowflake()
+        async with unit_of_work(bind_async_session) as session:
+            session.add(AutoModRule(guild_id=guild_id, rule_type="no_avatar"))
+            await session.flush()
+
+        result = await db_session.execute(
+            select(AutoModRule).where(AutoModRule.guild_id == guild_id)
+        )
+        assert result.scalars().all() == []
+
+    async def test_error_in_borrowed_block_rolls_back(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with unit_of_work(bind_async_session) as outer:
+            with pytest.raises(RuntimeError):
+                async with bind_async_session() as inner:
+                    inner.add(AutoModRule(guild_id=snowflake(), rule_type="no_avatar"))
+                    await inner.flush()
+                    raise RuntimeError("boom")
+            assert not outer.in_transaction()
+            # 外側はそのまま使い続けられる
+            await outer.execute(select(StickyMessage))
+
+    async def test_spawned_task_gets_own_session(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async def open_session() -> AsyncSession:
+            async with bind_async_session() as session:
+                return session
+
+        async with unit_of_work(bind_async_session) as outer:
+            spawned = await asyncio.create_task(open_session())
+            assert spawned is not outer
+
+    async def test_arguments_open_new_session(
+        self, bind_async_session: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with (
+            unit_of_work(bind_async_session) as outer,
+            bind_async_session(expire_on_commit=True) as other,
+        ):
+            assert other is not outer
+
+
+# ===========================================================================
+# ハンドラーのセッション数
+# ===========================================================================
+
+
+def _make_bot() -> MagicMock:
+    bot = MagicMock(spec=commands.Bot)
+    bot.user = MagicMock()
+    bot.user.id = 1
+    return bot
+
+
+def _make_member(guild_id: str) -> MagicMock:
+    member = MagicMock(spec=discord.Member)
+    member.id = int(snowflake())
+    member.bot = False
+    member.joined_at = datetime.now(UTC)
+    member.guild = MagicMock(spec=discord.Guild)
+    member.guild.id = int(guild_id)
+    member.add_roles = AsyncMock()
+    return member
+
+
+class TestHandlerSessions:
+    """unit_of_work を使うハンドラーのトランザクション数。"""
+
+    async def test_intro_check_reads_in_one_transaction(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        guild_id = snowflake()
+        rule = AutoModRule(
+            guild_id=guild_id,
+            rule_type="vc_without_intro",
+            action="kick",
+            required_channel_id=snowflake(),
+            created_at=datetime.now(UTC) - timedelta(days=1),
+        )
+        db_session.add(rule)
+        await db_session.commit()
+        member = _make_member(guild_id)
+        member.guild.get_channel.return_value = None
+        cog = AutoModCog(_make_bot())
+
+        with query_budget(statements=2, sessions=1):
+            matched, _ = await cog._check_intro_missing(
+                CompiledRule.from_model(rule), member
+            )
+        assert matched is True
+
+    async def test_chat_role_post_is_one_transaction(
+        self,
+        db_session: AsyncSession,
+        bind_async_session: async_sessionmaker[AsyncSession],
+        query_budget,
+    ) -> None:
+        """設定と初回のカウントの読み込みが 1 つのトランザクションに収まる。
+
+        投稿の加算は書き込まずにバッファへ溜め、flush でまとめて反映する。
+        """
+        guild_id = snowflake()
+        channel_id = snowflake()
+        await create_chat_role_config(
+            db_session, guild_id, channel_id, snowflake(), 5, None
+        )
+        member = _make_member(guild_id)
+        message = MagicMock(spec=discord.Message)
+        message.guild = member.guild
+        message.type = discord.MessageType.default
+        message.author = member
+        message.channel = MagicMock()
+        message.channel.id = int(channel_id)
+        message.created_at = datetime.now(UTC) + timedelta(seconds=1)
+        cog = ChatRoleCog(_make_bot())
+
+        with query_budget(statements=2, sessions=1):
+            await cog.handle_message(message)
+
+        stmt = select(ChatRoleProgress).where(
+            ChatRoleProgress.user_id == str(member.id)
+        )
+        assert (await db_session.execute(stmt)).scalar_one_or_none() is None
+        await cog._progress_buffer.flush()
+        assert (await db_session.execute(stmt)).scalar_one().count == 1
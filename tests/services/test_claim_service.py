@@ -0,0 +1,98 @@
+"""Tests for claim_service (event claim backends)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.claim_service import (
+    MemoryClaimStore,
+    PostgresClaimStore,
+    claim_event,
+    cleanup_expired_events,
+    create_claim_store,
+    get_claim_store,
+    set_claim_store,
+)
+
+
+class TestMemoryClaimStore:
+    """MemoryClaimStore のテスト。"""
+
+    async def test_first_claim_succeeds(self) -> None:
+        """初回 claim は True を返す。"""
+        store = MemoryClaimStore()
+        assert await store.claim("test:event") is True
+
+    async def test_duplicate_claim_returns_false(self) -> None:
+        """TTL 内の同一キーの claim は False を返す。"""
+        store = MemoryClaimStore()
+        await store.claim("test:event")
+        assert await store.claim("test:event") is False
+
+    async def test_different_keys_both_succeed(self) -> None:
+        """異なるキーなら両方 claim 成功。"""
+        store = MemoryClaimStore()
+        assert await store.claim("a") is True
+        assert await store.claim("b") is True
+
+    async def test_expired_claim_can_be_reclaimed(self) -> None:
+        """TTL を過ぎたキーは再 claim できる。"""
+        store = MemoryClaimStore(ttl_seconds=60)
+        with patch("src.services.claim_service.time.monotonic", return_value=1000.0):
+            await store.claim("test:event")
+        with patch("src.services.claim_service.time.monotonic", return_value=1061.0):
+            assert await store.claim("test:event") is True
+
+    async def test_cleanup_removes_only_expired(self) -> None:
+        """cleanup は期限切れのキーだけを削除する。"""
+        store = MemoryClaimStore(ttl_seconds=60)
+        with patch("src.services.claim_service.time.monotonic", return_value=1000.0):
+            await store.claim("old")
+        with patch("src.services.claim_service.time.monotonic", return_value=1050.0):
+            await store.claim("recent")
+        with patch("src.services.claim_service.time.monotonic", return_value=1070.0):
+            deleted = await store.cleanup()
+
+        assert deleted == 1
+        assert len(store) == 1
+
+
+class TestClaimStoreSelection:
+    """create_claim_store / get_claim_store のテスト。"""
+
+    def test_create_memory_store(self) -> None:
+        """memory バックエンドで MemoryClaimStore を作成する。"""
+        assert isinstance(create_claim_store("memory"), MemoryClaimStore)
+
+    def test_create_postgres_store(self) -> None:
+        """postgres バックエンドで PostgresClaimStore を作成する。"""
+        assert isinstance(create_claim_store("postgres"), PostgresClaimStore)
+
+    def test_create_unknown_store_raises(self) -> None:
+        """未知のバックエンド名は ValueError。"""
+        with pytest.raises(ValueError, match="Unknown claim backend"):
+            create_claim_store("redis")
+
+    def test_get_claim_store_uses_setting(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """未設定時は CLAIM_BACKEND に応じたストアを作成して使い回す。"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "claim_backend", "memory")
+        set_claim_store(None)
+
+        store = get_claim_store()
+        assert isinstance(store, MemoryClaimStore)
+        assert get_claim_store() is store
+
+    async def test_claim_event_delegates_to_store(
+        self, memory_claim_store: MemoryClaimStore
+    ) -> None:
+        """claim_event / cleanup_expired_events は共有ストアに委譲する。"""
+        assert await claim_event("vc_lobby:1:2:3") is True
+        assert await claim_event("vc_lobby:1:2:3") is False
+        assert len(memory_claim_store) == 1
+        assert await cleanup_expired_events() == 0
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 from sqlalchemy import text
@@ -15,14 +16,16 @@ from sqlalchemy.ext.asyncio import (
 
 from src.constants import DEFAULT_TEST_DATABASE_URL
 from src.database.models import Base
+from src.services.claim_service import PostgresClaimStore
 from src.services.db_service import (
+    add_chat_role_progress_counts,
     add_role_panel_item,
     add_voice_session_member,
+    bulk_sync_discord_channels,
+    bulk_sync_discord_roles,
     claim_automod_log,
     claim_ban_log,
-    claim_event,
     claim_join_role_assignment,
-    cleanup_expired_events,
     clear_bump_reminder,
     create_auto_reaction_config,
     create_automod_log,
@@ -64,6 +67,7 @@ from src.services.db_service import (
     get_all_automod_rules,
     get_all_bump_configs,
     get_all_discord_guilds,
+    get_all_enabled_automod_rules,
     get_all_lobbies,
     get_all_role_panels,
     get_all_sticky_messages,
@@ -78,6 +82,7 @@ from src.services.db_service import (
     get_bump_config,
     get_bump_reminder,
     get_chat_role_configs,
+    get_chat_role_progress,
     get_discord_channels_by_guild,
     get_discord_roles_by_guild,
     get_due_bump_reminders,
@@ -92,8 +97,12 @@ from src.services.db_service import (
     get_join_role_configs,
     get_lobbies_by_guild,
     get_lobby_by_channel_id,
+    get_next_bump_reminder_at,
+    get_next_chat_role_expiry,
+    get_next_join_role_expiry,
     get_role_panel,
     get_role_panel_by_message_id,
+    get_role_panel_item,
     get_role_panel_item_by_emoji,
     get_role_panel_items,
     get_role_panels_by_channel,
@@ -670,6 +679,41 @@ class TestBumpReminderOperations:
 
         assert due == []
 
+    async def test_get_next_bump_reminder_at(self, db_session: AsyncSession) -> None:
+        """Test getting the earliest remind_at of enabled reminders."""
+        from datetime import UTC, datetime, timedelta
+
+        now = datetime.now(UTC)
+        assert await get_next_bump_reminder_at(db_session) is None
+
+        await upsert_bump_reminder(
+            db_session,
+            guild_id="123",
+            channel_id="456",
+            service_name="DISBOARD",
+            remind_at=now + timedelta(hours=2),
+        )
+        await upsert_bump_reminder(
+            db_session,
+            guild_id="456",
+            channel_id="789",
+            service_name="ディス速報",
+            remind_at=now + timedelta(hours=1),
+        )
+        # Disabled reminders are ignored even if earlier
+        await upsert_bump_reminder(
+            db_session,
+            guild_id="789",
+            channel_id="012",
+            service_name="DISBOARD",
+            remind_at=now + timedelta(minutes=5),
+        )
+        await toggle_bump_reminder(db_session, "789", "DISBOARD")
+
+        next_at = await get_next_bump_reminder_at(db_session)
+
+        assert next_at == now + timedelta(hours=1)
+
     async def test_clear_bump_reminder(self, db_session: AsyncSession) -> None:
         """Test clearing a bump reminder (sets remind_at to None)."""
         from datetime import UTC, datetime, timedelta
@@ -1290,6 +1334,59 @@ class TestDiscordRoleOperations:
         count = await delete_discord_roles_by_guild(db_session, "nonexistent")
         assert count == 0
 
+    async def test_bulk_sync_discord_roles(self, db_session: AsyncSession) -> None:
+        """Test bulk syncing inserts, updates and removes roles in one call."""
+        await upsert_discord_role(
+            db_session, guild_id="123", role_id="1", role_name="Old Name"
+        )
+        await upsert_discord_role(
+            db_session, guild_id="123", role_id="2", role_name="Deleted Role"
+        )
+        await upsert_discord_role(
+            db_session, guild_id="999", role_id="3", role_name="Other Guild Role"
+        )
+
+        count = await bulk_sync_discord_roles(
+            db_session,
+            "123",
+            [
+                {
+                    "role_id": "1",
+                    "role_name": "New Name",
+                    "color": 0xFF0000,
+                    "position": 2,
+                },
+                {"role_id": "4", "role_name": "Added Role", "color": 0, "position": 1},
+            ],
+        )
+        assert count == 2
+
+        # Core の upsert は identity map を更新しないため再読み込みする
+        db_session.expire_all()
+        roles = await get_discord_roles_by_guild(db_session, "123")
+        assert [(r.role_id, r.role_name, r.color) for r in roles] == [
+            ("1", "New Name", 0xFF0000),
+            ("4", "Added Role", 0),
+        ]
+
+        # Other guilds are untouched
+        other_roles = await get_discord_roles_by_guild(db_session, "999")
+        assert len(other_roles) == 1
+
+    async def test_bulk_sync_discord_roles_empty(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Test bulk syncing an empty role list removes all guild roles."""
+        await upsert_discord_role(
+            db_session, guild_id="123", role_id="1", role_name="Role 1"
+        )
+
+        count = await bulk_sync_discord_roles(db_session, "123", [])
+        assert count == 0
+
+        roles = await get_discord_roles_by_guild(db_session, "123")
+        assert roles == []
+
     async def test_get_discord_roles_by_guild(self, db_session: AsyncSession) -> None:
         """Test getting all roles for a guild sorted by position."""
         # Create roles with different positions
@@ -1859,6 +1956,52 @@ class TestDiscordChannelOperations:
         channels = await get_discord_channels_by_guild(db_session, "123")
         assert len(channels) == 1
 
+    async def test_bulk_sync_discord_channels(self, db_session: AsyncSession) -> None:
+        """Test bulk syncing inserts, updates and removes channels in one call."""
+        await upsert_discord_channel(
+            db_session, guild_id="123", channel_id="1", channel_name="old-name"
+        )
+        await upsert_discord_channel(
+            db_session, guild_id="123", channel_id="2", channel_name="deleted"
+        )
+        await upsert_discord_channel(
+            db_session, guild_id="999", channel_id="3", channel_name="other"
+        )
+
+        count = await bulk_sync_discord_channels(
+            db_session,
+            "123",
+            [
+                {
+                    "channel_id": "1",
+                    "channel_name": "general",
+                    "channel_type": 0,
+                    "position": 0,
+                    "category_id": "10",
+                },
+                {
+                    "channel_id": "4",
+                    "channel_name": "voice",
+                    "channel_type": 2,
+                    "position": 1,
+                    "category_id": None,
+                },
+            ],
+        )
+        assert count == 2
+
+        # Core の upsert は identity map を更新しないため再読み込みする
+        db_session.expire_all()
+        channels = await get_discord_channels_by_guild(db_session, "123")
+        assert sorted(
+            (c.channel_id, c.channel_name, c.channel_type, c.category_id)
+            for c in channels
+        ) == [("1", "general", 0, "10"), ("4", "voice", 2, None)]
+
+        # Other guilds are untouched
+        other_channels = await get_discord_channels_by_guild(db_session, "999")
+        assert len(other_channels) == 1
+
 
 class TestDiscordGuildSortingAndTimestamps:
     """Tests for Discord guild sorting and timestamp behavior."""
@@ -2469,6 +2612,31 @@ class TestRolePanelItemOperations:
 
         assert items == []
 
+    async def test_get_role_panel_item(self, db_session: AsyncSession) -> None:
+        """Test getting an item by ID."""
+        panel = await create_role_panel(
+            db_session,
+            guild_id="123",
+            channel_id="456",
+            panel_type="button",
+            title="Test Panel",
+        )
+        created = await add_role_panel_item(
+            db_session, panel_id=panel.id, role_id="111", emoji="🎮"
+        )
+
+        item = await get_role_panel_item(db_session, created.id)
+
+        assert item is not None
+        assert item.panel_id == panel.id
+        assert item.role_id == "111"
+
+    async def test_get_role_panel_item_not_found(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Test getting a non-existent item."""
+        assert await get_role_panel_item(db_session, 99999) is None
+
     async def test_get_role_panel_item_by_emoji(self, db_session: AsyncSession) -> None:
         """Test getting an item by emoji."""
         panel = await create_role_panel(
@@ -3980,6 +4148,71 @@ class TestTicketOperations:
         assert updated.channel_id is None
         assert updated.transcript == "transcript text"
 
+    async def test_set_ticket_transcript_reference(
+        self, db_session: AsyncSession
+    ) -> None:
+        """添付先の参照を保存すると本文は保存しない。"""
+        from src.services.db_service import (
+            create_ticket,
+            create_ticket_category,
+            set_ticket_transcript,
+        )
+
+        cat = await create_ticket_category(
+            db_session, guild_id="123", name="Cat1", staff_role_id="999"
+        )
+        ticket = await create_ticket(
+            db_session,
+            guild_id="123",
+            user_id="user1",
+            username="User",
+            category_id=cat.id,
+            channel_id="ch1",
+            ticket_number=1,
+        )
+
+        updated = await set_ticket_transcript(
+            db_session,
+            ticket,
+            message_count=1500,
+            channel_id="888",
+            message_id="999",
+        )
+        assert updated.transcript is None
+        assert updated.transcript_message_count == 1500
+        assert updated.transcript_channel_id == "888"
+        assert updated.transcript_message_id == "999"
+
+    async def test_set_ticket_transcript_inline_text(
+        self, db_session: AsyncSession
+    ) -> None:
+        """添付できなかった場合は本文を保存する。"""
+        from src.services.db_service import (
+            create_ticket,
+            create_ticket_category,
+            set_ticket_transcript,
+        )
+
+        cat = await create_ticket_category(
+            db_session, guild_id="123", name="Cat1", staff_role_id="999"
+        )
+        ticket = await create_ticket(
+            db_session,
+            guild_id="123",
+            user_id="user1",
+            username="User",
+            category_id=cat.id,
+            channel_id="ch1",
+            ticket_number=1,
+        )
+
+        updated = await set_ticket_transcript(
+            db_session, ticket, message_count=2, text="transcript text"
+        )
+        assert updated.transcript == "transcript text"
+        assert updated.transcript_message_count == 2
+        assert updated.transcript_message_id is None
+
     async def test_get_all_tickets(self, db_session: AsyncSession) -> None:
         """全チケットを取得できる。"""
         from src.services.db_service import (
@@ -4376,6 +4609,27 @@ class TestAutomodDbService:
         enabled = await get_enabled_automod_rules_by_guild(db_session, "123")
         assert enabled == []
 
+    async def test_get_all_enabled_automod_rules(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Test getting enabled rules across guilds ordered by guild and id."""
+        disabled = await create_automod_rule(
+            db_session, guild_id="111", rule_type="no_avatar"
+        )
+        await toggle_automod_rule(db_session, disabled.id)
+        b1 = await create_automod_rule(
+            db_session, guild_id="222", rule_type="no_avatar"
+        )
+        a1 = await create_automod_rule(
+            db_session, guild_id="111", rule_type="username_match", pattern="x"
+        )
+        b2 = await create_automod_rule(
+            db_session, guild_id="222", rule_type="account_age", threshold_seconds=60
+        )
+
+        enabled = await get_all_enabled_automod_rules(db_session)
+        assert [r.id for r in enabled] == [a1.id, b1.id, b2.id]
+
     async def test_delete_automod_rule(self, db_session: AsyncSession) -> None:
         """Test deleting an automod rule."""
         rule = await create_automod_rule(
@@ -5465,6 +5719,25 @@ class TestJoinRoleDbService:
         result = await toggle_join_role_config(db_session, 999)
         assert result is None
 
+    async def test_get_next_join_role_expiry(self, db_session: AsyncSession) -> None:
+        """Test getting the earliest assignment expiry."""
+        from datetime import UTC, datetime, timedelta
+
+        now = datetime.now(UTC)
+        assert await get_next_join_role_expiry(db_session) is None
+
+        for user_id, hours in (("u1", 24), ("u2", 3)):
+            await create_join_role_assignment(
+                db_session,
+                guild_id="g1",
+                user_id=user_id,
+                role_id="r1",
+                assigned_at=now,
+                expires_at=now + timedelta(hours=hours),
+            )
+
+        assert await get_next_join_role_expiry(db_session) == now + timedelta(hours=3)
+
     async def test_create_join_role_assignment(self, db_session: AsyncSession) -> None:
         """Test creating a join role assignment."""
         from datetime import UTC, datetime, timedelta
@@ -5730,51 +6003,90 @@ class TestIntroPostCRUD:
 # ===========================================================================
 
 
-class TestClaimEvent:
-    """claim_event のアトミック重複防止テスト。"""
+@pytest.fixture
+def claim_store(db_session: AsyncSession) -> PostgresClaimStore:
+    """テスト DB を使う PostgresClaimStore。"""
+    factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    return PostgresClaimStore(factory, ttl_seconds=3600)
 
-    @pytest.mark.asyncio
-    async def test_first_claim_succeeds(self, db_session: AsyncSession) -> None:
+
+class TestPostgresClaimStore:
+    """PostgresClaimStore.claim のアトミック重複防止テスト。"""
+
+    async def test_first_claim_succeeds(self, claim_store: PostgresClaimStore) -> None:
         """初回 claim は True を返す。"""
-        result = await claim_event(db_session, "test:event:1")
+        result = await claim_store.claim("test:event:1")
         assert result is True
 
-    @pytest.mark.asyncio
     async def test_duplicate_claim_returns_false(
-        self, db_session: AsyncSession
+        self, claim_store: PostgresClaimStore
     ) -> None:
         """同一 event_key の2回目の claim は False を返す。"""
-        result1 = await claim_event(db_session, "test:event:dup")
+        result1 = await claim_store.claim("test:event:dup")
         assert result1 is True
 
-        result2 = await claim_event(db_session, "test:event:dup")
+        result2 = await claim_store.claim("test:event:dup")
         assert result2 is False
 
-    @pytest.mark.asyncio
-    async def test_different_keys_both_succeed(self, db_session: AsyncSession) -> None:
+    async def test_different_keys_both_succeed(
+        self, claim_store: PostgresClaimStore
+    ) -> None:
         """異なる event_key なら両方 claim 成功。"""
-        r1 = await claim_event(db_session, "test:event:a")
-        r2 = await claim_event(db_session, "test:event:b")
+        r1 = await claim_store.claim("test:event:a")
+        r2 = await claim_store.claim("test:event:b")
         assert r1 is True
         assert r2 is True
 
-    @pytest.mark.asyncio
-    async def test_claim_after_duplicate_still_works(
-        self, db_session: AsyncSession
+    async def test_expired_claim_can_be_reclaimed(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
     ) -> None:
-        """重複 claim (rollback) 後でも別キーの claim が成功する。"""
-        await claim_event(db_session, "test:event:first")
-        await claim_event(db_session, "test:event:first")  # False + rollback
+        """TTL を過ぎた (cleanup 前の) claim は再 claim できる。"""
+        from datetime import UTC, datetime, timedelta
 
-        result = await claim_event(db_session, "test:event:second")
-        assert result is True
+        from src.database.models import ProcessedEvent
 
+        db_session.add(
+            ProcessedEvent(
+                event_key="expired:event",
+                created_at=datetime.now(UTC) - timedelta(hours=2),
+            )
+        )
+        await db_session.commit()
 
-class TestCleanupExpiredEvents:
-    """cleanup_expired_events のテスト。"""
+        assert await claim_store.claim("expired:event") is True
+        assert await claim_store.claim("expired:event") is False
 
-    @pytest.mark.asyncio
-    async def test_cleanup_deletes_old_records(self, db_session: AsyncSession) -> None:
+    async def test_caller_session_unaffected_by_duplicate_claim(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
+    ) -> None:
+        """重複 claim は呼び出し側のセッションをロールバックしない。"""
+        await claim_store.claim("key:recovery:1")
+        lobby = await create_lobby(db_session, guild_id="111", lobby_channel_id="222")
+
+        result = await claim_store.claim("key:recovery:1")
+        assert result is False
+
+        # 呼び出し側のセッションは引き続き利用できる
+        lobby = await create_lobby(db_session, guild_id="333", lobby_channel_id="444")
+        assert lobby.id is not None
+
+    async def test_table_is_unlogged(self, db_session: AsyncSession) -> None:
+        """processed_events は UNLOGGED テーブルとして作成される。"""
+        result = await db_session.execute(
+            text(
+                "SELECT relpersistence::text FROM pg_class "
+                "WHERE relname = 'processed_events'"
+            )
+        )
+        assert result.scalar_one() == "u"
+
+
+class TestPostgresClaimStoreCleanup:
+    """PostgresClaimStore.cleanup のテスト。"""
+
+    async def test_cleanup_deletes_old_records(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
+    ) -> None:
         """古いレコードが削除される。"""
         from datetime import UTC, datetime, timedelta
 
@@ -5788,27 +6100,28 @@ class TestCleanupExpiredEvents:
         db_session.add(old_event)
         await db_session.commit()
 
-        deleted = await cleanup_expired_events(db_session, max_age_seconds=3600)
+        deleted = await claim_store.cleanup()
         assert deleted == 1
 
-    @pytest.mark.asyncio
-    async def test_cleanup_keeps_recent_records(self, db_session: AsyncSession) -> None:
+    async def test_cleanup_keeps_recent_records(
+        self, claim_store: PostgresClaimStore
+    ) -> None:
         """新しいレコードは削除されない。"""
-        await claim_event(db_session, "recent:event")
+        await claim_store.claim("recent:event")
 
-        deleted = await cleanup_expired_events(db_session, max_age_seconds=3600)
+        deleted = await claim_store.cleanup()
         assert deleted == 0
 
-    @pytest.mark.asyncio
     async def test_cleanup_returns_zero_when_empty(
-        self, db_session: AsyncSession
+        self, claim_store: PostgresClaimStore
     ) -> None:
         """テーブルが空なら 0。"""
-        deleted = await cleanup_expired_events(db_session)
+        deleted = await claim_store.cleanup()
         assert deleted == 0
 
-    @pytest.mark.asyncio
-    async def test_cleanup_mixed_old_and_recent(self, db_session: AsyncSession) -> None:
+    async def test_cleanup_mixed_old_and_recent(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
+    ) -> None:
         """古いレコードのみ削除し、新しいレコードは残す。"""
         from datetime import UTC, datetime, timedelta
 
@@ -5826,16 +6139,41 @@ class TestCleanupExpiredEvents:
 
         # 新しいレコード 2 件
         for i in range(2):
-            await claim_event(db_session, f"recent:{i}")
+            await claim_store.claim(f"recent:{i}")
 
-        deleted = await cleanup_expired_events(db_session, max_age_seconds=3600)
+        deleted = await claim_store.cleanup()
         assert deleted == 3
 
-    @pytest.mark.asyncio
-    async def test_cleanup_respects_custom_max_age(
-        self, db_session: AsyncSession
+    async def test_cleanup_deletes_in_batches(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
+    ) -> None:
+        """バッチサイズを超える件数も、複数回の DELETE で全て削除する。"""
+        from datetime import UTC, datetime, timedelta
+
+        from src.database.models import ProcessedEvent
+
+        for i in range(7):
+            db_session.add(
+                ProcessedEvent(
+                    event_key=f"old:{i}",
+                    created_at=datetime.now(UTC) - timedelta(hours=2),
+                )
+            )
+        await db_session.commit()
+        await claim_store.claim("recent")
+
+        with patch("src.services.claim_service.RETENTION_BATCH_SIZE", 3):
+            deleted = await claim_store.cleanup()
+        assert deleted == 7
+        remaining = await db_session.execute(
+            text("SELECT event_key FROM processed_events")
+        )
+        assert remaining.scalars().all() == ["recent"]
+
+    async def test_cleanup_respects_ttl(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
     ) -> None:
-        """カスタム max_age_seconds が正しく適用される。"""
+        """ttl_seconds が正しく適用される。"""
         from datetime import UTC, datetime, timedelta
 
         from src.database.models import ProcessedEvent
@@ -5849,22 +6187,23 @@ class TestCleanupExpiredEvents:
         )
         await db_session.commit()
 
-        # デフォルト (1時間) では削除されない
-        deleted = await cleanup_expired_events(db_session, max_age_seconds=3600)
+        # 1時間では削除されない
+        deleted = await claim_store.cleanup()
         assert deleted == 0
 
-        # 30分指定なら削除される
-        deleted = await cleanup_expired_events(db_session, max_age_seconds=1800)
+        # 30分なら削除される
+        claim_store.ttl_seconds = 1800
+        deleted = await claim_store.cleanup()
         assert deleted == 1
 
-    @pytest.mark.asyncio
-    async def test_cleanup_boundary_not_deleted(self, db_session: AsyncSession) -> None:
-        """ちょうどカットオフ時刻のレコードは削除されない (< 条件)。"""
+    async def test_cleanup_boundary_not_deleted(
+        self, db_session: AsyncSession, claim_store: PostgresClaimStore
+    ) -> None:
+        """カットオフ時刻より新しいレコードは削除されない (< 条件)。"""
         from datetime import UTC, datetime, timedelta
 
         from src.database.models import ProcessedEvent
 
-        # ちょうど 1秒前 (max_age=3600 → カットオフより新しい)
         db_session.add(
             ProcessedEvent(
                 event_key="boundary:event",
@@ -5873,42 +6212,10 @@ class TestCleanupExpiredEvents:
         )
         await db_session.commit()
 
-        deleted = await cleanup_expired_events(db_session, max_age_seconds=3600)
+        deleted = await claim_store.cleanup()
         assert deleted == 0
 
 
-class TestClaimEventSessionRecovery:
-    """claim_event の IntegrityError 後のセッション復旧テスト。"""
-
-    @pytest.mark.asyncio
-    async def test_session_usable_after_duplicate_claim(
-        self, db_session: AsyncSession
-    ) -> None:
-        """重複 claim (rollback) 後も他の DB 操作が可能。"""
-        await claim_event(db_session, "key:recovery:1")
-        result = await claim_event(db_session, "key:recovery:1")  # False + rollback
-        assert result is False
-
-        # rollback 後にロビー作成が成功することを確認
-        lobby = await create_lobby(db_session, guild_id="111", lobby_channel_id="222")
-        assert lobby.id is not None
-
-    @pytest.mark.asyncio
-    async def test_different_operations_after_rollback(
-        self, db_session: AsyncSession
-    ) -> None:
-        """重複 claim の rollback 後に異なる DB 操作が連続で成功する。"""
-        await claim_event(db_session, "ops:after:rollback")
-        await claim_event(db_session, "ops:after:rollback")  # False + rollback
-
-        # rollback 後にロビー作成 → 更にイベント claim → 両方成功
-        lobby = await create_lobby(db_session, guild_id="333", lobby_channel_id="444")
-        assert lobby.id is not None
-
-        result = await claim_event(db_session, "ops:after:rollback:2")
-        assert result is True
-
-
 class TestGetBotActivity:
     """Tests for get_bot_activity."""
 
@@ -6066,6 +6373,15 @@ class TestChatRoleDbService:
         assert progress is not None
         assert progress.count == 2
 
+    async def test_get_progress(self, db_session: AsyncSession) -> None:
+        config = await create_chat_role_config(db_session, "g1", "c1", "r1", 5, 24)
+        assert await get_chat_role_progress(db_session, config.id, "u1") is None
+
+        await increment_chat_role_progress(db_session, config.id, "u1")
+        progress = await get_chat_role_progress(db_session, config.id, "u1")
+        assert progress is not None
+        assert progress.count == 1
+
     async def test_increment_progress_returns_none_when_granted(
         self, db_session: AsyncSession
     ) -> None:
@@ -6083,6 +6399,53 @@ class TestChatRoleDbService:
         result = await increment_chat_role_progress(db_session, config.id, "u1")
         assert result is None
 
+    async def test_add_progress_counts_bulk(self, db_session: AsyncSession) -> None:
+        """複数ユーザーの加算を 1 文で反映し、新規・既存の両方を扱う。"""
+        config = await create_chat_role_config(db_session, "g1", "c1", "r1", 5, 24)
+        await increment_chat_role_progress(db_session, config.id, "u1")
+
+        progresses = await add_chat_role_progress_counts(
+            db_session, {(config.id, "u1"): 3, (config.id, "u2"): 2}
+        )
+
+        counts = {p.user_id: p.count for p in progresses}
+        assert counts == {"u1": 4, "u2": 2}
+        assert all(p.granted is False for p in progresses)
+
+    async def test_add_progress_counts_skips_granted(
+        self, db_session: AsyncSession
+    ) -> None:
+        """granted=True のレコードは更新せず戻り値にも含めない。"""
+        from datetime import UTC, datetime
+
+        config = await create_chat_role_config(db_session, "g1", "c1", "r1", 1, None)
+        progress = await increment_chat_role_progress(db_session, config.id, "u1")
+        assert progress is not None
+        await mark_chat_role_progress_granted(
+            db_session, progress.id, datetime.now(UTC), expires_at=None
+        )
+
+        progresses = await add_chat_role_progress_counts(
+            db_session, {(config.id, "u1"): 5, (config.id, "u2"): 1}
+        )
+
+        assert [p.user_id for p in progresses] == ["u2"]
+
+    async def test_add_progress_counts_ignores_deleted_config(
+        self, db_session: AsyncSession
+    ) -> None:
+        """削除済み設定の加算は FK 違反にならず捨てられる。"""
+        config = await create_chat_role_config(db_session, "g1", "c1", "r1", 5, 24)
+
+        progresses = await add_chat_role_progress_counts(
+            db_session, {(config.id, "u1"): 1, (config.id + 999, "u1"): 1}
+        )
+
+        assert [(p.config_id, p.count) for p in progresses] == [(config.id, 1)]
+
+    async def test_add_progress_counts_empty(self, db_session: AsyncSession) -> None:
+        assert await add_chat_role_progress_counts(db_session, {}) == []
+
     async def test_mark_progress_granted_succeeds_once(
         self, db_session: AsyncSession
     ) -> None:
@@ -6145,6 +6508,31 @@ class TestChatRoleDbService:
         ok2 = await mark_chat_role_progress_expired(db_session, progress.id)
         assert ok2 is False
 
+    async def test_get_next_chat_role_expiry(self, db_session: AsyncSession) -> None:
+        """付与済み Progress の最も早い expires_at を返す (永続付与は除く)。"""
+        from datetime import UTC, datetime, timedelta
+
+        config = await create_chat_role_config(db_session, "g1", "c1", "r1", 1, 24)
+        now = datetime.now(UTC)
+        assert await get_next_chat_role_expiry(db_session) is None
+
+        for user_id, expires_at in (
+            ("u1", now + timedelta(hours=5)),
+            ("u2", now + timedelta(hours=2)),
+            ("u3", None),
+        ):
+            progress = await increment_chat_role_progress(
+                db_session, config.id, user_id
+            )
+            assert progress is not None
+            await mark_chat_role_progress_granted(
+                db_session, progress.id, now, expires_at=expires_at
+            )
+        # granted=False の Progress は対象外
+        await increment_chat_role_progress(db_session, config.id, "u4")
+
+        assert await get_next_chat_role_expiry(db_session) == now + timedelta(hours=2)
+
     async def test_permanent_grant_not_in_expired_list(
         self, db_session: AsyncSession
     ) -> None:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import discord
@@ -9,6 +10,9 @@ import pytest
 from discord.ext import commands
 
 from src.bot import EphemeralVCBot, make_activity
+from src.core.message_router import get_message_router
+from src.database.change_feed import ChangeBatch
+from src.ui.control_panel import ControlPanelButton
 
 # ===========================================================================
 # __init__ テスト
@@ -29,6 +33,30 @@ class TestBotInit:
         assert isinstance(bot.activity, discord.Game)
         assert "お菓子" in bot.activity.name
 
+    def test_message_router_is_the_only_on_message_listener(self) -> None:
+        """on_message はメッセージルーターに 1 つだけ登録される。"""
+        bot = EphemeralVCBot()
+
+        assert get_message_router(bot) is bot.message_router
+        assert bot.extra_events["on_message"] == [bot.message_router.dispatch]
+
+    async def test_add_cog_instruments_listeners(self) -> None:
+        """add_cog で登録されたリスナーは計測付きになる。"""
+
+        class _Cog(commands.Cog):
+            @commands.Cog.listener()
+            async def on_member_join(self, member: discord.Member) -> None:
+                pass
+
+        bot = EphemeralVCBot()
+        cog = _Cog()
+        await bot.add_cog(cog)
+
+        (listener,) = bot.extra_events["on_member_join"]
+        await listener(MagicMock())
+
+        assert bot.listener_metrics.stats("_Cog", "on_member_join").calls == 1
+
 
 # ===========================================================================
 # setup_hook テスト
@@ -42,7 +70,10 @@ class TestSetupHook:
         """setup_hook テスト用のモック済み Bot を作成する。"""
         bot = EphemeralVCBot()
         bot.load_extension = AsyncMock()  # type: ignore[method-assign]
-        bot.add_view = MagicMock()  # type: ignore[method-assign]
+        bot.add_dynamic_items = MagicMock()  # type: ignore[method-assign]
+        bot.change_feed = MagicMock()
+        bot.change_feed.wait_connected = AsyncMock()
+        bot.loop_probe = MagicMock()
         return bot
 
     def _mock_session_factory(self) -> MagicMock:
@@ -68,11 +99,6 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
@@ -81,7 +107,7 @@ class TestSetupHook:
         ):
             await bot.setup_hook()
 
-        assert bot.load_extension.await_count == 12
+        assert bot.load_extension.await_count == 13
         bot.load_extension.assert_any_await("src.cogs.voice")
         bot.load_extension.assert_any_await("src.cogs.admin")
         bot.load_extension.assert_any_await("src.cogs.health")
@@ -94,6 +120,7 @@ class TestSetupHook:
         bot.load_extension.assert_any_await("src.cogs.chatrole")
         bot.load_extension.assert_any_await("src.cogs.auto_reaction")
         bot.load_extension.assert_any_await("src.cogs.eventlog")
+        bot.load_extension.assert_any_await("src.cogs.retention")
 
     @patch("src.bot.async_session")
     async def test_syncs_commands(self, mock_session_factory: MagicMock) -> None:
@@ -111,11 +138,6 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
@@ -127,24 +149,13 @@ class TestSetupHook:
         mock_tree.sync.assert_awaited_once()
 
     @patch("src.bot.async_session")
-    async def test_restores_views(self, mock_session_factory: MagicMock) -> None:
-        """DB のセッションから View が復元される。"""
+    async def test_starts_change_feed(self, mock_session_factory: MagicMock) -> None:
+        """Web 管理画面からの変更通知の受信を開始する。"""
         mock_session_factory.return_value.__aenter__ = AsyncMock(
             return_value=AsyncMock()
         )
         mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
 
-        vs1 = MagicMock()
-        vs1.id = 1
-        vs1.channel_id = "100"
-        vs1.is_locked = False
-        vs1.is_hidden = False
-        vs2 = MagicMock()
-        vs2.id = 2
-        vs2.channel_id = "200"
-        vs2.is_locked = True
-        vs2.is_hidden = True
-
         bot = self._make_bot()
         mock_tree = MagicMock()
         mock_tree.sync = AsyncMock()
@@ -153,11 +164,6 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[vs1, vs2],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
@@ -166,30 +172,26 @@ class TestSetupHook:
         ):
             await bot.setup_hook()
 
-        assert bot.add_view.call_count == 2
+        bot.change_feed.start.assert_called_once()
 
     @patch("src.bot.async_session")
-    async def test_restores_views_with_nsfw_channel(
+    async def test_waits_for_listen_before_loading_cogs(
         self, mock_session_factory: MagicMock
     ) -> None:
-        """NSFW チャンネルの場合、is_nsfw=True で View が復元される。"""
+        """LISTEN の開始を待ってから Cog を読み込む。"""
         mock_session_factory.return_value.__aenter__ = AsyncMock(
             return_value=AsyncMock()
         )
         mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
 
-        vs = MagicMock()
-        vs.id = 1
-        vs.channel_id = "100"
-        vs.is_locked = False
-        vs.is_hidden = False
-
-        # NSFW チャンネルをモック
-        nsfw_channel = MagicMock(spec=discord.VoiceChannel)
-        nsfw_channel.nsfw = True
-
         bot = self._make_bot()
-        bot.get_channel = MagicMock(return_value=nsfw_channel)
+        order: list[str] = []
+        bot.change_feed.wait_connected = AsyncMock(
+            side_effect=lambda: order.append("listen")
+        )
+        bot.load_extension = AsyncMock(  # type: ignore[method-assign]
+            side_effect=lambda _ext: order.append("load")
+        )
         mock_tree = MagicMock()
         mock_tree.sync = AsyncMock()
 
@@ -197,35 +199,30 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[vs],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
-            patch("src.bot.ControlPanelView") as mock_view_class,
         ):
             await bot.setup_hook()
 
-        # is_nsfw=True で View が作成されることを確認
-        mock_view_class.assert_called_once_with(1, False, False, True)
-        bot.get_channel.assert_called_once_with(100)
+        assert order[0] == "listen"
+        assert order.count("load") == 13
 
     @patch("src.bot.async_session")
-    async def test_no_views_when_no_sessions(
+    async def test_loads_cogs_when_listen_times_out(
         self, mock_session_factory: MagicMock
     ) -> None:
-        """セッションがない場合、View は登録されない。"""
+        """LISTEN の開始を待ちきれなくても Cog は読み込む。"""
         mock_session_factory.return_value.__aenter__ = AsyncMock(
             return_value=AsyncMock()
         )
         mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
 
         bot = self._make_bot()
+        never = asyncio.Event()
+        bot.change_feed.wait_connected = never.wait
         mock_tree = MagicMock()
         mock_tree.sync = AsyncMock()
 
@@ -234,35 +231,58 @@ class TestSetupHook:
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
             patch(
-                "src.bot.get_all_voice_sessions",
+                "src.bot.get_site_settings",
                 new_callable=AsyncMock,
-                return_value=[],
+                return_value=None,
+            ),
+            patch("src.bot.CHANGE_FEED_CONNECT_TIMEOUT_SECONDS", 0.01),
+        ):
+            await bot.setup_hook()
+
+        assert bot.load_extension.await_count == 13
+
+    @patch("src.bot.async_session")
+    async def test_starts_metrics(self, mock_session_factory: MagicMock) -> None:
+        """ループ遅延の計測と /metrics リスナーを開始する。"""
+        mock_session_factory.return_value.__aenter__ = AsyncMock(
+            return_value=AsyncMock()
+        )
+        mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        bot = self._make_bot()
+        bot.metrics_server = MagicMock()
+        bot.metrics_server.start = AsyncMock()
+        mock_tree = MagicMock()
+        mock_tree.sync = AsyncMock()
+
+        with (
+            patch.object(
+                type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
+            patch("src.bot.install_db_metrics") as mock_install,
         ):
             await bot.setup_hook()
 
-        bot.add_view.assert_not_called()
+        mock_install.assert_called_once()
+        bot.loop_probe.start.assert_called_once()
+        bot.metrics_server.start.assert_awaited_once()
 
     @patch("src.bot.async_session")
-    async def test_extension_load_error_raises(
+    async def test_registers_control_panel_button(
         self, mock_session_factory: MagicMock
     ) -> None:
-        """Cog 読み込みエラー時は例外が発生する。"""
+        """コントロールパネルのボタンはセッション数に関係なく 1 回だけ登録する。"""
         mock_session_factory.return_value.__aenter__ = AsyncMock(
             return_value=AsyncMock()
         )
         mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
 
-        bot = EphemeralVCBot()
-        bot.load_extension = AsyncMock(  # type: ignore[method-assign]
-            side_effect=commands.ExtensionError(message="Test error", name="test_ext")
-        )
-        bot.add_view = MagicMock()  # type: ignore[method-assign]
+        bot = self._make_bot()
         mock_tree = MagicMock()
         mock_tree.sync = AsyncMock()
 
@@ -270,43 +290,33 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
-            pytest.raises(commands.ExtensionError),
         ):
             await bot.setup_hook()
 
+        bot.add_dynamic_items.assert_called_once_with(ControlPanelButton)
+
     @patch("src.bot.async_session")
-    async def test_non_voice_channel_logs_warning(
+    async def test_extension_load_error_raises(
         self, mock_session_factory: MagicMock
     ) -> None:
-        """チャンネルが VoiceChannel でない場合、警告がログに出力される。"""
+        """Cog 読み込みエラー時は例外が発生する。"""
         mock_session_factory.return_value.__aenter__ = AsyncMock(
             return_value=AsyncMock()
         )
         mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
 
-        vs = MagicMock()
-        vs.id = 1
-        vs.channel_id = "100"
-        vs.is_locked = False
-        vs.is_hidden = False
-
-        # TextChannel (VoiceChannel ではない)
-        text_channel = MagicMock(spec=discord.TextChannel)
-
         bot = EphemeralVCBot()
-        bot.load_extension = AsyncMock()  # type: ignore[method-assign]
-        bot.add_view = MagicMock()  # type: ignore[method-assign]
-        bot.get_channel = MagicMock(return_value=text_channel)
+        bot.load_extension = AsyncMock(  # type: ignore[method-assign]
+            side_effect=commands.ExtensionError(message="Test error", name="test_ext")
+        )
+        bot.add_dynamic_items = MagicMock()  # type: ignore[method-assign]
+        bot.change_feed = MagicMock()
+        bot.change_feed.wait_connected = AsyncMock()
         mock_tree = MagicMock()
         mock_tree.sync = AsyncMock()
 
@@ -314,23 +324,15 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[vs],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
-            patch("src.bot.ControlPanelView") as mock_view_class,
+            pytest.raises(commands.ExtensionError),
         ):
             await bot.setup_hook()
 
-        # is_nsfw=False (デフォルト) で View が作成される
-        mock_view_class.assert_called_once_with(1, False, False, False)
-
     @patch("src.bot.async_session")
     async def test_tree_sync_error_raises(
         self, mock_session_factory: MagicMock
@@ -343,7 +345,9 @@ class TestSetupHook:
 
         bot = EphemeralVCBot()
         bot.load_extension = AsyncMock()  # type: ignore[method-assign]
-        bot.add_view = MagicMock()  # type: ignore[method-assign]
+        bot.add_dynamic_items = MagicMock()  # type: ignore[method-assign]
+        bot.change_feed = MagicMock()
+        bot.change_feed.wait_connected = AsyncMock()
         mock_tree = MagicMock()
         mock_tree.sync = AsyncMock(
             side_effect=discord.HTTPException(MagicMock(), "Sync failed")
@@ -353,11 +357,6 @@ class TestSetupHook:
             patch.object(
                 type(bot), "tree", new_callable=PropertyMock, return_value=mock_tree
             ),
-            patch(
-                "src.bot.get_all_voice_sessions",
-                new_callable=AsyncMock,
-                return_value=[],
-            ),
             patch(
                 "src.bot.get_site_settings",
                 new_callable=AsyncMock,
@@ -368,6 +367,50 @@ class TestSetupHook:
             await bot.setup_hook()
 
 
+# ===========================================================================
+# 変更通知テスト
+# ===========================================================================
+
+
+class TestChangeFeed:
+    """Tests for the web admin change feed wiring."""
+
+    def test_change_is_dispatched_as_db_change(self) -> None:
+        """受け取った変更は on_db_change イベントとして配られる。"""
+        bot = EphemeralVCBot()
+        batch = ChangeBatch(resync=True)
+
+        with patch.object(bot, "dispatch") as mock_dispatch:
+            bot._dispatch_db_change(batch)
+
+        mock_dispatch.assert_called_once_with("db_change", batch)
+
+    async def test_close_stops_change_feed(self) -> None:
+        """終了時に変更通知の受信を止める。"""
+        bot = EphemeralVCBot()
+        bot.change_feed = MagicMock()
+        bot.change_feed.stop = AsyncMock()
+
+        await bot.close()
+
+        bot.change_feed.stop.assert_awaited_once()
+
+    async def test_close_stops_metrics(self) -> None:
+        """終了時にループ遅延の計測と /metrics リスナーを止める。"""
+        bot = EphemeralVCBot()
+        bot.change_feed = MagicMock()
+        bot.change_feed.stop = AsyncMock()
+        bot.loop_probe = MagicMock()
+        bot.loop_probe.stop = AsyncMock()
+        bot.metrics_server = MagicMock()
+        bot.metrics_server.stop = AsyncMock()
+
+        await bot.close()
+
+        bot.loop_probe.stop.assert_awaited_once()
+        bot.metrics_server.stop.assert_awaited_once()
+
+
 # ===========================================================================
 # on_ready テスト
 # ===========================================================================
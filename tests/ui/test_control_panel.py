@@ -16,6 +16,7 @@ from src.ui.control_panel import (
     BlockSelectView,
     CameraToggleSelectMenu,
     CameraToggleSelectView,
+    ControlPanelButton,
     ControlPanelView,
     DissolveCancelView,
     DissolveConfirmView,
@@ -266,6 +267,114 @@ class TestInteractionCheck:
             result = await view.interaction_check(interaction)
             assert result is False
 
+    async def test_applies_session_state(self) -> None:
+        """許可したときは DB とチャンネルの状態をボタンに反映する。"""
+        view = ControlPanelView(session_id=0)
+        interaction = _make_interaction(user_id=1)
+        interaction.channel.nsfw = True
+        voice_session = _make_voice_session(
+            session_id=7, owner_id="1", is_locked=True, is_hidden=True
+        )
+
+        mock_factory, _ = _mock_async_session()
+        with (
+            patch("src.ui.control_panel.async_session", mock_factory),
+            patch(
+                "src.ui.control_panel.get_voice_session",
+                new_callable=AsyncMock,
+                return_value=voice_session,
+            ),
+        ):
+            assert await view.interaction_check(interaction) is True
+
+        assert view.session_id == 7
+        assert view.lock_button.label == "解除"
+        assert view.hide_button.label == "表示"
+        assert view.nsfw_button.label == "制限解除"
+
+
+# ===========================================================================
+# ControlPanelButton テスト
+# ===========================================================================
+
+
+class TestControlPanelButton:
+    """Tests for the ControlPanelButton dynamic item."""
+
+    async def test_template_matches_every_panel_button(self) -> None:
+        """パネルの全ボタンの custom_id がテンプレートに一致する。"""
+        template = ControlPanelButton.__discord_ui_compiled_template__
+        view = ControlPanelView(session_id=1)
+        custom_ids = [
+            child.custom_id
+            for child in view.children
+            if isinstance(child, discord.ui.Button)
+        ]
+
+        assert len(custom_ids) == 13
+        assert all(template.fullmatch(cid) for cid in custom_ids)
+        assert template.fullmatch("role_panel:1:1") is None
+
+    async def test_view_is_not_stored(self) -> None:
+        """送信・編集しても View ストアに登録されない。"""
+        assert ControlPanelView(session_id=1).is_dispatchable() is False
+
+    async def test_from_custom_id(self) -> None:
+        match = ControlPanelButton.__discord_ui_compiled_template__.fullmatch(
+            "lock_button"
+        )
+        assert match is not None
+
+        button = await ControlPanelButton.from_custom_id(
+            MagicMock(), MagicMock(), match
+        )
+
+        assert button.custom_id == "lock_button"
+
+    async def test_callback_runs_button_after_check(self) -> None:
+        """オーナーチェックを通ったら該当ボタンの処理を状態付きで呼ぶ。"""
+        button = ControlPanelButton("rename_button")
+        interaction = _make_interaction(user_id=1)
+        interaction.channel.name = "my channel"
+        voice_session = _make_voice_session(session_id=7, owner_id="1")
+
+        mock_factory, _ = _mock_async_session()
+        with (
+            patch("src.ui.control_panel.async_session", mock_factory),
+            patch(
+                "src.ui.control_panel.get_voice_session",
+                new_callable=AsyncMock,
+                return_value=voice_session,
+            ),
+        ):
+            await button.callback(interaction)
+
+        interaction.response.send_modal.assert_awaited_once()
+        modal = interaction.response.send_modal.call_args[0][0]
+        assert isinstance(modal, RenameModal)
+        assert modal.session_id == 7
+
+    async def test_callback_stops_when_check_fails(self) -> None:
+        """オーナー以外はボタンの処理を呼ばない。"""
+        button = ControlPanelButton("rename_button")
+        interaction = _make_interaction(user_id=2)
+        voice_session = _make_voice_session(owner_id="1")
+
+        mock_factory, _ = _mock_async_session()
+        with (
+            patch("src.ui.control_panel.async_session", mock_factory),
+            patch(
+                "src.ui.control_panel.get_voice_session",
+                new_callable=AsyncMock,
+                return_value=voice_session,
+            ),
+        ):
+            await button.callback(interaction)
+
+        interaction.response.send_modal.assert_not_awaited()
+        msg = interaction.response.send_message.call_args[0][0]
+        assert "オーナーのみ" in msg
+
 
 # ===========================================================================
 # RenameModal テスト
@@ -733,9 +842,7 @@ class TestTransferSelectMenu:
             assert "<@2>" in msg
             assert "譲渡" in msg
             # パネルが再投稿される
-            mock_repost.assert_awaited_once_with(
-                interaction.channel, interaction.client
-            )
+            mock_repost.assert_awaited_once_with(interaction.channel)
 
     async def test_member_not_found(self) -> None:
         """メンバーが見つからない場合。"""
@@ -1561,8 +1668,6 @@ class TestRepostPanel:
         channel.send = AsyncMock(return_value=MagicMock())
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock()
-        bot.add_view = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1573,7 +1678,7 @@ class TestRepostPanel:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         # 旧パネル削除
         old_msg.delete.assert_awaited_once()
@@ -1582,14 +1687,13 @@ class TestRepostPanel:
         kwargs = channel.send.call_args[1]
         assert "embed" in kwargs
         assert "view" in kwargs
-        # View が bot に登録される
-        bot.add_view.assert_called_once()
+        # View はストアに登録されない (ボタンは ControlPanelButton が受け付ける)
+        assert kwargs["view"].is_dispatchable() is False
 
     async def test_skips_when_no_session(self) -> None:
         """セッションがなければ何もしない。"""
         channel = MagicMock(spec=discord.VoiceChannel)
         channel.id = 100
-        bot = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1600,7 +1704,7 @@ class TestRepostPanel:
                 return_value=None,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         channel.send.assert_not_called()
 
@@ -1610,7 +1714,6 @@ class TestRepostPanel:
         channel.id = 100
         channel.guild = MagicMock(spec=discord.Guild)
         channel.guild.get_member = MagicMock(return_value=None)
-        bot = MagicMock()
 
         voice_session = _make_voice_session(owner_id="999")
 
@@ -1623,7 +1726,7 @@ class TestRepostPanel:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         channel.send.assert_not_called()
 
@@ -1643,8 +1746,6 @@ class TestRepostPanel:
         channel.send = AsyncMock(return_value=MagicMock())
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock()
-        bot.add_view = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1655,7 +1756,7 @@ class TestRepostPanel:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         # 新パネルは送信される
         channel.send.assert_awaited_once()
@@ -1673,8 +1774,6 @@ class TestRepostPanel:
         channel.send = AsyncMock(return_value=MagicMock())
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock()
-        bot.add_view = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1690,7 +1789,7 @@ class TestRepostPanel:
                 return_value=None,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         # 旧パネルが見つからなくても新パネルは送信される
         channel.send.assert_awaited_once()
@@ -1723,8 +1822,6 @@ class TestRepostPanel:
         channel.send = AsyncMock(return_value=MagicMock())
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock()
-        bot.add_view = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1735,7 +1832,7 @@ class TestRepostPanel:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         # どちらも削除されない
         other_bot_msg.delete.assert_not_awaited()
@@ -1757,8 +1854,6 @@ class TestRepostPanel:
         voice_session = _make_voice_session(
             owner_id="1", is_locked=True, is_hidden=True
         )
-        bot = MagicMock()
-        bot.add_view = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1773,7 +1868,7 @@ class TestRepostPanel:
                 wraps=ControlPanelView,
             ) as mock_view_cls,
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         # ControlPanelView が正しいフラグで呼ばれる
         mock_view_cls.assert_called_once_with(voice_session.id, True, True, True)
@@ -1801,8 +1896,6 @@ class TestRepostPanel:
         channel.send = AsyncMock(return_value=MagicMock())
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock()
-        bot.add_view = MagicMock()
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -1813,7 +1906,7 @@ class TestRepostPanel:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         # 履歴から見つけた旧パネルが削除される
         old_msg.delete.assert_awaited_once()
@@ -3992,7 +4085,6 @@ class TestRepostPanelHTTPException:
         channel.send = AsyncMock()
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock(spec=discord.ext.commands.Bot)
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -4003,7 +4095,7 @@ class TestRepostPanelHTTPException:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         channel.send.assert_awaited_once()
 
@@ -4024,7 +4116,6 @@ class TestRepostPanelHTTPException:
         )
 
         voice_session = _make_voice_session(owner_id="1")
-        bot = MagicMock(spec=discord.ext.commands.Bot)
 
         mock_factory, _ = _mock_async_session()
         with (
@@ -4035,7 +4126,7 @@ class TestRepostPanelHTTPException:
                 return_value=voice_session,
             ),
         ):
-            await repost_panel(channel, bot)
+            await repost_panel(channel)
 
         channel.send.assert_awaited_once()
 
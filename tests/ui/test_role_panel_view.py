@@ -198,16 +198,16 @@ class TestRoleButton:
             label="Test",
             style="success",
         )
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
         assert button.panel_id == 1
-        assert button.role_id == "123456789"
-        assert button.label == "Test"
+        assert button.item_id == 2
+        assert button.item.label == "Test"
 
     @pytest.mark.asyncio
     async def test_button_custom_id_format(self) -> None:
         """custom_id のフォーマットが正しい。"""
         item = _make_role_panel_item(item_id=50)
-        button = RoleButton(panel_id=100, item=item)
+        button = RoleButton.from_item(panel_id=100, item=item)
         assert button.custom_id == "role_panel:100:50"
 
     @pytest.mark.asyncio
@@ -215,25 +215,69 @@ class TestRoleButton:
         """style 文字列が ButtonStyle に変換される。"""
         # primary
         item = _make_role_panel_item(style="primary")
-        button = RoleButton(panel_id=1, item=item)
-        assert button.style == discord.ButtonStyle.primary
+        button = RoleButton.from_item(panel_id=1, item=item)
+        assert button.item.style == discord.ButtonStyle.primary
 
         # success
         item = _make_role_panel_item(style="success")
-        button = RoleButton(panel_id=1, item=item)
-        assert button.style == discord.ButtonStyle.success
+        button = RoleButton.from_item(panel_id=1, item=item)
+        assert button.item.style == discord.ButtonStyle.success
 
         # danger
         item = _make_role_panel_item(style="danger")
-        button = RoleButton(panel_id=1, item=item)
-        assert button.style == discord.ButtonStyle.danger
+        button = RoleButton.from_item(panel_id=1, item=item)
+        assert button.item.style == discord.ButtonStyle.danger
 
     @pytest.mark.asyncio
     async def test_button_default_style(self) -> None:
         """不明な style は secondary になる。"""
         item = _make_role_panel_item(style="unknown")
-        button = RoleButton(panel_id=1, item=item)
-        assert button.style == discord.ButtonStyle.secondary
+        button = RoleButton.from_item(panel_id=1, item=item)
+        assert button.item.style == discord.ButtonStyle.secondary
+
+    @pytest.mark.asyncio
+    async def test_from_custom_id(self) -> None:
+        """custom_id からパネル ID とアイテム ID を復元する。"""
+        match = RoleButton.__discord_ui_compiled_template__.fullmatch(
+            "role_panel:100:50"
+        )
+        assert match is not None
+
+        button = await RoleButton.from_custom_id(MagicMock(), MagicMock(), match)
+
+        assert button.panel_id == 100
+        assert button.item_id == 50
+        assert button.custom_id == "role_panel:100:50"
+
+    @pytest.mark.parametrize("found_item", ["missing", "other_panel"])
+    @pytest.mark.asyncio
+    async def test_callback_item_not_in_panel(self, found_item: str) -> None:
+        """アイテムが削除済み・別パネルのものならロールは変更しない。"""
+        clear_cooldown_cache()
+        button = RoleButton(panel_id=1, item_id=50)
+        item = None
+        if found_item == "other_panel":
+            item = _make_role_panel_item(item_id=50, panel_id=2)
+
+        interaction = MagicMock(spec=discord.Interaction)
+        interaction.guild = MagicMock(spec=discord.Guild)
+        interaction.user = MagicMock(spec=discord.Member)
+        interaction.user.id = 12345
+        interaction.user.roles = []
+        interaction.response = MagicMock()
+        interaction.response.send_message = AsyncMock()
+
+        with (
+            patch("src.ui.role_panel_view.async_session"),
+            patch("src.ui.role_panel_view.get_role_panel", return_value=None),
+            patch("src.ui.role_panel_view.get_role_panel_item", return_value=item),
+        ):
+            await button.callback(interaction)
+
+        interaction.guild.get_role.assert_not_called()
+        interaction.user.add_roles.assert_not_called()
+        msg = interaction.response.send_message.call_args.args[0]
+        assert "ロールが見つかりませんでした" in msg
 
 
 # ===========================================================================
@@ -371,9 +415,8 @@ class TestRefreshRolePanel:
         """message_id が None の場合 False を返す。"""
         channel = MagicMock(spec=discord.TextChannel)
         panel = _make_role_panel(message_id=None)
-        bot = MagicMock(spec=discord.Client)
 
-        result = await refresh_role_panel(channel, panel, [], bot)
+        result = await refresh_role_panel(channel, panel, [])
         assert result is False
 
     @pytest.mark.asyncio
@@ -382,9 +425,8 @@ class TestRefreshRolePanel:
         channel = MagicMock(spec=discord.TextChannel)
         channel.fetch_message = AsyncMock(side_effect=discord.NotFound(MagicMock(), ""))
         panel = _make_role_panel(message_id="123456")
-        bot = MagicMock(spec=discord.Client)
 
-        result = await refresh_role_panel(channel, panel, [], bot)
+        result = await refresh_role_panel(channel, panel, [])
         assert result is False
 
     @pytest.mark.asyncio
@@ -395,9 +437,8 @@ class TestRefreshRolePanel:
             side_effect=discord.HTTPException(MagicMock(), "error")
         )
         panel = _make_role_panel(message_id="123456")
-        bot = MagicMock(spec=discord.Client)
 
-        result = await refresh_role_panel(channel, panel, [], bot)
+        result = await refresh_role_panel(channel, panel, [])
         assert result is False
 
     @pytest.mark.asyncio
@@ -412,14 +453,10 @@ class TestRefreshRolePanel:
         panel = _make_role_panel(panel_type="button", message_id="123456")
         items = [_make_role_panel_item(emoji="🎮", label="Test")]
 
-        bot = MagicMock(spec=discord.Client)
-        bot.add_view = MagicMock()
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         msg.edit.assert_called_once()
-        bot.add_view.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_updates_reaction_panel(self) -> None:
@@ -438,9 +475,7 @@ class TestRefreshRolePanel:
             _make_role_panel_item(emoji="🎨"),
         ]
 
-        bot = MagicMock(spec=discord.Client)
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         msg.edit.assert_called_once()
@@ -463,10 +498,8 @@ class TestRefreshRolePanel:
         panel = _make_role_panel(panel_type="reaction", message_id="123456")
         items = [_make_role_panel_item(emoji="🎮")]
 
-        bot = MagicMock(spec=discord.Client)
-
         # リアクション追加失敗しても True が返る
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
         assert result is True
 
 
@@ -875,10 +908,7 @@ class TestUseEmbedFeature:
         )
         items = [_make_role_panel_item(emoji="🎮", label="Test")]
 
-        bot = MagicMock(spec=discord.Client)
-        bot.add_view = MagicMock()
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         msg.edit.assert_called_once()
@@ -906,10 +936,7 @@ class TestUseEmbedFeature:
         )
         items = [_make_role_panel_item(emoji="🎮", label="Test")]
 
-        bot = MagicMock(spec=discord.Client)
-        bot.add_view = MagicMock()
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         msg.edit.assert_called_once()
@@ -938,9 +965,7 @@ class TestUseEmbedFeature:
         )
         items = [_make_role_panel_item(emoji="🎮")]
 
-        bot = MagicMock(spec=discord.Client)
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         call_kwargs = msg.edit.call_args.kwargs
@@ -968,9 +993,7 @@ class TestUseEmbedFeature:
         )
         items = [_make_role_panel_item(emoji="🎮", role_id="111")]
 
-        bot = MagicMock(spec=discord.Client)
-
-        result = await refresh_role_panel(channel, panel, items, bot)
+        result = await refresh_role_panel(channel, panel, items)
 
         assert result is True
         call_kwargs = msg.edit.call_args.kwargs
@@ -1185,7 +1208,7 @@ class TestCooldownFeature:
         clear_cooldown_cache()
 
         item = _make_role_panel_item(emoji="🎮", role_id="111")
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         # モック interaction
         interaction = MagicMock(spec=discord.Interaction)
@@ -1242,7 +1265,7 @@ class TestRoleButtonExcludedRoles:
         clear_cooldown_cache()
 
         item = _make_role_panel_item(emoji="🎮", role_id="111")
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         # 除外ロール "555" を持つメンバー
         excluded_role = MagicMock(spec=discord.Role)
@@ -1265,7 +1288,10 @@ class TestRoleButtonExcludedRoles:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.ui.role_panel_view.get_role_panel") as mock_get:
+            with (
+                patch("src.ui.role_panel_view.get_role_panel") as mock_get,
+                patch("src.ui.role_panel_view.get_role_panel_item", return_value=item),
+            ):
                 mock_get.return_value = mock_panel
 
                 await button.callback(interaction)
@@ -1283,7 +1309,7 @@ class TestRoleButtonExcludedRoles:
         clear_cooldown_cache()
 
         item = _make_role_panel_item(emoji="🎮", role_id="111")
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         # 除外対象ではないロール "999" を持つメンバー
         other_role = MagicMock(spec=discord.Role)
@@ -1318,7 +1344,10 @@ class TestRoleButtonExcludedRoles:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.ui.role_panel_view.get_role_panel") as mock_get:
+            with (
+                patch("src.ui.role_panel_view.get_role_panel") as mock_get,
+                patch("src.ui.role_panel_view.get_role_panel_item", return_value=item),
+            ):
                 mock_get.return_value = mock_panel
 
                 await button.callback(interaction)
@@ -1334,7 +1363,7 @@ class TestRoleButtonExcludedRoles:
         clear_cooldown_cache()
 
         item = _make_role_panel_item(emoji="🎮", role_id="111")
-        button = RoleButton(panel_id=1, item=item)
+        button = RoleButton.from_item(panel_id=1, item=item)
 
         some_role = MagicMock(spec=discord.Role)
         some_role.id = 999
@@ -1364,7 +1393,10 @@ class TestRoleButtonExcludedRoles:
             mock_db = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_db
 
-            with patch("src.ui.role_panel_view.get_role_panel") as mock_get:
+            with (
+                patch("src.ui.role_panel_view.get_role_panel") as mock_get,
+                patch("src.ui.role_panel_view.get_role_panel_item", return_value=item),
+            ):
                 mock_get.return_value = mock_panel
 
                 await button.callback(interaction)
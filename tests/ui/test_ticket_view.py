@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import gzip
+import io
 from datetime import UTC, datetime
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import discord
@@ -11,15 +14,18 @@ from sqlalchemy.exc import IntegrityError
 
 from src.database.models import Ticket, TicketCategory, TicketPanel, TicketPanelCategory
 from src.ui.ticket_view import (
+    TICKET_DYNAMIC_ITEMS,
     TicketCategoryButton,
     TicketClaimButton,
     TicketCloseButton,
     TicketControlView,
     TicketPanelView,
+    TicketTranscript,
     _create_ticket_channel,
     create_ticket_opening_embed,
     create_ticket_panel_embed,
     generate_transcript,
+    save_transcript,
     send_close_log,
 )
 
@@ -46,6 +52,19 @@ def _make_ticket(**kwargs: object) -> MagicMock:
     return ticket
 
 
+async def _generate_transcript_text(
+    channel: MagicMock, ticket: MagicMock, category_name: str, closed_by_name: str
+) -> str:
+    """generate_transcript の結果を展開した文字列で返す。"""
+    transcript = await generate_transcript(
+        channel, ticket, category_name, closed_by_name
+    )
+    try:
+        return transcript.read_text()
+    finally:
+        transcript.close()
+
+
 def _make_category(**kwargs: object) -> MagicMock:
     """テスト用の TicketCategory モックを作成する。"""
     category = MagicMock(spec=TicketCategory)
@@ -167,7 +186,9 @@ class TestGenerateTranscript:
 
         channel.history = MagicMock(return_value=empty_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff_user")
+        result = await _generate_transcript_text(
+            channel, ticket, "General", "staff_user"
+        )
 
         assert "=== Ticket #42 - General ===" in result
         assert "Created by: testuser (123)" in result
@@ -207,7 +228,7 @@ class TestGenerateTranscript:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "[2026-02-07 10:00:05] user1: Hello" in result
         assert "[2026-02-07 10:00:10] staff: How can I help?" in result
@@ -230,7 +251,7 @@ class TestGenerateTranscript:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         # Bot Embed はスキップされるので、ヘッダーとフッターのみ
         lines = [line for line in result.split("\n") if line.startswith("[")]
@@ -257,10 +278,148 @@ class TestGenerateTranscript:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "[Attachments: https://example.com/file.png]" in result
 
+    async def test_transcript_is_gzip_file(self) -> None:
+        """gzip 圧縮したファイルとメッセージ数を返す。"""
+        ticket = _make_ticket(ticket_number=7)
+        channel = MagicMock(spec=discord.TextChannel)
+
+        messages = []
+        for i in range(600):
+            msg = MagicMock()
+            msg.author = MagicMock()
+            msg.author.bot = False
+            msg.author.name = "user1"
+            msg.embeds = []
+            msg.content = f"message {i}"
+            msg.attachments = []
+            msg.stickers = []
+            msg.created_at = datetime(2026, 2, 7, 10, 0, 0, tzinfo=UTC)
+            messages.append(msg)
+
+        async def message_history(*_args: object, **_kwargs: object):
+            for m in messages:
+                yield m
+
+        channel.history = MagicMock(return_value=message_history())
+
+        transcript = await generate_transcript(channel, ticket, "General", "staff")
+        try:
+            # 以前の 500 件の上限はない
+            assert transcript.message_count == 600
+            assert transcript.filename == "ticket-7-transcript.txt.gz"
+            transcript.file.seek(0)
+            text = gzip.decompress(transcript.file.read()).decode()
+            assert "message 0" in text
+            assert "message 599" in text
+            assert text == transcript.read_text()
+
+            file = transcript.to_discord_file()
+            assert file.filename == "ticket-7-transcript.txt.gz"
+            file.close()
+        finally:
+            transcript.close()
+        assert transcript.file.closed
+
+
+# =============================================================================
+# save_transcript テスト
+# =============================================================================
+
+
+class TestSaveTranscript:
+    """save_transcript のテスト。"""
+
+    @staticmethod
+    def _make_transcript(text: str = "line") -> TicketTranscript:
+        buffer = io.BytesIO(gzip.compress(text.encode()))
+        return TicketTranscript(filename="t.txt.gz", file=buffer, message_count=3)
+
+    async def test_saves_reference_when_attached(self) -> None:
+        """クローズログに添付できた場合は参照だけを保存する。"""
+        session = AsyncMock()
+        ticket = _make_ticket()
+        log_message = MagicMock(spec=discord.Message)
+        log_message.id = 999
+        log_message.channel = MagicMock()
+        log_message.channel.id = 888
+        log_message.attachments = [MagicMock()]
+
+        with patch(
+            "src.ui.ticket_view.set_ticket_transcript", new_callable=AsyncMock
+        ) as mock_set:
+            await save_transcript(session, ticket, self._make_transcript(), log_message)
+
+        mock_set.assert_awaited_once_with(
+            session, ticket, message_count=3, channel_id="888", message_id="999"
+        )
+
+    async def test_saves_text_without_log_message(self) -> None:
+        """クローズログを送れなかった場合は本文を保存する。"""
+        session = AsyncMock()
+        ticket = _make_ticket()
+
+        with patch(
+            "src.ui.ticket_view.set_ticket_transcript", new_callable=AsyncMock
+        ) as mock_set:
+            await save_transcript(session, ticket, self._make_transcript("abc"), None)
+
+        mock_set.assert_awaited_once_with(session, ticket, message_count=3, text="abc")
+
+    async def test_truncates_text_fallback(self) -> None:
+        """DB に保存する本文は末尾だけを残して切り詰める。"""
+        session = AsyncMock()
+        ticket = _make_ticket()
+        text = "".join(f"line {i}\n" for i in range(100))
+
+        with (
+            patch("src.ui.ticket_view.TICKET_TRANSCRIPT_DB_MAX_BYTES", 64),
+            patch(
+                "src.ui.ticket_view.set_ticket_transcript", new_callable=AsyncMock
+            ) as mock_set,
+        ):
+            await save_transcript(session, ticket, self._make_transcript(text), None)
+
+        saved = mock_set.call_args.kwargs["text"]
+        assert saved.startswith("[Transcript truncated: first ")
+        assert saved.endswith("line 99\n")
+        assert "line 0\n" not in saved
+        assert len(saved.split("\n", 1)[1].encode()) <= 64
+
+
+class TestTicketTranscriptReadText:
+    """TicketTranscript.read_text の切り詰めのテスト。"""
+
+    @staticmethod
+    def _make_transcript(text: str) -> TicketTranscript:
+        buffer = io.BytesIO(gzip.compress(text.encode()))
+        return TicketTranscript(filename="t.txt.gz", file=buffer, message_count=0)
+
+    def test_returns_full_text_under_limit(self) -> None:
+        transcript = self._make_transcript("a\nb\n")
+        assert transcript.read_text(max_bytes=100) == "a\nb\n"
+
+    def test_keeps_tail_from_line_boundary(self) -> None:
+        text = "first line\nsecond line\nthird\n"
+        transcript = self._make_transcript(text)
+
+        result = transcript.read_text(max_bytes=15)
+
+        omitted = len("first line\nsecond line\n")
+        assert result == (
+            f"[Transcript truncated: first {omitted} bytes omitted]\nthird\n"
+        )
+
+    def test_size_is_compressed_length(self) -> None:
+        data = gzip.compress(b"hello")
+        transcript = TicketTranscript(
+            filename="t.txt.gz", file=io.BytesIO(data), message_count=0
+        )
+        assert transcript.size == len(data)
+
 
 # =============================================================================
 # TicketPanelView テスト
@@ -310,7 +469,7 @@ class TestTicketCategoryButton:
     def test_custom_id_format(self) -> None:
         """custom_id が正しい形式。"""
         assoc = _make_association(category_id=5)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=3, association=assoc, category_name="Test"
         )
 
@@ -319,20 +478,20 @@ class TestTicketCategoryButton:
     def test_button_label_from_association(self) -> None:
         """button_label が設定されている場合はそれを使用。"""
         assoc = _make_association(button_label="Custom Label")
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Default"
         )
 
-        assert button.label == "Custom Label"
+        assert button.item.label == "Custom Label"
 
     def test_button_label_from_category_name(self) -> None:
         """button_label がない場合はカテゴリ名を使用。"""
         assoc = _make_association(button_label=None)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="General"
         )
 
-        assert button.label == "General"
+        assert button.item.label == "General"
 
     def test_button_style_mapping(self) -> None:
         """ボタンスタイルが正しくマッピングされる。"""
@@ -344,10 +503,10 @@ class TestTicketCategoryButton:
         }
         for style_name, expected_style in styles.items():
             assoc = _make_association(button_style=style_name)
-            button = TicketCategoryButton(
+            button = TicketCategoryButton.from_association(
                 panel_id=1, association=assoc, category_name="Test"
             )
-            assert button.style == expected_style
+            assert button.item.style == expected_style
 
 
 # =============================================================================
@@ -389,12 +548,12 @@ class TestTicketCloseButton:
     def test_button_style_is_danger(self) -> None:
         """ボタンスタイルが danger。"""
         button = TicketCloseButton(ticket_id=1)
-        assert button.style == discord.ButtonStyle.danger
+        assert button.item.style == discord.ButtonStyle.danger
 
     def test_button_label(self) -> None:
         """ラベルが Close。"""
         button = TicketCloseButton(ticket_id=1)
-        assert button.label == "Close"
+        assert button.item.label == "Close"
 
 
 # =============================================================================
@@ -413,12 +572,62 @@ class TestTicketClaimButton:
     def test_button_style_is_success(self) -> None:
         """ボタンスタイルが success。"""
         button = TicketClaimButton(ticket_id=1)
-        assert button.style == discord.ButtonStyle.success
+        assert button.item.style == discord.ButtonStyle.success
 
     def test_button_label(self) -> None:
         """ラベルが Claim。"""
         button = TicketClaimButton(ticket_id=1)
-        assert button.label == "Claim"
+        assert button.item.label == "Claim"
+
+
+# =============================================================================
+# DynamicItem (custom_id からの復元)
+# =============================================================================
+
+
+class TestTicketDynamicItems:
+    """custom_id からボタンを復元するテスト。"""
+
+    @pytest.mark.parametrize(
+        ("cls", "custom_id", "attrs"),
+        [
+            (
+                TicketCategoryButton,
+                "ticket_panel:3:5",
+                {"panel_id": 3, "category_id": 5},
+            ),
+            (TicketCloseButton, "ticket_ctrl:42:close", {"ticket_id": 42}),
+            (TicketClaimButton, "ticket_ctrl:42:claim", {"ticket_id": 42}),
+        ],
+    )
+    async def test_from_custom_id(
+        self,
+        cls: type[discord.ui.DynamicItem[Any]],
+        custom_id: str,
+        attrs: dict[str, int],
+    ) -> None:
+        match = cls.__discord_ui_compiled_template__.fullmatch(custom_id)
+        assert match is not None
+
+        button = await cls.from_custom_id(MagicMock(), MagicMock(), match)
+
+        assert button.custom_id == custom_id
+        for name, value in attrs.items():
+            assert getattr(button, name) == value
+
+    def test_templates_do_not_overlap(self) -> None:
+        """Close と Claim のテンプレートは互いの custom_id に一致しない。"""
+        close = TicketCloseButton.__discord_ui_compiled_template__
+        claim = TicketClaimButton.__discord_ui_compiled_template__
+        assert close.fullmatch("ticket_ctrl:1:claim") is None
+        assert claim.fullmatch("ticket_ctrl:1:close") is None
+
+    def test_registry_contains_all_buttons(self) -> None:
+        assert set(TICKET_DYNAMIC_ITEMS) == {
+            TicketCategoryButton,
+            TicketCloseButton,
+            TicketClaimButton,
+        }
 
 
 # =============================================================================
@@ -759,8 +968,12 @@ class TestTicketCloseButtonCallback:
             patch(
                 "src.ui.ticket_view.generate_transcript",
                 new_callable=AsyncMock,
-                return_value="transcript",
-            ),
+                return_value=MagicMock(spec=TicketTranscript),
+            ) as mock_transcript,
+            patch(
+                "src.ui.ticket_view.save_transcript",
+                new_callable=AsyncMock,
+            ) as mock_save,
             patch(
                 "src.ui.ticket_view.update_ticket_status",
                 new_callable=AsyncMock,
@@ -775,9 +988,123 @@ class TestTicketCloseButtonCallback:
             await button.callback(interaction)
 
         mock_update.assert_awaited_once()
+        assert "transcript" not in mock_update.call_args.kwargs
         mock_log.assert_awaited_once()
+        transcript = mock_transcript.return_value
+        assert mock_log.call_args.kwargs["transcript"] is transcript
+        mock_save.assert_awaited_once_with(
+            mock_session, ticket, transcript, mock_log.return_value
+        )
+        transcript.close.assert_called_once()
         interaction.channel.delete.assert_awaited_once()
 
+    async def test_close_button_releases_session_during_transcript(self) -> None:
+        """履歴取得とアップロードの間は DB セッションを開いていない。"""
+        button = TicketCloseButton(ticket_id=1)
+
+        interaction = MagicMock(spec=discord.Interaction)
+        interaction.guild = MagicMock(spec=discord.Guild)
+        interaction.channel = MagicMock(spec=discord.TextChannel)
+        interaction.channel.delete = AsyncMock()
+        interaction.response = AsyncMock()
+        interaction.followup = AsyncMock()
+        interaction.user = MagicMock()
+        interaction.user.name = "closer"
+
+        events: list[str] = []
+        open_sessions = 0
+
+        async def enter(*_args: object) -> AsyncMock:
+            nonlocal open_sessions
+            open_sessions += 1
+            return AsyncMock()
+
+        async def exit_(*_args: object) -> bool:
+            nonlocal open_sessions
+            open_sessions -= 1
+            return False
+
+        async def fake_transcript(*_args: object, **_kwargs: object) -> MagicMock:
+            events.append(f"transcript:{open_sessions}")
+            return MagicMock(spec=TicketTranscript)
+
+        async def fake_log(*_args: object, **_kwargs: object) -> MagicMock:
+            events.append(f"log:{open_sessions}")
+            return MagicMock()
+
+        async def fake_update(*_args: object, **_kwargs: object) -> None:
+            events.append(f"update:{open_sessions}")
+
+        ticket = _make_ticket(status="open")
+        with (
+            patch("src.ui.ticket_view.async_session") as mock_factory,
+            patch(
+                "src.ui.ticket_view.get_ticket",
+                new_callable=AsyncMock,
+                return_value=ticket,
+            ),
+            patch(
+                "src.ui.ticket_view.get_ticket_category",
+                new_callable=AsyncMock,
+                return_value=_make_category(),
+            ),
+            patch("src.ui.ticket_view.generate_transcript", fake_transcript),
+            patch("src.ui.ticket_view.send_close_log", fake_log),
+            patch("src.ui.ticket_view.update_ticket_status", fake_update),
+            patch("src.ui.ticket_view.save_transcript", new_callable=AsyncMock),
+        ):
+            mock_factory.return_value.__aenter__ = enter
+            mock_factory.return_value.__aexit__ = exit_
+            await button.callback(interaction)
+
+        assert events == ["transcript:0", "log:0", "update:1"]
+
+    async def test_close_button_skips_update_when_closed_meanwhile(self) -> None:
+        """履歴取得中に別経路でクローズされていたら更新しない。"""
+        button = TicketCloseButton(ticket_id=1)
+
+        interaction = MagicMock(spec=discord.Interaction)
+        interaction.guild = MagicMock(spec=discord.Guild)
+        interaction.channel = MagicMock(spec=discord.TextChannel)
+        interaction.channel.delete = AsyncMock()
+        interaction.response = AsyncMock()
+        interaction.followup = AsyncMock()
+        interaction.user = MagicMock()
+        interaction.user.name = "closer"
+
+        mock_factory, _ = _mock_async_session()
+        with (
+            patch("src.ui.ticket_view.async_session", mock_factory),
+            patch(
+                "src.ui.ticket_view.get_ticket",
+                new_callable=AsyncMock,
+                side_effect=[
+                    _make_ticket(status="open"),
+                    _make_ticket(status="closed"),
+                ],
+            ),
+            patch(
+                "src.ui.ticket_view.get_ticket_category",
+                new_callable=AsyncMock,
+                return_value=_make_category(),
+            ),
+            patch(
+                "src.ui.ticket_view.generate_transcript",
+                new_callable=AsyncMock,
+                return_value=MagicMock(spec=TicketTranscript),
+            ) as mock_transcript,
+            patch("src.ui.ticket_view.send_close_log", new_callable=AsyncMock),
+            patch(
+                "src.ui.ticket_view.update_ticket_status", new_callable=AsyncMock
+            ) as mock_update,
+            patch("src.ui.ticket_view.save_transcript", new_callable=AsyncMock),
+        ):
+            await button.callback(interaction)
+
+        mock_update.assert_not_awaited()
+        mock_transcript.return_value.close.assert_called_once()
+        interaction.channel.delete.assert_not_awaited()
+
 
 # =============================================================================
 # TicketClaimButton callback テスト
@@ -922,7 +1249,7 @@ class TestTicketCategoryButtonCallback:
     async def test_callback_guild_none(self) -> None:
         """guild が None の場合はエラーメッセージ。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -937,7 +1264,7 @@ class TestTicketCategoryButtonCallback:
     async def test_callback_category_disabled(self) -> None:
         """カテゴリが無効の場合はエラー。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -968,7 +1295,7 @@ class TestTicketCategoryButtonCallback:
     async def test_callback_category_none(self) -> None:
         """カテゴリが None の場合はエラー。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1013,7 +1340,7 @@ class TestGenerateTranscriptEdgeCases:
             side_effect=discord.HTTPException(MagicMock(status=403), "Missing Access")
         )
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "Failed to fetch message history" in result
 
@@ -1040,7 +1367,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "https://example.com/a.png" in result
         assert "https://example.com/b.pdf" in result
@@ -1066,7 +1393,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "[Attachments: https://example.com/file.png]" in result
 
@@ -1088,7 +1415,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "Bot message" in result
 
@@ -1122,7 +1449,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         # UTC 10:00 + 9h = 19:00 JST
         assert "Created at: 2026-02-07 19:00:00" in result
@@ -1150,7 +1477,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "[Stickers: cool_sticker]" in result
         assert "user1" in result
@@ -1177,7 +1504,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "Check this out" in result
         assert "[Stickers: like_sticker]" in result
@@ -1207,16 +1534,17 @@ class TestGenerateTranscriptEdgeCases:
         msg2.stickers = []
         msg2.created_at = datetime(2026, 2, 7, 10, 5, 0, tzinfo=UTC)
 
-        # channel.history() はデフォルトで新しい順 (msg2, msg1) で返す
+        # oldest_first=True なので古い順 (msg1, msg2) で返る
         async def message_history(*_args: object, **_kwargs: object):
-            for m in [msg2, msg1]:
+            for m in [msg1, msg2]:
                 yield m
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
-        # reverse() により古い順に並ぶ
+        # 件数の上限なしで古い順に取得する
+        channel.history.assert_called_once_with(limit=None, oldest_first=True)
         first_pos = result.index("First")
         second_pos = result.index("Second")
         assert first_pos < second_pos
@@ -1243,7 +1571,7 @@ class TestGenerateTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "user1: [Attachments: https://cdn.discord.com/img.png]" in result
 
@@ -1259,7 +1587,7 @@ class TestTicketCategoryButtonCallbackExtra:
     async def test_callback_existing_open_ticket(self) -> None:
         """既にオープンチケットがある場合はエラーメッセージ。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1300,7 +1628,7 @@ class TestTicketCategoryButtonCallbackExtra:
     async def test_callback_direct_creation_success(self) -> None:
         """フォームなしで直接チケット作成に成功。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1346,7 +1674,7 @@ class TestTicketCategoryButtonCallbackExtra:
     async def test_callback_direct_creation_failure(self) -> None:
         """チャンネル作成失敗時はエラーメッセージ。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1431,7 +1759,11 @@ class TestTicketCloseButtonChannelDeleteFailure:
             patch(
                 "src.ui.ticket_view.generate_transcript",
                 new_callable=AsyncMock,
-                return_value="transcript",
+                return_value=MagicMock(spec=TicketTranscript),
+            ),
+            patch(
+                "src.ui.ticket_view.save_transcript",
+                new_callable=AsyncMock,
             ),
             patch(
                 "src.ui.ticket_view.update_ticket_status",
@@ -1476,6 +1808,108 @@ class TestSendCloseLog:
         assert "Ticket #42" in embed.title
         assert "Closed" in embed.title
 
+    async def test_attaches_transcript(self) -> None:
+        """トランスクリプトを添付し、送信したメッセージを返す。"""
+        guild = MagicMock(spec=discord.Guild)
+        log_channel = MagicMock(spec=discord.TextChannel)
+        sent = MagicMock(spec=discord.Message)
+        log_channel.send = AsyncMock(return_value=sent)
+        guild.get_channel.return_value = log_channel
+        guild.filesize_limit = 10 * 1024 * 1024
+
+        ticket = _make_ticket(ticket_number=42)
+        category = _make_category(log_channel_id="888")
+        transcript = TicketTranscript(
+            filename="ticket-42-transcript.txt.gz",
+            file=io.BytesIO(gzip.compress(b"text")),
+            message_count=1200,
+        )
+
+        result = await send_close_log(
+            guild,
+            ticket,
+            category,
+            "closer",
+            "http://localhost:8000",
+            transcript=transcript,
+        )
+
+        assert result is sent
+        kwargs = log_channel.send.call_args.kwargs
+        assert kwargs["file"].filename == "ticket-42-transcript.txt.gz"
+        messages_field = next(f for f in kwargs["embed"].fields if f.name == "Messages")
+        assert messages_field.value == "1200"
+
+    async def test_skips_attachment_over_filesize_limit(self) -> None:
+        """アップロード上限を超えるトランスクリプトは添付しない。"""
+        guild = MagicMock(spec=discord.Guild)
+        log_channel = MagicMock(spec=discord.TextChannel)
+        sent = MagicMock(spec=discord.Message)
+        log_channel.send = AsyncMock(return_value=sent)
+        guild.get_channel.return_value = log_channel
+        guild.filesize_limit = 10
+
+        transcript = TicketTranscript(
+            filename="t.txt.gz",
+            file=io.BytesIO(gzip.compress(b"x" * 1000)),
+            message_count=5,
+        )
+        result = await send_close_log(
+            guild,
+            _make_ticket(),
+            _make_category(log_channel_id="888"),
+            "closer",
+            "http://localhost:8000",
+            transcript=transcript,
+        )
+
+        assert result is sent
+        assert "file" not in log_channel.send.call_args.kwargs
+
+    async def test_close_reason_argument_overrides_ticket(self) -> None:
+        """close_reason を渡した場合はそれを Reason に表示する。"""
+        guild = MagicMock(spec=discord.Guild)
+        log_channel = MagicMock(spec=discord.TextChannel)
+        log_channel.send = AsyncMock()
+        guild.get_channel.return_value = log_channel
+
+        await send_close_log(
+            guild,
+            _make_ticket(close_reason=None),
+            _make_category(log_channel_id="888"),
+            "closer",
+            "http://localhost:8000",
+            close_reason="resolved",
+        )
+
+        embed = log_channel.send.call_args.kwargs["embed"]
+        reason_field = next(f for f in embed.fields if f.name == "Reason")
+        assert reason_field.value == "resolved"
+
+    async def test_returns_none_on_http_exception(self) -> None:
+        """送信に失敗した場合は None を返す。"""
+        guild = MagicMock(spec=discord.Guild)
+        log_channel = MagicMock(spec=discord.TextChannel)
+        log_channel.send = AsyncMock(
+            side_effect=discord.HTTPException(MagicMock(status=413), "too large")
+        )
+        guild.get_channel.return_value = log_channel
+        guild.filesize_limit = 10 * 1024 * 1024
+
+        transcript = TicketTranscript(
+            filename="t.txt.gz", file=io.BytesIO(gzip.compress(b"")), message_count=0
+        )
+        result = await send_close_log(
+            guild,
+            _make_ticket(),
+            _make_category(log_channel_id="888"),
+            "closer",
+            "http://localhost:8000",
+            transcript=transcript,
+        )
+
+        assert result is None
+
     async def test_skips_when_no_log_channel_id(self) -> None:
         """log_channel_id が None の場合はスキップ。"""
         guild = MagicMock(spec=discord.Guild)
@@ -1612,7 +2046,7 @@ class TestTicketCategoryButtonCallbackExceptionHandling:
     async def test_exception_response_not_done_sends_response(self) -> None:
         """_handle_interaction 例外、response 未完了時は send_message。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1638,7 +2072,7 @@ class TestTicketCategoryButtonCallbackExceptionHandling:
     async def test_exception_response_done_sends_followup(self) -> None:
         """_handle_interaction で例外発生、response 完了済みは followup.send。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1664,7 +2098,7 @@ class TestTicketCategoryButtonCallbackExceptionHandling:
     async def test_exception_handler_http_exception_suppressed(self) -> None:
         """エラーハンドラ自体が HTTPException を出した場合も suppress。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1699,7 +2133,7 @@ class TestHandleInteractionPanelCategory:
     async def test_text_channel_category_passed_as_fallback(self) -> None:
         """TextChannel の場合、channel.category がフォールバックに渡される。"""
         assoc = _make_association(category_id=1)
-        button = TicketCategoryButton(
+        button = TicketCategoryButton.from_association(
             panel_id=1, association=assoc, category_name="Test"
         )
 
@@ -1763,7 +2197,7 @@ class TestTicketPanelViewCategoryNamesNone:
         view = TicketPanelView(panel_id=1, associations=[assoc])
 
         assert len(view.children) == 1
-        assert view.children[0].label == "Ticket"
+        assert view.children[0].item.label == "Ticket"
 
 
 # =============================================================================
@@ -2274,7 +2708,9 @@ class TestTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=empty_history())
 
-        result = await generate_transcript(channel, ticket, "Empty Cat", "staff_user")
+        result = await _generate_transcript_text(
+            channel, ticket, "Empty Cat", "staff_user"
+        )
 
         # Header and footer are present
         assert "=== Ticket #99 - Empty Cat ===" in result
@@ -2308,7 +2744,7 @@ class TestTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "[Attachments:" in result
         assert "https://cdn.example.com/photo.jpg" in result
@@ -2335,7 +2771,7 @@ class TestTranscriptEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff")
+        result = await _generate_transcript_text(channel, ticket, "General", "staff")
 
         assert "[Stickers:" in result
         assert "pepe_happy" in result
@@ -2453,7 +2889,9 @@ class TestGenerateTranscriptAdditionalEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff_user")
+        result = await _generate_transcript_text(
+            channel, ticket, "General", "staff_user"
+        )
 
         assert "https://cdn.discord.com/attachments/test.png" in result
         assert "See attached" in result
@@ -2480,7 +2918,9 @@ class TestGenerateTranscriptAdditionalEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "General", "staff_user")
+        result = await _generate_transcript_text(
+            channel, ticket, "General", "staff_user"
+        )
 
         # Bot + embeds の組み合わせはスキップされる
         assert "Bot Embed" not in result
@@ -2505,7 +2945,7 @@ class TestGenerateTranscriptAdditionalEdgeCases:
 
         channel.history = MagicMock(return_value=message_history())
 
-        result = await generate_transcript(channel, ticket, "一般", "スタッフ")
+        result = await _generate_transcript_text(channel, ticket, "一般", "スタッフ")
 
         assert "こんにちは" in result
         assert "ユーザー" in result
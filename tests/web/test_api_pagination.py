@@ -0,0 +1,220 @@
+"""Tests for keyset pagination of admin log and ticket list API routes."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import (
+    AutoModLog,
+    AutoModRule,
+    BanLog,
+    Ticket,
+    TicketCategory,
+)
+from src.web.jwt_auth import create_jwt_token
+from src.web.pagination import clamp_page_size, decode_cursor, encode_cursor
+
+BASE_TIME = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def auth_cookie(admin_user: object) -> dict[str, str]:  # noqa: ARG001
+    """認証済み Cookie を生成する。"""
+    token = create_jwt_token("test@example.com")
+    return {"session": token}
+
+
+async def _collect_pages(
+    client: AsyncClient,
+    url: str,
+    key: str,
+    cookies: dict[str, str],
+    **params: str | int,
+) -> list[list[dict[str, object]]]:
+    """next_cursor をたどって全ページを取得する。"""
+    pages: list[list[dict[str, object]]] = []
+    cursor = ""
+    while True:
+        response = await client.get(
+            url, params={**params, "cursor": cursor}, cookies=cookies
+        )
+        assert response.status_code == 200
+        data = response.json()
+        pages.append(data[key])
+        if data["next_cursor"] is None:
+            return pages
+        cursor = data["next_cursor"]
+
+
+class TestCursor:
+    """カーソル文字列のエンコード・デコード。"""
+
+    def test_round_trip(self) -> None:
+        created_at = datetime(2026, 3, 4, 5, 6, 7, 890123, tzinfo=UTC)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["!!!", "bm90LWEtY3Vyc29y", "fA"])
+    def test_invalid_cursor(self, cursor: str) -> None:
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+    def test_clamp_page_size(self) -> None:
+        assert clamp_page_size(0) == 1
+        assert clamp_page_size(50) == 50
+        assert clamp_page_size(10_000) == 500
+
+
+class TestAutoModLogsPagination:
+    """/api/v1/automod/logs のページング。"""
+
+    @pytest.fixture
+    async def logs(self, db_session: AsyncSession) -> list[AutoModLog]:
+        """2 ギルド分のログ。3 件ずつ同じ created_at を持つ。"""
+        rule = AutoModRule(guild_id="1", rule_type="no_avatar", action="ban")
+        db_session.add(rule)
+        await db_session.flush()
+        logs = [
+            AutoModLog(
+                guild_id="1" if i % 2 == 0 else "2",
+                user_id=str(100 + i % 3),
+                username=f"user{i}",
+                rule_id=rule.id,
+                action_taken="banned",
+                reason="No avatar set",
+                created_at=BASE_TIME + timedelta(minutes=i // 3),
+            )
+            for i in range(12)
+        ]
+        db_session.add_all(logs)
+        await db_session.commit()
+        return logs
+
+    async def test_pages_cover_all_rows_in_order(
+        self,
+        client: AsyncClient,
+        logs: list[AutoModLog],
+        auth_cookie: dict[str, str],
+    ) -> None:
+        """created_at が同じ行がページ境界にあっても重複・欠落しない。"""
+        pages = await _collect_pages(
+            client, "/api/v1/automod/logs", "logs", auth_cookie, limit=5
+        )
+        assert [len(p) for p in pages] == [5, 5, 2]
+        ids = [row["id"] for page in pages for row in page]
+        expected = sorted(logs, key=lambda log: (log.created_at, log.id), reverse=True)
+        assert ids == [log.id for log in expected]
+
+    async def test_exact_multiple_has_no_empty_page(
+        self,
+        client: AsyncClient,
+        logs: list[AutoModLog],  # noqa: ARG002
+        auth_cookie: dict[str, str],
+    ) -> None:
+        pages = await _collect_pages(
+            client, "/api/v1/automod/logs", "logs", auth_cookie, limit=6
+        )
+        assert [len(p) for p in pages] == [6, 6]
+
+    async def test_filters(
+        self,
+        client: AsyncClient,
+        logs: list[AutoModLog],
+        auth_cookie: dict[str, str],
+    ) -> None:
+        pages = await _collect_pages(
+            client,
+            "/api/v1/automod/logs",
+            "logs",
+            auth_cookie,
+            guild_id="1",
+            user_id="100",
+            limit=1,
+        )
+        rows = [row for page in pages for row in page]
+        expected = {
+            log.id for log in logs if log.guild_id == "1" and log.user_id == "100"
+        }
+        assert {row["id"] for row in rows} == expected
+        assert len(rows) == len(expected)
+
+    async def test_invalid_cursor_is_rejected(
+        self, client: AsyncClient, auth_cookie: dict[str, str]
+    ) -> None:
+        response = await client.get(
+            "/api/v1/automod/logs", params={"cursor": "!!!"}, cookies=auth_cookie
+        )
+        assert response.status_code == 400
+        assert response.json() == {"error": "Invalid cursor"}
+
+    async def test_requires_auth(self, client: AsyncClient) -> None:
+        response = await client.get("/api/v1/automod/logs")
+        assert response.status_code == 401
+
+
+class TestBanLogsPagination:
+    """/api/v1/banlogs のページング。"""
+
+    async def test_pages_and_guild_filter(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        auth_cookie: dict[str, str],
+    ) -> None:
+        logs = [
+            BanLog(
+                guild_id="1" if i < 7 else "2",
+                user_id=str(i),
+                username=f"user{i}",
+                created_at=BASE_TIME + timedelta(minutes=i),
+            )
+            for i in range(10)
+        ]
+        db_session.add_all(logs)
+        await db_session.commit()
+
+        pages = await _collect_pages(
+            client, "/api/v1/banlogs", "logs", auth_cookie, guild_id="1", limit=3
+        )
+        assert [len(p) for p in pages] == [3, 3, 1]
+        assert [row["username"] for page in pages for row in page] == [
+            f"user{i}" for i in range(6, -1, -1)
+        ]
+
+
+class TestTicketsPagination:
+    """/api/v1/tickets のページング。"""
+
+    async def test_status_filter_across_pages(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        auth_cookie: dict[str, str],
+    ) -> None:
+        cat = TicketCategory(guild_id="1", name="General", staff_role_id="999")
+        db_session.add(cat)
+        await db_session.flush()
+        tickets = [
+            Ticket(
+                guild_id="1",
+                user_id="456",
+                username="testuser",
+                category_id=cat.id,
+                ticket_number=i + 1,
+                status="closed" if i % 3 else "open",
+                created_at=BASE_TIME + timedelta(minutes=i),
+            )
+            for i in range(9)
+        ]
+        db_session.add_all(tickets)
+        await db_session.commit()
+
+        pages = await _collect_pages(
+            client, "/api/v1/tickets", "tickets", auth_cookie, status="closed", limit=4
+        )
+        assert [len(p) for p in pages] == [4, 2]
+        numbers = [row["ticket_number"] for page in pages for row in page]
+        assert numbers == [9, 8, 6, 5, 3, 2]
@@ -0,0 +1,73 @@
+"""Tests for the retention settings API routes."""
+
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.retention_service import RetentionPolicy, get_retention_policy
+from src.web.jwt_auth import create_jwt_token
+
+DEFAULT_RETENTION = {
+    "automod_logs_days": None,
+    "ban_logs_days": None,
+    "intro_posts_days": None,
+    "ticket_transcripts_days": None,
+    "chat_role_progress_days": None,
+    "archive_logs": False,
+}
+
+
+@pytest.fixture
+def auth_cookie(admin_user: object) -> dict[str, str]:  # noqa: ARG001
+    """認証済み Cookie を生成する。"""
+    token = create_jwt_token("test@example.com")
+    return {"session": token}
+
+
+class TestRetentionSettingsApi:
+    """GET /api/v1/settings と PUT /api/v1/settings/retention。"""
+
+    async def test_defaults_to_keep_forever(
+        self, client: AsyncClient, auth_cookie: dict[str, str]
+    ) -> None:
+        response = await client.get("/api/v1/settings", cookies=auth_cookie)
+        assert response.status_code == 200
+        assert response.json()["retention"] == DEFAULT_RETENTION
+
+    async def test_update_round_trip(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        auth_cookie: dict[str, str],
+    ) -> None:
+        body = {**DEFAULT_RETENTION, "automod_logs_days": 90, "archive_logs": True}
+        response = await client.put(
+            "/api/v1/settings/retention", json=body, cookies=auth_cookie
+        )
+        assert response.status_code == 200
+        assert response.json() == {"ok": True, "retention": body}
+
+        assert await get_retention_policy(db_session) == RetentionPolicy(
+            automod_logs_days=90, archive_logs=True
+        )
+        response = await client.get("/api/v1/settings", cookies=auth_cookie)
+        assert response.json()["retention"] == body
+        assert response.json()["timezone_offset"] == 9
+
+    @pytest.mark.parametrize("days", [0, -1, 3651])
+    async def test_rejects_out_of_range_days(
+        self, client: AsyncClient, auth_cookie: dict[str, str], days: int
+    ) -> None:
+        response = await client.put(
+            "/api/v1/settings/retention",
+            json={"ban_logs_days": days},
+            cookies=auth_cookie,
+        )
+        assert response.status_code == 400
+        assert response.json() == {"error": "ban_logs_days must be between 1 and 3650"}
+
+    async def test_requires_auth(self, client: AsyncClient) -> None:
+        response = await client.put("/api/v1/settings/retention", json={})
+        assert response.status_code == 401
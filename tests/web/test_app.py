@@ -131,6 +131,97 @@ class TestHealthCheckRoute:
 # ===========================================================================
 
 
+class TestApiHealthCheck:
+    """/api/v1/health のテスト。"""
+
+    async def test_includes_event_loop_stats(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Web プロセスのイベントループ遅延の統計を返す。"""
+        from unittest.mock import AsyncMock
+
+        from src.core.loop_monitor import LoopLagProbe
+        from src.web.app import app
+        from src.web.routes import api_misc
+
+        monkeypatch.setattr(
+            api_misc, "check_database_connection", AsyncMock(return_value=True)
+        )
+        probe = LoopLagProbe()
+        probe.observe(0.02)
+        monkeypatch.setattr(app.state, "loop_probe", probe, raising=False)
+
+        response = await client.get("/api/v1/health")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ok"
+        assert "event_loop" not in data
+        assert data["web_event_loop"]["samples"] == 1
+        assert data["web_event_loop"]["max"] == 0.02
+
+    async def test_includes_db_pool_state(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Web プロセスの DB プールの状態と取得待ち時間を返す。"""
+        from unittest.mock import AsyncMock
+
+        from src.web.routes import api_misc
+
+        monkeypatch.setattr(
+            api_misc, "check_database_connection", AsyncMock(return_value=True)
+        )
+
+        response = await client.get("/api/v1/health")
+
+        db_pool = response.json()["db_pool"]
+        assert {"size", "checked_out", "checkouts", "max_wait_ms", "timeouts"} <= set(
+            db_pool
+        )
+
+
+class TestMetricsRoute:
+    """/metrics ルートのテスト。"""
+
+    async def test_metrics_disabled_without_token(self, client: AsyncClient) -> None:
+        """METRICS_TOKEN 未設定時は公開しない。"""
+        response = await client.get("/metrics")
+
+        assert response.status_code == 404
+
+    async def test_metrics_returns_prometheus_text(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Prometheus 形式のメトリクスを返す。"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "metrics_token", "secret")
+
+        response = await client.get(
+            "/metrics", headers={"Authorization": "Bearer secret"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE db_queries_total counter" in response.text
+
+    async def test_metrics_requires_token_when_configured(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """METRICS_TOKEN 設定時は Bearer トークンが必要。"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "metrics_token", "secret")
+
+        denied = await client.get("/metrics")
+        allowed = await client.get(
+            "/metrics", headers={"Authorization": "Bearer secret"}
+        )
+
+        assert denied.status_code == 401
+        assert allowed.status_code == 200
+
+
 class TestIndexRoute:
     """/ ルートのテスト。"""
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -17,11 +18,15 @@ from src.web.discord_api import (
     _create_components_payload,
     _create_content_text,
     _create_embed_payload,
+    _create_http_client,
     add_reactions_to_message,
     clear_reactions_from_message,
+    close_http_client,
     delete_discord_message,
     edit_role_panel_in_discord,
     edit_ticket_panel_in_discord,
+    get_rate_limit_stats,
+    open_http_client,
     post_role_panel_to_discord,
     post_ticket_panel_to_discord,
 )
@@ -659,7 +664,7 @@ class TestAddReactionsToMessage:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 204
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -679,7 +684,7 @@ class TestAddReactionsToMessage:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 204
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -770,25 +775,40 @@ class TestAddReactionsToMessage:
         assert success is False
         assert "接続" in error
 
-    async def test_multiple_reactions_added_with_delay(
+    async def test_multiple_reactions_wait_only_when_bucket_exhausted(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        """複数リアクション追加時にレート制限対策のディレイが入る。"""
-        from unittest.mock import MagicMock
+        """固定ディレイは入れず、残り 0 のときだけリセットまで待機する。"""
+        import time
 
         from src.config import settings
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        success_response = MagicMock()
-        success_response.status_code = 204
-
+        responses = [
+            # 1 回目: バケットを使い切った (0.25 秒後にリセット)
+            httpx.Response(
+                204,
+                headers={
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset-After": "0.25",
+                },
+            ),
+            # 2 回目: まだ残りがある
+            httpx.Response(
+                204,
+                headers={
+                    "X-RateLimit-Remaining": "1",
+                    "X-RateLimit-Reset-After": "0.25",
+                },
+            ),
+            httpx.Response(204),
+        ]
         call_times: list[float] = []
-        import time
 
         async def mock_put(*_args, **_kwargs):
             call_times.append(time.monotonic())
-            return success_response
+            return responses[len(call_times) - 1]
 
         with patch("httpx.AsyncClient") as mock_client:
             mock_client.return_value.__aenter__.return_value.put = mock_put
@@ -803,11 +823,40 @@ class TestAddReactionsToMessage:
 
         assert success is True
         assert error is None
-        # 3回呼ばれた
         assert len(call_times) == 3
-        # ディレイが入っていることを確認 (各呼び出しの間隔が 0.2 秒以上)
-        for i in range(1, len(call_times)):
-            assert call_times[i] - call_times[i - 1] >= 0.2
+        # バケットを使い切った後はリセットまで待つ
+        assert call_times[1] - call_times[0] >= 0.2
+        # 残りがあれば待たない
+        assert call_times[2] - call_times[1] < 0.2
+
+    async def test_reaction_retried_after_429(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """429 を受けたリアクションは Retry-After 後に再送される。"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "discord_token", "test_token")
+
+        mock_put = AsyncMock(
+            side_effect=[
+                httpx.Response(
+                    429,
+                    headers={"Retry-After": "0.01"},
+                    json={"message": "You are being rate limited.", "global": False},
+                ),
+                httpx.Response(204),
+            ]
+        )
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.__aenter__.return_value.put = mock_put
+
+            items = [RolePanelItem(id=1, panel_id=1, role_id="111", emoji="🎮")]
+            success, error = await add_reactions_to_message("123", "456", items)
+
+        assert success is True
+        assert error is None
+        assert mock_put.await_count == 2
 
 
 # ===========================================================================
@@ -1031,7 +1080,7 @@ class TestClearReactionsFromMessage:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 204
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -1111,10 +1160,10 @@ class TestAddReactionsWithClear:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_put_response = AsyncMock()
+        mock_put_response = MagicMock()
         mock_put_response.status_code = 204
 
-        mock_delete_response = AsyncMock()
+        mock_delete_response = MagicMock()
         mock_delete_response.status_code = 204
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -1138,7 +1187,7 @@ class TestAddReactionsWithClear:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_put_response = AsyncMock()
+        mock_put_response = MagicMock()
         mock_put_response.status_code = 204
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -1153,10 +1202,10 @@ class TestAddReactionsWithClear:
         # delete (clear) は呼ばれない
         assert not mock_instance.delete.called
 
-    async def test_delay_after_clear_before_add(
+    async def test_no_fixed_delay_after_clear(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        """clear_existing=True でクリア後にディレイが入る。"""
+        """clear_existing=True でもクリア後に固定ディレイを入れない。"""
         import time
         from unittest.mock import MagicMock
 
@@ -1197,8 +1246,8 @@ class TestAddReactionsWithClear:
         assert len(call_times) == 2
         assert call_times[0][0] == "delete"
         assert call_times[1][0] == "put"
-        # delete と put の間にディレイがある (0.4 秒以上)
-        assert call_times[1][1] - call_times[0][1] >= 0.4
+        # レート制限ヘッダーがなければ delete と put の間で待たない
+        assert call_times[1][1] - call_times[0][1] < 0.4
 
 
 # ===========================================================================
@@ -1233,7 +1282,7 @@ class TestDeleteDiscordMessage:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 204
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -1256,7 +1305,7 @@ class TestDeleteDiscordMessage:
 
         monkeypatch.setattr(settings, "discord_token", "test_token")
 
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 404
 
         with patch("httpx.AsyncClient") as mock_client:
@@ -2441,3 +2490,88 @@ class TestAddReactionsClearFailure:
         assert error is None
         # リアクション追加 (put) が呼ばれた
         assert mock_instance.put.called
+
+
+# ===========================================================================
+# 共有 HTTP クライアントテスト
+# ===========================================================================
+
+
+class TestSharedHttpClient:
+    """open_http_client / close_http_client と共有クライアント利用のテスト。"""
+
+    @pytest.fixture(autouse=True)
+    async def _reset_client(self) -> AsyncIterator[None]:
+        yield
+        await close_http_client()
+
+    async def test_open_returns_same_client(self) -> None:
+        """open_http_client は作成済みのクライアントを再利用する。"""
+        client1 = await open_http_client()
+        client2 = await open_http_client()
+
+        assert client1 is client2
+        assert not client1.is_closed
+
+    def test_client_applies_limits_from_settings(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """接続数の上限が設定値から反映される。"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "discord_http_max_connections", 7)
+        monkeypatch.setattr(settings, "discord_http_max_keepalive_connections", 3)
+
+        with patch("httpx.AsyncClient") as mock_client:
+            _create_http_client()
+
+        limits = mock_client.call_args.kwargs["limits"]
+        assert limits.max_connections == 7
+        assert limits.max_keepalive_connections == 3
+
+    async def test_rate_limit_stats(self) -> None:
+        """共有クライアントの作成中だけレート制限のカウンターを返す。"""
+        assert get_rate_limit_stats() == {}
+
+        await open_http_client()
+
+        stats = get_rate_limit_stats()
+        assert stats["requests"] == 0
+        assert stats["rate_limited"] == 0
+
+    async def test_close_closes_client(self) -> None:
+        """close_http_client はクライアントを閉じて破棄する。"""
+        client = await open_http_client()
+
+        await close_http_client()
+
+        assert client.is_closed
+        # 2 回目の close は何もしない
+        await close_http_client()
+
+    async def test_requests_use_shared_client(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """共有クライアントがあれば一時クライアントを作らずに使う。"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "discord_token", "test_token")
+
+        client = await open_http_client()
+        mock_response = MagicMock()
+        mock_response.status_code = 204
+
+        with (
+            patch.object(
+                client, "delete", AsyncMock(return_value=mock_response)
+            ) as mock_delete,
+            patch("httpx.AsyncClient") as mock_client,
+        ):
+            success, error = await clear_reactions_from_message("123", "456")
+
+        assert success is True
+        assert error is None
+        mock_delete.assert_awaited_once()
+        mock_client.assert_not_called()
+        # リクエスト後も共有クライアントは閉じない
+        assert not client.is_closed
@@ -0,0 +1,269 @@
+"""Tests for Discord REST API rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from src.core.metrics import DISCORD_REST_LATENCY, DISCORD_REST_RATE_LIMITED
+from src.web.discord_ratelimit import DiscordRateLimiter, _route_key
+
+API = "https://discord.com/api/v10"
+
+
+def _client(*responses: httpx.Response) -> MagicMock:
+    """put / post が順にレスポンスを返すモッククライアント。"""
+    client = MagicMock()
+    client.put = AsyncMock(side_effect=list(responses))
+    client.post = AsyncMock(side_effect=list(responses))
+    return client
+
+
+def _exhausted(reset_after: str = "2.5") -> httpx.Response:
+    return httpx.Response(
+        204,
+        headers={
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": reset_after,
+        },
+    )
+
+
+# ===========================================================================
+# ルートキーのテスト
+# ===========================================================================
+
+
+class TestRouteKey:
+    """_route_key 関数のテスト。"""
+
+    def test_reaction_route_groups_messages_and_emojis(self) -> None:
+        """メッセージ ID と絵文字はプレースホルダになる。"""
+        route1, major1 = _route_key(
+            "put", f"{API}/channels/123/messages/456/reactions/%F0%9F%8E%AE/@me"
+        )
+        route2, major2 = _route_key(
+            "PUT", f"{API}/channels/123/messages/789/reactions/name:111/@me"
+        )
+
+        assert (
+            route1 == route2 == "PUT /channels/123/messages/{id}/reactions/{emoji}/@me"
+        )
+        assert major1 == major2 == "123"
+
+    def test_major_parameter_separates_routes(self) -> None:
+        """チャンネル ID (メジャーパラメータ) は別のルートとして扱う。"""
+        route1, _ = _route_key("POST", f"{API}/channels/1/messages")
+        route2, _ = _route_key("POST", f"{API}/channels/2/messages")
+
+        assert route1 != route2
+
+    def test_method_separates_routes(self) -> None:
+        """同じパスでもメソッドが違えば別のルートになる。"""
+        patch_route, _ = _route_key("PATCH", f"{API}/channels/1/messages/2")
+        delete_route, _ = _route_key("DELETE", f"{API}/channels/1/messages/2")
+
+        assert patch_route != delete_route
+
+
+# ===========================================================================
+# DiscordRateLimiter のテスト
+# ===========================================================================
+
+
+class TestDiscordRateLimiter:
+    """DiscordRateLimiter のテスト。"""
+
+    async def test_no_wait_while_remaining(self) -> None:
+        """残りがある間は待機せずに送信する。"""
+        limiter = DiscordRateLimiter()
+        ok = httpx.Response(
+            204,
+            headers={"X-RateLimit-Remaining": "3", "X-RateLimit-Reset-After": "1"},
+        )
+        client = _client(ok, ok)
+        url = f"{API}/channels/1/messages/2/reactions/a/@me"
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.request(client, "PUT", url, timeout=10)
+            await limiter.request(client, "PUT", url, timeout=10)
+
+        mock_sleep.assert_not_awaited()
+        assert limiter.stats.requests == 2
+        client.put.assert_awaited_with(url, timeout=10)
+
+    async def test_waits_for_reset_when_exhausted(self) -> None:
+        """残り 0 になったバケットはリセットまで待ってから送信する。"""
+        limiter = DiscordRateLimiter()
+        client = _client(_exhausted("2.5"), httpx.Response(204))
+        url = f"{API}/channels/1/messages/2/reactions/a/@me"
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.request(client, "PUT", url)
+            await limiter.request(client, "PUT", url)
+
+        mock_sleep.assert_awaited_once()
+        assert 2.0 < mock_sleep.await_args.args[0] <= 2.5
+        assert limiter.stats.preemptive_waits == 1
+
+    async def test_other_channel_not_blocked(self) -> None:
+        """別チャンネル (メジャーパラメータ) のバケットは待たない。"""
+        limiter = DiscordRateLimiter()
+        client = _client(_exhausted(), httpx.Response(204))
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.request(client, "POST", f"{API}/channels/1/messages")
+            await limiter.request(client, "POST", f"{API}/channels/2/messages")
+
+        mock_sleep.assert_not_awaited()
+
+    async def test_retries_after_429(self) -> None:
+        """429 を受けたら Retry-After 秒待って再送する。"""
+        limiter = DiscordRateLimiter()
+        client = _client(
+            httpx.Response(429, headers={"Retry-After": "1.5"}),
+            httpx.Response(204),
+        )
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            response = await limiter.request(
+                client, "POST", f"{API}/channels/1/messages"
+            )
+
+        assert response.status_code == 204
+        mock_sleep.assert_awaited_once_with(1.5)
+        assert limiter.stats.rate_limited == 1
+        assert limiter.stats.global_rate_limited == 0
+        assert limiter.stats.requests == 2
+
+    async def test_records_metrics(self) -> None:
+        """所要時間と 429 の回数をメトリクスに記録する。"""
+        limiter = DiscordRateLimiter()
+        client = _client(
+            httpx.Response(429, headers={"Retry-After": "0.1"}),
+            httpx.Response(204),
+        )
+        requests_before = DISCORD_REST_LATENCY.count(method="POST")
+        limited_before = DISCORD_REST_RATE_LIMITED.value(scope="bucket")
+
+        with patch("src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock):
+            await limiter.request(client, "POST", f"{API}/channels/1/messages")
+
+        assert DISCORD_REST_LATENCY.count(method="POST") == requests_before + 1
+        assert DISCORD_REST_RATE_LIMITED.value(scope="bucket") == limited_before + 1
+
+    async def test_retry_after_from_body(self) -> None:
+        """Retry-After ヘッダーがなければ JSON の retry_after を使う。"""
+        limiter = DiscordRateLimiter()
+        client = _client(
+            httpx.Response(429, json={"retry_after": 0.75, "global": False}),
+            httpx.Response(204),
+        )
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.request(client, "POST", f"{API}/channels/1/messages")
+
+        mock_sleep.assert_awaited_once_with(0.75)
+
+    async def test_global_429_blocks_all_buckets(self) -> None:
+        """グローバルな 429 は他のバケットのリクエストも待たせる。"""
+        limiter = DiscordRateLimiter()
+        client = _client(
+            httpx.Response(
+                429, headers={"Retry-After": "3", "X-RateLimit-Global": "true"}
+            ),
+            httpx.Response(204),
+            httpx.Response(204),
+        )
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await limiter.request(client, "POST", f"{API}/channels/1/messages")
+
+        assert limiter.stats.global_rate_limited == 1
+        # 再送前にグローバルのリセットまで待機した
+        mock_sleep.assert_awaited_once()
+        assert 2.5 < mock_sleep.await_args.args[0] <= 3
+
+    async def test_gives_up_after_max_retries(self) -> None:
+        """再送上限に達したら最後の 429 レスポンスを返す。"""
+        limiter = DiscordRateLimiter()
+        rate_limited = httpx.Response(429, headers={"Retry-After": "0.1"})
+        client = _client(*[rate_limited] * 4)
+
+        with patch("src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock):
+            response = await limiter.request(
+                client, "POST", f"{API}/channels/1/messages"
+            )
+
+        assert response.status_code == 429
+        assert client.post.await_count == 4
+        assert limiter.stats.rate_limited == 4
+
+    async def test_global_limit_per_second(self) -> None:
+        """送信側のグローバル上限を超えるとウィンドウの終わりまで待つ。"""
+        limiter = DiscordRateLimiter(global_limit_per_second=2)
+        client = _client(*[httpx.Response(204)] * 3)
+
+        with patch(
+            "src.web.discord_ratelimit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            for channel_id in ("1", "2", "3"):
+                await limiter.request(
+                    client, "POST", f"{API}/channels/{channel_id}/messages"
+                )
+
+        mock_sleep.assert_awaited_once()
+        assert limiter.stats.preemptive_waits == 1
+
+    async def test_concurrent_waiters_share_the_next_window(self) -> None:
+        """同時に待っていたリクエストが次のウィンドウで上限を超えない。"""
+        limiter = DiscordRateLimiter(global_limit_per_second=2)
+        clock = [100.0]
+        sent: list[float] = []
+
+        async def fake_sleep(seconds: float) -> None:
+            wake_at = clock[0] + seconds
+            await real_sleep(0)
+            clock[0] = max(clock[0], wake_at)
+
+        async def send() -> None:
+            await limiter._wait_global()
+            sent.append(clock[0])
+
+        real_sleep = asyncio.sleep
+        fake_time = MagicMock()
+        fake_time.monotonic = lambda: clock[0]
+        with (
+            patch("src.web.discord_ratelimit.time", fake_time),
+            patch("src.web.discord_ratelimit.asyncio.sleep", fake_sleep),
+        ):
+            await asyncio.gather(*(send() for _ in range(6)))
+
+        assert sent == [100.0, 100.0, 101.0, 101.0, 102.0, 102.0]
+
+    async def test_snapshot(self) -> None:
+        """snapshot はカウンターを辞書で返す。"""
+        limiter = DiscordRateLimiter()
+        client = _client(httpx.Response(204))
+
+        await limiter.request(client, "POST", f"{API}/channels/1/messages")
+
+        snapshot = limiter.snapshot()
+        assert snapshot["requests"] == 1
+        assert snapshot["rate_limited"] == 0
+        assert snapshot["wait_seconds"] == 0.0
@@ -101,3 +101,25 @@ class TestLifespanHandler:
             # 例外が発生しないことを確認
             async with lifespan(test_app):
                 pass  # 正常に完了すればOK
+
+    async def test_lifespan_opens_and_closes_http_client(self) -> None:
+        """起動時に共有 HTTP クライアントを作成し、終了時に閉じる。"""
+        from fastapi import FastAPI
+
+        from src.web import discord_api
+        from src.web.app import lifespan
+
+        test_app = FastAPI()
+
+        with patch(
+            "src.web.app.check_database_connection", new_callable=AsyncMock
+        ) as mock_check_db:
+            mock_check_db.return_value = False
+
+            async with lifespan(test_app):
+                client = discord_api._http_client
+                assert client is not None
+                assert not client.is_closed
+
+        assert client.is_closed
+        assert discord_api._http_client is None
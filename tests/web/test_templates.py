@@ -2691,6 +2691,30 @@ class TestTicketDetailPage:
         )
         assert "will be available" not in result
 
+    def test_transcript_attached_to_close_log(self) -> None:
+        """本文がクローズログにある場合は件数と Discord へのリンクを表示する。"""
+        ticket = Ticket(
+            id=1,
+            guild_id="123",
+            user_id="456",
+            username="testuser",
+            category_id=1,
+            status="closed",
+            ticket_number=1,
+            transcript=None,
+            transcript_message_count=1234,
+            transcript_channel_id="888",
+            transcript_message_id="999",
+        )
+        result = ticket_detail_page(
+            ticket,
+            category_name="General",
+            guild_name="Guild",
+            csrf_token="token",
+        )
+        assert "1234 messages" in result
+        assert "https://discord.com/channels/123/888/999" in result
+
 
 class TestTicketPanelsListPage:
     """ticket_panels_list_page のテスト。"""